@@ -8,6 +8,7 @@ from languagemodelcommon.image_generation.image_generator_factory import (
 )
 from languagemodelcommon.ocr.ocr_extractor_factory import OCRExtractorFactory
 from languagemodelcommon.configs.config_reader.config_reader import ConfigReader
+from languagemodelcommon.utilities.mongo_url_utils import MongoUrlHelpers
 from languagemodelcommon.configs.config_reader.mcp_json_fetcher import McpJsonFetcher
 from languagemodelcommon.container.container_factory import (
     LanguageModelCommonContainerFactory,
@@ -78,6 +79,21 @@ from languagemodelcommon.models.model_factory import ModelFactory
 from languagemodelcommon.persistence.persistence_factory import (
     PersistenceFactory,
 )
+from language_model_gateway.gateway.routers.model_routing.tokenizer_executor import (
+    TokenizerExecutor,
+)
+from language_model_gateway.gateway.routers.model_routing.bedrock_executor import (
+    BedrockExecutor,
+)
+from language_model_gateway.gateway.routers.model_routing.mongo_client_provider import (
+    MongoClientProvider,
+)
+from language_model_gateway.gateway.routers.model_routing.session_savings_cache import (
+    SessionSavingsCache,
+)
+from language_model_gateway.gateway.routers.model_routing.upstream_client_pool import (
+    UpstreamClientPool,
+)
 from language_model_gateway.gateway.providers.langchain_chat_completions_provider import (
     LangChainCompletionsProvider,
 )
@@ -113,6 +129,23 @@ logger.setLevel(SRC_LOG_LEVELS["INITIALIZATION"])
 
 
 class LanguageModelGatewayContainerFactory:
+    @staticmethod
+    def _model_routing_mongo_uri(
+        env_vars: LanguageModelGatewayEnvironmentVariables,
+    ) -> str | None:
+        """MONGO_LLM_STORAGE_URI with MONGO_LLM_STORAGE_DB_USERNAME/PASSWORD
+        merged in, the same way persistence_factory.py does for other
+        Mongo-backed stores — the bare URL has no embedded credentials in
+        some environments."""
+        mongo_uri = env_vars.mongo_llm_storage_uri
+        if not mongo_uri:
+            return None
+        return MongoUrlHelpers.add_credentials_to_mongo_url(
+            mongo_url=mongo_uri,
+            username=env_vars.mongo_llm_storage_db_username,
+            password=env_vars.mongo_llm_storage_db_password,
+        )
+
     @classmethod
     def create_container(cls, *, source: str) -> SimpleContainer:
         logger.info("Initializing DI container")
@@ -155,6 +188,82 @@ class LanguageModelGatewayContainerFactory:
 
         container.singleton(HttpClientFactory, lambda c: HttpClientFactory())
 
+        # One pool of long-lived upstream connections per worker for
+        # CodingModelRouter; closed by the app lifespan on shutdown.
+        container.singleton(
+            UpstreamClientPool,
+            lambda c: UpstreamClientPool(
+                max_connections=c.resolve(
+                    LanguageModelGatewayEnvironmentVariables
+                ).model_routing_upstream_max_connections,
+                max_keepalive_connections=c.resolve(
+                    LanguageModelGatewayEnvironmentVariables
+                ).model_routing_upstream_max_keepalive_connections,
+                keepalive_expiry_seconds=c.resolve(
+                    LanguageModelGatewayEnvironmentVariables
+                ).model_routing_upstream_keepalive_expiry_seconds,
+                http2=c.resolve(
+                    LanguageModelGatewayEnvironmentVariables
+                ).model_routing_upstream_http2,
+            ),
+        )
+
+        # One MongoDB client (and connection pool) per worker shared by the
+        # model router's usage/error trackers, account directory and session
+        # savings reader; connected and closed by the app lifespan.
+        container.singleton(
+            MongoClientProvider,
+            lambda c: MongoClientProvider(
+                mongo_uri=cls._model_routing_mongo_uri(
+                    c.resolve(LanguageModelGatewayEnvironmentVariables)
+                ),
+                max_pool_size=c.resolve(
+                    LanguageModelGatewayEnvironmentVariables
+                ).model_routing_mongo_max_pool_size,
+                min_pool_size=c.resolve(
+                    LanguageModelGatewayEnvironmentVariables
+                ).model_routing_mongo_min_pool_size,
+            ),
+        )
+
+        # Shared by the usage tracker, which invalidates it on every write,
+        # and the session savings endpoint it caches for.
+        container.singleton(
+            SessionSavingsCache,
+            lambda c: SessionSavingsCache(
+                ttl_seconds=c.resolve(
+                    LanguageModelGatewayEnvironmentVariables
+                ).model_routing_session_savings_cache_ttl_seconds,
+            ),
+        )
+        # Per-worker thread pool for CodingModelRouter's preflight token
+        # counting; shut down by the app lifespan.
+        container.singleton(
+            TokenizerExecutor,
+            lambda c: TokenizerExecutor(
+                max_workers=c.resolve(
+                    LanguageModelGatewayEnvironmentVariables
+                ).model_routing_tokenizer_max_workers,
+                max_pending=c.resolve(
+                    LanguageModelGatewayEnvironmentVariables
+                ).model_routing_tokenizer_max_pending,
+                timeout_seconds=c.resolve(
+                    LanguageModelGatewayEnvironmentVariables
+                ).model_routing_tokenizer_timeout_seconds,
+            ),
+        )
+        # Per-worker thread pool for boto3 Bedrock calls (only used with
+        # MODEL_ROUTING_BEDROCK_NATIVE_CLIENT=boto3); shut down by the app
+        # lifespan.
+        container.singleton(
+            BedrockExecutor,
+            lambda c: BedrockExecutor(
+                max_workers=c.resolve(
+                    LanguageModelGatewayEnvironmentVariables
+                ).model_routing_bedrock_executor_max_workers,
+            ),
+        )
+
         container.singleton(
             OpenAiChatCompletionsProvider,
             lambda c: OpenAiChatCompletionsProvider(
@@ -5,7 +5,7 @@ import uuid
 from contextlib import asynccontextmanager
 from os import makedirs
 from pathlib import Path
-from typing import AsyncGenerator, Annotated, List
+from typing import Any, AsyncGenerator, Annotated, List
 
 from fastapi import FastAPI, HTTPException
 from fastapi.params import Depends
@@ -22,19 +22,53 @@ from starlette.staticfiles import StaticFiles
 from languagemodelcommon.configs.config_reader.config_reader import ConfigReader
 from key_value.aio.stores.base import BaseContextManagerStore, BaseStore
 from languagemodelcommon.configs.schemas.config_schema import ChatModelConfig
-from languagemodelcommon.utilities.mongo_url_utils import MongoUrlHelpers
 from language_model_gateway.container.container_factory import (
     LanguageModelGatewayContainerFactory,
 )
 from language_model_gateway.gateway.middleware.fastapi_logging_middleware import (
     FastApiLoggingMiddleware,
 )
+from language_model_gateway.gateway.routers.model_routing.bedrock_client import (
+    get_bedrock_circuit_breaker,
+    get_bedrock_dispatch_scheduler,
+)
+from language_model_gateway.gateway.routers.model_routing.dispatch_budget_store import (
+    RedisDispatchBudgetStore,
+)
+from language_model_gateway.gateway.routers.model_routing.mongo_client_provider import (
+    MongoClientProvider,
+)
+from language_model_gateway.gateway.routers.model_routing.route_config import (
+    _config_backends,
+    _tokenizer_models,
+)
+from language_model_gateway.gateway.routers.model_routing.route_config_watcher import (
+    RouteConfigWatcher,
+)
 from language_model_gateway.gateway.routers.model_routing.router import (
     CodingModelRouter,
 )
+from language_model_gateway.gateway.routers.model_routing.session_savings_cache import (
+    SessionSavingsCache,
+)
 from language_model_gateway.gateway.routers.model_routing.session_savings_router import (
     SessionSavingsRouter,
 )
+from language_model_gateway.gateway.routers.model_routing.tokenizer import (
+    preload_tokenizers,
+)
+from language_model_gateway.gateway.routers.model_routing.tokenizer_executor import (
+    TokenizerExecutor,
+)
+from language_model_gateway.gateway.routers.model_routing.bedrock_executor import (
+    BedrockExecutor,
+)
+from language_model_gateway.gateway.routers.model_routing.usage_rollup_router import (
+    UsageRollupRouter,
+)
+from language_model_gateway.gateway.routers.model_routing.upstream_client_pool import (
+    UpstreamClientPool,
+)
 from language_model_gateway.gateway.routers.chat_completion_router import (
     ChatCompletionsRouter,
 )
@@ -53,6 +87,9 @@ from language_model_gateway.gateway.routers.token_submission_router import (
     TokenSubmissionRouter,
 )
 from language_model_gateway.gateway.utilities.endpoint_filter import EndpointFilter
+from language_model_gateway.gateway.utilities.event_loop_lag_monitor import (
+    EventLoopLagMonitor,
+)
 from language_model_gateway.gateway.utilities.logger.log_levels import (
     SRC_LOG_LEVELS,
     build_log_handler,
@@ -133,16 +170,69 @@ async def lifespan(app1: FastAPI) -> AsyncGenerator[None, None]:
     env_vars = container.resolve(LanguageModelGatewayEnvironmentVariables)
     snapshot_cache: BaseContextManagerStore = container.resolve(BaseStore)
     config_reader = container.resolve(ConfigReader)
+    upstream_client_pool = container.resolve(UpstreamClientPool)
+    dispatch_scheduler = get_bedrock_dispatch_scheduler()
+    tokenizer_executor = container.resolve(TokenizerExecutor)
+    bedrock_executor = container.resolve(BedrockExecutor)
+    mongo_client_provider = container.resolve(MongoClientProvider)
+    loop_lag_monitor = EventLoopLagMonitor()
     refresh_task: asyncio.Task[None] | None = None
+    coding_model_router = getattr(app1.state, "coding_model_router", None)
+
+    async def prewarm_routes(config: dict[str, Any] | None = None) -> None:
+        """Tokenizers, upstream clients and AWS credentials for `config`'s
+        routes (the live config by default)."""
+        if coding_model_router is not None:
+            await coding_model_router.prewarm_routes(_config_backends(config))
+        if env_vars.model_routing_tokenizer_preload:
+            await preload_tokenizers(_tokenizer_models(config))
+
+    route_config_watcher = RouteConfigWatcher(
+        interval_seconds=env_vars.model_routing_config_reload_interval_seconds,
+        prewarm=prewarm_routes,
+    )
     try:
         logger.info(f"Starting application initialization for worker {worker_id}...")
 
         # Open the snapshot cache store (MongoDB if configured, memory otherwise)
         await snapshot_cache.__aenter__()
 
+        loop_lag_monitor.start()
+
+        # Connect the model router's shared MongoDB client now, not on the
+        # first request that records usage
+        if mongo_client_provider.mongo_uri:
+            await mongo_client_provider.connect()
+
+        # Load the account directory into memory (if enabled) so resolving
+        # an account's email doesn't query MongoDB
+        if coding_model_router is not None:
+            await coding_model_router.astart()
+
+        # Share the Bedrock dispatch budget with the other workers if configured
+        dispatch_redis_url = env_vars.model_routing_dispatch_redis_url
+        if dispatch_redis_url:
+            dispatch_scheduler.use_shared_store(
+                RedisDispatchBudgetStore(dispatch_redis_url)
+            )
+            logger.info("Bedrock dispatch budget shared via Redis")
+
+        get_bedrock_circuit_breaker().configure(
+            enabled=env_vars.model_routing_circuit_breaker_enabled,
+            open_seconds=env_vars.model_routing_circuit_open_seconds,
+            open_below_health=env_vars.model_routing_circuit_open_below_health,
+        )
+
         # Eagerly load all configs at startup (triggers GitHub download if configured)
         await _load_all_configs(config_reader=config_reader)
 
+        # Load route tokenizers, upstream clients and AWS credentials now so
+        # the first request doesn't pay for them
+        await prewarm_routes()
+
+        # Pick up edits to the route config without a restart
+        route_config_watcher.start()
+
         # Start background refresh loop
         interval = env_vars.config_refresh_interval_minutes
         refresh_task = asyncio.create_task(
@@ -170,7 +260,19 @@ async def lifespan(app1: FastAPI) -> AsyncGenerator[None, None]:
                 except asyncio.CancelledError:
                     # Expected: background refresh task was cancelled during shutdown
                     logger.debug("Background refresh task cancelled during shutdown")
+            await route_config_watcher.stop()
             await snapshot_cache.__aexit__(None, None, None)
+            # Drain CodingModelRouter's buffered usage writes and stop its
+            # account directory sync.
+            if coding_model_router is not None:
+                await coding_model_router.aclose()
+            await mongo_client_provider.aclose()
+            # Close CodingModelRouter's pooled upstream connections.
+            await upstream_client_pool.aclose()
+            await dispatch_scheduler.aclose()
+            tokenizer_executor.shutdown()
+            bedrock_executor.shutdown()
+            await loop_lag_monitor.stop()
             logger.info("Application shutdown completed")
         except Exception:
             logger.exception("Application shutdown failed for worker %s", worker_id)
@@ -182,52 +284,105 @@ def create_app() -> FastAPI:
     container = ContainerRegistry.get_current()
     env_vars = container.resolve(LanguageModelGatewayEnvironmentVariables)
 
-    mongo_llm_storage_uri = env_vars.mongo_llm_storage_uri
-    if mongo_llm_storage_uri:
-        # The bare MONGO_URL/MONGO_LLM_STORAGE_URI has no embedded credentials in
-        # some environments; merge in MONGO_LLM_STORAGE_DB_USERNAME/PASSWORD the
-        # same way persistence_factory.py does for other Mongo-backed stores.
-        mongo_llm_storage_uri = MongoUrlHelpers.add_credentials_to_mongo_url(
-            mongo_url=mongo_llm_storage_uri,
-            username=env_vars.mongo_llm_storage_db_username,
-            password=env_vars.mongo_llm_storage_db_password,
-        )
-
+    mongo_client_provider = container.resolve(MongoClientProvider)
+    mongo_llm_storage_uri = mongo_client_provider.mongo_uri
+    # Shared so usage writes invalidate what the savings endpoint serves.
+    session_savings_cache = container.resolve(SessionSavingsCache)
+
+    coding_model_router = CodingModelRouter(
+        mongo_uri=mongo_llm_storage_uri,
+        usage_db_name=env_vars.mongo_llm_storage_db_name or "llm_storage",
+        usage_collection_name=env_vars.model_routing_usage_collection_name,
+        usage_session_collection_name=(
+            env_vars.model_routing_usage_session_collection_name
+        ),
+        usage_track_sessions=env_vars.model_routing_usage_session_tracking_enabled,
+        usage_capture_previews=env_vars.model_routing_usage_capture_previews,
+        usage_preview_chars=env_vars.model_routing_usage_preview_chars,
+        usage_rollup_collection_prefix=(
+            env_vars.model_routing_usage_rollup_collection_prefix
+            if env_vars.model_routing_usage_rollups_enabled
+            else None
+        ),
+        error_collection_name=env_vars.model_routing_error_collection_name,
+        error_group_collection_name=(
+            env_vars.model_routing_error_group_collection_name
+        ),
+        error_aggregation_window_seconds=(
+            env_vars.model_routing_error_aggregation_window_seconds
+        ),
+        error_sample_rate=env_vars.model_routing_error_sample_rate,
+        error_max_writes_per_second=(
+            env_vars.model_routing_error_max_writes_per_second
+        ),
+        account_directory_collection_name=(
+            env_vars.model_routing_account_directory_collection_name
+        ),
+        account_directory_preload=env_vars.model_routing_account_directory_preload,
+        account_directory_cache_max_entries=(
+            env_vars.model_routing_account_directory_cache_max_entries
+        ),
+        account_directory_hit_ttl_seconds=(
+            env_vars.model_routing_account_directory_hit_ttl_seconds
+        ),
+        account_directory_miss_ttl_seconds=(
+            env_vars.model_routing_account_directory_miss_ttl_seconds
+        ),
+        account_directory_refresh_interval_seconds=(
+            env_vars.model_routing_account_directory_refresh_interval_seconds
+        ),
+        token_reader=container.resolve(TokenReader),
+        debug_log_received_oauth_tokens=env_vars.debug_log_received_oauth_tokens,
+        custom_header_prefix=env_vars.model_routing_custom_header_prefix,
+        bedrock_transport=env_vars.model_routing_bedrock_transport,
+        qwen_enable_thinking=env_vars.model_routing_qwen_enable_thinking,
+        bedrock_connect_timeout_seconds=(
+            env_vars.model_routing_bedrock_connect_timeout_seconds
+        ),
+        bedrock_read_timeout_seconds=(
+            env_vars.model_routing_bedrock_read_timeout_seconds
+        ),
+        bedrock_max_attempts=env_vars.model_routing_bedrock_max_attempts,
+        bedrock_retry_mode=env_vars.model_routing_bedrock_retry_mode,
+        bedrock_native_client=env_vars.model_routing_bedrock_native_client,
+        stream_flush_bytes=env_vars.model_routing_stream_flush_bytes,
+        stream_flush_interval_seconds=(
+            env_vars.model_routing_stream_flush_interval_ms / 1000
+        ),
+        upstream_client_pool=container.resolve(UpstreamClientPool),
+        tokenizer_executor=container.resolve(TokenizerExecutor),
+        bedrock_executor=container.resolve(BedrockExecutor),
+        mongo_client_provider=mongo_client_provider,
+        session_savings_cache=session_savings_cache,
+        usage_write_batch_size=env_vars.model_routing_usage_write_batch_size,
+        usage_flush_interval_seconds=(
+            env_vars.model_routing_usage_flush_interval_ms / 1000
+        ),
+        usage_max_pending_writes=env_vars.model_routing_usage_max_pending_writes,
+        spool_directory=env_vars.model_routing_spool_dir or None,
+        mongo_write_timeout_seconds=(
+            env_vars.model_routing_mongo_write_timeout_seconds
+        ),
+    )
+    # Closed (and its buffered usage records drained) by the lifespan.
+    app1.state.coding_model_router = coding_model_router
+    app1.include_router(coding_model_router.get_router())
     app1.include_router(
-        CodingModelRouter(
+        SessionSavingsRouter(
             mongo_uri=mongo_llm_storage_uri,
-            usage_db_name=env_vars.mongo_llm_storage_db_name or "llm_storage",
-            usage_collection_name=env_vars.model_routing_usage_collection_name,
-            usage_session_collection_name=(
-                env_vars.model_routing_usage_session_collection_name
-            ),
-            usage_track_sessions=env_vars.model_routing_usage_session_tracking_enabled,
-            usage_capture_previews=env_vars.model_routing_usage_capture_previews,
-            usage_preview_chars=env_vars.model_routing_usage_preview_chars,
-            error_collection_name=env_vars.model_routing_error_collection_name,
-            account_directory_collection_name=(
-                env_vars.model_routing_account_directory_collection_name
-            ),
-            token_reader=container.resolve(TokenReader),
-            debug_log_received_oauth_tokens=env_vars.debug_log_received_oauth_tokens,
-            custom_header_prefix=env_vars.model_routing_custom_header_prefix,
-            bedrock_transport=env_vars.model_routing_bedrock_transport,
-            qwen_enable_thinking=env_vars.model_routing_qwen_enable_thinking,
-            bedrock_connect_timeout_seconds=(
-                env_vars.model_routing_bedrock_connect_timeout_seconds
-            ),
-            bedrock_read_timeout_seconds=(
-                env_vars.model_routing_bedrock_read_timeout_seconds
-            ),
-            bedrock_max_attempts=env_vars.model_routing_bedrock_max_attempts,
-            bedrock_retry_mode=env_vars.model_routing_bedrock_retry_mode,
+            db_name=env_vars.mongo_llm_storage_db_name or "llm_storage",
+            collection_name=env_vars.model_routing_usage_session_collection_name,
+            mongo_client_provider=mongo_client_provider,
+            savings_cache=session_savings_cache,
         ).get_router()
     )
     app1.include_router(
-        SessionSavingsRouter(
+        UsageRollupRouter(
             mongo_uri=mongo_llm_storage_uri,
             db_name=env_vars.mongo_llm_storage_db_name or "llm_storage",
-            collection_name=env_vars.model_routing_usage_session_collection_name,
+            collection_prefix=env_vars.model_routing_usage_rollup_collection_prefix,
+            token_reader=container.resolve(TokenReader),
+            mongo_client_provider=mongo_client_provider,
         ).get_router()
     )
     app1.include_router(ChatCompletionsRouter().get_router())
@@ -37,10 +37,14 @@ class FastApiLoggingMiddleware(BaseHTTPMiddleware):
         if request.url.path == "/health":
             return await call_next(request)
 
+        # Keep the raw bytes and only parse them if the request is actually
+        # logged (an error response, or DEBUG) — decoding every multi-MB
+        # /v1/messages body here just to discard it doubled the JSON work
+        # the endpoint itself already does.
         try:
-            req_body = await request.json()
+            raw_req_body: bytes | None = await request.body()
         except Exception:
-            req_body = None
+            raw_req_body = None
 
         start_time = time.perf_counter()
         response: Response = await call_next(request)
@@ -119,6 +123,7 @@ class FastApiLoggingMiddleware(BaseHTTPMiddleware):
                             )
 
         if response.status_code >= 300:
+            req_body = self._parse_body(raw_req_body)
             logger.error(
                 f"\n==== Request ERROR: {request.method} {request.url} ======"
                 f"\n===== Headers ======"
@@ -135,6 +140,7 @@ class FastApiLoggingMiddleware(BaseHTTPMiddleware):
             )
         else:
             if logger.isEnabledFor(logging.DEBUG):
+                req_body = self._parse_body(raw_req_body)
                 logger.debug(
                     f"\n==== Request: {request.method} {request.url} ======"
                     f"\n===== Headers ======"
@@ -150,3 +156,12 @@ class FastApiLoggingMiddleware(BaseHTTPMiddleware):
                     f"\n==== End of Response Body ======"
                 )
         return response
+
+    @staticmethod
+    def _parse_body(raw_req_body: bytes | None) -> object:
+        if not raw_req_body:
+            return None
+        try:
+            return json.loads(raw_req_body)
+        except Exception:
+            return None
@@ -4,14 +4,27 @@ Resolves Claude Code's opaque per-request account_uuid (sent in
 body["metadata"]["user_id"]) to a human email via a manually populated
 MongoDB lookup table. See docs/superpowers/specs/2026-07-12-account-directory-design.md
 for the full background on why this exists.
+
+resolve_email() is on the hot request path, so lookups are served from an
+in-process cache: AccountDirectory.start() bulk-loads the collection at
+startup, then a MongoDB change stream keeps the cache current (or, where
+change streams aren't available, e.g. a standalone mongod, a periodic
+re-load does). Accounts not in the cache fall back to one find_one, and the
+result — including "not in the directory" — is cached with its own TTL.
 """
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+import time
+from collections import OrderedDict
 from typing import Any
 
+from .mongo_client_provider import MongoClientProvider
+
+
 logger = logging.getLogger(__name__)
 
 
@@ -59,6 +72,39 @@ def extract_session_id(body_json: dict[str, Any]) -> str | None:
     return session_id if isinstance(session_id, str) else None
 
 
+class _EmailCache:
+    """LRU of account_uuid -> email (None for a miss), each entry with its
+    own expiry.
+
+    Only touched from the event loop, so no lock is needed.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[str | None, float]] = OrderedDict()
+
+    def get(self, account_uuid: str) -> tuple[bool, str | None]:
+        """(found, email); an expired entry counts as not found."""
+        entry = self._entries.get(account_uuid)
+        if entry is None:
+            return False, None
+        email, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[account_uuid]
+            return False, None
+        self._entries.move_to_end(account_uuid)
+        return True, email
+
+    def put(self, account_uuid: str, email: str | None, ttl_seconds: float) -> None:
+        self._entries[account_uuid] = (email, time.monotonic() + ttl_seconds)
+        self._entries.move_to_end(account_uuid)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
 class AccountDirectory:
     """Resolves an account_uuid to an email via a manually populated Mongo collection."""
 
@@ -68,15 +114,39 @@ class AccountDirectory:
         db_name: str = "llm_storage",
         collection_name: str = "account_directory",
         enabled: bool = True,
+        client_provider: MongoClientProvider | None = None,
+        *,
+        cache_max_entries: int = 10_000,
+        hit_ttl_seconds: float = 3600.0,
+        miss_ttl_seconds: float = 300.0,
+        failure_ttl_seconds: float = 30.0,
+        refresh_interval_seconds: float = 300.0,
     ) -> None:
         self._mongo_uri = mongo_uri
         self._db_name = db_name
         self._collection_name = collection_name
         self._enabled = enabled
+        self._client_provider = client_provider
         self._client: Any | None = None
         self._db: Any | None = None
         self._collection: Any | None = None
-        self._email_cache: dict[str, str | None] = {}
+        self._email_cache = _EmailCache(cache_max_entries)
+        self._cache_max_entries = cache_max_entries
+        self._hit_ttl_seconds = hit_ttl_seconds
+        self._miss_ttl_seconds = miss_ttl_seconds
+        # A failed lookup is cached briefly so an outage doesn't turn into a
+        # find_one per request, but is retried long before a genuine miss.
+        self._failure_ttl_seconds = failure_ttl_seconds
+        self._refresh_interval_seconds = refresh_interval_seconds
+        self._sync_task: asyncio.Task[None] | None = None
+
+    def _report_mongo_failure(self, error: BaseException) -> None:
+        if self._client_provider is not None:
+            self._client_provider.report_failure("account_directory", error)
+
+    def _report_mongo_success(self) -> None:
+        if self._client_provider is not None:
+            self._client_provider.report_success()
 
     async def _ensure_connected(self) -> None:
         """Ensure MongoDB connection is established."""
@@ -84,12 +154,9 @@ class AccountDirectory:
             return
 
         try:
-            # Deferred import: skip pymongo's import cost when this feature
-            # is disabled (no mongo_uri configured), since _ensure_connected
-            # is then never called.
-            from pymongo import AsyncMongoClient
-
-            self._client = AsyncMongoClient(self._mongo_uri)
+            self._client = MongoClientProvider.client_for(
+                self._client_provider, self._mongo_uri
+            )
             self._db = self._client[self._db_name]
             self._collection = self._db[self._collection_name]
             logger.info(
@@ -105,46 +172,145 @@ class AccountDirectory:
             )
             self._enabled = False
 
+    async def start(self) -> None:
+        """Preload the directory and start keeping the cache in sync.
+
+        Called from the FastAPI lifespan. Never raises: if MongoDB is
+        unreachable, lookups fall back to find_one on the request path.
+        """
+        await self._ensure_connected()
+        if self._collection is None or self._sync_task is not None:
+            return
+        await self.preload()
+        self._sync_task = asyncio.create_task(self._sync_loop())
+
+    async def preload(self) -> int:
+        """Stream the collection into the cache; returns entries loaded.
+
+        Stops at the cache's capacity rather than evicting what it just
+        loaded.
+        """
+        if self._collection is None:
+            return 0
+        loaded = 0
+        try:
+            cursor = self._collection.find({}, {"email": 1}, batch_size=1000)
+            async for doc in cursor:
+                self._cache_document(doc)
+                loaded += 1
+                if loaded >= self._cache_max_entries:
+                    break
+        except Exception as e:
+            self._report_mongo_failure(e)
+            logger.warning("[account_directory] Failed to preload directory: %s", e)
+            return loaded
+        self._report_mongo_success()
+        logger.info("[account_directory] Preloaded %d account(s)", loaded)
+        return loaded
+
+    def _cache_document(self, doc: dict[str, Any]) -> None:
+        email = doc.get("email")
+        if isinstance(email, str):
+            self._email_cache.put(str(doc["_id"]), email, self._hit_ttl_seconds)
+        else:
+            self._email_cache.put(str(doc["_id"]), None, self._miss_ttl_seconds)
+
+    def _apply_change(self, change: dict[str, Any]) -> None:
+        account_uuid = (change.get("documentKey") or {}).get("_id")
+        if account_uuid is None:
+            return
+        operation = change.get("operationType")
+        doc = change.get("fullDocument")
+        if operation in ("insert", "update", "replace") and isinstance(doc, dict):
+            self._cache_document(doc)
+        elif operation in ("insert", "update", "replace", "delete"):
+            self._email_cache.put(str(account_uuid), None, self._miss_ttl_seconds)
+
+    async def _watch(self) -> None:
+        if self._collection is None:
+            return
+        async with await self._collection.watch(full_document="updateLookup") as stream:
+            logger.info("[account_directory] Watching directory for changes")
+            async for change in stream:
+                self._apply_change(change)
+
+    async def _sync_loop(self) -> None:
+        """Apply directory changes as they happen.
+
+        Change streams need a replica set; when one can't be opened (or
+        drops), the directory is re-loaded every refresh interval instead,
+        and the change stream is retried after each re-load.
+        """
+        fallback_logged = False
+        while True:
+            try:
+                await self._watch()
+            except Exception as e:
+                log = logger.debug if fallback_logged else logger.info
+                log(
+                    "[account_directory] Change stream unavailable (%s); "
+                    "re-loading every %.0fs",
+                    e,
+                    self._refresh_interval_seconds,
+                )
+                fallback_logged = True
+            await asyncio.sleep(self._refresh_interval_seconds)
+            await self.preload()
+
     async def resolve_email(self, account_uuid: str) -> str | None:
         """Look up the email for an account_uuid. Returns None on any failure.
 
-        Results (including misses) are cached in-process for the lifetime of
-        this instance, since the underlying directory only changes via manual
-        re-import and this is called on the hot request path. A transient
-        Mongo failure is cached as a miss too, same as a genuine "not in the
-        directory" — it won't be retried until the process restarts.
+        Served from the cache when possible. Hits, misses ("not in the
+        directory") and failed lookups are each cached for their own TTL,
+        so a newly added account or a recovered MongoDB is picked up
+        without a restart even when the cache isn't being kept in sync.
         """
-        if account_uuid in self._email_cache:
-            return self._email_cache[account_uuid]
+        found, cached = self._email_cache.get(account_uuid)
+        if found:
+            return cached
 
         await self._ensure_connected()
 
         if self._collection is None:
-            self._email_cache[account_uuid] = None
+            self._email_cache.put(account_uuid, None, self._miss_ttl_seconds)
             return None
 
         try:
             doc = await self._collection.find_one({"_id": account_uuid})
         except Exception as e:
+            self._report_mongo_failure(e)
             logger.warning(
                 "[account_directory] Failed to resolve account_uuid: %s",
                 e,
                 exc_info=True,
             )
-            self._email_cache[account_uuid] = None
+            self._email_cache.put(account_uuid, None, self._failure_ttl_seconds)
             return None
+        self._report_mongo_success()
 
         if not doc:
-            self._email_cache[account_uuid] = None
+            self._email_cache.put(account_uuid, None, self._miss_ttl_seconds)
             return None
 
         email = doc.get("email")
         result = email if isinstance(email, str) else None
-        self._email_cache[account_uuid] = result
+        self._email_cache.put(
+            account_uuid,
+            result,
+            self._hit_ttl_seconds if result is not None else self._miss_ttl_seconds,
+        )
         return result
 
     async def close(self) -> None:
-        """Close MongoDB connection."""
-        if self._client is not None:
+        """Close MongoDB connection (unless it's the shared one, which is
+        closed by its MongoClientProvider)."""
+        task, self._sync_task = self._sync_task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                logger.debug("[account_directory] Directory sync stopped")
+        if self._client is not None and self._client_provider is None:
             await self._client.close()
             logger.info("[account_directory] MongoDB connection closed")
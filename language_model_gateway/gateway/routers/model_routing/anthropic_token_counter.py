@@ -0,0 +1,239 @@
+"""
+Local token counting for Anthropic-format `/v1/messages/count_tokens` bodies.
+
+Claude Code calls count_tokens constantly to decide when to compact. Routes
+without a HuggingFace `tokenizer_model` (Anthropic passthrough and Bedrock)
+used to forward it upstream — a network round trip per call — or return
+`len(json.dumps(body)) // 4`, which ignores how images, tool schemas and
+thinking blocks are actually billed. Claude's tokenizer isn't published, so
+this walks the body and counts each part the way Anthropic documents it:
+
+- text (system, messages, tool results): characters / _TEXT_CHARS_PER_TOKEN;
+  JSON-ish content (tool inputs, tool schemas) is denser, so it uses
+  _JSON_CHARS_PER_TOKEN;
+- images: (width × height) / 750 after the API's own downscaling, with the
+  dimensions read from the image header rather than decoding the image;
+- tools: their name, description and schema, plus the fixed tool-use system
+  prompt Anthropic adds whenever `tools` is non-empty;
+- thinking blocks from earlier assistant turns are stripped by the API
+  and not counted; only the final assistant turn's are.
+
+Counts err slightly high rather than low — undercounting is what lets a
+session overflow before Claude Code compacts. Results are cached by a
+digest of the raw request body (count_tokens_cache), since Claude Code
+re-counts an unchanged body several times per turn.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import math
+import struct
+from typing import Any
+
+from . import json_codec
+from .tokenizer import _TokenCountCache
+
+_TEXT_CHARS_PER_TOKEN = 3.5
+_JSON_CHARS_PER_TOKEN = 3.0
+
+# Fixed framing: the request itself, and each message's role markers.
+_REQUEST_OVERHEAD_TOKENS = 4
+_MESSAGE_OVERHEAD_TOKENS = 3
+# Anthropic's tool-use system prompt, added once whenever `tools` is set.
+_TOOL_SYSTEM_PROMPT_TOKENS = 346
+_TOOL_OVERHEAD_TOKENS = 8
+
+# Images: the API downscales so the long edge is at most 1568px, then bills
+# (width * height) / 750, which tops out around 1600 tokens.
+_IMAGE_MAX_EDGE_PX = 1568
+_IMAGE_PIXELS_PER_TOKEN = 750
+_IMAGE_MAX_TOKENS = 1600
+# Base64 characters decoded to find an image's dimensions — enough for PNG,
+# GIF and WebP headers and for JPEG start-of-frame markers after typical
+# EXIF/ICC segments.
+_IMAGE_HEADER_B64_CHARS = 65_536
+
+# PDFs are billed per page as text plus a page image; with no text
+# extraction here, each page is counted at the image ceiling plus a typical
+# page of text.
+_PDF_PAGE_TOKENS = _IMAGE_MAX_TOKENS + 800
+
+# Results are one int each, keyed by body digest. The body names the model,
+# which picks the route; route_config._swap_config clears the cache when the
+# routes change.
+_COUNT_CACHE_MAX_ENTRIES = 4096
+
+count_tokens_cache = _TokenCountCache(_COUNT_CACHE_MAX_ENTRIES)
+
+
+def _text_tokens(text: str) -> int:
+    return math.ceil(len(text) / _TEXT_CHARS_PER_TOKEN)
+
+
+def _json_tokens(value: Any) -> int:
+    if not value:
+        return 0
+    return math.ceil(len(json_codec.dumps(value)) / _JSON_CHARS_PER_TOKEN)
+
+
+def _image_dimensions(data: bytes) -> tuple[int, int] | None:
+    """(width, height) from a PNG, GIF, WebP or JPEG header, or None."""
+    if data.startswith(b"\x89PNG\r\n\x1a\n") and len(data) >= 24:
+        width, height = struct.unpack(">II", data[16:24])
+        return width, height
+    if data[:6] in (b"GIF87a", b"GIF89a") and len(data) >= 10:
+        width, height = struct.unpack("<HH", data[6:10])
+        return width, height
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP" and len(data) >= 30:
+        chunk = data[12:16]
+        if chunk == b"VP8X":
+            width = 1 + int.from_bytes(data[24:27], "little")
+            height = 1 + int.from_bytes(data[27:30], "little")
+            return width, height
+        if chunk == b"VP8 ":
+            width, height = struct.unpack("<HH", data[26:30])
+            return width & 0x3FFF, height & 0x3FFF
+        if chunk == b"VP8L" and len(data) >= 25:
+            bits = int.from_bytes(data[21:25], "little")
+            return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+        return None
+    if data[:2] == b"\xff\xd8":
+        i = 2
+        while i + 9 < len(data):
+            if data[i] != 0xFF:
+                i += 1
+                continue
+            marker = data[i + 1]
+            # SOF0-SOF15, excluding DHT (C4), JPG (C8) and DAC (CC)
+            if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+                height, width = struct.unpack(">HH", data[i + 5 : i + 9])
+                return width, height
+            if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+                i += 2
+                continue
+            (length,) = struct.unpack(">H", data[i + 2 : i + 4])
+            i += 2 + length
+    return None
+
+
+def _image_tokens(source: Any) -> int:
+    if not isinstance(source, dict) or source.get("type") != "base64":
+        return _IMAGE_MAX_TOKENS  # URL / file images: size unknown here
+    prefix = str(source.get("data", ""))[:_IMAGE_HEADER_B64_CHARS]
+    try:
+        header = base64.b64decode(prefix[: len(prefix) // 4 * 4])
+    except (binascii.Error, ValueError):
+        return _IMAGE_MAX_TOKENS
+    dimensions = _image_dimensions(header)
+    if dimensions is None or min(dimensions) <= 0:
+        return _IMAGE_MAX_TOKENS
+    width, height = dimensions
+    scale = min(1.0, _IMAGE_MAX_EDGE_PX / max(width, height))
+    pixels = (width * scale) * (height * scale)
+    return min(_IMAGE_MAX_TOKENS, math.ceil(pixels / _IMAGE_PIXELS_PER_TOKEN))
+
+
+def _document_tokens(source: Any) -> int:
+    if not isinstance(source, dict):
+        return 0
+    source_type = source.get("type")
+    if source_type == "text":
+        return _text_tokens(str(source.get("data", "")))
+    if source_type == "content":
+        return _content_tokens(source.get("content"), include_thinking=False)
+    if source_type == "base64":
+        try:
+            pdf = base64.b64decode(str(source.get("data", "")))
+        except (binascii.Error, ValueError):
+            return _PDF_PAGE_TOKENS
+        pages = pdf.count(b"/Type /Page") - pdf.count(b"/Type /Pages")
+        pages += pdf.count(b"/Type/Page") - pdf.count(b"/Type/Pages")
+        return max(1, pages) * _PDF_PAGE_TOKENS
+    return _PDF_PAGE_TOKENS  # URL / file documents: size unknown here
+
+
+def _block_tokens(block: Any, *, include_thinking: bool) -> int:
+    if not isinstance(block, dict):
+        return _text_tokens(str(block))
+    btype = block.get("type")
+    if btype == "text":
+        return _text_tokens(str(block.get("text", "")))
+    if btype == "image":
+        return _image_tokens(block.get("source"))
+    if btype == "document":
+        return _document_tokens(block.get("source"))
+    if btype in ("tool_use", "server_tool_use"):
+        return _text_tokens(str(block.get("name", ""))) + _json_tokens(
+            block.get("input")
+        )
+    if btype == "tool_result":
+        return _content_tokens(block.get("content"), include_thinking=False)
+    if btype == "thinking":
+        if not include_thinking:
+            return 0
+        return _text_tokens(str(block.get("thinking", "")))
+    if btype == "redacted_thinking":
+        if not include_thinking:
+            return 0
+        # Encrypted; the ciphertext is roughly 4/3 the size of the original.
+        return math.ceil(len(str(block.get("data", ""))) * 0.75 / 4)
+    # search results, web search results, etc.: count their JSON.
+    return _json_tokens({k: v for k, v in block.items() if k != "cache_control"})
+
+
+def _content_tokens(content: Any, *, include_thinking: bool) -> int:
+    if content is None:
+        return 0
+    if isinstance(content, str):
+        return _text_tokens(content)
+    if isinstance(content, list):
+        return sum(
+            _block_tokens(block, include_thinking=include_thinking) for block in content
+        )
+    return _text_tokens(str(content))
+
+
+def _tool_tokens(tool: Any) -> int:
+    if not isinstance(tool, dict):
+        return 0
+    if "input_schema" not in tool and "type" in tool:
+        # Server / built-in tools (web_search, bash, text_editor, ...): their
+        # definitions are supplied by Anthropic; count the config given here.
+        return _TOOL_OVERHEAD_TOKENS + _json_tokens(tool)
+    return (
+        _TOOL_OVERHEAD_TOKENS
+        + _text_tokens(str(tool.get("name", "")))
+        + _text_tokens(str(tool.get("description", "")))
+        + _json_tokens(tool.get("input_schema"))
+    )
+
+
+def count_anthropic_request_tokens(body_json: dict[str, Any]) -> int:
+    """Approximate `input_tokens` for an Anthropic Messages request body."""
+    total = _REQUEST_OVERHEAD_TOKENS
+    total += _content_tokens(body_json.get("system"), include_thinking=False)
+
+    messages = body_json.get("messages") or []
+    last_assistant = max(
+        (
+            i
+            for i, m in enumerate(messages)
+            if isinstance(m, dict) and m.get("role") == "assistant"
+        ),
+        default=-1,
+    )
+    for i, message in enumerate(messages):
+        if not isinstance(message, dict):
+            continue
+        total += _MESSAGE_OVERHEAD_TOKENS
+        total += _content_tokens(
+            message.get("content"), include_thinking=i == last_assistant
+        )
+
+    tools = body_json.get("tools") or []
+    if tools:
+        total += _TOOL_SYSTEM_PROMPT_TOKENS
+        total += sum(_tool_tokens(tool) for tool in tools)
+    return total
@@ -1,10 +1,23 @@
 from __future__ import annotations
 
+import logging
 import os
+import threading
+import time
 from typing import Any, Generator, override
 
 import httpx
 
+from language_model_gateway.gateway.utilities.logger.log_levels import SRC_LOG_LEVELS
+
+from .constants import (
+    _BEDROCK_CREDENTIALS_MIN_REMAINING_S,
+    _BEDROCK_CREDENTIALS_REFRESH_RETRY_S,
+)
+
+logger = logging.getLogger(__name__)
+logger.setLevel(SRC_LOG_LEVELS.get("LLM", logging.INFO))
+
 
 class BedrockCredentialsUnavailableError(RuntimeError):
     """No AWS credentials are configured at all (no profile/role found).
@@ -47,26 +60,131 @@ def _bedrock_credential_error_detail(exc: BaseException) -> tuple[str, str] | No
     return None
 
 
+def _expires_within(credentials: Any, seconds: float | None) -> bool:
+    """Whether botocore credentials are due for a refresh within `seconds`
+    (botocore's own advisory window when None). Static credentials never
+    are."""
+    refresh_needed = getattr(credentials, "refresh_needed", None)
+    return refresh_needed is not None and bool(refresh_needed(refresh_in=seconds))
+
+
+class BedrockSigner:
+    """Cached credentials and SigV4 signer for one (AWS_PROFILE, region).
+
+    Resolving credentials walks botocore's whole provider chain (config
+    files, SSO, IMDS...), so it happens once, not on every signed request.
+    Refreshable credentials (SSO, assumed roles, instance profiles) are
+    refreshed on a background thread as soon as botocore would refresh them
+    itself; requests keep signing with the current ones meanwhile. Only the
+    first use (unless pre-warmed) and credentials that are about to expire
+    because refreshing kept failing resolve on the request path.
+    """
+
+    def __init__(self, profile: str | None, region: str) -> None:
+        self._profile = profile
+        self._region = region
+        self._lock = threading.Lock()
+        self._credentials: Any = None
+        self._signer: Any = None
+        self._refresh_thread: threading.Thread | None = None
+        self._retry_refresh_at = 0.0
+
+    def _load(self) -> None:
+        """Resolve (or refresh) the credentials and rebuild the signer."""
+        from botocore.auth import SigV4Auth as _BotocoreSigV4Auth
+
+        credentials = self._credentials
+        if credentials is None:
+            import boto3
+
+            session = (
+                boto3.Session(profile_name=self._profile, region_name=self._region)
+                if self._profile
+                else boto3.Session(region_name=self._region)
+            )
+            credentials = session.get_credentials()
+            if credentials is None:
+                raise BedrockCredentialsUnavailableError("No AWS credentials available")
+        # Refreshes credentials that are due, under botocore's own lock.
+        frozen = credentials.get_frozen_credentials()
+        self._credentials = credentials
+        self._signer = _BotocoreSigV4Auth(frozen, "bedrock", self._region)
+
+    def _refresh(self) -> None:
+        try:
+            with self._lock:
+                self._load()
+        except Exception:
+            self._retry_refresh_at = time.monotonic() + (
+                _BEDROCK_CREDENTIALS_REFRESH_RETRY_S
+            )
+            logger.warning(
+                "[coding-model-router] refreshing AWS credentials for "
+                "profile=%s region=%s failed; signing with the current ones",
+                self._profile,
+                self._region,
+                exc_info=True,
+            )
+
+    def _refreshing(self) -> bool:
+        thread = self._refresh_thread
+        return thread is not None and thread.is_alive()
+
+    def signer(self) -> Any:
+        """The botocore SigV4Auth to sign the next request with."""
+        signer = self._signer
+        if signer is None or _expires_within(
+            self._credentials, _BEDROCK_CREDENTIALS_MIN_REMAINING_S
+        ):
+            with self._lock:
+                if self._signer is None or _expires_within(
+                    self._credentials, _BEDROCK_CREDENTIALS_MIN_REMAINING_S
+                ):
+                    self._load()
+                return self._signer
+        if (
+            _expires_within(self._credentials, None)
+            and not self._refreshing()
+            and time.monotonic() >= self._retry_refresh_at
+        ):
+            with self._lock:
+                if not self._refreshing():
+                    self._refresh_thread = threading.Thread(
+                        target=self._refresh,
+                        name="bedrock-credentials-refresh",
+                        daemon=True,
+                    )
+                    self._refresh_thread.start()
+        return signer
+
+
+_bedrock_signers: dict[tuple[str | None, str], BedrockSigner] = {}
+_bedrock_signers_lock = threading.Lock()
+
+
+def get_bedrock_signer(route: dict[str, Any]) -> BedrockSigner:
+    """The process-wide BedrockSigner for the current AWS_PROFILE and
+    `route`'s region."""
+    key = (os.environ.get("AWS_PROFILE"), route.get("aws_region", "us-east-1"))
+    signer = _bedrock_signers.get(key)
+    if signer is None:
+        with _bedrock_signers_lock:
+            signer = _bedrock_signers.setdefault(key, BedrockSigner(*key))
+    return signer
+
+
 def _sign_bedrock(url: str, body: bytes, route: dict[str, Any]) -> dict[str, str]:
     """Return headers dict with AWS SigV4 Authorization for a Bedrock POST."""
-    import boto3
-    from botocore.auth import SigV4Auth as _BotocoreSigV4Auth
     from botocore.awsrequest import AWSRequest
 
-    profile = os.environ.get("AWS_PROFILE")
-    region = route.get("aws_region", "us-east-1")
-    session = boto3.Session(profile_name=profile) if profile else boto3.Session()
-    raw_creds = session.get_credentials()
-    if raw_creds is None:
-        raise BedrockCredentialsUnavailableError("No AWS credentials available")
-    creds = raw_creds.get_frozen_credentials()
+    signer = get_bedrock_signer(route).signer()
     req = AWSRequest(
         method="POST",
         url=url,
         data=body,
         headers={"Content-Type": "application/json"},
     )
-    _BotocoreSigV4Auth(creds, "bedrock", region).add_auth(req)
+    signer.add_auth(req)
     return dict(req.headers)
 
 
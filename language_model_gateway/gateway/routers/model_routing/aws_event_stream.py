@@ -0,0 +1,133 @@
+"""
+Incremental decoder for AWS's binary event-stream framing
+(application/vnd.amazon.eventstream), the wire format of Bedrock's
+ConverseStream response — what botocore's EventStream parses for boto3.
+
+Kept free of any I/O so converse_http_client.py can feed it chunks straight
+off the socket on the event loop. Each message is:
+
+    total length (4) | headers length (4) | prelude CRC32 (4)
+    headers | payload | message CRC32 (4)
+
+with big-endian lengths, both CRCs checked.
+"""
+
+from __future__ import annotations
+
+import struct
+import zlib
+from dataclasses import dataclass
+from typing import Any
+
+_PRELUDE_LENGTH = 12
+_CRC_LENGTH = 4
+# Bedrock messages are a few KB; anything near this is corrupt framing, not
+# a big event, and must not make the decoder buffer without bound.
+_MAX_MESSAGE_LENGTH = 16 * 1024 * 1024
+
+# Header value types -> fixed value length (None: 2-byte length prefix).
+_FIXED_VALUE_LENGTHS: dict[int, int | None] = {
+    0: 0,  # bool true
+    1: 0,  # bool false
+    2: 1,  # byte
+    3: 2,  # short
+    4: 4,  # int
+    5: 8,  # long
+    6: None,  # byte array
+    7: None,  # string
+    8: 8,  # timestamp (ms since epoch)
+    9: 16,  # uuid
+}
+
+
+class EventStreamError(ValueError):
+    """The bytes received aren't valid event-stream framing."""
+
+
+@dataclass(frozen=True)
+class EventStreamMessage:
+    headers: dict[str, Any]
+    payload: bytes
+
+
+def _decode_headers(raw: memoryview) -> dict[str, Any]:
+    headers: dict[str, Any] = {}
+    pos = 0
+    end = len(raw)
+    while pos < end:
+        name_length = raw[pos]
+        pos += 1
+        name = bytes(raw[pos : pos + name_length]).decode("utf-8")
+        pos += name_length
+        value_type = raw[pos]
+        pos += 1
+        if value_type not in _FIXED_VALUE_LENGTHS:
+            raise EventStreamError(f"unknown header value type {value_type}")
+        length = _FIXED_VALUE_LENGTHS[value_type]
+        if length is None:
+            (length,) = struct.unpack_from(">H", raw, pos)
+            pos += 2
+        value = raw[pos : pos + length]
+        pos += length
+        if pos > end:
+            raise EventStreamError("header runs past the end of the headers")
+        if value_type == 0:
+            headers[name] = True
+        elif value_type == 1:
+            headers[name] = False
+        elif value_type == 7:
+            headers[name] = bytes(value).decode("utf-8")
+        elif value_type in (6, 9):
+            headers[name] = bytes(value)
+        else:
+            headers[name] = int.from_bytes(value, "big", signed=True)
+    return headers
+
+
+class EventStreamDecoder:
+    """Turns arbitrarily split chunks of an event stream into messages."""
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+
+    def feed(self, data: bytes) -> list[EventStreamMessage]:
+        """Add `data` and return every message it completes, in order."""
+        buffer = self._buffer
+        buffer += data
+        messages: list[EventStreamMessage] = []
+        start = 0
+        while len(buffer) - start >= _PRELUDE_LENGTH:
+            total_length, headers_length, prelude_crc = struct.unpack_from(
+                ">III", buffer, start
+            )
+            if zlib.crc32(memoryview(buffer)[start : start + 8]) != prelude_crc:
+                raise EventStreamError("prelude checksum mismatch")
+            if (
+                total_length > _MAX_MESSAGE_LENGTH
+                or total_length < _PRELUDE_LENGTH + headers_length + _CRC_LENGTH
+            ):
+                raise EventStreamError(f"invalid message length {total_length}")
+            if len(buffer) - start < total_length:
+                break
+            view = memoryview(buffer)[start : start + total_length]
+            (message_crc,) = struct.unpack_from(">I", view, total_length - 4)
+            if zlib.crc32(view[:-_CRC_LENGTH]) != message_crc:
+                view.release()
+                raise EventStreamError("message checksum mismatch")
+            headers_end = _PRELUDE_LENGTH + headers_length
+            messages.append(
+                EventStreamMessage(
+                    headers=_decode_headers(view[_PRELUDE_LENGTH:headers_end]),
+                    payload=bytes(view[headers_end:-_CRC_LENGTH]),
+                )
+            )
+            view.release()
+            start += total_length
+        if start:
+            del buffer[:start]
+        return messages
+
+    @property
+    def pending(self) -> int:
+        """Bytes of an incomplete message still buffered."""
+        return len(self._buffer)
@@ -11,29 +11,62 @@ from language_model_gateway.gateway.utilities.logger.log_levels import SRC_LOG_L
 
 from .aws_auth import _sign_bedrock
 from .constants import (
-    _BEDROCK_MIN_DISPATCH_INTERVAL_S,
     _CONTEXT_OVERFLOW_RE,
     _MAX_THROTTLE_RETRIES,
     _THROTTLE_BASE_DELAY_S,
     _THROTTLE_MAX_DELAY_S,
     _THROTTLE_TEXT_RE,
 )
+from .circuit_breaker import RouteCircuitBreaker
+from .dispatch_scheduler import BedrockDispatchScheduler
+from .failover import FailoverRequested
 
 logger = logging.getLogger(__name__)
 logger.setLevel(SRC_LOG_LEVELS.get("LLM", logging.INFO))
 
-_bedrock_dispatch_lock = asyncio.Lock()
-_bedrock_last_dispatch: float = 0.0
+# One scheduler per worker process, shared by all three auth="aws" dispatch
+# paths (Bedrock Mantle, native Converse, Anthropic-format Bedrock).
+_bedrock_dispatch_scheduler = BedrockDispatchScheduler()
+# Likewise one circuit breaker per worker, fed by the same wrappers below.
+_bedrock_circuit_breaker = RouteCircuitBreaker()
 
 
-async def _pace_bedrock_dispatch() -> None:
-    global _bedrock_last_dispatch
-    async with _bedrock_dispatch_lock:
-        loop = asyncio.get_running_loop()
-        wait = _BEDROCK_MIN_DISPATCH_INTERVAL_S - (loop.time() - _bedrock_last_dispatch)
-        if wait > 0:
-            await asyncio.sleep(wait)
-        _bedrock_last_dispatch = asyncio.get_running_loop().time()
+def get_bedrock_dispatch_scheduler() -> BedrockDispatchScheduler:
+    """This worker's Bedrock dispatch scheduler — for the app lifespan to
+    attach a shared budget store to, and close on shutdown."""
+    return _bedrock_dispatch_scheduler
+
+
+def get_bedrock_circuit_breaker() -> RouteCircuitBreaker:
+    """This worker's Bedrock circuit breaker — checked by the router before
+    dispatch, and configured from the app lifespan."""
+    return _bedrock_circuit_breaker
+
+
+async def _pace_bedrock_dispatch(route: dict[str, Any]) -> None:
+    """Wait for this route's (region, model) dispatch token. Runs before
+    every attempt, retries included."""
+    await _bedrock_dispatch_scheduler.acquire(route)
+
+
+def _record_bedrock_throttle(route: dict[str, Any]) -> None:
+    """Feed a throttle response back into the route's dispatch rate and
+    circuit."""
+    _bedrock_dispatch_scheduler.record_throttle(route)
+    _bedrock_circuit_breaker.record_failure(route)
+
+
+def _record_bedrock_unavailable(route: dict[str, Any]) -> None:
+    """Feed a transport failure (timeout, refused connection) or a 5xx into
+    the route's circuit. Not a throttle: the dispatch rate is left alone."""
+    _bedrock_circuit_breaker.record_failure(route)
+
+
+def _record_bedrock_success(route: dict[str, Any]) -> None:
+    """Feed a successful dispatch back into the route's dispatch rate and
+    circuit."""
+    _bedrock_dispatch_scheduler.record_success(route)
+    _bedrock_circuit_breaker.record_success(route)
 
 
 def _throttle_backoff(attempt: int) -> float:
@@ -98,16 +131,20 @@ async def _send_with_bedrock_retry(
     route: dict[str, Any],
     auth: str,
     request_id: str = "unknown",
+    failover: bool = False,
 ) -> tuple[httpx.Response, int]:
     """Returns `(response, attempt)` — `attempt` is the number of throttle/
     transport-error retries consumed before this response was returned (0
     for non-"aws" auth, which never retries here, and for any "aws" request
     that succeeded or hit a non-retryable error on the first try).
+
+    With `failover`, a throttle, 5xx or transport error (any auth) raises
+    FailoverRequested on the first attempt instead of retrying.
     """
     attempt = 0
     while True:
         if auth == "aws":
-            await _pace_bedrock_dispatch()
+            await _pace_bedrock_dispatch(route)
         upstream_req = client.build_request(
             "POST", target_url, headers=upstream_headers, content=raw_body
         )
@@ -118,6 +155,10 @@ async def _send_with_bedrock_retry(
             # no retry at all here — a momentary network blip failed the
             # request outright instead of getting the same backoff treatment
             # as an HTTP-level throttle response.
+            if auth == "aws":
+                _record_bedrock_unavailable(route)
+            if failover:
+                raise FailoverRequested(f"{type(exc).__name__}: {exc}") from exc
             if auth != "aws" or attempt >= _MAX_THROTTLE_RETRIES:
                 raise
             delay = _throttle_backoff(attempt)
@@ -140,14 +181,34 @@ async def _send_with_bedrock_retry(
             upstream_headers = {**upstream_headers, **sig_headers}
             continue
 
-        if auth != "aws" or resp.status_code < 400 or attempt >= _MAX_THROTTLE_RETRIES:
+        if resp.status_code < 400:
+            if auth == "aws":
+                _record_bedrock_success(route)
+            return resp, attempt
+        # Nothing to classify: no retry, failover or Bedrock feedback applies.
+        if auth != "aws" and not failover:
             return resp, attempt
 
         error_body = await resp.aread()
         await resp.aclose()
         error_text = error_body.decode("utf-8", errors="replace")
+        throttled = _is_throttling(resp.status_code, error_text)
+        # Recorded before anything is returned — including the last retry's
+        # response — so every throttle reaches the dispatch rate and every
+        # 5xx the circuit breaker.
+        if auth == "aws":
+            if throttled:
+                _record_bedrock_throttle(route)
+            elif resp.status_code >= 500:
+                _record_bedrock_unavailable(route)
+
+        if failover and (throttled or resp.status_code >= 500):
+            raise FailoverRequested(
+                error_text[:200] or f"status {resp.status_code}",
+                status_code=resp.status_code,
+            )
 
-        if not _is_throttling(resp.status_code, error_text):
+        if auth != "aws" or not throttled or attempt >= _MAX_THROTTLE_RETRIES:
             return (
                 httpx.Response(
                     status_code=resp.status_code,
@@ -0,0 +1,283 @@
+"""
+Dedicated, bounded thread pool for the boto3 Bedrock Converse client
+(MODEL_ROUTING_BEDROCK_NATIVE_CLIENT=boto3; the default httpx client in
+converse_http_client.py needs no threads).
+
+boto3 blocks, so BedrockNativeDispatcher has to call it off the event loop.
+Through `asyncio.to_thread` those calls shared asyncio's small default
+executor with everything else that uses it, and a stream paid one executor
+round trip per event. Instead:
+
+- Each Converse call, and each ConverseStream for its whole life, holds one
+  of `max_workers` threads here. A stream's thread opens it and then pumps
+  its events into an asyncio.Queue, handing over everything that arrived
+  since the event loop last picked up — a burst of events costs one loop
+  wakeup, not one per event. At most `max_buffered_events` wait unconsumed
+  before the pump stops reading.
+- Nothing queues for a thread. When they're all busy, run() and stream()
+  raise BedrockExecutorSaturatedError and the dispatcher answers
+  529 overloaded_error, which clients retry, rather than the request
+  silently waiting behind streams that can last minutes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import threading
+from collections.abc import AsyncGenerator, Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Generic, TypeVar
+
+from opentelemetry import metrics
+
+from language_model_gateway.gateway.utilities.logger.log_levels import SRC_LOG_LEVELS
+
+from .constants import _BEDROCK_STREAM_MAX_BUFFERED_EVENTS
+
+logger = logging.getLogger(__name__)
+logger.setLevel(SRC_LOG_LEVELS.get("LLM", logging.INFO))
+
+_meter = metrics.get_meter(__name__)
+_in_flight = _meter.create_up_down_counter(
+    "model_routing.bedrock.executor.in_flight",
+    description="boto3 Bedrock calls and streams holding an executor thread",
+)
+_queue_depth = _meter.create_up_down_counter(
+    "model_routing.bedrock.executor.queue_depth",
+    description="Streamed Bedrock events pumped but not yet consumed",
+)
+_rejection_counter = _meter.create_counter(
+    "model_routing.bedrock.executor.rejections",
+    description="boto3 Bedrock calls refused because every thread was busy",
+)
+
+_T = TypeVar("_T")
+
+
+class BedrockExecutorSaturatedError(RuntimeError):
+    """Every BedrockExecutor thread is busy; the request wasn't started."""
+
+
+class _StreamEnd:
+    """Last item a pump hands over: how the stream ended."""
+
+    __slots__ = ("error",)
+
+    def __init__(self, error: BaseException | None) -> None:
+        self.error = error
+
+
+class _EventPump(Generic[_T]):
+    """One stream's hand-off between its pump thread and the event loop.
+
+    `run` executes on the pump thread; everything else on the loop. Events
+    collect in `_pending` under a lock, and the thread schedules a single
+    `_deliver` on the loop per batch rather than one callback per event.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_buffered: int) -> None:
+        self._loop = loop
+        self.opened: asyncio.Future[None] = loop.create_future()
+        self._queue: asyncio.Queue[list[Any]] = asyncio.Queue()
+        self._lock = threading.Lock()
+        self._pending: list[Any] = []
+        self._delivery_scheduled = False
+        self._max_buffered = max_buffered
+        self._room = threading.Semaphore(max_buffered)
+        self._closed = False
+
+    def _call_soon(self, callback: Callable[..., None], *args: Any) -> None:
+        try:
+            self._loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            pass  # loop already closed (shutdown) — nobody left to deliver to
+
+    def _set_opened(self, error: BaseException | None) -> None:
+        if self._closed:
+            return  # the caller stopped waiting for it (cancelled)
+        if error is None:
+            self.opened.set_result(None)
+        else:
+            self.opened.set_exception(error)
+
+    def _hand_off(self, item: Any) -> None:
+        with self._lock:
+            self._pending.append(item)
+            schedule = not self._delivery_scheduled
+            self._delivery_scheduled = True
+        if schedule:
+            self._call_soon(self._deliver)
+
+    def _deliver(self) -> None:
+        with self._lock:
+            batch, self._pending = self._pending, []
+            self._delivery_scheduled = False
+        if self._closed:
+            return
+        _queue_depth.add(_event_count(batch))
+        self._queue.put_nowait(batch)
+
+    def run(self, open_stream: Callable[[], Iterable[_T]]) -> None:
+        try:
+            stream = open_stream()
+        except BaseException as exc:
+            self._call_soon(self._set_opened, exc)
+            return
+        self._call_soon(self._set_opened, None)
+        end = _StreamEnd(None)
+        try:
+            for event in stream:
+                self._room.acquire()
+                if self._closed:
+                    break
+                self._hand_off(event)
+        except BaseException as exc:
+            end = _StreamEnd(exc)
+        finally:
+            # botocore's EventStream releases its connection on close().
+            close = getattr(stream, "close", None)
+            if close is not None:
+                try:
+                    close()
+                except Exception:
+                    logger.debug(
+                        "[coding-model-router] closing a Bedrock event stream failed",
+                        exc_info=True,
+                    )
+        self._hand_off(end)
+
+    async def events(self) -> AsyncGenerator[_T, None]:
+        try:
+            while True:
+                batch = await self._queue.get()
+                count = _event_count(batch)
+                _queue_depth.add(-count)
+                if count:
+                    self._room.release(count)
+                for event in batch[:count]:
+                    yield event
+                if count < len(batch):
+                    error = batch[-1].error
+                    if error is not None:
+                        raise error
+                    return
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Stop consuming. A pump waiting on boto3 keeps its thread until the
+        next event (or read timeout), then closes the stream."""
+        if self._closed:
+            return
+        self._closed = True
+        self._room.release(self._max_buffered)
+        while not self._queue.empty():
+            _queue_depth.add(-_event_count(self._queue.get_nowait()))
+
+
+def _event_count(batch: list[Any]) -> int:
+    """Events in a handed-over batch, not counting a final _StreamEnd."""
+    if batch and isinstance(batch[-1], _StreamEnd):
+        return len(batch) - 1
+    return len(batch)
+
+
+class BedrockExecutor:
+    """Runs boto3 Bedrock calls and streams on a dedicated, bounded pool.
+
+    Registered as a container singleton (see
+    LanguageModelGatewayContainerFactory) and shut down from the FastAPI
+    lifespan; CodingModelRouter builds a private one when none is injected
+    (e.g. in tests). Threads are only started once boto3 is actually used.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_workers: int = 64,
+        max_buffered_events: int = _BEDROCK_STREAM_MAX_BUFFERED_EVENTS,
+    ) -> None:
+        self._max_workers = max_workers
+        self._max_buffered_events = max_buffered_events
+        self._in_flight = 0
+        self._pool: ThreadPoolExecutor | None = None
+
+    @property
+    def in_flight(self) -> int:
+        """Calls and streams currently holding a thread."""
+        return self._in_flight
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self._max_workers,
+                thread_name_prefix="model-routing-bedrock",
+            )
+        return self._pool
+
+    def _release(self) -> None:
+        self._in_flight -= 1
+        _in_flight.add(-1)
+
+    def _release_threadsafe(
+        self, loop: asyncio.AbstractEventLoop, _future: Future[Any]
+    ) -> None:
+        # Called on the pool thread; the counter is only touched on the loop.
+        try:
+            loop.call_soon_threadsafe(self._release)
+        except RuntimeError:
+            pass  # loop already closed (shutdown) — nothing left to account for
+
+    def _submit(self, fn: Callable[[], _T], operation: str) -> Future[_T]:
+        if self._in_flight >= self._max_workers:
+            _rejection_counter.add(1, {"operation": operation})
+            logger.warning(
+                "[coding-model-router] Bedrock executor saturated (%d in flight) "
+                "— rejecting %s",
+                self._in_flight,
+                operation,
+            )
+            raise BedrockExecutorSaturatedError(
+                f"All {self._max_workers} Bedrock worker threads are busy"
+            )
+        future = self._get_pool().submit(fn)
+        self._in_flight += 1
+        _in_flight.add(1)
+        # Released when the thread finishes, not when the caller stops
+        # waiting: an abandoned call still occupies its thread until then.
+        future.add_done_callback(
+            functools.partial(self._release_threadsafe, asyncio.get_running_loop())
+        )
+        return future
+
+    async def run(self, fn: Callable[..., _T], *args: Any, **kwargs: Any) -> _T:
+        """`fn(*args, **kwargs)` on a pool thread, e.g. boto3's converse()."""
+        future = self._submit(functools.partial(fn, *args, **kwargs), "converse")
+        return await asyncio.wrap_future(future)
+
+    async def stream(
+        self, open_stream: Callable[[], Iterable[_T]]
+    ) -> AsyncGenerator[_T, None]:
+        """Call `open_stream()` on a thread of its own, which then pumps the
+        events it returns. Returns once the stream is open — raising what
+        `open_stream` raised, like boto3's converse_stream() — with an async
+        generator over the events; an exception raised mid-stream is raised
+        from the generator after the events before it."""
+        pump: _EventPump[_T] = _EventPump(
+            asyncio.get_running_loop(), self._max_buffered_events
+        )
+        self._submit(functools.partial(pump.run, open_stream), "converse_stream")
+        try:
+            await asyncio.shield(pump.opened)
+        except BaseException:
+            pump.close()
+            raise
+        return pump.events()
+
+    def shutdown(self) -> None:
+        """Stop accepting work; running calls finish in the background."""
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
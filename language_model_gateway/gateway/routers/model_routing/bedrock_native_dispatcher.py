@@ -10,7 +10,7 @@ import asyncio
 import json
 import logging
 from datetime import datetime
-from typing import TYPE_CHECKING, Any, Callable, cast
+from typing import TYPE_CHECKING, Any, AsyncGenerator, Callable, cast
 
 from starlette.background import BackgroundTasks
 from starlette.requests import Request
@@ -19,19 +19,27 @@ from starlette.responses import JSONResponse, StreamingResponse
 from language_model_gateway.gateway.utilities.logger.log_levels import SRC_LOG_LEVELS
 
 from .aws_auth import _bedrock_credential_error_detail
-from .bedrock_client import _pace_bedrock_dispatch, _throttle_backoff
+from .bedrock_client import (
+    _pace_bedrock_dispatch,
+    _record_bedrock_success,
+    _record_bedrock_throttle,
+    _record_bedrock_unavailable,
+    _throttle_backoff,
+)
 from .bedrock_converse_client import (
     BedrockRuntimeClientProvider,
     _is_transient_bedrock_error_code,
 )
+from .bedrock_executor import BedrockExecutor, BedrockExecutorSaturatedError
 from .constants import _MAX_THROTTLE_RETRIES
+from .converse_http_client import AsyncConverseClient
 from .converse_request_translator import (
     _converse_response_to_anthropic,
     _openai_to_converse_request,
 )
+from .failover import FailoverRequested
 from .converse_stream_adapter import (
     _converse_stream_with_usage_tracking,
-    _iter_converse_stream_events,
     _stream_bedrock_converse_to_anthropic,
 )
 from .stream_converter import _msg_id
@@ -51,6 +59,9 @@ class BedrockNativeDispatcher:
     out of CodingModelRouter to keep routing decisions separate from
     this transport's dispatch mechanics, mirroring the
     BaseChatCompletionsProvider adapter pattern used for other backends.
+
+    With a `converse_client`, requests go through it on the event loop
+    instead of through boto3 on `executor`'s threads.
     """
 
     def __init__(
@@ -61,13 +72,85 @@ class BedrockNativeDispatcher:
         record_error: Callable[..., None],
         record_upstream_latency: Callable[..., None],
         error_response: Callable[[str, str, bool], "JSONResponse | StreamingResponse"],
+        converse_client: AsyncConverseClient | None = None,
+        executor: BedrockExecutor | None = None,
     ) -> None:
         self._client_provider = client_provider
+        self._converse_client = converse_client
+        self._executor = executor or BedrockExecutor()
         self._get_usage_tracker = get_usage_tracker
         self._record_error = record_error
         self._record_upstream_latency = record_upstream_latency
         self._error_response = error_response
 
+    async def _converse(
+        self, route: dict[str, Any], converse_kwargs: dict[str, Any]
+    ) -> dict[str, Any]:
+        if self._converse_client is not None:
+            return await self._converse_client.converse(route, converse_kwargs)
+        bedrock_client = self._client_provider.get_client(route)
+        resp: dict[str, Any] = await self._executor.run(
+            bedrock_client.converse, **converse_kwargs
+        )
+        return resp
+
+    async def _converse_stream(
+        self, route: dict[str, Any], converse_kwargs: dict[str, Any]
+    ) -> AsyncGenerator[dict[str, Any], None]:
+        """Establish the stream (raising as boto3 would if that fails) and
+        return its events."""
+        if self._converse_client is not None:
+            return await self._converse_client.converse_stream(route, converse_kwargs)
+        bedrock_client = self._client_provider.get_client(route)
+
+        def open_stream() -> Any:
+            return bedrock_client.converse_stream(**converse_kwargs)["stream"]
+
+        return await self._executor.stream(open_stream)
+
+    def _overloaded_response(
+        self,
+        exc: BedrockExecutorSaturatedError,
+        *,
+        failover: bool,
+        request_id: str,
+        auth_info: dict[str, Any],
+        upstream_model: str,
+        request_start_time: datetime,
+        model_tier: str,
+        backend: str,
+        auth: str,
+        api_type: str,
+        streaming: bool,
+    ) -> JSONResponse:
+        """529 overloaded_error for a request the boto3 executor had no thread
+        for — unlike other errors here, a real error status, so clients back
+        off and retry instead of showing it as the model's answer. With
+        `failover`, the next candidate gets a chance first."""
+        if failover:
+            raise FailoverRequested(str(exc), status_code=529) from exc
+        self._record_error(
+            request_id=request_id,
+            auth_info=auth_info,
+            model=upstream_model,
+            error_type="bedrock_executor_saturated",
+            error_message=str(exc),
+            start_time=request_start_time,
+            model_tier=model_tier,
+            backend=backend,
+            auth=auth,
+            api_type=api_type,
+            streaming=streaming,
+            status_code=529,
+        )
+        return JSONResponse(
+            {
+                "type": "error",
+                "error": {"type": "overloaded_error", "message": str(exc)},
+            },
+            status_code=529,
+        )
+
     async def dispatch_nonstreaming(
         self,
         *,
@@ -87,9 +170,13 @@ class BedrockNativeDispatcher:
         request_start_time: datetime,
         dispatch_start: float,
         background_tasks: BackgroundTasks,
+        failover: bool = False,
     ) -> JSONResponse:
         """Non-streaming counterpart to the openai-SDK Mantle dispatch, for
         auth="aws" routes when self._bedrock_transport == "native".
+
+        With `failover`, a transient error or timeout raises
+        FailoverRequested instead of being retried or surfaced.
         """
         from botocore.exceptions import (
             ClientError,
@@ -101,19 +188,31 @@ class BedrockNativeDispatcher:
         )
 
         msg_id = _msg_id()
-        bedrock_client = self._client_provider.get_client(route)
         converse_kwargs, tool_name_map = _openai_to_converse_request(
             body_json, route["model"]
         )
 
         throttle_attempt = 0
         while True:
-            await _pace_bedrock_dispatch()
+            await _pace_bedrock_dispatch(route)
             try:
-                resp = await asyncio.to_thread(
-                    bedrock_client.converse, **converse_kwargs
-                )
+                resp = await self._converse(route, converse_kwargs)
+                _record_bedrock_success(route)
                 break
+            except BedrockExecutorSaturatedError as exc:
+                return self._overloaded_response(
+                    exc,
+                    failover=failover,
+                    request_id=request_id,
+                    auth_info=auth_info,
+                    upstream_model=upstream_model,
+                    request_start_time=request_start_time,
+                    model_tier=model_tier,
+                    backend=backend,
+                    auth=auth,
+                    api_type=api_type,
+                    streaming=False,
+                )
             except (NoCredentialsError, TokenRetrievalError) as cred_exc:
                 detail = _bedrock_credential_error_detail(cred_exc)
                 if detail is None:
@@ -145,10 +244,14 @@ class BedrockNativeDispatcher:
                 aws_request_id = exc.response.get("ResponseMetadata", {}).get(
                     "RequestId"
                 )
-                if (
-                    _is_transient_bedrock_error_code(error_code)
-                    and throttle_attempt < _MAX_THROTTLE_RETRIES
-                ):
+                transient = _is_transient_bedrock_error_code(error_code)
+                if transient:
+                    _record_bedrock_throttle(route)
+                    if failover:
+                        raise FailoverRequested(
+                            f"{error_code}: {error_message_text}"
+                        ) from exc
+                if transient and throttle_attempt < _MAX_THROTTLE_RETRIES:
                     delay = _throttle_backoff(throttle_attempt)
                     throttle_attempt += 1
                     logger.warning(
@@ -194,6 +297,9 @@ class BedrockNativeDispatcher:
                 ConnectTimeoutError,
                 EndpointConnectionError,
             ) as exc:
+                _record_bedrock_unavailable(route)
+                if failover:
+                    raise FailoverRequested(f"{type(exc).__name__}: {exc}") from exc
                 # BotoCoreError subclasses, not ClientError — the ClientError
                 # branch above never sees these. Not retried here: the
                 # connect/read timeouts are already app-configured (see
@@ -260,6 +366,7 @@ class BedrockNativeDispatcher:
                 response_text=None,
                 raw_usage=usage,
                 retry_count=throttle_attempt,
+                routing=auth_info.get("routing"),
             )
         response.background = background_tasks
         return response
@@ -283,6 +390,7 @@ class BedrockNativeDispatcher:
         auth_info: dict[str, Any],
         request_start_time: datetime,
         dispatch_start: float,
+        failover: bool = False,
     ) -> StreamingResponse | JSONResponse:
         """Streaming counterpart to dispatch_nonstreaming."""
         from botocore.exceptions import (
@@ -295,19 +403,31 @@ class BedrockNativeDispatcher:
         )
 
         msg_id = _msg_id()
-        bedrock_client = self._client_provider.get_client(route)
         converse_kwargs, tool_name_map = _openai_to_converse_request(
             body_json, route["model"]
         )
 
         throttle_attempt = 0
         while True:
-            await _pace_bedrock_dispatch()
+            await _pace_bedrock_dispatch(route)
             try:
-                raw_response = await asyncio.to_thread(
-                    bedrock_client.converse_stream, **converse_kwargs
-                )
+                events = await self._converse_stream(route, converse_kwargs)
+                _record_bedrock_success(route)
                 break
+            except BedrockExecutorSaturatedError as exc:
+                return self._overloaded_response(
+                    exc,
+                    failover=failover,
+                    request_id=request_id,
+                    auth_info=auth_info,
+                    upstream_model=upstream_model,
+                    request_start_time=request_start_time,
+                    model_tier=model_tier,
+                    backend=backend,
+                    auth=auth,
+                    api_type=api_type,
+                    streaming=True,
+                )
             except (NoCredentialsError, TokenRetrievalError) as cred_exc:
                 detail = _bedrock_credential_error_detail(cred_exc)
                 if detail is None:
@@ -334,10 +454,14 @@ class BedrockNativeDispatcher:
                 aws_request_id = exc.response.get("ResponseMetadata", {}).get(
                     "RequestId"
                 )
-                if (
-                    _is_transient_bedrock_error_code(error_code)
-                    and throttle_attempt < _MAX_THROTTLE_RETRIES
-                ):
+                transient = _is_transient_bedrock_error_code(error_code)
+                if transient:
+                    _record_bedrock_throttle(route)
+                    if failover:
+                        raise FailoverRequested(
+                            f"{error_code}: {error_message_text}"
+                        ) from exc
+                if transient and throttle_attempt < _MAX_THROTTLE_RETRIES:
                     delay = _throttle_backoff(throttle_attempt)
                     throttle_attempt += 1
                     logger.warning(
@@ -380,6 +504,9 @@ class BedrockNativeDispatcher:
                 ConnectTimeoutError,
                 EndpointConnectionError,
             ) as exc:
+                _record_bedrock_unavailable(route)
+                if failover:
+                    raise FailoverRequested(f"{type(exc).__name__}: {exc}") from exc
                 # Same rationale as dispatch_nonstreaming's equivalent branch:
                 # BotoCoreError subclasses the ClientError branch never sees,
                 # and deliberately not retried — see that branch's comment.
@@ -406,8 +533,6 @@ class BedrockNativeDispatcher:
             api_type=api_type,
         )
 
-        events = _iter_converse_stream_events(raw_response["stream"])
-
         # Mirrors router.py's own _record_mid_stream_error closure for the
         # Mantle path — a failure raised after streaming has already started
         # is only ever shown inline to the client unless recorded here too.
@@ -0,0 +1,262 @@
+"""
+Per-(region, model) circuit breaker for Bedrock dispatches.
+
+Throttle retries are per request: when a Bedrock region or Mantle endpoint
+is hard-down, every request independently waits through up to
+`_MAX_THROTTLE_RETRIES` backoffs before failing. The breaker remembers what
+earlier requests saw, so later ones fail fast (or go to the route's
+`fallback_model`) instead.
+
+It is fed by the same wrappers in bedrock_client.py that feed the dispatch
+scheduler: every throttle or transient error (`_is_throttling`,
+`_is_transient_stream_error`, transient native error codes) and every
+transport failure counts as a failure, every successful dispatch as a
+success. Health is an EWMA of those outcomes, per (aws_region, model) like
+the dispatch buckets:
+
+- closed: requests pass. Health below `open_below_health` (after at least
+  `min_samples` outcomes) opens the circuit.
+- open: requests are rejected for `open_seconds`. A late success from a
+  request admitted before the circuit opened doesn't close it.
+- half_open: one probe request at a time is let through. Its success closes
+  the circuit, its failure opens it again; a probe that never reports back
+  frees its slot after another `open_seconds`.
+
+The router checks the circuit once per request, before dispatch; retries of
+a request already admitted are not cut short.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+import weakref
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from opentelemetry import metrics
+from opentelemetry.metrics import CallbackOptions, Observation
+
+from language_model_gateway.gateway.utilities.logger.log_levels import SRC_LOG_LEVELS
+
+from .constants import (
+    _BEDROCK_CIRCUIT_HEALTH_ALPHA,
+    _BEDROCK_CIRCUIT_MIN_SAMPLES,
+    _BEDROCK_CIRCUIT_OPEN_BELOW_HEALTH,
+    _BEDROCK_CIRCUIT_OPEN_S,
+)
+from .dispatch_scheduler import _bucket_key, _BucketKey
+
+logger = logging.getLogger(__name__)
+logger.setLevel(SRC_LOG_LEVELS.get("LLM", logging.INFO))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Exported as the state gauge's value.
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+_breakers: weakref.WeakSet[RouteCircuitBreaker] = weakref.WeakSet()
+
+
+def _observe_state(options: CallbackOptions) -> Iterable[Observation]:
+    for breaker in list(_breakers):
+        for (region, model), circuit in breaker.circuits():
+            yield Observation(
+                _STATE_VALUES[circuit.state],
+                {"aws_region": region, "upstream_model": model},
+            )
+
+
+def _observe_health(options: CallbackOptions) -> Iterable[Observation]:
+    for breaker in list(_breakers):
+        for (region, model), circuit in breaker.circuits():
+            yield Observation(
+                circuit.health, {"aws_region": region, "upstream_model": model}
+            )
+
+
+_meter = metrics.get_meter(__name__)
+_meter.create_observable_gauge(
+    "model_routing.bedrock.circuit.state",
+    callbacks=[_observe_state],
+    description="Bedrock circuit state (0 closed, 1 half-open, 2 open)",
+)
+_meter.create_observable_gauge(
+    "model_routing.bedrock.circuit.health",
+    callbacks=[_observe_health],
+    description="EWMA of Bedrock dispatch outcomes (1 healthy, 0 failing)",
+)
+_transition_counter = _meter.create_counter(
+    "model_routing.bedrock.circuit.transitions",
+    description="Bedrock circuit state changes, by new state",
+)
+_rejection_counter = _meter.create_counter(
+    "model_routing.bedrock.circuit.rejections",
+    description="Requests turned away (or sent to a fallback) by an open circuit",
+)
+
+
+@dataclass
+class _Circuit:
+    state: str = CLOSED
+    health: float = 1.0
+    samples: int = 0
+    opened_at: float = 0.0
+    # Until when the half-open probe slot is taken.
+    probe_until: float = 0.0
+
+
+class RouteCircuitBreaker:
+    """Circuit breaker keyed by (region, model), like the dispatch scheduler.
+
+    Only touched from the event loop. Created at import time (see
+    bedrock_client.py); settings are applied later with configure().
+    """
+
+    def __init__(
+        self,
+        *,
+        enabled: bool = True,
+        open_seconds: float = _BEDROCK_CIRCUIT_OPEN_S,
+        open_below_health: float = _BEDROCK_CIRCUIT_OPEN_BELOW_HEALTH,
+        min_samples: int = _BEDROCK_CIRCUIT_MIN_SAMPLES,
+        health_alpha: float = _BEDROCK_CIRCUIT_HEALTH_ALPHA,
+    ) -> None:
+        self._enabled = enabled
+        self._open_seconds = open_seconds
+        self._open_below_health = open_below_health
+        self._min_samples = min_samples
+        self._health_alpha = health_alpha
+        self._circuits: dict[_BucketKey, _Circuit] = {}
+        _breakers.add(self)
+
+    def configure(
+        self,
+        *,
+        enabled: bool,
+        open_seconds: float,
+        open_below_health: float,
+    ) -> None:
+        """Apply the app's settings; called once from the app lifespan."""
+        self._enabled = enabled
+        self._open_seconds = open_seconds
+        self._open_below_health = open_below_health
+        if not enabled:
+            self.reset()
+
+    def reset(self) -> None:
+        """Forget every circuit's state (all closed again)."""
+        self._circuits.clear()
+
+    def circuits(self) -> list[tuple[_BucketKey, _Circuit]]:
+        return list(self._circuits.items())
+
+    def try_acquire(self, route: dict[str, Any]) -> bool:
+        """Whether a request may be dispatched to `route` now. In half-open
+        state a True takes the single probe slot."""
+        if not self._enabled:
+            return True
+        key = _bucket_key(route)
+        circuit = self._circuits.get(key)
+        if circuit is None or circuit.state == CLOSED:
+            return True
+        now = time.monotonic()
+        if circuit.state == OPEN:
+            if now < circuit.opened_at + self._open_seconds:
+                self._rejected(key)
+                return False
+            self._transition(key, circuit, HALF_OPEN)
+        if now < circuit.probe_until:
+            self._rejected(key)
+            return False
+        circuit.probe_until = now + self._open_seconds
+        return True
+
+    def retry_after(self, route: dict[str, Any]) -> float:
+        """Seconds until `route`'s circuit lets a probe through (0 unless
+        it's open)."""
+        circuit = self._circuits.get(_bucket_key(route))
+        if circuit is None or circuit.state == CLOSED:
+            return 0.0
+        now = time.monotonic()
+        if circuit.state == OPEN:
+            return max(0.0, circuit.opened_at + self._open_seconds - now)
+        return max(0.0, circuit.probe_until - now)
+
+    def record_success(self, route: dict[str, Any]) -> None:
+        if not self._enabled:
+            return
+        key = _bucket_key(route)
+        circuit = self._circuits.get(key)
+        if circuit is None or circuit.state == OPEN:
+            # Open: a straggler admitted before the circuit opened doesn't
+            # show the backend has recovered — only the half-open probe does.
+            return
+        if circuit.state == HALF_OPEN:
+            # The probe got through: start over with a clean record.
+            self._transition(key, circuit, CLOSED)
+            circuit.health = 1.0
+            circuit.samples = 0
+            circuit.probe_until = 0.0
+            return
+        self._observe(circuit, 1.0)
+
+    def record_failure(self, route: dict[str, Any]) -> None:
+        if not self._enabled:
+            return
+        key = _bucket_key(route)
+        circuit = self._circuits.setdefault(key, _Circuit())
+        self._observe(circuit, 0.0)
+        if circuit.state == HALF_OPEN or (
+            circuit.state == CLOSED
+            and circuit.samples >= self._min_samples
+            and circuit.health < self._open_below_health
+        ):
+            circuit.opened_at = time.monotonic()
+            circuit.probe_until = 0.0
+            self._transition(key, circuit, OPEN)
+
+    def _observe(self, circuit: _Circuit, outcome: float) -> None:
+        circuit.samples += 1
+        circuit.health += self._health_alpha * (outcome - circuit.health)
+
+    def _transition(self, key: _BucketKey, circuit: _Circuit, state: str) -> None:
+        previous, circuit.state = circuit.state, state
+        region, model = key
+        _transition_counter.add(
+            1, {"aws_region": region, "upstream_model": model, "state": state}
+        )
+        log = logger.warning if state == OPEN else logger.info
+        log(
+            "[coding-model-router] Bedrock circuit %s -> %s region=%s model=%s "
+            "health=%.2f",
+            previous,
+            state,
+            region,
+            model,
+            circuit.health,
+        )
+
+    def _rejected(self, key: _BucketKey) -> None:
+        region, model = key
+        _rejection_counter.add(1, {"aws_region": region, "upstream_model": model})
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Current per-key state, for the circuits endpoint and tests."""
+        now = time.monotonic()
+        return {
+            f"{region}/{model}": {
+                "state": circuit.state,
+                "health": round(circuit.health, 4),
+                "samples": circuit.samples,
+                "retry_after_s": (
+                    round(max(0.0, circuit.opened_at + self._open_seconds - now), 1)
+                    if circuit.state == OPEN
+                    else 0.0
+                ),
+            }
+            for (region, model), circuit in self._circuits.items()
+        }
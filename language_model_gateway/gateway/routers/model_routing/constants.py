@@ -20,7 +20,54 @@ _HOP_BY_HOP_HEADERS = frozenset(
     {"content-encoding", "transfer-encoding", "connection", "keep-alive"}
 )
 
+# Bedrock dispatch pacing (see dispatch_scheduler.py): per-(region, model)
+# token bucket defaults, overridable per route via `dispatch_rate_per_s` /
+# `dispatch_burst`. The default rate matches the old fixed 300ms interval.
 _BEDROCK_MIN_DISPATCH_INTERVAL_S = 0.3
+_BEDROCK_DEFAULT_DISPATCH_RATE_PER_S = 1.0 / _BEDROCK_MIN_DISPATCH_INTERVAL_S
+_BEDROCK_DEFAULT_DISPATCH_BURST = 3
+# AIMD: floor the adaptive rate never drops below, the factor a throttle
+# multiplies it by, and the fraction of the configured rate each successful
+# dispatch adds back.
+_BEDROCK_MIN_DISPATCH_RATE_PER_S = 0.2
+_BEDROCK_AIMD_DECREASE_FACTOR = 0.5
+_BEDROCK_AIMD_INCREASE_FRACTION = 0.05
+# How long the dispatch scheduler paces per worker after the shared (Redis)
+# dispatch budget store fails, before trying it again.
+_BEDROCK_SHARED_DISPATCH_RETRY_S = 30.0
+# Per-(region, model) circuit breaker (see circuit_breaker.py): health is an
+# EWMA of dispatch outcomes (1 = success, 0 = throttle/transient/transport
+# failure). The circuit opens once health drops below the threshold with at
+# least the minimum number of outcomes seen — 0.8^8 < 0.2, so more failures in
+# a row than one request's own retries — and stays open this long before
+# letting a single probe request through.
+_BEDROCK_CIRCUIT_HEALTH_ALPHA = 0.2
+_BEDROCK_CIRCUIT_OPEN_BELOW_HEALTH = 0.2
+_BEDROCK_CIRCUIT_MIN_SAMPLES = 10
+_BEDROCK_CIRCUIT_OPEN_S = 30.0
+# Hedged routing (see failover.py): a route's hedge delay is its observed
+# non-streaming latency percentile over this many recent requests, once at
+# least the minimum have been seen (its `hedge_after_ms` until then).
+_HEDGE_LATENCY_WINDOW = 200
+_HEDGE_MIN_SAMPLES = 20
+_HEDGE_DEFAULT_PERCENTILE = 95.0
+# Cached Bedrock signing credentials (see aws_auth.BedrockSigner): refreshed
+# in the background once botocore would refresh them, and only resolved on the
+# request path when less than this is left (a refresh fell behind). A failed
+# background refresh is retried after the second delay.
+_BEDROCK_CREDENTIALS_MIN_REMAINING_S = 60.0
+_BEDROCK_CREDENTIALS_REFRESH_RETRY_S = 30.0
+# Pattern-matched model ids remembered by route_config._find_route (hits and
+# misses). Ids come from clients, so the memo is cleared when it fills up.
+_ROUTE_MATCH_CACHE_MAX_ENTRIES = 1024
+# Streamed events a boto3 ConverseStream pump thread may hand over before the
+# response generator consumes them (see bedrock_executor.BedrockExecutor);
+# beyond this it stops reading from Bedrock until the client catches up.
+_BEDROCK_STREAM_MAX_BUFFERED_EVENTS = 512
+# _stream_oai_sdk_to_anthropic and stream_flush.flush_frames read their
+# source ahead of the client by at most this many chunks (see
+# stream_prefetch.Prefetcher).
+_STREAM_PREFETCH_MAX_CHUNKS = 64
 _MAX_THROTTLE_RETRIES = 5
 _THROTTLE_BASE_DELAY_S = 1.0
 _THROTTLE_MAX_DELAY_S = 20.0
@@ -5,14 +5,21 @@ Pipeline (per spec):
   1. Translate Anthropic request → OpenAI format (done by caller)
   2. Count tokens with Qwen tokenizer + chat template
   3. If within budget → send as-is
-  4. Phase 1: head+tail compress oversized tool results, recount
+  4. Phase 1: head+tail compress oversized tool results, oldest first, only
+     as many as needed to fit
   5. Phase 2: drop oldest message groups (system never dropped; never cut past
      the last group that starts with role=="user" — every backend rejects a
      conversation that doesn't start with a user turn, and the conversation's
      most recent turn is not always a plain user message, e.g. right after a
-     tool call)
-  6. Recount after each drop; stop when budget satisfied
-  7. Log all compression actions with token deltas
+     tool call). The cut index is found by bisection over cumulative group
+     token counts
+  6. Track the running count by subtracting per-message counts (cached across
+     requests — see count_oai_message_tokens) instead of re-templating the
+     whole conversation after every change; one exact recount confirms the
+     result, falling back to a bisection over exact recounts if the estimate
+     was off
+  7. Log all compression actions with token deltas, and the preflight's
+     latency and number of full tokenizer passes
 
 Budget formula (all values configurable in route JSON):
   effective_input_tokens = backend_max_context_tokens
@@ -22,18 +29,30 @@ Budget formula (all values configurable in route JSON):
 
 from __future__ import annotations
 
+import bisect
 import dataclasses
 import json
 import logging
+import time
+from collections.abc import Callable
 from typing import Any
 
+from opentelemetry import metrics
+
 from language_model_gateway.gateway.utilities.logger.log_levels import SRC_LOG_LEVELS
 
-from .tokenizer import count_oai_request_tokens
+from .tokenizer import count_oai_message_tokens, count_oai_request_tokens
 
 logger = logging.getLogger(__name__)
 logger.setLevel(SRC_LOG_LEVELS.get("LLM", logging.INFO))
 
+_meter = metrics.get_meter(__name__)
+_preflight_histogram = _meter.create_histogram(
+    "model_routing.context.preflight_time",
+    unit="s",
+    description="Time spent enforcing the context budget before dispatch",
+)
+
 # ---------------------------------------------------------------------------
 # Defaults
 # ---------------------------------------------------------------------------
@@ -117,32 +136,38 @@ def compress_tool_result_text(
 
 def _compress_tool_messages(
     messages: list[dict[str, Any]],
+    fits: Callable[[int, dict[str, Any], dict[str, Any]], bool] | None = None,
 ) -> tuple[list[dict[str, Any]], list[str]]:
     """
-    Compress oversized tool-role messages in place (head+tail).
+    Head+tail compress oversized tool-role messages, oldest first.
 
     Returns (updated_messages, log_lines). Only messages whose content exceeds
     _TOOL_COMPRESS_THRESHOLD_CHARS are modified; all others pass through unchanged.
+
+    `fits(index, original, compressed)` is called after each compression and
+    stops compressing once it returns True, so recent tool output — usually
+    what the model needs most — is left intact when compressing older results
+    is already enough. Without it every oversized result is compressed.
     """
     log_lines: list[str] = []
-    result: list[dict[str, Any]] = []
+    result: list[dict[str, Any]] = list(messages)
     for i, msg in enumerate(messages):
         if msg.get("role") != "tool":
-            result.append(msg)
             continue
         content = msg.get("content", "")
         if (
             not isinstance(content, str)
             or len(content) <= _TOOL_COMPRESS_THRESHOLD_CHARS
         ):
-            result.append(msg)
             continue
         compressed = compress_tool_result_text(content)
-        result.append({**msg, "content": compressed})
+        result[i] = {**msg, "content": compressed}
         log_lines.append(
             f"  tool[{i}] id={msg.get('tool_call_id', '?')!r}: "
             f"{len(content):,} → {len(compressed):,} chars"
         )
+        if fits is not None and fits(i, msg, result[i]):
+            break
     return result, log_lines
 
 
@@ -242,6 +267,27 @@ def _char_estimate_tokens(oai_body: dict[str, Any]) -> int:
     return int(len(json.dumps(oai_body)) / 3.5)
 
 
+def _message_token_counts(
+    messages: list[dict[str, Any]],
+    tokenizer_model: str,
+    using_char_estimate: bool,
+) -> list[int] | None:
+    """
+    Each message's share of the request's token count, on the same scale as the
+    count being adjusted (tokenizer or 3.5-chars/token estimate). None if any
+    message can't be counted, in which case callers recount the whole body.
+    """
+    if using_char_estimate:
+        return [int(len(json.dumps(msg)) / 3.5) for msg in messages]
+    counts: list[int] = []
+    for msg in messages:
+        count = count_oai_message_tokens(msg, tokenizer_model)
+        if count is None:
+            return None
+        counts.append(count)
+    return counts
+
+
 def _apply_output_budget_cap(
     oai_body: dict[str, Any],
     token_count: int,
@@ -300,10 +346,20 @@ def _apply_output_budget_cap(
     return oai_body
 
 
+@dataclasses.dataclass
+class _PreflightStats:
+    """What one enforce_context_budget call did, for its latency log/metric."""
+
+    full_counts: int = 0
+    over_budget: bool = False
+
+
 def enforce_context_budget(
     oai_body: dict[str, Any],
     route: dict[str, Any],
     tokenizer_model: str,
+    *,
+    char_estimate_only: bool = False,
 ) -> dict[str, Any]:
     """
     Enforce the context budget on a translated OpenAI-format request.
@@ -314,10 +370,41 @@ def enforce_context_budget(
 
     Falls back to a 4-chars/token character estimate when the tokenizer is
     unavailable (e.g. `transformers` not installed) so compression still runs.
+    `char_estimate_only=True` skips the tokenizer outright — for when the
+    tokenizer executor is saturated or timed out (see TokenizerExecutor).
 
     Never modifies the input dict; always returns a new dict or the original if
     no changes are needed.
+
+    Records its own latency (model_routing.context.preflight_time, with an
+    `over_budget` attribute) and logs it, with the number of full-conversation
+    token counts it took, for every over-budget request.
     """
+    stats = _PreflightStats()
+    start = time.perf_counter()
+    try:
+        return _enforce_context_budget(
+            oai_body, route, tokenizer_model, stats, char_estimate_only
+        )
+    finally:
+        elapsed = time.perf_counter() - start
+        _preflight_histogram.record(elapsed, {"over_budget": stats.over_budget})
+        if stats.over_budget:
+            logger.info(
+                "[coding-model-router] over-budget preflight took %.1fms "
+                "(%d full token count(s))",
+                elapsed * 1000,
+                stats.full_counts,
+            )
+
+
+def _enforce_context_budget(
+    oai_body: dict[str, Any],
+    route: dict[str, Any],
+    tokenizer_model: str,
+    stats: _PreflightStats,
+    char_estimate_only: bool,
+) -> dict[str, Any]:
     budget = build_budget(route)
 
     # Cap max_tokens to reserved_output_tokens so input+output never exceeds backend limit.
@@ -334,7 +421,12 @@ def enforce_context_budget(
         )
         oai_body = {**oai_body, "max_tokens": budget.reserved_output_tokens}
 
-    _raw_count = count_oai_request_tokens(oai_body, tokenizer_model)
+    _raw_count = (
+        None
+        if char_estimate_only
+        else count_oai_request_tokens(oai_body, tokenizer_model)
+    )
+    stats.full_counts += 1
     _using_char_estimate: bool
     token_count: int
     if _raw_count is None:
@@ -351,6 +443,7 @@ def enforce_context_budget(
         token_count = _raw_count
 
     def _recount(body: dict[str, Any]) -> int:
+        stats.full_counts += 1
         if _using_char_estimate:
             return _char_estimate_tokens(body)
         result = count_oai_request_tokens(body, tokenizer_model)
@@ -370,6 +463,7 @@ def enforce_context_budget(
     if token_count <= budget.effective_input_tokens:
         return _apply_output_budget_cap(oai_body, token_count, budget)
 
+    stats.over_budget = True
     logger.warning(
         "[coding-model-router] request exceeds budget by %d tokens (%d > %d); compressing",
         token_count - budget.effective_input_tokens,
@@ -380,20 +474,60 @@ def enforce_context_budget(
     messages = list(oai_body.get("messages", []))
 
     # ── Phase 1: head+tail compress oversized tool results ───────────────────
-    messages, log_lines = _compress_tool_messages(messages)
+    # With per-message counts, compression stops as soon as the running
+    # estimate fits (and carries on if the exact recount then doesn't);
+    # otherwise every oversized result is compressed and the body recounted
+    # once.
+    estimate = token_count
+
+    incremental = True
+
+    def _fits_after(
+        index: int, original: dict[str, Any], compressed: dict[str, Any]
+    ) -> bool:
+        nonlocal estimate, incremental
+        counts = _message_token_counts(
+            [original, compressed], tokenizer_model, _using_char_estimate
+        )
+        if counts is None:
+            # Can't estimate — compress everything and recount instead.
+            incremental = False
+        if not incremental or counts is None:
+            return False
+        estimate -= counts[0] - counts[1]
+        return estimate <= budget.effective_input_tokens
+
+    compressed, log_lines = _compress_tool_messages(messages, _fits_after)
     if log_lines:
         logger.info(
             "[coding-model-router] tool result compression:\n%s",
             "\n".join(log_lines),
         )
-        updated = {**oai_body, "messages": messages}
-        new_count = _recount(updated)
+        messages = compressed
+        new_count = (
+            estimate if incremental else _recount({**oai_body, "messages": messages})
+        )
         logger.info(
-            "[coding-model-router] after tool compression: %d tokens (saved %d)",
+            "[coding-model-router] after tool compression: %d tokens (saved %d)%s",
             new_count,
             token_count - new_count,
+            " [estimated]" if incremental else "",
         )
         token_count = new_count
+        if token_count <= budget.effective_input_tokens and incremental:
+            token_count = _recount({**oai_body, "messages": messages})
+            if token_count > budget.effective_input_tokens:
+                # The estimate undershot: compress the remaining oversized
+                # results too before any history is dropped.
+                messages, rest_lines = _compress_tool_messages(messages)
+                if rest_lines:
+                    logger.info(
+                        "[coding-model-router] estimate undershot (%d tokens); "
+                        "compressing the remaining tool results:\n%s",
+                        token_count,
+                        "\n".join(rest_lines),
+                    )
+                    token_count = _recount({**oai_body, "messages": messages})
         if token_count <= budget.effective_input_tokens:
             return _apply_output_budget_cap(
                 {**oai_body, "messages": messages}, token_count, budget
@@ -403,16 +537,76 @@ def enforce_context_budget(
     system_msg, groups = _group_conversation(messages)
     max_cut = _max_valid_cut_index(groups)
     cut = 0
-    dropped = 0
 
-    while cut < max_cut and token_count > budget.effective_input_tokens:
-        dropped += len(groups[cut])
-        cut += 1
+    # Exact recounts by cut, shared by the estimate check and the searches.
+    exact: dict[int, int] = {}
+
+    def _count_at(k: int) -> int:
+        if k not in exact:
+            exact[k] = _recount(
+                {**oai_body, "messages": _reassemble(system_msg, groups[k:])}
+            )
+        return exact[k]
+
+    def _smallest_fitting_cut(lo: int, hi: int) -> int:
+        """Bisect exact recounts for the smallest cut in [lo, hi] that fits;
+        `hi` when none smaller does."""
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if _count_at(mid) <= budget.effective_input_tokens:
+                hi = mid
+            else:
+                lo = mid + 1
+        return lo
+
+    droppable_counts = _message_token_counts(
+        [msg for group in groups[:max_cut] for msg in group],
+        tokenizer_model,
+        _using_char_estimate,
+    )
+    if droppable_counts is not None and max_cut:
+        # removed[k - 1] = tokens removed by dropping the first k groups; the
+        # smallest k that brings the estimate within budget is a bisection
+        # away, with no tokenizer work at all.
+        removed: list[int] = []
+        position = 0
+        for group in groups[:max_cut]:
+            removed.append(
+                (removed[-1] if removed else 0)
+                + sum(droppable_counts[position : position + len(group)])
+            )
+            position += len(group)
+        excess = token_count - budget.effective_input_tokens
+        cut = min(max_cut, bisect.bisect_left(removed, excess) + 1)
+        estimate = token_count - removed[cut - 1]
+        token_count = _count_at(cut)
+        logger.info(
+            "[coding-model-router] dropped %d group(s): estimated %d tokens, "
+            "recounted %d",
+            cut,
+            estimate,
+            token_count,
+        )
+        # Per-message counts leave out the chat template's wrapping of tool
+        # calls and results, so the estimate can also overshoot: when a
+        # smaller cut fits as well, find the smallest one.
+        if (
+            token_count <= budget.effective_input_tokens
+            and cut > 1
+            and _count_at(cut - 1) <= budget.effective_input_tokens
+        ):
+            cut = _smallest_fitting_cut(1, cut - 1)
+
+    # Exact fallback — per-message counts unavailable, or the estimate above
+    # undershot and the conversation is still over budget. Bisect over exact
+    # recounts for the smallest cut in (cut, max_cut] that fits.
+    if cut < max_cut and token_count > budget.effective_input_tokens:
+        cut = _smallest_fitting_cut(cut + 1, max_cut)
+    if cut:
+        token_count = _count_at(cut)
         messages = _reassemble(system_msg, groups[cut:])
-        token_count = _recount({**oai_body, "messages": messages})
-        if token_count <= budget.effective_input_tokens:
-            break
 
+    dropped = sum(len(group) for group in groups[:cut])
     groups = groups[cut:]
 
     if dropped:
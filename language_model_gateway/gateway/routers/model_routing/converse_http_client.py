@@ -0,0 +1,239 @@
+"""
+Async client for the native Bedrock Converse API — Converse and
+ConverseStream sent as SigV4-signed requests over the pooled httpx clients
+(see upstream_client_pool.py), with the ConverseStream event stream decoded
+on the event loop as bytes arrive (see aws_event_stream.py).
+
+A drop-in for the boto3 client BedrockRuntimeClientProvider hands out: it
+takes the same converse kwargs (see converse_request_translator.py), returns
+the same response and event shapes, and raises the same botocore exceptions,
+so BedrockNativeDispatcher's retry and error handling and
+converse_stream_adapter.py's event contract don't change. What it avoids is
+boto3's blocking I/O: a thread hop per request and per streamed event.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, AsyncGenerator
+from urllib.parse import quote
+
+import httpx
+
+from . import json_codec
+from .aws_auth import BedrockCredentialsUnavailableError, _sign_bedrock
+from .aws_event_stream import EventStreamDecoder, EventStreamMessage
+from .upstream_client_pool import UpstreamClientPool
+
+
+def _runtime_url(route: dict[str, Any]) -> str:
+    """The bedrock-runtime endpoint boto3 would use for the route's region."""
+    region = route.get("aws_region", "us-east-1")
+    return f"https://bedrock-runtime.{region}.amazonaws.com"
+
+
+def _error_code(raw: str | None) -> str:
+    """`x-amzn-ErrorType`, a body's `__type` or `:exception-type` → boto3's
+    error code, e.g. "ThrottlingException:http://...",
+    "com.amazon...#ThrottlingException" or "throttlingException" →
+    "ThrottlingException"."""
+    code = (raw or "").split(":", 1)[0].rsplit("#", 1)[-1]
+    return code[:1].upper() + code[1:]
+
+
+def _client_error(
+    code: str,
+    message: str,
+    operation_name: str,
+    *,
+    status_code: int | None = None,
+    aws_request_id: str | None = None,
+    event_stream: bool = False,
+) -> Exception:
+    from botocore.exceptions import ClientError, EventStreamError
+
+    error_response: dict[str, Any] = {
+        "Error": {"Code": code, "Message": message},
+        "ResponseMetadata": {
+            "RequestId": aws_request_id,
+            "HTTPStatusCode": status_code,
+        },
+    }
+    error_cls = EventStreamError if event_stream else ClientError
+    return error_cls(error_response, operation_name)  # type: ignore[arg-type]
+
+
+def _transport_error(exc: httpx.TransportError, url: str) -> Exception:
+    """The botocore exception boto3 raises for the same transport failure."""
+    from botocore.exceptions import (
+        ConnectTimeoutError,
+        EndpointConnectionError,
+        ReadTimeoutError,
+    )
+
+    if isinstance(exc, httpx.ConnectTimeout):
+        return ConnectTimeoutError(endpoint_url=url, error=exc)
+    if isinstance(exc, httpx.TimeoutException):
+        return ReadTimeoutError(endpoint_url=url, error=exc)
+    return EndpointConnectionError(endpoint_url=url, error=exc)
+
+
+class AsyncConverseClient:
+    """Sends Converse/ConverseStream requests without leaving the event loop.
+
+    `connect_timeout_seconds`/`read_timeout_seconds` have the same meaning
+    as for the boto3 client (see BedrockRuntimeClientProvider); a read
+    timeout applies to each read, so it bounds the gap between two streamed
+    events, not the whole generation. Nothing is retried here — the
+    dispatcher owns retries.
+    """
+
+    def __init__(
+        self,
+        *,
+        upstream_client_pool: UpstreamClientPool,
+        connect_timeout_seconds: float = 60.0,
+        read_timeout_seconds: float = 60.0,
+    ) -> None:
+        self._upstream_client_pool = upstream_client_pool
+        self._timeout = httpx.Timeout(
+            read_timeout_seconds, connect=connect_timeout_seconds
+        )
+
+    def _client(self, route: dict[str, Any]) -> httpx.AsyncClient:
+        return self._upstream_client_pool.get_client(
+            _runtime_url(route),
+            auth="aws",
+            aws_region=route.get("aws_region", "us-east-1"),
+        )
+
+    def prewarm(self, route: dict[str, Any]) -> None:
+        """Open the route's pooled client ahead of its first request."""
+        self._client(route)
+
+    async def _send(
+        self,
+        route: dict[str, Any],
+        converse_kwargs: dict[str, Any],
+        action: str,
+        operation_name: str,
+    ) -> httpx.Response:
+        """Sign and send one request; returns the response with its body
+        not yet read, or raises the matching botocore exception."""
+        from botocore.exceptions import NoCredentialsError
+
+        body = dict(converse_kwargs)
+        model_id = body.pop("modelId")
+        url = f"{_runtime_url(route)}/model/{quote(model_id, safe='')}/{action}"
+        raw_body = json_codec.dumps(body)
+        try:
+            headers = _sign_bedrock(url, raw_body, route)
+        except BedrockCredentialsUnavailableError as exc:
+            raise NoCredentialsError() from exc
+        client = self._client(route)
+        request = client.build_request(
+            "POST", url, content=raw_body, headers=headers, timeout=self._timeout
+        )
+        try:
+            response = await client.send(request, stream=True)
+        except httpx.TransportError as exc:
+            raise _transport_error(exc, url) from exc
+        if response.status_code >= 400:
+            try:
+                error_body = await response.aread()
+            except httpx.TransportError:
+                error_body = b""
+            finally:
+                await response.aclose()
+            try:
+                error_json = json.loads(error_body)
+                message = error_json.get("message") or error_json.get("Message", "")
+                body_code = error_json.get("__type")
+            except (ValueError, AttributeError):
+                message = error_body.decode("utf-8", "replace")
+                body_code = None
+            # Same precedence as botocore; the bare status code when neither
+            # names the error.
+            raise _client_error(
+                _error_code(response.headers.get("x-amzn-errortype") or body_code)
+                or str(response.status_code),
+                message,
+                operation_name,
+                status_code=response.status_code,
+                aws_request_id=response.headers.get("x-amzn-requestid"),
+            )
+        return response
+
+    async def converse(
+        self, route: dict[str, Any], converse_kwargs: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Bedrock Converse — the response dict boto3's converse() returns."""
+        response = await self._send(route, converse_kwargs, "converse", "Converse")
+        try:
+            raw = await response.aread()
+        except httpx.TransportError as exc:
+            raise _transport_error(exc, str(response.url)) from exc
+        finally:
+            await response.aclose()
+        result: dict[str, Any] = json_codec.loads(raw)
+        return result
+
+    async def converse_stream(
+        self, route: dict[str, Any], converse_kwargs: dict[str, Any]
+    ) -> AsyncGenerator[dict[str, Any], None]:
+        """Bedrock ConverseStream. Returns once the stream is established
+        (so an error response raises here, like boto3's converse_stream());
+        the returned generator yields events shaped like boto3's, e.g.
+        `{"contentBlockDelta": {...}}`, and raises botocore's
+        EventStreamError for an exception sent mid-stream."""
+        response = await self._send(
+            route, converse_kwargs, "converse-stream", "ConverseStream"
+        )
+        return self._iter_events(response)
+
+    async def _iter_events(
+        self, response: httpx.Response
+    ) -> AsyncGenerator[dict[str, Any], None]:
+        decoder = EventStreamDecoder()
+        aws_request_id = response.headers.get("x-amzn-requestid")
+        try:
+            async for chunk in response.aiter_bytes():
+                for message in decoder.feed(chunk):
+                    yield self._event(message, aws_request_id)
+            if decoder.pending:
+                raise _transport_error(
+                    httpx.RemoteProtocolError("event stream ended mid-message"),
+                    str(response.url),
+                )
+        except httpx.TransportError as exc:
+            raise _transport_error(exc, str(response.url)) from exc
+        finally:
+            await response.aclose()
+
+    @staticmethod
+    def _event(
+        message: EventStreamMessage, aws_request_id: str | None
+    ) -> dict[str, Any]:
+        headers = message.headers
+        message_type = headers.get(":message-type", "event")
+        if message_type == "event":
+            payload: dict[str, Any] = (
+                json_codec.loads(message.payload) if message.payload else {}
+            )
+            return {headers.get(":event-type", ""): payload}
+        if message_type == "exception":
+            code = _error_code(headers.get(":exception-type"))
+            try:
+                text = json.loads(message.payload).get("message", "")
+            except (ValueError, AttributeError):
+                text = message.payload.decode("utf-8", "replace")
+        else:
+            code = _error_code(headers.get(":error-code"))
+            text = headers.get(":error-message", "")
+        raise _client_error(
+            code,
+            text,
+            "ConverseStream",
+            aws_request_id=aws_request_id,
+            event_stream=True,
+        )
@@ -1,6 +1,7 @@
 """
-Streaming adaptation for the native Bedrock Converse API — converts boto3's
-synchronous converse_stream() EventStream into an async generator of
+Streaming adaptation for the native Bedrock Converse API — converts a
+Converse event stream (from converse_http_client.py, or boto3's pumped onto
+the event loop by bedrock_executor.py) into an async generator of
 Anthropic-format SSE bytes, with an optional usage-tracking wrapper.
 
 Split out of bedrock_converse_client.py, which now owns only client
@@ -10,7 +11,6 @@ response translation lives in converse_request_translator.py.
 
 from __future__ import annotations
 
-import asyncio
 import logging
 from datetime import datetime
 from typing import Any, AsyncGenerator, Callable
@@ -29,30 +29,6 @@ logger = logging.getLogger(__name__)
 logger.setLevel(SRC_LOG_LEVELS.get("LLM", logging.INFO))
 
 
-async def _iter_converse_stream_events(
-    sync_events: Any,
-) -> AsyncGenerator[dict[str, Any], None]:
-    """Adapt boto3's synchronous converse_stream() EventStream onto the
-    asyncio event loop — pulling one event at a time via asyncio.to_thread,
-    since boto3 has no native async client and iterating its EventStream
-    blocks the thread it's called from.
-    """
-    iterator = iter(sync_events)
-
-    def _next_event() -> dict[str, Any] | None:
-        try:
-            result = next(iterator)
-            return result  # type: ignore[no-any-return]
-        except StopIteration:
-            return None
-
-    while True:
-        event = await asyncio.to_thread(_next_event)
-        if event is None:
-            return
-        yield event
-
-
 async def _stream_bedrock_converse_to_anthropic(
     events: AsyncGenerator[dict[str, Any], None],
     msg_id: str,
@@ -227,6 +203,10 @@ async def _stream_bedrock_converse_to_anthropic(
         stream_error_msg = str(exc)
         if on_stream_error is not None:
             on_stream_error(stream_error_msg)
+    finally:
+        # Releases the upstream connection now, rather than whenever the
+        # generator is garbage-collected, if we stopped early (disconnect).
+        await events.aclose()
 
     for idx in sorted(open_block_types):
         yield _sse_event(
@@ -379,5 +359,6 @@ async def _converse_stream_with_usage_tracking(
                 raw_usage=usage_sink.get("raw_usage"),
                 start_time=start_time,
                 retry_count=retry_count,
+                routing=auth_info.get("routing"),
             )
         )
@@ -0,0 +1,172 @@
+"""
+Cross-worker Bedrock dispatch budget, shared through Redis.
+
+Each Gunicorn worker's BedrockDispatchScheduler otherwise paces only its own
+requests, so N workers send N times the intended rate and then all back off
+together once Bedrock throttles. With a store configured
+(MODEL_ROUTING_DISPATCH_REDIS_URL), every worker — on one pod or many — draws
+tokens from the same per-(region, model) bucket, and a throttle seen by any
+worker lowers the rate for all of them.
+
+Each operation is one atomic Lua script, and scripts use Redis' own clock
+(`TIME`) rather than each caller's, so buckets stay consistent across hosts
+with skewed clocks. The `redis` package is imported lazily — this module is
+only loaded when a store URL is configured.
+"""
+
+from __future__ import annotations
+
+from abc import ABCMeta, abstractmethod
+from typing import Any, override
+
+# KEYS[1]: bucket hash. ARGV: max_rate, burst, ttl_s.
+# Returns seconds to wait before retrying (as a string — Redis truncates Lua
+# numbers to integers in replies); "0" means a token was taken.
+_TAKE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local max_rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local b = redis.call('HMGET', KEYS[1], 'tokens', 'ts', 'rate')
+local rate = tonumber(b[3]) or max_rate
+if rate > max_rate then rate = max_rate end
+local tokens = tonumber(b[1]) or burst
+local ts = tonumber(b[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+else
+  wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now, 'rate', rate)
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[3]))
+return tostring(wait)
+"""
+
+# KEYS[1]: bucket hash. ARGV: max_rate, min_rate, decrease_factor, ttl_s.
+_THROTTLE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local max_rate = tonumber(ARGV[1])
+local rate = tonumber(redis.call('HGET', KEYS[1], 'rate')) or max_rate
+rate = math.max(tonumber(ARGV[2]), rate * tonumber(ARGV[3]))
+local tokens = tonumber(redis.call('HGET', KEYS[1], 'tokens')) or 0
+redis.call('HSET', KEYS[1], 'tokens', math.min(tokens, 0), 'ts', now, 'rate', rate)
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[4]))
+return tostring(rate)
+"""
+
+# KEYS[1]: bucket hash. ARGV: max_rate, increase_fraction, ttl_s.
+_SUCCESS_SCRIPT = """
+local max_rate = tonumber(ARGV[1])
+local rate = tonumber(redis.call('HGET', KEYS[1], 'rate'))
+if rate == nil or rate >= max_rate then return tostring(max_rate) end
+rate = math.min(max_rate, rate + max_rate * tonumber(ARGV[2]))
+redis.call('HSET', KEYS[1], 'rate', rate)
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[3]))
+return tostring(rate)
+"""
+
+
+class BaseDispatchBudgetStore(metaclass=ABCMeta):
+    """Shared token buckets for BedrockDispatchScheduler, keyed by
+    "region/model".
+
+    Implementations must be safe to call concurrently from many processes;
+    any exception is treated by the scheduler as the store being unavailable
+    and it falls back to its local, per-worker bucket for a while.
+    """
+
+    @abstractmethod
+    async def take(self, key: str, *, max_rate: float, burst: float) -> float:
+        """Take a token; returns 0.0 on success, else seconds to wait."""
+
+    @abstractmethod
+    async def record_throttle(
+        self,
+        key: str,
+        *,
+        max_rate: float,
+        min_rate: float,
+        decrease_factor: float,
+    ) -> float:
+        """Multiplicative decrease; returns the new shared rate."""
+
+    @abstractmethod
+    async def record_success(
+        self, key: str, *, max_rate: float, increase_fraction: float
+    ) -> float:
+        """Additive increase toward `max_rate`; returns the new shared rate."""
+
+    async def aclose(self) -> None:
+        return None
+
+
+class RedisDispatchBudgetStore(BaseDispatchBudgetStore):
+    """Redis-backed token buckets shared by every worker using the same URL
+    and key prefix.
+
+    Keys expire after `ttl_seconds` of inactivity, so a model that stops
+    being routed to doesn't leave state behind forever.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        *,
+        key_prefix: str = "model-routing:bedrock-dispatch:",
+        ttl_seconds: int = 3600,
+        socket_timeout_seconds: float = 0.5,
+    ) -> None:
+        import redis.asyncio as redis_asyncio
+
+        self._key_prefix = key_prefix
+        self._ttl_seconds = ttl_seconds
+        self._client: Any = redis_asyncio.from_url(
+            url,
+            socket_timeout=socket_timeout_seconds,
+            socket_connect_timeout=socket_timeout_seconds,
+        )
+        self._take = self._client.register_script(_TAKE_SCRIPT)
+        self._throttle = self._client.register_script(_THROTTLE_SCRIPT)
+        self._success = self._client.register_script(_SUCCESS_SCRIPT)
+
+    def _key(self, key: str) -> str:
+        return f"{self._key_prefix}{key}"
+
+    @override
+    async def take(self, key: str, *, max_rate: float, burst: float) -> float:
+        result = await self._take(
+            keys=[self._key(key)], args=[max_rate, burst, self._ttl_seconds]
+        )
+        return float(result)
+
+    @override
+    async def record_throttle(
+        self,
+        key: str,
+        *,
+        max_rate: float,
+        min_rate: float,
+        decrease_factor: float,
+    ) -> float:
+        result = await self._throttle(
+            keys=[self._key(key)],
+            args=[max_rate, min_rate, decrease_factor, self._ttl_seconds],
+        )
+        return float(result)
+
+    @override
+    async def record_success(
+        self, key: str, *, max_rate: float, increase_fraction: float
+    ) -> float:
+        result = await self._success(
+            keys=[self._key(key)],
+            args=[max_rate, increase_fraction, self._ttl_seconds],
+        )
+        return float(result)
+
+    @override
+    async def aclose(self) -> None:
+        await self._client.aclose()
@@ -0,0 +1,357 @@
+"""
+Client-side pacing for Bedrock dispatches — a token bucket per (region,
+model), replacing the single worker-wide lock + fixed 300ms minimum interval
+that used to serialize every auth="aws" request regardless of where it was
+going.
+
+Each bucket's rate adapts to what Bedrock tells us (AIMD): a throttle halves
+it and drains the bucket, every successful dispatch adds back a small
+fraction of the configured rate, never exceeding it. Requests to different
+regions or models never wait on each other.
+
+Used through the thin wrappers in bedrock_client.py (`_pace_bedrock_dispatch`,
+`_record_bedrock_throttle`, `_record_bedrock_success`), which all three
+auth="aws" dispatch paths already call.
+
+On its own each worker paces only its own requests. With a shared store
+attached (see dispatch_budget_store.py) tokens are drawn from a bucket shared
+by every worker, and throttles are propagated to it; the local bucket then
+only tracks this worker's view, and takes over again whenever the store is
+unreachable.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Coroutine
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from opentelemetry import metrics
+
+from language_model_gateway.gateway.utilities.logger.log_levels import SRC_LOG_LEVELS
+
+from .constants import (
+    _BEDROCK_AIMD_DECREASE_FACTOR,
+    _BEDROCK_AIMD_INCREASE_FRACTION,
+    _BEDROCK_DEFAULT_DISPATCH_BURST,
+    _BEDROCK_DEFAULT_DISPATCH_RATE_PER_S,
+    _BEDROCK_MIN_DISPATCH_RATE_PER_S,
+    _BEDROCK_SHARED_DISPATCH_RETRY_S,
+)
+
+if TYPE_CHECKING:
+    from .dispatch_budget_store import BaseDispatchBudgetStore
+
+logger = logging.getLogger(__name__)
+logger.setLevel(SRC_LOG_LEVELS.get("LLM", logging.INFO))
+
+_meter = metrics.get_meter(__name__)
+_dispatch_wait_histogram = _meter.create_histogram(
+    "model_routing.bedrock.dispatch.wait_time",
+    unit="s",
+    description="Time a Bedrock request waited for a dispatch token",
+)
+_dispatch_queue_depth = _meter.create_up_down_counter(
+    "model_routing.bedrock.dispatch.queue_depth",
+    description="Bedrock requests currently waiting for a dispatch token",
+)
+_dispatch_throttle_counter = _meter.create_counter(
+    "model_routing.bedrock.dispatch.throttles",
+    description="Bedrock throttle responses fed back into the dispatch rate",
+)
+_shared_store_error_counter = _meter.create_counter(
+    "model_routing.bedrock.dispatch.shared_store_errors",
+    description="Failed calls to the shared dispatch budget store",
+)
+
+_BucketKey = tuple[str, str]
+
+
+def _bucket_key(route: dict[str, Any]) -> _BucketKey:
+    return (route.get("aws_region", "us-east-1"), str(route.get("model", "")))
+
+
+def _configured_rate(route: dict[str, Any]) -> float:
+    return float(route.get("dispatch_rate_per_s", _BEDROCK_DEFAULT_DISPATCH_RATE_PER_S))
+
+
+def _configured_burst(route: dict[str, Any]) -> float:
+    return float(route.get("dispatch_burst", _BEDROCK_DEFAULT_DISPATCH_BURST))
+
+
+def _store_key(key: _BucketKey) -> str:
+    return f"{key[0]}/{key[1]}"
+
+
+@dataclass
+class _TokenBucket:
+    """One (region, model)'s dispatch budget.
+
+    `max_rate` is the route's configured ceiling; `rate` is the current,
+    throttle-adjusted refill rate. `lock` makes waiters take tokens in FIFO
+    order, so a burst of concurrent requests drains evenly instead of
+    every waiter waking at once and racing for the same token.
+    """
+
+    max_rate: float
+    burst: float
+    rate: float
+    tokens: float
+    updated: float
+    waiting: int = 0
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    def refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self.updated)
+        self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+        self.updated = now
+
+
+class BedrockDispatchScheduler:
+    """Token-bucket scheduler for Bedrock dispatches, keyed by (region, model).
+
+    Rate and burst come from the route config (`dispatch_rate_per_s`,
+    `dispatch_burst`), defaulting to the old fixed pacing's ~3.3 req/s with
+    a small burst — but now per (region, model) rather than shared by the
+    whole worker. A changed route config (e.g. after a reload) is picked up
+    on the next dispatch for that key.
+
+    `shared_store` makes every worker using the same store draw from one
+    budget per key (see use_shared_store). A store failure never fails a
+    request: the scheduler logs it, paces locally for
+    `shared_store_retry_seconds`, then tries the store again.
+    """
+
+    def __init__(
+        self,
+        *,
+        min_rate_per_s: float = _BEDROCK_MIN_DISPATCH_RATE_PER_S,
+        decrease_factor: float = _BEDROCK_AIMD_DECREASE_FACTOR,
+        increase_fraction: float = _BEDROCK_AIMD_INCREASE_FRACTION,
+        shared_store: BaseDispatchBudgetStore | None = None,
+        shared_store_retry_seconds: float = _BEDROCK_SHARED_DISPATCH_RETRY_S,
+    ) -> None:
+        self._min_rate_per_s = min_rate_per_s
+        self._decrease_factor = decrease_factor
+        self._increase_fraction = increase_fraction
+        self._buckets: dict[_BucketKey, _TokenBucket] = {}
+        self._shared_store = shared_store
+        self._shared_store_retry_seconds = shared_store_retry_seconds
+        self._shared_store_down_until = 0.0
+        # Throttle/success updates to the shared store are fire-and-forget
+        # (record_* are called from sync code); hold references until done.
+        self._pending: set[asyncio.Task[Any]] = set()
+
+    def use_shared_store(self, store: BaseDispatchBudgetStore | None) -> None:
+        """Attach (or, with None, detach) a cross-worker budget store.
+
+        Called once from the app lifespan when MODEL_ROUTING_DISPATCH_REDIS_URL
+        is set; the per-worker scheduler is created at import time, before
+        configuration is available.
+        """
+        self._shared_store = store
+        self._shared_store_down_until = 0.0
+
+    def _usable_store(self) -> BaseDispatchBudgetStore | None:
+        if self._shared_store is None:
+            return None
+        if time.monotonic() < self._shared_store_down_until:
+            return None
+        return self._shared_store
+
+    def _shared_store_failed(self, operation: str) -> None:
+        _shared_store_error_counter.add(1, {"operation": operation})
+        if time.monotonic() >= self._shared_store_down_until:
+            logger.warning(
+                "[coding-model-router] shared Bedrock dispatch store failed "
+                "during %s — pacing per worker for %.0fs",
+                operation,
+                self._shared_store_retry_seconds,
+                exc_info=True,
+            )
+        self._shared_store_down_until = (
+            time.monotonic() + self._shared_store_retry_seconds
+        )
+
+    def _update_shared_store(
+        self, operation: str, coro: Coroutine[Any, Any, Any]
+    ) -> None:
+        async def run() -> None:
+            try:
+                await coro
+            except Exception:
+                self._shared_store_failed(operation)
+
+        try:
+            task = asyncio.get_running_loop().create_task(run())
+        except RuntimeError:
+            # No running loop (sync caller, e.g. a test) — nothing to share with.
+            coro.close()
+            return
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _acquire_shared(
+        self, store: BaseDispatchBudgetStore, key: _BucketKey, bucket: _TokenBucket
+    ) -> bool:
+        """Take a token from the shared bucket; False if the store failed and
+        the caller should pace locally instead."""
+        while True:
+            try:
+                wait = await store.take(
+                    _store_key(key), max_rate=bucket.max_rate, burst=bucket.burst
+                )
+            except Exception:
+                self._shared_store_failed("take")
+                return False
+            if wait <= 0.0:
+                return True
+            # Never sleep longer than the floor rate's interval: the shared
+            # rate may recover (or the route config change) meanwhile.
+            await asyncio.sleep(min(wait, 1.0 / self._min_rate_per_s))
+
+    def _bucket(self, route: dict[str, Any], now: float) -> _TokenBucket:
+        key = _bucket_key(route)
+        max_rate = max(self._min_rate_per_s, _configured_rate(route))
+        burst = max(1.0, _configured_burst(route))
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = _TokenBucket(
+                max_rate=max_rate,
+                burst=burst,
+                rate=max_rate,
+                tokens=burst,
+                updated=now,
+            )
+            self._buckets[key] = bucket
+        elif bucket.max_rate != max_rate or bucket.burst != burst:
+            bucket.refill(now)
+            bucket.max_rate = max_rate
+            bucket.burst = burst
+            bucket.rate = min(bucket.rate, max_rate)
+            bucket.tokens = min(bucket.tokens, burst)
+        return bucket
+
+    async def acquire(self, route: dict[str, Any]) -> float:
+        """Wait for a dispatch token for `route`; returns seconds waited."""
+        start = time.monotonic()
+        bucket = self._bucket(route, start)
+        region, model = _bucket_key(route)
+        attributes = {"aws_region": region, "upstream_model": model}
+        bucket.waiting += 1
+        _dispatch_queue_depth.add(1, attributes)
+        try:
+            async with bucket.lock:
+                store = self._usable_store()
+                shared = store is not None and await self._acquire_shared(
+                    store, _bucket_key(route), bucket
+                )
+                while not shared:
+                    now = time.monotonic()
+                    bucket.refill(now)
+                    if bucket.tokens >= 1.0:
+                        bucket.tokens -= 1.0
+                        break
+                    # Re-checked after sleeping: a throttle elsewhere may
+                    # have lowered the rate (and drained the bucket) meanwhile.
+                    await asyncio.sleep((1.0 - bucket.tokens) / bucket.rate)
+        finally:
+            bucket.waiting -= 1
+            _dispatch_queue_depth.add(-1, attributes)
+        waited = time.monotonic() - start
+        _dispatch_wait_histogram.record(waited, attributes)
+        if waited >= 1.0:
+            logger.info(
+                "[coding-model-router] Bedrock dispatch waited %.2fs for a token "
+                "region=%s model=%s rate=%.2f/s queued=%d",
+                waited,
+                region,
+                model,
+                bucket.rate,
+                bucket.waiting,
+            )
+        return waited
+
+    def record_throttle(self, route: dict[str, Any]) -> None:
+        """Multiplicative decrease: halve the rate and drain the bucket, so
+        requests already queued behind this one back off too instead of
+        immediately hitting the same throttle."""
+        bucket = self._bucket(route, time.monotonic())
+        previous = bucket.rate
+        bucket.rate = max(self._min_rate_per_s, bucket.rate * self._decrease_factor)
+        bucket.tokens = min(bucket.tokens, 0.0)
+        region, model = _bucket_key(route)
+        store = self._usable_store()
+        if store is not None:
+            self._update_shared_store(
+                "record_throttle",
+                store.record_throttle(
+                    _store_key((region, model)),
+                    max_rate=bucket.max_rate,
+                    min_rate=self._min_rate_per_s,
+                    decrease_factor=self._decrease_factor,
+                ),
+            )
+        _dispatch_throttle_counter.add(
+            1, {"aws_region": region, "upstream_model": model}
+        )
+        logger.info(
+            "[coding-model-router] Bedrock throttled — dispatch rate %.2f/s -> "
+            "%.2f/s region=%s model=%s",
+            previous,
+            bucket.rate,
+            region,
+            model,
+        )
+
+    def record_success(self, route: dict[str, Any]) -> None:
+        """Additive increase back toward the configured rate."""
+        bucket = self._bucket(route, time.monotonic())
+        # The shared rate may have been lowered by another worker even if
+        # this one has never been throttled, so always report success there.
+        store = self._usable_store()
+        if store is not None:
+            self._update_shared_store(
+                "record_success",
+                store.record_success(
+                    _store_key(_bucket_key(route)),
+                    max_rate=bucket.max_rate,
+                    increase_fraction=self._increase_fraction,
+                ),
+            )
+        if bucket.rate < bucket.max_rate:
+            bucket.rate = min(
+                bucket.max_rate,
+                bucket.rate + bucket.max_rate * self._increase_fraction,
+            )
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Current per-key state, for diagnostics and tests."""
+        return {
+            f"{region}/{model}": {
+                "rate_per_s": bucket.rate,
+                "max_rate_per_s": bucket.max_rate,
+                "burst": bucket.burst,
+                "tokens": bucket.tokens,
+                "queued": bucket.waiting,
+            }
+            for (region, model), bucket in self._buckets.items()
+        }
+
+    async def aclose(self) -> None:
+        """Flush pending shared-store updates and close the store."""
+        if self._pending:
+            await asyncio.gather(*list(self._pending), return_exceptions=True)
+        store, self._shared_store = self._shared_store, None
+        if store is not None:
+            try:
+                await store.aclose()
+            except Exception:
+                logger.warning(
+                    "[coding-model-router] failed to close shared Bedrock "
+                    "dispatch store",
+                    exc_info=True,
+                )
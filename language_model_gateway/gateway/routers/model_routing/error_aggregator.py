@@ -0,0 +1,179 @@
+"""
+Groups identical upstream failures so an error storm doesn't turn into a
+MongoDB write storm.
+
+During an outage every request fails the same way, and ErrorTracker used to
+write one full document (response headers, a 1000-char message) per
+failure — extra write load on MongoDB exactly when things are degraded.
+With an ErrorAggregator, failures are grouped per `window_seconds` by
+(model, error_type, status_code, normalized message), and each group is
+written once per window as a counted document with its first/last
+timestamps and the request_ids whose full documents were kept.
+
+Full per-request documents are still written for the first failure in each
+group and window, then for a `sample_rate` fraction of the rest — and never
+more than `max_writes_per_second` of them in total, however many groups
+there are.
+"""
+
+from __future__ import annotations
+
+import random
+import re
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+
+_NORMALIZED_MESSAGE_LIMIT = 200
+
+# Request-specific parts of an error message, replaced so that the same
+# failure for different requests normalizes to the same text.
+_VOLATILE_PATTERNS: tuple[tuple[re.Pattern[str], str], ...] = (
+    (
+        re.compile(
+            r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.I
+        ),
+        "<id>",
+    ),
+    (re.compile(r"\b[0-9a-f]{16,}\b", re.I), "<id>"),
+    (re.compile(r"\d+(?:\.\d+)?"), "<n>"),
+    (re.compile(r"\s+"), " "),
+)
+
+# Context copied onto the group document from its first failure.
+_CONTEXT_FIELDS: tuple[str, ...] = (
+    "model_tier",
+    "backend",
+    "bedrock_transport",
+    "auth",
+    "api_type",
+)
+
+
+def normalize_error_message(message: str) -> str:
+    """The message with ids and numbers masked, for grouping."""
+    for pattern, replacement in _VOLATILE_PATTERNS:
+        message = pattern.sub(replacement, message)
+    return message.strip()[:_NORMALIZED_MESSAGE_LIMIT]
+
+
+@dataclass
+class _ErrorGroup:
+    key: dict[str, Any]
+    context: dict[str, Any]
+    example_message: str
+    first_seen: datetime
+    last_seen: datetime
+    count: int = 0
+    sample_request_ids: list[str] = field(default_factory=list)
+
+
+class ErrorAggregator:
+    """Per-window failure groups plus the per-request write budget.
+
+    Only touched from the event loop. ErrorTracker calls observe() for every
+    failure and writes drain()'s group documents once per window.
+    """
+
+    def __init__(
+        self,
+        *,
+        window_seconds: float = 10.0,
+        sample_rate: float = 0.05,
+        max_writes_per_second: float = 20.0,
+        max_sample_request_ids: int = 20,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        self._window_seconds = window_seconds
+        self._sample_rate = sample_rate
+        self._max_writes_per_second = max_writes_per_second
+        self._max_sample_request_ids = max_sample_request_ids
+        self._rng = rng
+        self._groups: dict[tuple[Any, ...], _ErrorGroup] = {}
+        self._window_start = datetime.now(timezone.utc)
+        # Token bucket for full per-request documents.
+        self._write_tokens = max_writes_per_second
+        self._tokens_updated_at = time.monotonic()
+        self._suppressed = 0
+
+    @property
+    def window_seconds(self) -> float:
+        return self._window_seconds
+
+    @property
+    def has_groups(self) -> bool:
+        return bool(self._groups)
+
+    def observe(self, record: dict[str, Any]) -> bool:
+        """Count a failure into its group; True if its full document should
+        also be written."""
+        key = {
+            "model": record.get("model"),
+            "error_type": record.get("error_type"),
+            "status_code": record.get("status_code"),
+            "message": normalize_error_message(record.get("error_message", "")),
+        }
+        key_tuple = tuple(key.values())
+        timestamp: datetime = record["timestamp"]
+        group = self._groups.get(key_tuple)
+        first_in_window = group is None
+        if group is None:
+            group = _ErrorGroup(
+                key=key,
+                context={
+                    name: record[name] for name in _CONTEXT_FIELDS if name in record
+                },
+                example_message=record.get("error_message", ""),
+                first_seen=timestamp,
+                last_seen=timestamp,
+            )
+            self._groups[key_tuple] = group
+        group.count += 1
+        group.last_seen = timestamp
+
+        if not first_in_window and self._rng() >= self._sample_rate:
+            return False
+        if not self._take_write_token():
+            self._suppressed += 1
+            return False
+        if len(group.sample_request_ids) < self._max_sample_request_ids:
+            group.sample_request_ids.append(record["request_id"])
+        return True
+
+    def _take_write_token(self) -> bool:
+        now = time.monotonic()
+        self._write_tokens = min(
+            self._max_writes_per_second,
+            self._write_tokens
+            + (now - self._tokens_updated_at) * self._max_writes_per_second,
+        )
+        self._tokens_updated_at = now
+        if self._write_tokens < 1:
+            return False
+        self._write_tokens -= 1
+        return True
+
+    def drain(self) -> tuple[list[dict[str, Any]], int]:
+        """The current window's group documents, and how many full
+        documents were skipped for the write budget; starts a new window."""
+        window_start = self._window_start
+        window_end = self._window_start = datetime.now(timezone.utc)
+        documents = [
+            {
+                **group.key,
+                **group.context,
+                "example_message": group.example_message,
+                "count": group.count,
+                "first_seen": group.first_seen,
+                "last_seen": group.last_seen,
+                "window_start": window_start,
+                "window_end": window_end,
+                "sample_request_ids": group.sample_request_ids,
+            }
+            for group in self._groups.values()
+        ]
+        self._groups = {}
+        suppressed, self._suppressed = self._suppressed, 0
+        return documents, suppressed
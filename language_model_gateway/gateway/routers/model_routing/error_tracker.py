@@ -2,14 +2,27 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
 from datetime import datetime, timezone
 from typing import Any
 
+from .error_aggregator import ErrorAggregator
+from .mongo_client_provider import MongoClientProvider
+from .record_spool import RecordSpool
+
+
 logger = logging.getLogger(__name__)
 
 _ERROR_MESSAGE_LIMIT = 1000
 
+# MongoDB's duplicate key error: a replayed record that was already written.
+_DUPLICATE_KEY_ERROR = 11000
+# With a spool, a failed connect is retried after this long instead of
+# disabling tracking for the life of the worker.
+_CONNECT_RETRY_SECONDS = 30.0
+
 
 class ErrorTracker:
     """Tracks and records upstream request failures to MongoDB for model routing.
@@ -17,6 +30,14 @@ class ErrorTracker:
     Sibling of UsageTracker, same lazy-connect/fire-and-forget/never-raise
     posture — a failure to write an error record must never mask or replace
     the original error being recorded.
+
+    With a `spool`, records MongoDB doesn't take (write failed, or took
+    longer than `write_timeout_seconds`) are spooled and replayed later, as
+    in UsageTracker.
+
+    With an `aggregator`, failures are also counted into per-window groups
+    written to `group_collection_name`, and only a sample of them get a
+    full document of their own (see error_aggregator.py).
     """
 
     def __init__(
@@ -25,41 +46,78 @@ class ErrorTracker:
         db_name: str = "llm_storage",
         collection_name: str = "errors",
         enabled: bool = True,
+        client_provider: MongoClientProvider | None = None,
+        spool: RecordSpool | None = None,
+        write_timeout_seconds: float | None = None,
+        aggregator: ErrorAggregator | None = None,
+        group_collection_name: str = "error_groups",
     ) -> None:
         self._mongo_uri = mongo_uri
         self._db_name = db_name
         self._collection_name = collection_name
         self._enabled = enabled
+        self._client_provider = client_provider
         self._client: Any | None = None
         self._db: Any | None = None
         self._collection: Any | None = None
+        self._spool = spool
+        self._write_timeout_seconds = write_timeout_seconds
+        self._connect_retry_at = 0.0
+        self._aggregator = aggregator
+        self._group_collection_name = group_collection_name
+        self._group_collection: Any | None = None
+        self._group_flush_task: asyncio.Task[None] | None = None
+        # The loop's current flush_groups() write, shielded from the loop's
+        # cancellation so close() can wait for it instead of losing the
+        # groups it has already drained.
+        self._group_write_task: asyncio.Task[None] | None = None
+
+    def _report_mongo_failure(self, error: BaseException) -> None:
+        if self._client_provider is not None:
+            self._client_provider.report_failure("error_tracker", error)
+
+    def _report_mongo_success(self) -> None:
+        if self._client_provider is not None:
+            self._client_provider.report_success()
 
     async def _ensure_connected(self) -> None:
         """Ensure MongoDB connection is established."""
         if not self._enabled or self._collection is not None:
             return
+        if time.monotonic() < self._connect_retry_at:
+            return
 
         try:
-            # Deferred import: skip pymongo's import cost when this feature
-            # is disabled (no mongo_uri configured), since _ensure_connected
-            # is then never called.
-            from pymongo import AsyncMongoClient
-
-            self._client = AsyncMongoClient(self._mongo_uri)
+            self._client = MongoClientProvider.client_for(
+                self._client_provider, self._mongo_uri
+            )
             self._db = self._client[self._db_name]
             self._collection = self._db[self._collection_name]
+            self._group_collection = self._db[self._group_collection_name]
             logger.info(
                 "[error_tracker] Connected to MongoDB: %s.%s",
                 self._db_name,
                 self._collection_name,
             )
         except Exception as e:
+            if self._spool is not None:
+                logger.warning(
+                    "[error_tracker] Failed to connect to MongoDB: %s. "
+                    "Spooling error records; retrying in %.0fs.",
+                    e,
+                    _CONNECT_RETRY_SECONDS,
+                )
+                self._connect_retry_at = time.monotonic() + _CONNECT_RETRY_SECONDS
+                return
             logger.warning(
                 "[error_tracker] Failed to connect to MongoDB: %s. "
                 "Error tracking will be disabled.",
                 e,
             )
             self._enabled = False
+            return
+        if self._spool is not None and self._spool.has_pending():
+            self._spool.schedule_replay(self._replay)
 
     async def record_error(
         self,
@@ -97,7 +155,7 @@ class ErrorTracker:
         """
         await self._ensure_connected()
 
-        if self._collection is None:
+        if self._collection is None and (self._spool is None or not self._enabled):
             return
 
         end_time = datetime.now(timezone.utc)
@@ -138,17 +196,164 @@ class ErrorTracker:
         if response_headers:
             error_record["response_headers"] = response_headers
 
+        if self._aggregator is not None:
+            write_record = self._aggregator.observe(error_record)
+            if self._group_flush_task is None or self._group_flush_task.done():
+                self._group_flush_task = asyncio.create_task(self._group_flush_loop())
+            if not write_record:
+                return
+
+        if self._spool is not None:
+            # Up front, so a replay of a write that did land is a duplicate.
+            from bson import ObjectId
+
+            error_record["_id"] = ObjectId()
+            if self._collection is None:
+                self._spool_record(error_record)
+                return
+        if self._collection is None:
+            return
+
         try:
-            await self._collection.insert_one(error_record)
+            if self._write_timeout_seconds is None:
+                await self._collection.insert_one(error_record)
+            else:
+                await asyncio.wait_for(
+                    self._collection.insert_one(error_record),
+                    timeout=self._write_timeout_seconds,
+                )
         except Exception as e:
+            self._report_mongo_failure(e)
             logger.warning(
                 "[error_tracker] Failed to record error: %s",
                 e,
                 exc_info=True,
             )
+            if self._spool is not None:
+                self._spool_record(error_record)
+        else:
+            self._report_mongo_success()
+
+    def _spool_record(
+        self, error_record: dict[str, Any], *, group: bool = False
+    ) -> None:
+        entry: dict[str, Any] = {"record": error_record}
+        if group:
+            entry["group"] = True
+        if self._spool is not None and self._spool.append([entry]):
+            self._spool.schedule_replay(self._replay)
+
+    async def _group_flush_loop(self) -> None:
+        """Write the error groups once per aggregation window; exits once a
+        window passes with no failures (the next failure restarts it)."""
+        if self._aggregator is None:
+            return
+        while self._aggregator.has_groups:
+            await asyncio.sleep(self._aggregator.window_seconds)
+            self._group_write_task = asyncio.create_task(self.flush_groups())
+            await asyncio.shield(self._group_write_task)
+
+    async def flush_groups(self) -> None:
+        """Write the current window's error groups, one document each."""
+        if self._aggregator is None:
+            return
+        groups, suppressed = self._aggregator.drain()
+        if suppressed:
+            logger.info(
+                "[error_tracker] Skipped %d error records over the write budget "
+                "(counted in their error groups)",
+                suppressed,
+            )
+        if not groups:
+            return
+        if self._spool is not None:
+            from bson import ObjectId
+
+            for group in groups:
+                group["_id"] = ObjectId()
+        if self._group_collection is None:
+            for group in groups:
+                self._spool_record(group, group=True)
+            return
+        try:
+            if self._write_timeout_seconds is None:
+                await self._group_collection.insert_many(groups, ordered=False)
+            else:
+                await asyncio.wait_for(
+                    self._group_collection.insert_many(groups, ordered=False),
+                    timeout=self._write_timeout_seconds,
+                )
+        except Exception as e:
+            self._report_mongo_failure(e)
+            logger.warning(
+                "[error_tracker] Failed to record %d error groups: %s",
+                len(groups),
+                e,
+                exc_info=True,
+            )
+            for group in groups:
+                self._spool_record(group, group=True)
+        else:
+            self._report_mongo_success()
+
+    async def _replay(self, entries: list[dict[str, Any]]) -> bool:
+        """Insert a batch of spooled error records (see RecordSpool); False
+        while MongoDB is still unavailable."""
+        await self._ensure_connected()
+        if self._collection is None:
+            return False
+        from pymongo.errors import BulkWriteError
+
+        for collection, records in (
+            (
+                self._collection,
+                [entry["record"] for entry in entries if not entry.get("group")],
+            ),
+            (
+                self._group_collection,
+                [entry["record"] for entry in entries if entry.get("group")],
+            ),
+        ):
+            if not records:
+                continue
+            if collection is None:
+                return False
+            try:
+                await collection.insert_many(records, ordered=False)
+            except BulkWriteError as e:
+                rejected = sum(
+                    error.get("code") != _DUPLICATE_KEY_ERROR
+                    for error in e.details.get("writeErrors", [])
+                )
+                if rejected:
+                    logger.warning(
+                        "[error_tracker] Failed to replay %d of %d error records: %s",
+                        rejected,
+                        len(records),
+                        e,
+                    )
+            except Exception as e:
+                self._report_mongo_failure(e)
+                return False
+        self._report_mongo_success()
+        return True
 
     async def close(self) -> None:
-        """Close MongoDB connection."""
-        if self._client is not None:
+        """Write any pending error groups, then close the spool and the
+        MongoDB connection (unless it's the shared one, which is closed by
+        its MongoClientProvider)."""
+        if self._group_flush_task is not None and not self._group_flush_task.done():
+            self._group_flush_task.cancel()
+            try:
+                await self._group_flush_task
+            except asyncio.CancelledError:
+                logger.debug("[error_tracker] Group flush task cancelled")
+        if self._group_write_task is not None:
+            # Cancelling the loop doesn't stop a write it had started.
+            await self._group_write_task
+        await self.flush_groups()
+        if self._spool is not None:
+            await self._spool.close()
+        if self._client is not None and self._client_provider is None:
             await self._client.close()
             logger.info("[error_tracker] MongoDB connection closed")
@@ -0,0 +1,84 @@
+"""
+Failover and hedging across a route's candidates (see
+route_config._route_candidates): the route itself, its `alternates`, then its
+`fallback_model` route.
+
+Every dispatch path takes a `failover` flag, set while a later candidate
+remains. With it set, a throttle, transient stream error, 5xx or transport
+failure raises FailoverRequested straight away — after feeding the dispatch
+scheduler and circuit breaker as usual — instead of sitting through the
+throttle backoff, and the router moves on to the next candidate. The last
+candidate retries as before.
+
+Hedging is for non-streaming requests on routes with `hedge_after_ms`: if
+the first candidate hasn't answered within the route's recent latency
+percentile (HedgeLatencyTracker), the next candidate is sent the same
+request and whichever answers first is returned. The other one is left to
+finish, so its usage is recorded — the backend bills it either way.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import Any
+
+from .constants import (
+    _HEDGE_DEFAULT_PERCENTILE,
+    _HEDGE_LATENCY_WINDOW,
+    _HEDGE_MIN_SAMPLES,
+)
+
+
+class FailoverRequested(Exception):
+    """A dispatch gave up on its candidate so the next one can be tried."""
+
+    def __init__(self, reason: str, *, status_code: int | None = None) -> None:
+        super().__init__(reason)
+        self.reason = reason
+        self.status_code = status_code
+
+
+def _route_label(route: dict[str, Any]) -> str:
+    """Short, stable name for a candidate in logs and usage records."""
+    if route["auth"] == "aws":
+        return f"{route.get('aws_region', 'us-east-1')}/{route['model']}"
+    return str(route["url"])
+
+
+class HedgeLatencyTracker:
+    """Recent non-streaming latencies per candidate, for hedge delays.
+
+    Only touched from the event loop.
+    """
+
+    def __init__(
+        self,
+        *,
+        window: int = _HEDGE_LATENCY_WINDOW,
+        min_samples: int = _HEDGE_MIN_SAMPLES,
+    ) -> None:
+        self._window = window
+        self._min_samples = min_samples
+        self._samples: dict[str, deque[float]] = {}
+
+    def observe(self, route: dict[str, Any], seconds: float) -> None:
+        label = _route_label(route)
+        samples = self._samples.get(label)
+        if samples is None:
+            samples = self._samples[label] = deque(maxlen=self._window)
+        samples.append(seconds)
+
+    def delay_s(self, route: dict[str, Any]) -> float | None:
+        """How long to wait for `route` before hedging, or None if the
+        route isn't hedged."""
+        after_ms = route.get("hedge_after_ms")
+        if after_ms is None:
+            return None
+        samples = self._samples.get(_route_label(route))
+        if samples is None or len(samples) < self._min_samples:
+            return float(after_ms) / 1000
+        percentile = float(route.get("hedge_percentile", _HEDGE_DEFAULT_PERCENTILE))
+        ordered = sorted(samples)
+        rank = max(1, math.ceil(percentile / 100 * len(ordered)))
+        return ordered[min(rank, len(ordered)) - 1]
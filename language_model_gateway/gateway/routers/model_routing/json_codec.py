@@ -0,0 +1,62 @@
+"""
+JSON encode/decode for request bodies on the CodingModelRouter hot path.
+
+Claude Code bodies routinely run to several MB (150k+ token histories), and
+every `/v1/messages` request is parsed once and re-serialized once on its way
+upstream. orjson does both several times faster than the stdlib and is
+already installed as a transitive dependency; when it isn't available (or
+rejects a payload the stdlib accepts) these fall back to `json`, so behavior
+never depends on which backend is in use.
+
+Only for bodies whose bytes are forwarded or parsed — character-count token
+*estimates* keep using `json.dumps`, since their chars-per-token ratios were
+calibrated against its (spaced, ASCII-escaped) output.
+"""
+
+from __future__ import annotations
+
+import json
+from types import ModuleType
+from typing import Any
+
+_orjson: ModuleType | None
+try:
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - orjson ships with the locked deps
+    _orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers only
+# ever need to catch this one.
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data: bytes | str) -> Any:
+    """Parse a JSON document.
+
+    orjson is stricter than the stdlib about a few inputs clients do send —
+    lone UTF-16 surrogate escapes (e.g. an emoji split mid-way by a truncated
+    tool output) and NaN/Infinity literals — so a document it rejects is
+    re-parsed with `json.loads` before being reported as invalid.
+    """
+    if _orjson is not None:
+        try:
+            return _orjson.loads(data)
+        except _orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes, ready to send upstream.
+
+    Falls back to the stdlib for values orjson refuses (integers beyond 64
+    bits, lone surrogates, non-string dict keys) rather than failing the
+    request.
+    """
+    if _orjson is not None:
+        try:
+            encoded: bytes = _orjson.dumps(obj)
+            return encoded
+        except TypeError:
+            pass
+    return json.dumps(obj, separators=(",", ":")).encode()
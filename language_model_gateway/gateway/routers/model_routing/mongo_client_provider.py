@@ -0,0 +1,142 @@
+"""
+One shared AsyncMongoClient per worker for model-routing persistence.
+
+UsageTracker, ErrorTracker, AccountDirectory and SessionSavingsReader each
+used to build their own AsyncMongoClient on first use — four connection
+pools, four sets of monitor threads and four server-discovery handshakes
+per worker. They now take their client from this provider, which is
+registered as a container singleton, connected from the FastAPI lifespan
+before the worker serves traffic, and closed on shutdown.
+
+The provider also keeps the shared health state: components report
+operation failures and successes here, so a MongoDB outage is logged once
+on the way down and once on recovery instead of once per component per
+request.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from language_model_gateway.gateway.utilities.logger.log_levels import SRC_LOG_LEVELS
+
+logger = logging.getLogger(__name__)
+logger.setLevel(SRC_LOG_LEVELS.get("LLM", logging.INFO))
+
+
+class MongoClientProvider:
+    """Lazily built, shared AsyncMongoClient for the model router.
+
+    `mongo_uri=None` means model-routing persistence isn't configured;
+    get_client() then returns None and every consumer stays disabled.
+    """
+
+    def __init__(
+        self,
+        mongo_uri: str | None,
+        *,
+        max_pool_size: int = 20,
+        min_pool_size: int = 0,
+        server_selection_timeout_ms: int = 5000,
+    ) -> None:
+        self._mongo_uri = mongo_uri
+        self._max_pool_size = max_pool_size
+        self._min_pool_size = min_pool_size
+        self._server_selection_timeout_ms = server_selection_timeout_ms
+        self._client: Any | None = None
+        # None until the first connect()/report_*: health not yet known.
+        self._healthy: bool | None = None
+
+    @property
+    def mongo_uri(self) -> str | None:
+        return self._mongo_uri
+
+    @property
+    def healthy(self) -> bool | None:
+        """Last known MongoDB health as seen by any consumer."""
+        return self._healthy
+
+    def get_client(self) -> Any | None:
+        """The shared client, built on first call; None if not configured.
+
+        Building an AsyncMongoClient doesn't connect — that happens in the
+        background (or in connect()) — so this is safe to call on the
+        request path.
+        """
+        if self._client is None and self._mongo_uri:
+            # Deferred import: skip pymongo's import cost when model-routing
+            # persistence isn't configured.
+            from pymongo import AsyncMongoClient
+
+            self._client = AsyncMongoClient(
+                self._mongo_uri,
+                maxPoolSize=self._max_pool_size,
+                minPoolSize=self._min_pool_size,
+                serverSelectionTimeoutMS=self._server_selection_timeout_ms,
+            )
+        return self._client
+
+    @staticmethod
+    def client_for(provider: MongoClientProvider | None, mongo_uri: str) -> Any:
+        """The client a persistence component should use: `provider`'s shared
+        one when it has a provider, otherwise a new AsyncMongoClient that the
+        component builds and owns (and closes).
+
+        Raises RuntimeError if `provider` has no client configured.
+        """
+        if provider is not None:
+            client = provider.get_client()
+            if client is None:
+                raise RuntimeError("no shared MongoDB client configured")
+            return client
+        # Deferred import: skip pymongo's import cost when model-routing
+        # persistence isn't configured, since no component then connects.
+        from pymongo import AsyncMongoClient
+
+        return AsyncMongoClient(mongo_uri)
+
+    async def connect(self) -> bool:
+        """Connect and ping now, rather than on the first request.
+
+        Never raises: a MongoDB that's down at startup must not stop the
+        worker from serving — consumers just skip their writes until it's
+        back.
+        """
+        try:
+            client = self.get_client()
+            if client is None:
+                return False
+            await client.aconnect()
+            await client.admin.command("ping")
+        except Exception as e:
+            self.report_failure("startup", e)
+            return False
+        self.report_success()
+        logger.info(
+            "[mongo_client_provider] Connected to MongoDB (pool %d-%d)",
+            self._min_pool_size,
+            self._max_pool_size,
+        )
+        return True
+
+    def report_failure(self, component: str, error: BaseException) -> None:
+        """Record a failed MongoDB operation; logs only the transition."""
+        if self._healthy is not False:
+            logger.warning(
+                "[mongo_client_provider] MongoDB unavailable (seen by %s): %s",
+                component,
+                error,
+            )
+        self._healthy = False
+
+    def report_success(self) -> None:
+        if self._healthy is False:
+            logger.info("[mongo_client_provider] MongoDB available again")
+        self._healthy = True
+
+    async def aclose(self) -> None:
+        client, self._client = self._client, None
+        if client is not None:
+            await client.close()
+            logger.info("[mongo_client_provider] MongoDB connection closed")
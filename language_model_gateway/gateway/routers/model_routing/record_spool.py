@@ -0,0 +1,302 @@
+"""
+Local write-ahead spool for model-routing records MongoDB didn't take.
+
+When a usage or error write fails or times out, UsageTracker and
+ErrorTracker append the records here instead of dropping them, and a
+background replayer bulk-loads them once MongoDB is reachable again. The
+request path never waits on either: appends are buffered writes to the
+page cache, and the fsync that makes them durable is batched (at most one
+per `fsync_interval_seconds`) and run off the event loop.
+
+Format: one JSON object per line in `{directory}/{name}-{pid}.jsonl`, with
+datetimes and ObjectIds tagged (`{"$date": ...}`, `{"$oid": ...}`) so they
+round-trip. Each worker appends only to its own file and holds an exclusive
+flock on it; a file whose lock can be taken belongs to a worker that has
+exited, so any worker may replay it. To replay its own file a worker first
+renames it to a `.replay` segment and starts a fresh one.
+
+Replay is at-least-once: a segment is deleted only after every batch in it
+was written, and a segment interrupted by another outage is replayed from
+the start. Callers give every record an `_id` before spooling it, so a
+re-inserted record fails as a duplicate key instead of being counted twice.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import fcntl
+import glob
+import json
+import logging
+import os
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+from typing import IO, Any
+
+from opentelemetry import metrics
+
+logger = logging.getLogger(__name__)
+
+_meter = metrics.get_meter(__name__)
+_spool_records_counter = _meter.create_counter(
+    "model_routing.spool.records",
+    description="Records appended to / replayed from the local spool, by spool",
+)
+
+
+def _encode_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$date": value.isoformat()}
+    if type(value).__name__ == "ObjectId":
+        return {"$oid": str(value)}
+    raise TypeError(f"{type(value).__name__} is not spoolable")
+
+
+def _decode_object(obj: dict[str, Any]) -> Any:
+    if len(obj) == 1:
+        if "$date" in obj:
+            return datetime.fromisoformat(obj["$date"])
+        if "$oid" in obj:
+            from bson import ObjectId
+
+            return ObjectId(obj["$oid"])
+    return obj
+
+
+def encode_entry(entry: dict[str, Any]) -> bytes:
+    return (
+        json.dumps(entry, default=_encode_default, separators=(",", ":")).encode()
+        + b"\n"
+    )
+
+
+def decode_entry(line: bytes) -> dict[str, Any]:
+    entry: dict[str, Any] = json.loads(line, object_hook=_decode_object)
+    return entry
+
+
+class RecordSpool:
+    """Append-only JSONL spool with batched fsync and a background replayer.
+
+    `write` (see schedule_replay) gets each batch of replayed entries and
+    returns False when MongoDB is still unavailable, which stops the replay
+    until the next attempt. Only touched from the event loop.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        name: str,
+        *,
+        fsync_interval_seconds: float = 0.2,
+        replay_interval_seconds: float = 5.0,
+        replay_batch_size: int = 500,
+        max_bytes: int = 1 << 30,
+    ) -> None:
+        self._directory = directory
+        self._name = name
+        self._fsync_interval_seconds = fsync_interval_seconds
+        self._replay_interval_seconds = replay_interval_seconds
+        self._replay_batch_size = max(1, replay_batch_size)
+        self._max_bytes = max_bytes
+        self._path = os.path.join(directory, f"{name}-{os.getpid()}.jsonl")
+        self._file: IO[bytes] | None = None
+        self._bytes = 0
+        self._sync_task: asyncio.Task[None] | None = None
+        self._replay_task: asyncio.Task[None] | None = None
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def _open(self) -> IO[bytes]:
+        if self._file is None:
+            os.makedirs(self._directory, exist_ok=True)
+            file = open(self._path, "ab")
+            # Held until close: tells other workers this file is live.
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            self._file = file
+            self._bytes = file.tell()
+        return self._file
+
+    def append(self, entries: list[dict[str, Any]]) -> bool:
+        """Append entries; False (nothing written) if the spool is full or
+        can't be written."""
+        if not entries:
+            return True
+        data = b"".join(encode_entry(entry) for entry in entries)
+        try:
+            file = self._open()
+            if self._bytes + len(data) > self._max_bytes:
+                logger.warning(
+                    "[record_spool] %s spool is full (%d bytes); not spooling "
+                    "%d records",
+                    self._name,
+                    self._bytes,
+                    len(entries),
+                )
+                return False
+            file.write(data)
+            # To the OS now, so a worker crash loses nothing; to disk with
+            # the next batched fsync.
+            file.flush()
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(
+                "[record_spool] Failed to spool %d %s records: %s",
+                len(entries),
+                self._name,
+                e,
+            )
+            return False
+        self._bytes += len(data)
+        _spool_records_counter.add(
+            len(entries), {"spool": self._name, "direction": "spooled"}
+        )
+        if self._sync_task is None or self._sync_task.done():
+            self._sync_task = asyncio.create_task(self._sync_soon())
+        return True
+
+    async def _sync_soon(self) -> None:
+        await asyncio.sleep(self._fsync_interval_seconds)
+        await self._sync()
+
+    async def _sync(self) -> None:
+        if self._file is not None:
+            await asyncio.to_thread(os.fsync, self._file.fileno())
+
+    def has_pending(self) -> bool:
+        """Whether this worker's file or any other segment holds records."""
+        if self._bytes:
+            return True
+        return any(path != self._path for path in self._segment_paths())
+
+    def _segment_paths(self) -> list[str]:
+        pattern = os.path.join(self._directory, f"{self._name}-*")
+        return sorted(
+            path for path in glob.glob(pattern) if path.endswith((".jsonl", ".replay"))
+        )
+
+    async def _rotate(self) -> None:
+        """Move this worker's records into a `.replay` segment."""
+        if self._file is None or not self._bytes:
+            return
+        if self._sync_task is not None and not self._sync_task.done():
+            await self._sync_task
+        await self._sync()
+        file, self._file = self._file, None
+        self._bytes = 0
+        segment = os.path.join(
+            self._directory, f"{self._name}-{os.getpid()}-{time.time_ns()}.replay"
+        )
+        os.rename(self._path, segment)
+        file.close()
+
+    def schedule_replay(
+        self, write: Callable[[list[dict[str, Any]]], Awaitable[bool]]
+    ) -> None:
+        """Start the background replayer unless it's already running; it
+        exits once the spool is empty."""
+        if self._replay_task is None or self._replay_task.done():
+            self._replay_task = asyncio.create_task(self._replay_loop(write))
+
+    async def _replay_loop(
+        self, write: Callable[[list[dict[str, Any]]], Awaitable[bool]]
+    ) -> None:
+        while True:
+            await asyncio.sleep(self._replay_interval_seconds)
+            try:
+                if await self.replay(write):
+                    return
+            except Exception as e:
+                logger.warning(
+                    "[record_spool] Replaying the %s spool failed: %s",
+                    self._name,
+                    e,
+                    exc_info=True,
+                )
+
+    async def replay(
+        self, write: Callable[[list[dict[str, Any]]], Awaitable[bool]]
+    ) -> bool:
+        """Replay every segment this worker can claim (its own records and
+        exited workers'); False if `write` reported MongoDB still
+        unavailable, or records were spooled meanwhile."""
+        await self._rotate()
+        for path in self._segment_paths():
+            if path == self._path:
+                continue
+            if not await self._replay_segment(path, write):
+                return False
+        return self._bytes == 0
+
+    async def _replay_segment(
+        self,
+        path: str,
+        write: Callable[[list[dict[str, Any]]], Awaitable[bool]],
+    ) -> bool:
+        try:
+            file = open(path, "rb")
+        except FileNotFoundError:
+            return True
+        with file:
+            try:
+                fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                # A live worker's file, or another worker is replaying it.
+                return True
+            if os.fstat(file.fileno()).st_nlink == 0:
+                # Finished and deleted by another worker while we waited.
+                return True
+            replayed = 0
+            while batch := await asyncio.to_thread(self._read_batch, file, path):
+                if not await write(batch):
+                    logger.info(
+                        "[record_spool] MongoDB still unavailable; %s kept for "
+                        "the next replay",
+                        path,
+                    )
+                    return False
+                replayed += len(batch)
+            os.unlink(path)
+        _spool_records_counter.add(
+            replayed, {"spool": self._name, "direction": "replayed"}
+        )
+        logger.info(
+            "[record_spool] Replayed %d %s records from %s", replayed, self._name, path
+        )
+        return True
+
+    def _read_batch(self, file: IO[bytes], path: str) -> list[dict[str, Any]]:
+        batch: list[dict[str, Any]] = []
+        while len(batch) < self._replay_batch_size:
+            line = file.readline()
+            if not line:
+                break
+            try:
+                batch.append(decode_entry(line))
+            except ValueError:
+                # A torn final line from a crash mid-append.
+                logger.warning("[record_spool] Skipping unreadable line in %s", path)
+        return batch
+
+    async def close(self) -> None:
+        """Stop the replayer and fsync/close this worker's file. Unreplayed
+        records stay on disk for the next worker to replay."""
+        if self._replay_task is not None and not self._replay_task.done():
+            self._replay_task.cancel()
+            try:
+                await self._replay_task
+            except asyncio.CancelledError:
+                logger.debug("[record_spool] %s replayer cancelled", self._name)
+        if self._sync_task is not None and not self._sync_task.done():
+            await self._sync_task
+        file, self._file = self._file, None
+        if file is None:
+            return
+        await asyncio.to_thread(os.fsync, file.fileno())
+        empty = self._bytes == 0
+        self._bytes = 0
+        if empty:
+            os.unlink(self._path)
+        file.close()
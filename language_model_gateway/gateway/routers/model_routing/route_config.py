@@ -9,6 +9,9 @@ from typing import Any
 
 from language_model_gateway.gateway.utilities.logger.log_levels import SRC_LOG_LEVELS
 
+from .anthropic_token_counter import count_tokens_cache
+from .constants import _ROUTE_MATCH_CACHE_MAX_ENTRIES
+
 logger = logging.getLogger(__name__)
 logger.setLevel(SRC_LOG_LEVELS.get("LLM", logging.INFO))
 
@@ -20,11 +23,16 @@ _CONFIG_PATH = Path(
 )
 
 
+def _read_config(path: Path) -> dict[str, Any]:
+    """Parse the config at `path`; raises OSError or ValueError."""
+    with open(path) as f:
+        result: dict[str, Any] = json.load(f)
+        return result
+
+
 def _load_config() -> dict[str, Any]:
     try:
-        with open(_CONFIG_PATH) as f:
-            result: dict[str, Any] = json.load(f)
-            return result
+        return _read_config(_CONFIG_PATH)
     except FileNotFoundError:
         logger.warning(
             "[coding-model-router] config not found at %s — no routes configured; "
@@ -60,28 +68,142 @@ def _build_routes(
     return routes, patterns
 
 
-# Note: Config loaded at module import time and cached globally.
-# In production, containers are restarted when config changes via volume mounts.
-# For runtime config reload, call _reload_routes() to refresh _ROUTES from disk.
+# Note: Config loaded at module import time and cached globally. A running
+# worker picks up changes to the file through RouteConfigWatcher (see
+# route_config_watcher.py); _reload_routes() refreshes it from disk on demand.
 _CONFIG: dict[str, Any] = _load_config()
 _ROUTES: dict[str, dict[str, Any]]
 _PATTERNS: list[tuple[re.Pattern[str], dict[str, Any]]]
 _ROUTES, _PATTERNS = _build_routes(_CONFIG)
 
+# Memoized pattern lookups: the _PATTERNS list they were matched against, and
+# model id → route (or None). Starts over whenever _PATTERNS is replaced, so
+# a reload never serves a match from the previous config.
+_PATTERN_MATCHES: tuple[
+    list[tuple[re.Pattern[str], dict[str, Any]]], dict[str, dict[str, Any] | None]
+] = (_PATTERNS, {})
+
 
 def _find_route(model: str) -> dict[str, Any] | None:
-    """Exact match first (fast path), then the first matching tier pattern."""
+    """Exact match first (fast path), then the first matching tier pattern.
+
+    Pattern results are remembered per model id, so a version-bumped id
+    only scans the patterns on its first request.
+    """
+    global _PATTERN_MATCHES
     if route := _ROUTES.get(model):
         return route
-    for pattern, route in _PATTERNS:
-        if pattern.search(model):
-            return route
-    return None
+    patterns, matches = _PATTERN_MATCHES
+    if patterns is not _PATTERNS:
+        patterns, matches = _PATTERN_MATCHES = (_PATTERNS, {})
+    try:
+        return matches[model]
+    except KeyError:
+        pass
+    match = next((route for pattern, route in patterns if pattern.search(model)), None)
+    if len(matches) >= _ROUTE_MATCH_CACHE_MAX_ENTRIES:
+        matches.clear()
+    matches[model] = match
+    return match
+
+
+# Keys that describe how to pick between candidates, not a candidate itself.
+_CANDIDATE_ONLY_KEYS = frozenset({"alternates", "fallback_model", "hedge_after_ms"})
+
+
+def _route_candidates(route: dict[str, Any]) -> list[dict[str, Any]]:
+    """`route`, then each of its `alternates`, then its `fallback_model`
+    route — the order the router tries them in.
+
+    An alternate is a partial route merged over this one, e.g.
+    `{"aws_region": "us-west-2", "url": "..."}` for the same model in
+    another region or `{"bedrock_transport": "native"}`. A route without
+    either key is its own only candidate.
+    """
+    alternates = route.get("alternates") or []
+    fallback_model = route.get("fallback_model")
+    if not alternates and not fallback_model:
+        return [route]
+    candidates = [route, *_alternate_routes(route)]
+    if fallback_model:
+        fallback_route = _find_route(fallback_model)
+        if fallback_route is None or fallback_route is route:
+            logger.warning(
+                "[coding-model-router] fallback_model '%s' does not resolve to "
+                "another route",
+                fallback_model,
+            )
+        else:
+            candidates.append(fallback_route)
+    return candidates
+
+
+def _alternate_routes(route: dict[str, Any]) -> list[dict[str, Any]]:
+    """`route`'s `alternates`, each merged over the route itself."""
+    alternates = route.get("alternates") or []
+    if not alternates:
+        return []
+    base = {k: v for k, v in route.items() if k not in _CANDIDATE_ONLY_KEYS}
+    merged: list[dict[str, Any]] = []
+    for alternate in alternates:
+        if isinstance(alternate, dict):
+            merged.append({**base, **alternate})
+        else:
+            logger.warning(
+                "[coding-model-router] ignoring alternate %r of route '%s' — "
+                "alternates must be objects",
+                alternate,
+                route.get("claude_model"),
+            )
+    return merged
+
+
+def _config_backends(config: dict[str, Any] | None = None) -> list[dict[str, Any]]:
+    """Every route in `config` (the live config by default) plus each of its
+    alternates — everything a request can be dispatched to, e.g. for
+    pre-warming upstream clients."""
+    backends: list[dict[str, Any]] = []
+    for route in (_CONFIG if config is None else config).get("routes", []):
+        backends.append(route)
+        backends.extend(_alternate_routes(route))
+    return backends
+
+
+def _swap_config(
+    config: dict[str, Any],
+    routes: dict[str, dict[str, Any]],
+    patterns: list[tuple[re.Pattern[str], dict[str, Any]]],
+) -> None:
+    """Make `config` (already built into `routes`/`patterns`) the live one.
+
+    The globals are rebound together with nothing in between that could
+    yield to the event loop, so a request sees either the old config or the
+    new one, never a mix of both. Route dicts are never mutated: requests
+    already in flight keep the route they resolved.
+
+    Cached count_tokens results are dropped with the old config: they were
+    counted the way its routes said to (count_tokens, tokenizer_model).
+    """
+    global _CONFIG, _ROUTES, _PATTERNS
+    _CONFIG, _ROUTES, _PATTERNS = config, routes, patterns
+    count_tokens_cache.clear()
 
 
 def _reload_routes() -> dict[str, dict[str, Any]]:
     """Reload routes from disk and return the updated exact-match routes dict."""
-    global _CONFIG, _ROUTES, _PATTERNS
-    _CONFIG = _load_config()
-    _ROUTES, _PATTERNS = _build_routes(_CONFIG)
-    return _ROUTES
+    config = _load_config()
+    routes, patterns = _build_routes(config)
+    _swap_config(config, routes, patterns)
+    return routes
+
+
+def _tokenizer_models(config: dict[str, Any] | None = None) -> list[str]:
+    """Every distinct `tokenizer_model` named by a route of `config` (the
+    live config by default)."""
+    return sorted(
+        {
+            model
+            for route in (_CONFIG if config is None else config).get("routes", [])
+            if (model := route.get("tokenizer_model"))
+        }
+    )
@@ -0,0 +1,139 @@
+"""
+Hot reload of model-router-config.json for CodingModelRouter.
+
+RouteConfigWatcher polls the config file's mtime, size and inode and, when
+they change, parses and builds the new routes off to the side, lets the
+caller pre-warm what they need (tokenizers, upstream clients), and only then
+swaps them in (see route_config._swap_config). A config that doesn't parse
+or build is logged and ignored; the worker keeps serving the routes it has.
+
+Polling rather than inotify: it needs no extra dependency, and it sees the
+symlink swap Kubernetes uses to update a mounted ConfigMap, which a watch on
+the file itself misses.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import re
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+from language_model_gateway.gateway.utilities.logger.log_levels import SRC_LOG_LEVELS
+
+from . import route_config
+
+logger = logging.getLogger(__name__)
+logger.setLevel(SRC_LOG_LEVELS.get("LLM", logging.INFO))
+
+_FileSignature = tuple[int, int, int]
+
+
+class RouteConfigWatcher:
+    """Per-worker poller that swaps in a changed route config.
+
+    `prewarm` is awaited with the new config before it goes live, so the
+    first requests to a new route don't pay for loading its tokenizer or
+    building its clients. Its failures are logged; the config still goes
+    live.
+    """
+
+    def __init__(
+        self,
+        *,
+        path: Path | None = None,
+        interval_seconds: float = 5.0,
+        prewarm: Callable[[dict[str, Any]], Awaitable[None]] | None = None,
+    ) -> None:
+        self._path: Path = path or route_config._CONFIG_PATH
+        self._interval_seconds = interval_seconds
+        self._prewarm = prewarm
+        self._signature: _FileSignature | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    def _stat(self) -> _FileSignature | None:
+        try:
+            st = os.stat(self._path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size, st.st_ino
+
+    def start(self) -> None:
+        """Start polling; the file as it is now counts as already loaded."""
+        if self._task is not None or self._interval_seconds <= 0:
+            return
+        self._signature = self._stat()
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            "[coding-model-router] watching %s for route changes every %.1fs",
+            self._path,
+            self._interval_seconds,
+        )
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            logger.debug("[coding-model-router] route config watcher stopped")
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval_seconds)
+            try:
+                await self.check()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning(
+                    "[coding-model-router] route config reload failed",
+                    exc_info=True,
+                )
+
+    async def check(self) -> bool:
+        """Reload the config if the file changed since the last check.
+        Returns whether a new config went live."""
+        signature = self._stat()
+        # A missing file is usually mid-update; keep the current routes.
+        if signature is None or signature == self._signature:
+            return False
+        self._signature = signature
+        try:
+            config = await asyncio.to_thread(route_config._read_config, self._path)
+            routes, patterns = route_config._build_routes(config)
+        except (
+            OSError,
+            ValueError,
+            AttributeError,
+            KeyError,
+            TypeError,
+            re.error,
+        ) as e:
+            logger.warning(
+                "[coding-model-router] ignoring changed route config %s — %s; "
+                "keeping the current routes",
+                self._path,
+                e,
+            )
+            return False
+        if self._prewarm is not None:
+            try:
+                await self._prewarm(config)
+            except Exception:
+                logger.warning(
+                    "[coding-model-router] pre-warming the new routes failed",
+                    exc_info=True,
+                )
+        route_config._swap_config(config, routes, patterns)
+        logger.info(
+            "[coding-model-router] reloaded %d route(s) from %s",
+            len(routes),
+            self._path,
+        )
+        return True
@@ -21,15 +21,17 @@ Supported wire protocols (route.api_type, default "anthropic"):
 from __future__ import annotations
 
 import asyncio
+import functools
+import hashlib
 import inspect
 import json
 import logging
+import math
 import time
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, AsyncGenerator, Sequence
+from typing import Any, AsyncGenerator, Callable, Coroutine, Sequence
 
-import httpx
 from fastapi import APIRouter
 from fastapi import params
 from opentelemetry import trace
@@ -46,15 +48,28 @@ from starlette.responses import JSONResponse, Response, StreamingResponse
 
 from language_model_gateway.gateway.utilities.logger.log_levels import SRC_LOG_LEVELS
 
-from .aws_auth import SigV4Auth, _bedrock_credential_error_detail, _sign_bedrock
+from .anthropic_token_counter import (
+    count_anthropic_request_tokens,
+    count_tokens_cache,
+)
+from .aws_auth import (
+    _bedrock_credential_error_detail,
+    _sign_bedrock,
+    get_bedrock_signer,
+)
 from .bedrock_client import (
     _is_throttling,
     _is_transient_stream_error,
     _pace_bedrock_dispatch,
+    _record_bedrock_success,
+    _record_bedrock_throttle,
+    _record_bedrock_unavailable,
+    get_bedrock_circuit_breaker,
     _send_with_bedrock_retry,
     _throttle_backoff,
 )
 from .bedrock_converse_client import BedrockRuntimeClientProvider
+from .bedrock_executor import BedrockExecutor
 from .bedrock_native_dispatcher import BedrockNativeDispatcher
 from .constants import (
     _ANTHROPIC_ONLY_HEADERS,
@@ -64,14 +79,20 @@ from .constants import (
     _TOKEN_ESTIMATE_SAFETY_BUFFER,
 )
 from .context_manager import enforce_context_budget
+from .converse_http_client import AsyncConverseClient
+from .failover import FailoverRequested, HedgeLatencyTracker, _route_label
 from .message_translator import (
     _anthropic_content_to_text,
     _anthropic_to_openai_request,
     _estimate_input_tokens,
     _openai_to_anthropic_response,
 )
-from .route_config import _find_route
+from .mongo_client_provider import MongoClientProvider
+from .record_spool import RecordSpool
+from .route_config import _find_route, _route_candidates
+from .session_savings_cache import SessionSavingsCache
 from .tokenizer import count_oai_request_tokens
+from .tokenizer_executor import TokenizerExecutor
 from .stream_converter import (
     _fire_and_forget,
     _msg_id,
@@ -81,12 +102,16 @@ from .stream_converter import (
     _stream_passthrough,
     _stream_passthrough_with_usage_tracking,
 )
+from .stream_flush import StreamFlushPolicy
 from .account_directory import (
     AccountDirectory,
     extract_account_uuid,
     extract_session_id,
 )
+from .error_aggregator import ErrorAggregator
 from .error_tracker import ErrorTracker
+from . import json_codec
+from .upstream_client_pool import UpstreamClientPool
 from .usage_tracker import UsageTracker
 
 logger = logging.getLogger(__name__)
@@ -126,8 +151,18 @@ class CodingModelRouter:
         usage_track_sessions: bool = True,
         usage_capture_previews: bool = False,
         usage_preview_chars: int = 100,
+        usage_rollup_collection_prefix: str | None = None,
         error_collection_name: str = "errors",
+        error_group_collection_name: str = "error_groups",
+        error_aggregation_window_seconds: float = 0.0,
+        error_sample_rate: float = 0.05,
+        error_max_writes_per_second: float = 20.0,
         account_directory_collection_name: str = "account_directory",
+        account_directory_preload: bool = False,
+        account_directory_cache_max_entries: int = 10_000,
+        account_directory_hit_ttl_seconds: float = 3600.0,
+        account_directory_miss_ttl_seconds: float = 300.0,
+        account_directory_refresh_interval_seconds: float = 300.0,
         token_reader: TokenReader | None = None,
         debug_log_received_oauth_tokens: bool = False,
         custom_header_prefix: str = "x-model-routing-",
@@ -137,6 +172,19 @@ class CodingModelRouter:
         bedrock_read_timeout_seconds: float = 60.0,
         bedrock_max_attempts: int = 1,
         bedrock_retry_mode: str = "adaptive",
+        bedrock_native_client: str = "boto3",
+        stream_flush_bytes: int = 0,
+        stream_flush_interval_seconds: float = 0.0,
+        upstream_client_pool: UpstreamClientPool | None = None,
+        tokenizer_executor: TokenizerExecutor | None = None,
+        bedrock_executor: BedrockExecutor | None = None,
+        mongo_client_provider: MongoClientProvider | None = None,
+        session_savings_cache: SessionSavingsCache | None = None,
+        usage_write_batch_size: int = 1,
+        usage_flush_interval_seconds: float = 0.5,
+        usage_max_pending_writes: int = 10_000,
+        spool_directory: str | None = None,
+        mongo_write_timeout_seconds: float | None = None,
     ) -> None:
         self.router = APIRouter(
             prefix=prefix,
@@ -146,7 +194,27 @@ class CodingModelRouter:
         self._token_reader: TokenReader | None = token_reader
         self._custom_header_prefix: str = custom_header_prefix.lower()
         self._bedrock_transport: str = bedrock_transport
+        # The worker-wide breaker the Bedrock dispatch wrappers feed.
+        self._circuit_breaker = get_bedrock_circuit_breaker()
+        self._hedge_latency = HedgeLatencyTracker()
         self._qwen_enable_thinking: bool = qwen_enable_thinking
+        # Routes can override either limit (see StreamFlushPolicy.for_route).
+        self._stream_flush_policy = StreamFlushPolicy(
+            max_bytes=stream_flush_bytes,
+            max_delay_seconds=stream_flush_interval_seconds,
+        )
+        # Shared per worker when injected from the container (closed by the
+        # app lifespan); a private pool otherwise, e.g. in tests.
+        self._upstream_client_pool: UpstreamClientPool = (
+            upstream_client_pool or UpstreamClientPool()
+        )
+        # Same ownership as the pool above: tokenizer calls never run on the
+        # event loop (see TokenizerExecutor).
+        self._tokenizer_executor: TokenizerExecutor = (
+            tokenizer_executor or TokenizerExecutor()
+        )
+        # And for boto3 Bedrock calls, when they're used (see BedrockExecutor).
+        self._bedrock_executor: BedrockExecutor = bedrock_executor or BedrockExecutor()
         self._debug_log_received_oauth_tokens: bool = debug_log_received_oauth_tokens
         if self._debug_log_received_oauth_tokens:
             logger.warning(
@@ -155,10 +223,21 @@ class CodingModelRouter:
                 "bodies will be written to logs. Local development only; never "
                 "enable this in a shared or deployed environment."
             )
+        # Visible response text is only ever persisted as a truncated preview,
+        # so streaming paths never need to keep more of it than this.
+        self._usage_preview_chars: int = (
+            usage_preview_chars if usage_capture_previews else 0
+        )
         self._usage_tracker: UsageTracker | None = None
         self._error_tracker: ErrorTracker | None = None
         self._account_directory: AccountDirectory | None = None
+        self._account_directory_preload: bool = account_directory_preload
         if mongo_uri:
+            # Records MongoDB doesn't take wait here for it to come back.
+            usage_spool = error_spool = None
+            if spool_directory:
+                usage_spool = RecordSpool(spool_directory, "usage")
+                error_spool = RecordSpool(spool_directory, "errors")
             self._usage_tracker = UsageTracker(
                 mongo_uri=mongo_uri,
                 db_name=usage_db_name,
@@ -168,26 +247,67 @@ class CodingModelRouter:
                 track_sessions=usage_track_sessions,
                 capture_previews=usage_capture_previews,
                 preview_chars=usage_preview_chars,
+                write_batch_size=usage_write_batch_size,
+                flush_interval_seconds=usage_flush_interval_seconds,
+                max_pending_writes=usage_max_pending_writes,
+                client_provider=mongo_client_provider,
+                savings_cache=session_savings_cache,
+                rollup_collection_prefix=usage_rollup_collection_prefix,
+                spool=usage_spool,
+                write_timeout_seconds=mongo_write_timeout_seconds,
             )
             self._error_tracker = ErrorTracker(
                 mongo_uri=mongo_uri,
                 db_name=usage_db_name,
                 collection_name=error_collection_name,
                 enabled=True,
+                client_provider=mongo_client_provider,
+                spool=error_spool,
+                write_timeout_seconds=mongo_write_timeout_seconds,
+                # 0 keeps one document per failure.
+                aggregator=(
+                    ErrorAggregator(
+                        window_seconds=error_aggregation_window_seconds,
+                        sample_rate=error_sample_rate,
+                        max_writes_per_second=error_max_writes_per_second,
+                    )
+                    if error_aggregation_window_seconds > 0
+                    else None
+                ),
+                group_collection_name=error_group_collection_name,
             )
             self._account_directory = AccountDirectory(
                 mongo_uri=mongo_uri,
                 db_name=usage_db_name,
                 collection_name=account_directory_collection_name,
                 enabled=True,
+                client_provider=mongo_client_provider,
+                cache_max_entries=account_directory_cache_max_entries,
+                hit_ttl_seconds=account_directory_hit_ttl_seconds,
+                miss_ttl_seconds=account_directory_miss_ttl_seconds,
+                refresh_interval_seconds=account_directory_refresh_interval_seconds,
             )
-        self._bedrock_native_dispatcher = BedrockNativeDispatcher(
-            client_provider=BedrockRuntimeClientProvider(
+        self._bedrock_client_provider = BedrockRuntimeClientProvider(
+            connect_timeout_seconds=bedrock_connect_timeout_seconds,
+            read_timeout_seconds=bedrock_read_timeout_seconds,
+            max_attempts=bedrock_max_attempts,
+            retry_mode=bedrock_retry_mode,
+        )
+        # "httpx" sends native Converse requests from the event loop over the
+        # pooled clients; "boto3" runs them on worker threads.
+        self._converse_client: AsyncConverseClient | None = (
+            AsyncConverseClient(
+                upstream_client_pool=self._upstream_client_pool,
                 connect_timeout_seconds=bedrock_connect_timeout_seconds,
                 read_timeout_seconds=bedrock_read_timeout_seconds,
-                max_attempts=bedrock_max_attempts,
-                retry_mode=bedrock_retry_mode,
-            ),
+            )
+            if bedrock_native_client == "httpx"
+            else None
+        )
+        self._bedrock_native_dispatcher = BedrockNativeDispatcher(
+            client_provider=self._bedrock_client_provider,
+            converse_client=self._converse_client,
+            executor=self._bedrock_executor,
             get_usage_tracker=lambda: self._usage_tracker,
             record_error=self._record_error,
             record_upstream_latency=self._record_upstream_latency,
@@ -195,6 +315,68 @@ class CodingModelRouter:
         )
         self._register_routes()
 
+    async def astart(self) -> None:
+        """Preload the account directory and start keeping it in sync, if
+        enabled; called from the FastAPI lifespan on startup."""
+        if self._account_directory is not None and self._account_directory_preload:
+            await self._account_directory.start()
+
+    async def aclose(self) -> None:
+        """Flush buffered usage records, stop the account directory sync and
+        close their connections and spools; called from the FastAPI
+        lifespan on shutdown."""
+        if self._usage_tracker is not None:
+            await self._usage_tracker.close()
+        if self._error_tracker is not None:
+            await self._error_tracker.close()
+        if self._account_directory is not None:
+            await self._account_directory.close()
+
+    async def prewarm_routes(self, routes: Sequence[dict[str, Any]]) -> None:
+        """Build the upstream clients `routes` dispatch through ahead of
+        their first request — the pooled httpx/openai clients (or the boto3
+        client of native Bedrock routes, off the event loop) and the AWS
+        signing credentials. Called at startup and before a reloaded route
+        config goes live (see RouteConfigWatcher)."""
+        for route in routes:
+            auth = route.get("auth")
+            url = route.get("url")
+            if not auth or not url:
+                continue
+            aws_region = route.get("aws_region", "us-east-1") if auth == "aws" else None
+            bedrock_transport = route.get("bedrock_transport", self._bedrock_transport)
+            try:
+                if route.get("api_type", "anthropic") != "openai":
+                    self._upstream_client_pool.get_client(
+                        url, auth=auth, aws_region=aws_region
+                    )
+                elif auth == "aws" and bedrock_transport == "native":
+                    if self._converse_client is not None:
+                        self._converse_client.prewarm(route)
+                    else:
+                        await asyncio.to_thread(
+                            self._bedrock_client_provider.get_client, route
+                        )
+                        continue
+                else:
+                    self._upstream_client_pool.get_openai_client(
+                        url.removesuffix("/chat/completions"),
+                        auth=auth,
+                        aws_region=aws_region,
+                    )
+                if auth == "aws":
+                    await asyncio.to_thread(get_bedrock_signer(route).signer)
+            except Exception as e:
+                # Missing or expired AWS credentials are common locally, and
+                # the route's own requests report them to the client.
+                detail = _bedrock_credential_error_detail(e)
+                logger.warning(
+                    "[coding-model-router] failed to pre-warm route '%s': %s",
+                    route.get("claude_model"),
+                    detail[1] if detail else e,
+                    exc_info=detail is None,
+                )
+
     def _register_routes(self) -> None:
         self.router.add_api_route(
             "/messages",
@@ -213,6 +395,18 @@ class CodingModelRouter:
             summary="Proxy Anthropic token count endpoint",
             status_code=200,
         )
+        self.router.add_api_route(
+            "/model-routing/circuits",
+            self.get_circuits,
+            methods=["GET"],
+            response_model=None,
+            summary="Bedrock circuit breaker state",
+            description="Per-(region, model) circuit state and health for this worker.",
+            status_code=200,
+        )
+
+    async def get_circuits(self) -> JSONResponse:
+        return JSONResponse({"circuits": self._circuit_breaker.snapshot()})
 
     async def proxy_messages(
         self, request: Request, background_tasks: BackgroundTasks
@@ -225,9 +419,23 @@ class CodingModelRouter:
         # Generate request_id at the start for consistent tracing
         request_id = _msg_id()
 
+        # Claude Code re-counts an unchanged body several times per turn;
+        # answer repeats from the cache before even parsing the body. The
+        # body's model picks the route, so the digest is route-scoped for as
+        # long as the config is; a config reload clears the cache.
+        count_key: tuple[str, bytes] | None = None
+        if request.url.path.endswith("/count_tokens"):
+            count_key = (
+                "count_tokens",
+                hashlib.blake2b(raw_body, digest_size=16).digest(),
+            )
+            cached_count = count_tokens_cache.get(count_key)
+            if cached_count is not None:
+                return JSONResponse({"input_tokens": cached_count})
+
         try:
-            body_json = json.loads(raw_body)
-        except json.JSONDecodeError:
+            body_json = json_codec.loads(raw_body)
+        except json_codec.JSONDecodeError:
             logger.error(
                 "[coding-model-router] invalid JSON body request_id=%s",
                 request_id,
@@ -273,9 +481,92 @@ class CodingModelRouter:
                 "auth": "passthrough",
                 "url": "https://api.anthropic.com/v1/messages",
                 "model": model,
+                # Unconfigured model: let Anthropic answer (or reject the id).
+                "count_tokens": "upstream",
             }
 
+        # ── Candidates: the route, its alternates, its fallback_model route ──
+        async def dispatch(
+            candidate: dict[str, Any],
+            *,
+            fresh_body: bool,
+            failover: bool,
+            routing: dict[str, Any] | None = None,
+            tasks: BackgroundTasks = background_tasks,
+        ) -> StreamingResponse | JSONResponse | Response:
+            response = await self._dispatch_route(
+                route=candidate,
+                model=model,
+                # Every stage after this mutates the body, so a candidate
+                # tried after another gets its own copy.
+                body_json=json_codec.loads(raw_body) if fresh_body else body_json,
+                raw_body=raw_body,
+                req_suffix=req_suffix,
+                request=request,
+                background_tasks=tasks,
+                request_id=request_id,
+                request_start_time=request_start_time,
+                auth_info=(
+                    auth_info if routing is None else {**auth_info, "routing": routing}
+                ),
+                user_id=user_id,
+                prompt_text=prompt_text,
+                accept_encoding=accept_encoding,
+                is_fallback_route=is_fallback_route,
+                count_key=count_key,
+                failover=failover,
+            )
+            # Per candidate: an alternate can tune its own streams.
+            return self._stream_flush_policy.for_route(candidate).apply(
+                response,
+                {
+                    "api_type": candidate.get("api_type", "anthropic"),
+                    "tier": candidate.get("tier", "unknown"),
+                },
+            )
+
+        # /count_tokens is answered locally (or forwarded as-is): never
+        # gated by the circuit breaker, failed over or hedged.
+        if req_suffix == "/count_tokens":
+            return await dispatch(route, fresh_body=False, failover=False)
+        return await self._dispatch_candidates(
+            _route_candidates(route),
+            dispatch,
+            request_id=request_id,
+            auth_info=auth_info,
+            request_start_time=request_start_time,
+            is_streaming=bool(body_json.get("stream")),
+        )
+
+    async def _dispatch_route(
+        self,
+        *,
+        route: dict[str, Any],
+        model: str,
+        body_json: dict[str, Any],
+        raw_body: bytes,
+        req_suffix: str,
+        request: Request,
+        background_tasks: BackgroundTasks,
+        request_id: str,
+        request_start_time: datetime,
+        auth_info: dict[str, Any],
+        user_id: str,
+        prompt_text: str | None,
+        accept_encoding: str | None,
+        is_fallback_route: bool,
+        count_key: tuple[str, bytes] | None,
+        failover: bool = False,
+    ) -> StreamingResponse | JSONResponse | Response:
+        """Send the request to one route candidate.
+
+        With `failover` (a later candidate remains), a throttle, transient
+        error, 5xx or transport failure raises FailoverRequested instead of
+        being retried or surfaced — see failover.py.
+        """
         auth: str = route["auth"]
+        # Per route, so an alternate can switch between Mantle and native.
+        bedrock_transport: str = route.get("bedrock_transport", self._bedrock_transport)
         api_type: str = route.get("api_type", "anthropic")
         model_tier: str = route.get("tier", "unknown")
         backend: str = "anthropic" if auth == "passthrough" else "aws_bedrock"
@@ -290,26 +581,48 @@ class CodingModelRouter:
         is_streaming: bool = bool(body_json.get("stream"))
         tokenizer_model: str | None = route.get("tokenizer_model")
 
-        # /count_tokens — return an accurate count when a tokenizer is configured,
-        # otherwise fall back to the character-based estimate.
-        if req_suffix == "/count_tokens" and api_type == "openai":
-            if tokenizer_model:
+        # /count_tokens — counted locally, with the route's tokenizer when it
+        # has one and the Anthropic-format counter otherwise, so Claude Code's
+        # frequent compaction checks never wait on an upstream round trip.
+        # A route can set "count_tokens": "upstream" to forward it instead
+        # (e.g. to get Anthropic's exact count for a passthrough model).
+        if req_suffix == "/count_tokens" and (
+            api_type == "openai" or route.get("count_tokens", "local") == "local"
+        ):
+            token_count: int | None = None
+            if api_type == "openai" and tokenizer_model:
                 oai_body_for_count = _anthropic_to_openai_request(
                     body_json, enable_qwen_thinking=self._qwen_enable_thinking
                 )
-                token_count = count_oai_request_tokens(
-                    oai_body_for_count, tokenizer_model
+                token_count = await self._tokenizer_executor.run(
+                    count_oai_request_tokens,
+                    oai_body_for_count,
+                    tokenizer_model,
+                    operation="count_tokens",
                 )
-                if token_count is not None:
-                    return JSONResponse({"input_tokens": token_count})
-            return JSONResponse({"input_tokens": len(json.dumps(body_json)) // 4})
+                if token_count is None:
+                    # Tokenizer busy or unavailable: answer, but don't cache.
+                    return JSONResponse(
+                        {"input_tokens": count_anthropic_request_tokens(body_json)}
+                    )
+            else:
+                token_count = count_anthropic_request_tokens(body_json)
+            if count_key is not None:
+                count_tokens_cache.put(count_key, token_count)
+            return JSONResponse({"input_tokens": token_count})
 
         target_url = route["url"] if api_type == "openai" else route["url"] + req_suffix
 
+        # Stages below mutate (or replace) body_json in place; it is
+        # serialized once, only if it changed and only where the raw bytes
+        # are actually sent (the openai SDK and native Converse paths take
+        # body_json itself), rather than after every stage.
+        body_changed = False
+
         # Rewrite model name if upstream differs
         if upstream_model != model:
             body_json["model"] = upstream_model
-            raw_body = json.dumps(body_json).encode()
+            body_changed = True
 
         # ── Context enforcement ───────────────────────────────────────────────
         #
@@ -326,8 +639,22 @@ class CodingModelRouter:
             body_json = _anthropic_to_openai_request(
                 body_json, enable_qwen_thinking=self._qwen_enable_thinking
             )
-            body_json = enforce_context_budget(body_json, route, tokenizer_model)
-            raw_body = json.dumps(body_json).encode()
+            # Off the event loop; a saturated or timed-out tokenizer falls
+            # back to the character estimate rather than delaying dispatch.
+            enforced = await self._tokenizer_executor.run(
+                enforce_context_budget,
+                body_json,
+                route,
+                tokenizer_model,
+                operation="enforce_context_budget",
+            )
+            body_json = (
+                enforced
+                if enforced is not None
+                else enforce_context_budget(
+                    body_json, route, tokenizer_model, char_estimate_only=True
+                )
+            )
         else:
             # Strategy B — character-based cap on Anthropic-format body
             route_context_window: int | None = route.get("context_window")
@@ -362,6 +689,7 @@ class CodingModelRouter:
                             smart_max = min(smart_max, route_max_tokens)
                         if requested_max > smart_max:
                             body_json["max_tokens"] = smart_max
+                            body_changed = True
                             logger.warning(
                                 "[coding-model-router] overflow: seeding max_tokens=%d (raw_remaining=%d × 70%% − buffer)",
                                 smart_max,
@@ -377,6 +705,7 @@ class CodingModelRouter:
                     )
                     if requested_max > effective_max_tokens:
                         body_json["max_tokens"] = effective_max_tokens
+                        body_changed = True
                         logger.info(
                             "[coding-model-router] dynamic max_tokens: capped %d → %d",
                             requested_max,
@@ -387,7 +716,9 @@ class CodingModelRouter:
                 body_json = _anthropic_to_openai_request(
                     body_json, enable_qwen_thinking=self._qwen_enable_thinking
                 )
-                raw_body = json.dumps(body_json).encode()
+
+        if body_changed and api_type != "openai":
+            raw_body = json_codec.dumps(body_json)
 
         # Build upstream headers
         base_headers: dict[str, str] = {
@@ -409,7 +740,7 @@ class CodingModelRouter:
         if auth == "aws":
             region = route.get("aws_region", "us-east-1")
             if api_type == "openai":
-                # SigV4 applied per-request via SigV4Auth on the httpx client below
+                # SigV4 applied per-request via SigV4Auth on the pooled httpx client below
                 upstream_headers = base_headers
             else:
                 try:
@@ -466,11 +797,7 @@ class CodingModelRouter:
         dispatch_start = time.perf_counter()
 
         # ── Native Bedrock Converse route: manual fallback for Bedrock Mantle ──
-        if (
-            api_type == "openai"
-            and auth == "aws"
-            and self._bedrock_transport == "native"
-        ):
+        if api_type == "openai" and auth == "aws" and bedrock_transport == "native":
             if is_streaming:
                 return await self._bedrock_native_dispatcher.dispatch_streaming(
                     route=route,
@@ -489,6 +816,7 @@ class CodingModelRouter:
                     auth_info=auth_info,
                     request_start_time=request_start_time,
                     dispatch_start=dispatch_start,
+                    failover=failover,
                 )
             return await self._bedrock_native_dispatcher.dispatch_nonstreaming(
                 route=route,
@@ -507,6 +835,7 @@ class CodingModelRouter:
                 request_start_time=request_start_time,
                 dispatch_start=dispatch_start,
                 background_tasks=background_tasks,
+                failover=failover,
             )
 
         # ── OpenAI-format route: use openai SDK + Anthropic translation ──────────
@@ -514,14 +843,15 @@ class CodingModelRouter:
             import openai
 
             base_url = target_url.removesuffix("/chat/completions")
-            _auth_obj = SigV4Auth(route) if auth == "aws" else None
-            http_client = httpx.AsyncClient(auth=_auth_obj, timeout=None)  # nosec B113
-            _placeholder_key = "dummy"  # pragma: allowlist secret
-            oai_client = openai.AsyncOpenAI(
-                api_key=_placeholder_key,
-                base_url=base_url,
-                http_client=http_client,
-                max_retries=0,
+            # Pooled: keep-alive connections are reused across requests and
+            # across the throttle retries below, instead of paying a fresh
+            # TCP + TLS handshake each time.
+            oai_client = self._upstream_client_pool.get_openai_client(
+                base_url,
+                auth=auth,
+                aws_region=(
+                    route.get("aws_region", "us-east-1") if auth == "aws" else None
+                ),
             )
             oai_kwargs = {k: v for k, v in body_json.items() if k != "stream"}
             if chat_template_kwargs := oai_kwargs.pop("chat_template_kwargs", None):
@@ -534,7 +864,6 @@ class CodingModelRouter:
                     "chat_template_kwargs": chat_template_kwargs
                 }
             msg_id = _msg_id()
-            streaming_started = False
             # Bound here (not just inside `if is_streaming:`) so the bare
             # openai.APIError handler below can safely check it regardless of
             # which branch ran — it's only ever non-None for the streaming path.
@@ -544,19 +873,8 @@ class CodingModelRouter:
                     first_chunk = None
                     _throttle_attempt = 0
                     while True:
-                        if _throttle_attempt > 0:
-                            await http_client.aclose()
-                            http_client = httpx.AsyncClient(  # nosec B113
-                                auth=_auth_obj, timeout=None
-                            )
-                            oai_client = openai.AsyncOpenAI(
-                                api_key=_placeholder_key,
-                                base_url=base_url,
-                                http_client=http_client,
-                                max_retries=0,
-                            )
                         if auth == "aws":
-                            await _pace_bedrock_dispatch()
+                            await _pace_bedrock_dispatch(route)
                         stream = None
                         try:
                             stream = await oai_client.chat.completions.create(
@@ -565,6 +883,8 @@ class CodingModelRouter:
                                 stream_options={"include_usage": True},
                             )
                             first_chunk = await stream.__anext__()
+                            if auth == "aws":
+                                _record_bedrock_success(route)
                             break
                         except Exception as peek_exc:
                             if stream is not None:
@@ -590,6 +910,17 @@ class CodingModelRouter:
                                     _peek_text,
                                 )
                             )
+                            _unavailable = isinstance(
+                                peek_exc, openai.APIConnectionError
+                            ) or (_status is not None and _status >= 500)
+                            if _retryable and auth == "aws":
+                                _record_bedrock_throttle(route)
+                            elif _unavailable and auth == "aws":
+                                _record_bedrock_unavailable(route)
+                            if failover and (_retryable or _unavailable):
+                                raise FailoverRequested(
+                                    _peek_text[:200], status_code=_status
+                                ) from peek_exc
                             if _retryable and _throttle_attempt < _MAX_THROTTLE_RETRIES:
                                 delay = _throttle_backoff(_throttle_attempt)
                                 _throttle_attempt += 1
@@ -605,7 +936,6 @@ class CodingModelRouter:
                                 await asyncio.sleep(delay)
                             else:
                                 raise
-                    streaming_started = True
                     self._record_upstream_latency(
                         dispatch_start,
                         model_tier=model_tier,
@@ -637,20 +967,22 @@ class CodingModelRouter:
                             response_headers=dict(stream.response.headers),
                         )
 
+                    # The same policy dispatch() applies to the response, so
+                    # deltas are only merged when its frames are.
+                    flush_policy = self._stream_flush_policy.for_route(route)
                     # Create streaming response with usage tracking
                     if self._usage_tracker:
                         stream_gen = _oai_stream_with_usage_tracking(
                             stream,
                             msg_id,
                             upstream_model,
-                            http_client,
                             self._usage_tracker,
                             auth_info,
                             first_chunk=first_chunk,
                             prompt_text=prompt_text,
                             model_tier=model_tier,
                             backend=backend,
-                            bedrock_transport=self._bedrock_transport,
+                            bedrock_transport=bedrock_transport,
                             price_per_mtok=price_per_mtok,
                             anthropic_price_per_mtok=anthropic_price_per_mtok,
                             streaming=True,
@@ -665,16 +997,17 @@ class CodingModelRouter:
                             start_time=request_start_time,
                             on_stream_error=_record_mid_stream_error,
                             retry_count=_throttle_attempt,
+                            flush_policy=flush_policy,
                         )
                     else:
                         stream_gen = _oai_stream_with_cleanup(
                             stream,
                             msg_id,
                             upstream_model,
-                            http_client,
                             first_chunk=first_chunk,
                             request=request,
                             on_stream_error=_record_mid_stream_error,
+                            flush_policy=flush_policy,
                         )
                     return StreamingResponse(
                         stream_gen,
@@ -690,17 +1023,28 @@ class CodingModelRouter:
                     _throttle_attempt = 0
                     while True:
                         if auth == "aws":
-                            await _pace_bedrock_dispatch()
+                            await _pace_bedrock_dispatch(route)
                         try:
                             resp = await oai_client.chat.completions.create(
                                 **oai_kwargs, stream=False
                             )
+                            if auth == "aws":
+                                _record_bedrock_success(route)
                             break
                         except openai.APIStatusError as exc:
-                            if (
-                                _is_throttling(exc.status_code, exc.response.text)
-                                and _throttle_attempt < _MAX_THROTTLE_RETRIES
-                            ):
+                            _throttled = _is_throttling(
+                                exc.status_code, exc.response.text
+                            )
+                            if _throttled and auth == "aws":
+                                _record_bedrock_throttle(route)
+                            elif auth == "aws" and exc.status_code >= 500:
+                                _record_bedrock_unavailable(route)
+                            if failover and (_throttled or exc.status_code >= 500):
+                                raise FailoverRequested(
+                                    exc.response.text[:200],
+                                    status_code=exc.status_code,
+                                ) from exc
+                            if _throttled and _throttle_attempt < _MAX_THROTTLE_RETRIES:
                                 delay = _throttle_backoff(_throttle_attempt)
                                 _throttle_attempt += 1
                                 logger.warning(
@@ -714,6 +1058,14 @@ class CodingModelRouter:
                                 await asyncio.sleep(delay)
                                 continue
                             raise
+                        except openai.APIConnectionError as exc:
+                            if auth == "aws":
+                                _record_bedrock_unavailable(route)
+                            if failover:
+                                raise FailoverRequested(
+                                    f"{type(exc).__name__}: {exc}"
+                                ) from exc
+                            raise
                     self._record_upstream_latency(
                         dispatch_start,
                         model_tier=model_tier,
@@ -750,7 +1102,7 @@ class CodingModelRouter:
                             prompt_text=prompt_text,
                             model_tier=model_tier,
                             backend=backend,
-                            bedrock_transport=self._bedrock_transport,
+                            bedrock_transport=bedrock_transport,
                             price_per_mtok=price_per_mtok,
                             anthropic_price_per_mtok=anthropic_price_per_mtok,
                             streaming=False,
@@ -761,6 +1113,8 @@ class CodingModelRouter:
                         )
                     response.background = background_tasks
                     return response
+            except FailoverRequested:
+                raise
             except openai.APIStatusError as exc:
                 logger.error(
                     "[coding-model-router] Bedrock Mantle upstream error: status=%d "
@@ -907,18 +1261,27 @@ class CodingModelRouter:
                     streaming=is_streaming,
                     user_id=user_id,
                 )
-            finally:
-                if not streaming_started:
-                    await http_client.aclose()
 
         # ── Anthropic-format route: stream bytes verbatim via httpx ──────────────
-        client = httpx.AsyncClient(timeout=None)  # nosec B113
+        client = self._upstream_client_pool.get_client(
+            target_url,
+            auth=auth,
+            aws_region=route.get("aws_region", "us-east-1") if auth == "aws" else None,
+        )
         try:
             upstream_resp, bedrock_retry_count = await _send_with_bedrock_retry(
-                client, target_url, upstream_headers, raw_body, route, auth, request_id
+                client,
+                target_url,
+                upstream_headers,
+                raw_body,
+                route,
+                auth,
+                request_id,
+                failover=failover,
             )
+        except FailoverRequested:
+            raise
         except Exception as exc:
-            await client.aclose()
             # Previously re-raised with no record at all — a connection
             # failure/timeout dispatching to Anthropic/Bedrock became a bare
             # 500 with zero trace in model-router-errors.
@@ -959,7 +1322,7 @@ class CodingModelRouter:
 
         if upstream_resp.status_code >= 400:
             error_body = await upstream_resp.aread()
-            await client.aclose()
+            await upstream_resp.aclose()
 
             logger.error(
                 "[coding-model-router] upstream %d from %s user_id=%s request_id=%s: %s",
@@ -1029,11 +1392,10 @@ class CodingModelRouter:
             # usage can be extracted the same way the openai-format route does.
             body_bytes = await upstream_resp.aread()
             await upstream_resp.aclose()
-            await client.aclose()
             if self._usage_tracker:
                 try:
-                    response_body = json.loads(body_bytes)
-                except (json.JSONDecodeError, UnicodeDecodeError):
+                    response_body = json_codec.loads(body_bytes)
+                except (json_codec.JSONDecodeError, UnicodeDecodeError):
                     response_body = None
                 if response_body is not None:
                     compression_used = (
@@ -1074,7 +1436,6 @@ class CodingModelRouter:
         if self._usage_tracker:
             stream_gen = _stream_passthrough_with_usage_tracking(
                 upstream_resp,
-                client,
                 self._usage_tracker,
                 request_id,
                 auth_info,
@@ -1092,9 +1453,10 @@ class CodingModelRouter:
                 compression_used="none",
                 request=request,
                 retry_count=bedrock_retry_count,
+                preview_chars=self._usage_preview_chars,
             )
         else:
-            stream_gen = _stream_passthrough(upstream_resp, client, request=request)
+            stream_gen = _stream_passthrough(upstream_resp, request=request)
 
         return StreamingResponse(
             stream_gen,
@@ -1255,6 +1617,300 @@ class CodingModelRouter:
         span.set_attribute("api_type", api_type)
         span.set_attribute("upstream_latency_ms", latency_ms)
 
+    async def _dispatch_candidates(
+        self,
+        candidates: list[dict[str, Any]],
+        dispatch: Callable[
+            ..., Coroutine[Any, Any, StreamingResponse | JSONResponse | Response]
+        ],
+        *,
+        request_id: str,
+        auth_info: dict[str, Any],
+        request_start_time: datetime,
+        is_streaming: bool,
+    ) -> StreamingResponse | JSONResponse | Response:
+        """Try `candidates` in order, skipping those whose circuit is open
+        and moving on when one asks to fail over (see failover.py). If none
+        is left, fail fast with Anthropic's overloaded error."""
+        # Only routes with alternates or a fallback get `routing` on their
+        # usage records.
+        routed = len(candidates) > 1
+        failed_over_from: list[str] = []
+        body_used = False
+        index = 0
+        while index < len(candidates):
+            candidate = candidates[index]
+            index += 1
+            if candidate["auth"] == "aws" and not self._circuit_breaker.try_acquire(
+                candidate
+            ):
+                continue
+            failover = index < len(candidates)
+            routing = self._routing_info(candidate, index - 1, failed_over_from)
+            hedge_delay = (
+                self._hedge_latency.delay_s(candidate)
+                if failover and not is_streaming
+                else None
+            )
+            if hedge_delay is None:
+                try:
+                    return await dispatch(
+                        candidate,
+                        fresh_body=body_used,
+                        failover=failover,
+                        routing=routing if routed else None,
+                    )
+                except FailoverRequested as exc:
+                    failures = [(candidate, exc)]
+            else:
+                response, index, failures = await self._dispatch_hedged(
+                    candidates,
+                    index,
+                    candidate,
+                    dispatch,
+                    delay_s=hedge_delay,
+                    fresh_body=body_used,
+                    routing=routing,
+                    failed_over_from=failed_over_from,
+                    request_id=request_id,
+                )
+                if response is not None:
+                    return response
+            body_used = True
+            for failed, failure in failures:
+                self._record_failover(
+                    failed,
+                    failure,
+                    request_id=request_id,
+                    auth_info=auth_info,
+                    request_start_time=request_start_time,
+                    streaming=is_streaming,
+                )
+                failed_over_from.append(_route_label(failed))
+        return self._routes_unavailable_response(
+            candidates[0],
+            failed_over=bool(failed_over_from),
+            request_id=request_id,
+            auth_info=auth_info,
+            request_start_time=request_start_time,
+            streaming=is_streaming,
+        )
+
+    async def _dispatch_hedged(
+        self,
+        candidates: list[dict[str, Any]],
+        next_index: int,
+        primary: dict[str, Any],
+        dispatch: Callable[
+            ..., Coroutine[Any, Any, StreamingResponse | JSONResponse | Response]
+        ],
+        *,
+        delay_s: float,
+        fresh_body: bool,
+        routing: dict[str, Any],
+        failed_over_from: list[str],
+        request_id: str,
+    ) -> tuple[
+        StreamingResponse | JSONResponse | Response | None,
+        int,
+        list[tuple[dict[str, Any], FailoverRequested]],
+    ]:
+        """Send `primary`; if it hasn't answered within `delay_s`, also send
+        the next available candidate and return whichever answers first with
+        a 2xx. An error response only wins if nothing else succeeds.
+
+        Returns the response (None if every request sent failed over), the
+        index of the next untried candidate, and the failovers. The slower
+        request is left to finish so its usage is still recorded.
+        """
+        start = time.perf_counter()
+        primary_task = asyncio.create_task(
+            dispatch(
+                primary,
+                fresh_body=fresh_body,
+                failover=True,
+                routing=routing,
+                tasks=BackgroundTasks(),
+            )
+        )
+        primary_task.add_done_callback(
+            functools.partial(self._observe_hedge_latency, primary, start)
+        )
+        sent = [(primary_task, primary, routing)]
+        done, _ = await asyncio.wait({primary_task}, timeout=delay_s)
+        if not done:
+            while next_index < len(candidates):
+                hedge = candidates[next_index]
+                next_index += 1
+                if hedge["auth"] == "aws" and not self._circuit_breaker.try_acquire(
+                    hedge
+                ):
+                    continue
+                logger.info(
+                    "[coding-model-router] request_id=%s no answer from %s after "
+                    "%.2fs — hedging to %s",
+                    request_id,
+                    _route_label(primary),
+                    delay_s,
+                    _route_label(hedge),
+                )
+                hedge_routing = self._routing_info(
+                    hedge, next_index - 1, failed_over_from
+                )
+                routing["hedged"] = hedge_routing["hedged"] = True
+                hedge_task = asyncio.create_task(
+                    dispatch(
+                        hedge,
+                        fresh_body=True,
+                        failover=next_index < len(candidates),
+                        routing=hedge_routing,
+                        tasks=BackgroundTasks(),
+                    )
+                )
+                sent.append((hedge_task, hedge, hedge_routing))
+                break
+
+        failures: list[tuple[dict[str, Any], FailoverRequested]] = []
+        # The first error response, returned only if no request succeeds
+        # (e.g. the last candidate's 5xx, sent with failover off).
+        error_task: asyncio.Task[Any] | None = None
+        pending: set[asyncio.Task[Any]] = {task for task, _, _ in sent}
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task, candidate, task_routing in sent:
+                if task not in done:
+                    continue
+                exc = task.exception()
+                if isinstance(exc, FailoverRequested):
+                    failures.append((candidate, exc))
+                    continue
+                if exc is None and not 200 <= task.result().status_code < 300:
+                    if error_task is None:
+                        error_task = task
+                    continue
+                return self._hedge_won(task, sent), next_index, failures
+        if error_task is not None:
+            return self._hedge_won(error_task, sent), next_index, failures
+        return None, next_index, failures
+
+    def _hedge_won(
+        self,
+        winner: asyncio.Task[Any],
+        sent: list[tuple[asyncio.Task[Any], dict[str, Any], dict[str, Any]]],
+    ) -> StreamingResponse | JSONResponse | Response:
+        """Mark `winner` in the usage records' routing, leave the others to
+        finish as losers, and return its response."""
+        for task, _, task_routing in sent:
+            if "hedged" in task_routing:
+                task_routing["hedge_winner"] = task is winner
+            if task is not winner:
+                task.add_done_callback(self._finish_hedge_loser)
+        # Re-raises anything but a failover, as an unhedged dispatch would
+        # have.
+        response: StreamingResponse | JSONResponse | Response = winner.result()
+        return response
+
+    def _observe_hedge_latency(
+        self, route: dict[str, Any], start: float, task: asyncio.Task[Any]
+    ) -> None:
+        if not task.cancelled() and task.exception() is None:
+            self._hedge_latency.observe(route, time.perf_counter() - start)
+
+    @staticmethod
+    def _finish_hedge_loser(task: asyncio.Task[Any]) -> None:
+        """Run the slower hedged request's background tasks (its usage
+        record) once it finishes — the backend bills it either way."""
+        if task.cancelled() or task.exception() is not None:
+            return
+        background = getattr(task.result(), "background", None)
+        if background is not None:
+            _fire_and_forget(background())
+
+    @staticmethod
+    def _routing_info(
+        candidate: dict[str, Any], index: int, failed_over_from: list[str]
+    ) -> dict[str, Any]:
+        """The `routing` field of this candidate's usage record."""
+        return {
+            "served_by": _route_label(candidate),
+            "candidate_index": index,
+            "failed_over_from": list(failed_over_from),
+        }
+
+    def _record_failover(
+        self,
+        route: dict[str, Any],
+        exc: FailoverRequested,
+        *,
+        request_id: str,
+        auth_info: dict[str, Any],
+        request_start_time: datetime,
+        streaming: bool,
+    ) -> None:
+        logger.warning(
+            "[coding-model-router] request_id=%s failing over from %s: %s",
+            request_id,
+            _route_label(route),
+            exc.reason,
+        )
+        self._record_error(
+            request_id=request_id,
+            auth_info=auth_info,
+            model=route["model"],
+            error_type="route_failover",
+            error_message=exc.reason,
+            start_time=request_start_time,
+            model_tier=route.get("tier", "unknown"),
+            backend="anthropic" if route["auth"] == "passthrough" else "aws_bedrock",
+            auth=route["auth"],
+            api_type=route.get("api_type", "anthropic"),
+            streaming=streaming,
+            status_code=exc.status_code,
+        )
+
+    def _routes_unavailable_response(
+        self,
+        route: dict[str, Any],
+        *,
+        failed_over: bool,
+        request_id: str,
+        auth_info: dict[str, Any],
+        request_start_time: datetime,
+        streaming: bool,
+    ) -> JSONResponse:
+        """Fail fast with Anthropic's overloaded error, which Claude Code
+        retries on its own after Retry-After."""
+        retry_after = max(1, math.ceil(self._circuit_breaker.retry_after(route)))
+        reason = "all routes failed over" if failed_over else "circuit open"
+        message = (
+            f"No backend available for {route.get('claude_model', route['model'])} "
+            f"({reason}); retry in {retry_after}s"
+        )
+        self._record_error(
+            request_id=request_id,
+            auth_info=auth_info,
+            model=route["model"],
+            error_type="routes_exhausted" if failed_over else "circuit_open",
+            error_message=message,
+            start_time=request_start_time,
+            model_tier=route.get("tier", "unknown"),
+            backend="anthropic" if route["auth"] == "passthrough" else "aws_bedrock",
+            auth=route["auth"],
+            api_type=route.get("api_type", "anthropic"),
+            streaming=streaming,
+            status_code=503,
+        )
+        return JSONResponse(
+            {
+                "type": "error",
+                "error": {"type": "overloaded_error", "message": message},
+            },
+            status_code=503,
+            headers={"retry-after": str(retry_after)},
+        )
+
     @staticmethod
     def _annotate_fallback_error(error_body: bytes, model: str) -> bytes:
         """
@@ -1407,7 +2063,8 @@ class CodingModelRouter:
         self._account_directory is intentionally unused here — it's still
         constructed so the model-router-account-directory collection exists
         for that downstream reporting join, but this router no longer queries
-        it live.
+        it live. (If that changes, set account_directory_preload so lookups
+        are served from memory.)
         """
         account_uuid = extract_account_uuid(body_json)
         if account_uuid:
@@ -0,0 +1,115 @@
+"""
+In-process cache in front of SessionSavingsReader for the savings endpoint.
+
+The Claude Code statusline fetches a session's savings on every render, but
+the numbers only change when a request in that session finishes. Results
+(including "no rollup yet") are cached per session for `ttl_seconds`, and
+UsageTracker invalidates a session's entry as soon as it writes that
+session's rollup, so this worker never serves a stale figure for a session
+it just updated. Another worker's updates show up within the TTL.
+
+Concurrent lookups for a session that isn't cached share one MongoDB read.
+Each cached result carries an ETag so the endpoint can answer an unchanged
+result with 304 Not Modified.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from .session_savings_reader import SessionSavings
+
+
+@dataclass(frozen=True)
+class CachedSessionSavings:
+    """A lookup result, serialized once for every response that serves it.
+
+    `body` and `etag` are None when the session has no rollup (a 404).
+    """
+
+    savings: SessionSavings | None
+    body: bytes | None
+    etag: str | None
+
+    @classmethod
+    def of(cls, savings: SessionSavings | None) -> CachedSessionSavings:
+        if savings is None:
+            return cls(savings=None, body=None, etag=None)
+        body = savings.model_dump_json().encode()
+        digest = hashlib.blake2b(body, digest_size=8).hexdigest()
+        return cls(savings=savings, body=body, etag=f'"{digest}"')
+
+
+class SessionSavingsCache:
+    """TTL + LRU cache of session savings with per-session request
+    coalescing.
+
+    Registered as a container singleton (see
+    LanguageModelGatewayContainerFactory) so the usage tracker that
+    invalidates entries and the endpoint that reads them share it.
+    Only touched from the event loop.
+    """
+
+    def __init__(self, *, ttl_seconds: float = 10.0, max_entries: int = 10_000) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[CachedSessionSavings, float]] = (
+            OrderedDict()
+        )
+        self._in_flight: dict[str, asyncio.Task[CachedSessionSavings]] = {}
+
+    async def get(
+        self,
+        session_id: str,
+        load: Callable[[str], Awaitable[SessionSavings | None]],
+    ) -> CachedSessionSavings:
+        """The session's savings, from cache or from one shared `load`."""
+        entry = self._entries.get(session_id)
+        if entry is not None:
+            cached, expires_at = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(session_id)
+                return cached
+            del self._entries[session_id]
+
+        task = self._in_flight.get(session_id)
+        if task is None:
+            task = asyncio.create_task(self._load(session_id, load))
+            self._in_flight[session_id] = task
+        # Shielded: one caller disconnecting mustn't cancel the others' read.
+        return await asyncio.shield(task)
+
+    async def _load(
+        self,
+        session_id: str,
+        load: Callable[[str], Awaitable[SessionSavings | None]],
+    ) -> CachedSessionSavings:
+        try:
+            savings = await load(session_id)
+        finally:
+            # Not current if the session was invalidated while loading: the
+            # result may predate that write, so it's returned but not cached.
+            current = self._in_flight.get(session_id) is asyncio.current_task()
+            if current:
+                del self._in_flight[session_id]
+        cached = CachedSessionSavings.of(savings)
+        if current:
+            self._entries[session_id] = (cached, time.monotonic() + self._ttl_seconds)
+            self._entries.move_to_end(session_id)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return cached
+
+    def invalidate(self, session_id: str) -> None:
+        """Drop a session's entry (and any read already in flight from being
+        cached); the next lookup reads MongoDB."""
+        self._entries.pop(session_id, None)
+        self._in_flight.pop(session_id, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
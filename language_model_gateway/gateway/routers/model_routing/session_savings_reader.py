@@ -14,6 +14,9 @@ from typing import Any
 
 from pydantic import BaseModel
 
+from .mongo_client_provider import MongoClientProvider
+
+
 logger = logging.getLogger(__name__)
 
 # Mirrors usage_tracker.py's _TIER_TO_SESSION_BUCKET value set — the session
@@ -44,27 +47,34 @@ class SessionSavingsReader:
         db_name: str = "llm_storage",
         collection_name: str = "model-router-sessions",
         enabled: bool = True,
+        client_provider: MongoClientProvider | None = None,
     ) -> None:
         self._mongo_uri = mongo_uri
         self._db_name = db_name
         self._collection_name = collection_name
         self._enabled = enabled
+        self._client_provider = client_provider
         self._client: Any | None = None
         self._db: Any | None = None
         self._collection: Any | None = None
 
+    def _report_mongo_failure(self, error: BaseException) -> None:
+        if self._client_provider is not None:
+            self._client_provider.report_failure("session_savings_reader", error)
+
+    def _report_mongo_success(self) -> None:
+        if self._client_provider is not None:
+            self._client_provider.report_success()
+
     async def _ensure_connected(self) -> None:
         """Ensure MongoDB connection is established."""
         if not self._enabled or self._collection is not None:
             return
 
         try:
-            # Deferred import: skip pymongo's import cost when this feature
-            # is disabled (no mongo_uri configured), since _ensure_connected
-            # is then never called.
-            from pymongo import AsyncMongoClient
-
-            self._client = AsyncMongoClient(self._mongo_uri)
+            self._client = MongoClientProvider.client_for(
+                self._client_provider, self._mongo_uri
+            )
             self._db = self._client[self._db_name]
             self._collection = self._db[self._collection_name]
             logger.info(
@@ -95,6 +105,7 @@ class SessionSavingsReader:
         try:
             doc = await self._collection.find_one({"session_id": session_id})
         except Exception as e:
+            self._report_mongo_failure(e)
             logger.warning(
                 "[session_savings_reader] Failed to look up session %s: %s",
                 session_id,
@@ -102,6 +113,7 @@ class SessionSavingsReader:
                 exc_info=True,
             )
             return None
+        self._report_mongo_success()
 
         if not doc:
             return None
@@ -126,7 +138,8 @@ class SessionSavingsReader:
         )
 
     async def close(self) -> None:
-        """Close MongoDB connection."""
-        if self._client is not None:
+        """Close MongoDB connection (unless it's the shared one, which is
+        closed by its MongoClientProvider)."""
+        if self._client is not None and self._client_provider is None:
             await self._client.close()
             logger.info("[session_savings_reader] MongoDB connection closed")
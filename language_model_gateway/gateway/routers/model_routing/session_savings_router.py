@@ -7,6 +7,10 @@ figure — no prompt/response content, no PHI, no email/account identity.
 
 This is a tracked CLAUDE.md baseline exception, not a silent gap — see
 BAI-320 for owner/scope/expiry.
+
+Lookups go through SessionSavingsCache (the statusline polls this on every
+render), and responses carry an ETag: a client that sends it back in
+If-None-Match gets 304 Not Modified while the figures are unchanged.
 """
 
 from __future__ import annotations
@@ -15,8 +19,14 @@ import logging
 from enum import Enum
 from typing import Sequence
 
-from fastapi import APIRouter, HTTPException, params
+from fastapi import APIRouter, HTTPException, Request, Response, params
 
+from language_model_gateway.gateway.routers.model_routing.mongo_client_provider import (
+    MongoClientProvider,
+)
+from language_model_gateway.gateway.routers.model_routing.session_savings_cache import (
+    SessionSavingsCache,
+)
 from language_model_gateway.gateway.routers.model_routing.session_savings_reader import (
     SessionSavings,
     SessionSavingsReader,
@@ -29,6 +39,13 @@ logger.setLevel(SRC_LOG_LEVELS.get("LLM", logging.INFO))
 _NOT_FOUND_DETAIL = "no usage recorded for this session"
 
 
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
 class SessionSavingsRouter:
     """Exposes GET {prefix}/sessions/{session_id}/savings."""
 
@@ -41,12 +58,17 @@ class SessionSavingsRouter:
         mongo_uri: str | None = None,
         db_name: str = "llm_storage",
         collection_name: str = "model-router-sessions",
+        mongo_client_provider: MongoClientProvider | None = None,
+        savings_cache: SessionSavingsCache | None = None,
     ) -> None:
         self.router = APIRouter(
             prefix=prefix,
             tags=tags or ["model-routing-savings"],
             dependencies=dependencies or [],
         )
+        # Shared with the usage tracker (which invalidates entries) when
+        # injected from the container; a private cache otherwise, e.g. in tests.
+        self._cache: SessionSavingsCache = savings_cache or SessionSavingsCache()
         self._reader: SessionSavingsReader | None = None
         if mongo_uri:
             self._reader = SessionSavingsReader(
@@ -54,6 +76,7 @@ class SessionSavingsRouter:
                 db_name=db_name,
                 collection_name=collection_name,
                 enabled=True,
+                client_provider=mongo_client_provider,
             )
         self._register_routes()
 
@@ -63,6 +86,7 @@ class SessionSavingsRouter:
             self.get_session_savings,
             methods=["GET"],
             response_model=SessionSavings,
+            responses={304: {"description": "Unchanged since If-None-Match"}},
             summary="Get model-routing savings for a Claude Code session",
             description=(
                 "Returns this gateway's cumulative cost savings (vs. "
@@ -72,13 +96,19 @@ class SessionSavingsRouter:
             status_code=200,
         )
 
-    async def get_session_savings(self, session_id: str) -> SessionSavings:
+    async def get_session_savings(self, session_id: str, request: Request) -> Response:
         if self._reader is None:
             raise HTTPException(status_code=404, detail=_NOT_FOUND_DETAIL)
-        savings = await self._reader.get_session_savings(session_id)
-        if savings is None:
+        cached = await self._cache.get(session_id, self._reader.get_session_savings)
+        if cached.body is None or cached.etag is None:
             raise HTTPException(status_code=404, detail=_NOT_FOUND_DETAIL)
-        return savings
+        # no-cache: clients may keep the body but must revalidate each time.
+        headers = {"ETag": cached.etag, "Cache-Control": "no-cache"}
+        if _etag_matches(request.headers.get("if-none-match"), cached.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(
+            content=cached.body, media_type="application/json", headers=headers
+        )
 
     def get_router(self) -> APIRouter:
         return self.router
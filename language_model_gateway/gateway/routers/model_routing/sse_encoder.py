@@ -0,0 +1,86 @@
+"""
+Encoding of the Anthropic SSE `content_block_delta` events
+stream_converter._stream_oai_sdk_to_anthropic emits for every streamed token.
+
+`_sse_event` builds the event's nested dict and `json.dumps`es all of it. For
+a delta only the text (or partial tool-argument JSON) varies, so the rest of
+the frame is precomputed per (block index, delta type) and only the text is
+JSON-escaped — by the same C escaper `json.dumps` uses, so the bytes are
+identical to what `_sse_event` produces.
+
+DeltaCoalescer merges consecutive deltas for the same block into one event,
+so a burst of tokens costs one event instead of one per token. The caller
+decides when to flush (see _stream_oai_sdk_to_anthropic).
+"""
+
+from __future__ import annotations
+
+import functools
+from json.encoder import encode_basestring_ascii
+
+# Delta type -> the field carrying its value.
+_DELTA_FIELDS = {"text_delta": "text", "input_json_delta": "partial_json"}
+_DELTA_SUFFIX = b"}}\n\n"
+
+
+@functools.lru_cache(maxsize=256)
+def _delta_prefix(index: int, delta_type: str) -> bytes:
+    return (
+        "event: content_block_delta\n"
+        f'data: {{"type": "content_block_delta", "index": {index}, '
+        f'"delta": {{"type": "{delta_type}", "{_DELTA_FIELDS[delta_type]}": '
+    ).encode()
+
+
+def _delta_event(index: int, delta_type: str, value: str) -> bytes:
+    """The `content_block_delta` event `_sse_event` would build for `value`,
+    byte for byte, without building or serializing the dict."""
+    return b"".join(
+        (
+            _delta_prefix(index, delta_type),
+            encode_basestring_ascii(value).encode(),
+            _DELTA_SUFFIX,
+        )
+    )
+
+
+class DeltaCoalescer:
+    """Buffers consecutive deltas for one content block as a single event.
+
+    With `merge=False` nothing is buffered: add() returns each delta's
+    event as is.
+    """
+
+    __slots__ = ("_merge", "_index", "_delta_type", "_parts")
+
+    def __init__(self, merge: bool = True) -> None:
+        self._merge = merge
+        self._index = -1
+        self._delta_type = ""
+        self._parts: list[str] = []
+
+    def __bool__(self) -> bool:
+        return bool(self._parts)
+
+    def add(self, index: int, delta_type: str, value: str) -> bytes | None:
+        """Buffer a delta. Returns the buffered event first if it was for
+        another block or delta type — it must go out before this one."""
+        if not self._merge:
+            return _delta_event(index, delta_type, value)
+        flushed = None
+        if self._parts and (index != self._index or delta_type != self._delta_type):
+            flushed = self.flush()
+        if not self._parts:
+            self._index = index
+            self._delta_type = delta_type
+        self._parts.append(value)
+        return flushed
+
+    def flush(self) -> bytes | None:
+        """The buffered deltas as one event, or None if there are none."""
+        parts = self._parts
+        if not parts:
+            return None
+        self._parts = []
+        value = parts[0] if len(parts) == 1 else "".join(parts)
+        return _delta_event(self._index, self._delta_type, value)
@@ -13,7 +13,10 @@ from starlette.requests import Request
 
 from language_model_gateway.gateway.utilities.logger.log_levels import SRC_LOG_LEVELS
 
-from .constants import _OAI_TO_ANT_STOP
+from .constants import _OAI_TO_ANT_STOP, _STREAM_PREFETCH_MAX_CHUNKS
+from .sse_encoder import DeltaCoalescer, _delta_event
+from .stream_flush import StreamFlushPolicy
+from .stream_prefetch import END, Prefetcher
 
 logger = logging.getLogger(__name__)
 logger.setLevel(SRC_LOG_LEVELS.get("LLM", logging.INFO))
@@ -109,6 +112,7 @@ async def _stream_oai_sdk_to_anthropic(
     text_sink: dict[str, str] | None = None,
     request: Request | None = None,
     on_stream_error: Callable[[str], None] | None = None,
+    flush_policy: StreamFlushPolicy | None = None,
 ) -> AsyncGenerator[bytes, None]:
     """Convert an openai SDK async stream to Anthropic SSE format.
 
@@ -129,6 +133,10 @@ async def _stream_oai_sdk_to_anthropic(
     error-tracker dependency of its own (kept decoupled from infrastructure).
     Without this hook, such failures were only ever surfaced inline to the
     client and never recorded anywhere for triage.
+
+    `flush_policy` is the route's output flush policy. When it merges
+    frames, text/tool-argument deltas whose chunks have already arrived are
+    merged into one event too.
     """
     if usage_sink is None:
         usage_sink = {}
@@ -162,8 +170,21 @@ async def _stream_oai_sdk_to_anthropic(
                 return
             yield chunk
 
+    # Deltas are merged only while the next chunk has already arrived;
+    # nothing waits here for more. Holding a frame for a burst is
+    # flush_frames' job, so there is one hold, and its flush_delay metric
+    # sees it. The first delta is always sent straight away.
+    chunks = Prefetcher(_iter_stream(), _STREAM_PREFETCH_MAX_CHUNKS)
+    deltas = DeltaCoalescer(merge=flush_policy is not None and flush_policy.enabled)
+    sent_delta = False
     try:
-        async for chunk in _iter_stream():
+        while True:
+            if deltas and not chunks.ready():
+                if flushed := deltas.flush():
+                    yield flushed
+            chunk = await chunks.get()
+            if chunk is END:
+                break
             if not sent_message_start:
                 sent_message_start = True
                 yield _sse_event(
@@ -196,6 +217,8 @@ async def _stream_oai_sdk_to_anthropic(
                             text_idx = next_idx
                             next_idx += 1
                             open_blocks[text_idx] = {"type": "text"}
+                            if flushed := deltas.flush():
+                                yield flushed
                             yield _sse_event(
                                 "content_block_start",
                                 {
@@ -204,14 +227,11 @@ async def _stream_oai_sdk_to_anthropic(
                                     "content_block": {"type": "text", "text": ""},
                                 },
                             )
-                        yield _sse_event(
-                            "content_block_delta",
-                            {
-                                "type": "content_block_delta",
-                                "index": text_idx,
-                                "delta": {"type": "text_delta", "text": visible},
-                            },
-                        )
+                        if not sent_delta:
+                            sent_delta = True
+                            yield _delta_event(text_idx, "text_delta", visible)
+                        elif flushed := deltas.add(text_idx, "text_delta", visible):
+                            yield flushed
                 for tc in delta.tool_calls or []:
                     oai_tc_idx = tc.index
                     if oai_tc_idx not in tool_idx_map:
@@ -221,6 +241,8 @@ async def _stream_oai_sdk_to_anthropic(
                         tc_id = tc.id or f"toolu_{ant_idx:04x}"
                         tc_name = (tc.function.name if tc.function else "") or ""
                         open_blocks[ant_idx] = {"type": "tool_use"}
+                        if flushed := deltas.flush():
+                            yield flushed
                         yield _sse_event(
                             "content_block_start",
                             {
@@ -236,17 +258,10 @@ async def _stream_oai_sdk_to_anthropic(
                         )
                     ant_idx = tool_idx_map[oai_tc_idx]
                     if tc.function and tc.function.arguments:
-                        yield _sse_event(
-                            "content_block_delta",
-                            {
-                                "type": "content_block_delta",
-                                "index": ant_idx,
-                                "delta": {
-                                    "type": "input_json_delta",
-                                    "partial_json": tc.function.arguments,
-                                },
-                            },
-                        )
+                        if flushed := deltas.add(
+                            ant_idx, "input_json_delta", tc.function.arguments
+                        ):
+                            yield flushed
             if chunk.usage:
                 # Capture both input and output tokens from usage
                 if chunk.usage.prompt_tokens is not None:
@@ -267,6 +282,8 @@ async def _stream_oai_sdk_to_anthropic(
     else:
         _stream_error_msg = None
     finally:
+        # Stop reading before the stream is closed under the reader.
+        await chunks.aclose()
         if stream is not None:
             # Handle both sync close() and async aclose()
             close_method = getattr(stream, "aclose", getattr(stream, "close", None))
@@ -275,6 +292,9 @@ async def _stream_oai_sdk_to_anthropic(
                 if inspect.isawaitable(_close_result):
                     await _close_result
 
+    if flushed := deltas.flush():
+        yield flushed
+
     if not sent_message_start:
         yield _sse_event(
             "message_start",
@@ -390,34 +410,32 @@ async def _oai_stream_with_cleanup(
     stream: Any,
     msg_id: str,
     upstream_model: str,
-    http_client: httpx.AsyncClient,
     first_chunk: Any = None,
     request: Request | None = None,
     on_stream_error: Callable[[str], None] | None = None,
+    flush_policy: StreamFlushPolicy | None = None,
 ) -> AsyncGenerator[bytes, None]:
     """
-    Stream wrapper that closes the upstream HTTP client after the stream
-    completes. Does not record usage.
+    Stream wrapper for the no-usage-tracking case. The upstream HTTP client
+    is pooled (see UpstreamClientPool) and outlives this stream, so only the
+    SDK stream itself is closed — by _stream_oai_sdk_to_anthropic.
     """
-    try:
-        async for chunk in _stream_oai_sdk_to_anthropic(
-            stream,
-            msg_id,
-            upstream_model,
-            first_chunk=first_chunk,
-            request=request,
-            on_stream_error=on_stream_error,
-        ):
-            yield chunk
-    finally:
-        await http_client.aclose()
+    async for chunk in _stream_oai_sdk_to_anthropic(
+        stream,
+        msg_id,
+        upstream_model,
+        first_chunk=first_chunk,
+        request=request,
+        on_stream_error=on_stream_error,
+        flush_policy=flush_policy,
+    ):
+        yield chunk
 
 
 async def _oai_stream_with_usage_tracking(
     stream: Any,
     msg_id: str,
     upstream_model: str,
-    http_client: httpx.AsyncClient,
     usage_tracker: Any,
     auth_info: dict[str, Any],
     start_time: datetime,
@@ -435,6 +453,7 @@ async def _oai_stream_with_usage_tracking(
     request: Request | None = None,
     on_stream_error: Callable[[str], None] | None = None,
     retry_count: int | None = None,
+    flush_policy: StreamFlushPolicy | None = None,
 ) -> AsyncGenerator[bytes, None]:
     """
     Stream wrapper that records usage to MongoDB after stream completes.
@@ -452,11 +471,11 @@ async def _oai_stream_with_usage_tracking(
             text_sink=text_sink,
             request=request,
             on_stream_error=on_stream_error,
+            flush_policy=flush_policy,
         ):
             sse_event_count += 1
             yield chunk
     finally:
-        await http_client.aclose()
         input_tokens = usage_sink.get("input_tokens", 0)
         output_tokens = usage_sink.get("output_tokens", 0)
         if usage_tracker and (input_tokens > 0 or output_tokens > 0):
@@ -490,15 +509,17 @@ async def _oai_stream_with_usage_tracking(
                     response_text=text_sink.get("output_text"),
                     raw_usage=usage_sink.get("raw_usage"),
                     start_time=start_time,
+                    routing=auth_info.get("routing"),
                 )
             )
 
 
 async def _stream_passthrough(
     resp: httpx.Response,
-    client: httpx.AsyncClient,
     request: Request | None = None,
 ) -> AsyncGenerator[bytes, None]:
+    """Relay upstream bytes verbatim. Only the response is closed at the end —
+    the client it came from is pooled and shared with other requests."""
     try:
         async for chunk in resp.aiter_bytes():
             if request is not None and await request.is_disconnected():
@@ -510,13 +531,22 @@ async def _stream_passthrough(
             yield chunk
     finally:
         await resp.aclose()
-        await client.aclose()
 
 
-def _parse_anthropic_sse_usage(
-    raw: bytes,
-) -> tuple[int, int, str | None, dict[str, Any]]:
-    """Sniff token usage and visible text out of a raw Anthropic SSE stream.
+# Upper bound on a single buffered (not yet newline-terminated) SSE line.
+# The events the sniffer reads (message_start, message_delta, text_delta) are
+# all small; anything longer than this is some other event (e.g. a large
+# tool-input delta) and is skipped up to its newline instead of buffered.
+_SSE_SNIFF_MAX_LINE_BYTES = 64 * 1024
+
+# Cheap byte-level pre-filter so json.loads only ever runs on the handful of
+# event types the sniffer actually needs, not on every relayed line.
+_SSE_SNIFF_MARKERS = (b'"message_start"', b'"message_delta"', b'"text_delta"')
+
+
+class AnthropicSseUsageSniffer:
+    """Incrementally sniff token usage and visible text out of a raw
+    Anthropic SSE stream, one relayed chunk at a time.
 
     Anthropic's own wire format needs no reformatting (unlike the OpenAI-SDK
     conversion path), so this only reads `data:` lines for the fields it
@@ -525,52 +555,116 @@ def _parse_anthropic_sse_usage(
     `message_delta`, which carries the final cumulative count (message_start's
     own `usage.output_tokens` is a placeholder, not the real total).
 
-    The returned raw_usage dict starts from message_start's usage object
-    (which already carries cache_creation_input_tokens/cache_read_input_tokens
-    — Anthropic knows those upfront, before generation starts) and is
-    overlaid with message_delta's usage object, so the final output_tokens
-    count wins without discarding the cache fields message_delta doesn't
-    repeat.
+    The raw_usage dict starts from message_start's usage object (which
+    already carries cache_creation_input_tokens/cache_read_input_tokens —
+    Anthropic knows those upfront, before generation starts) and is overlaid
+    with message_delta's usage object, so the final output_tokens count wins
+    without discarding the cache fields message_delta doesn't repeat.
+
+    State is O(1) in the length of the stream: only the current partial line
+    (capped at _SSE_SNIFF_MAX_LINE_BYTES) and, if `text_limit` is set, at
+    most `text_limit + 1` characters of visible text are held. The extra
+    character lets UsageTracker's `_truncate` still tell a cut-off preview
+    from a complete one. `text_limit=None` keeps all text; `0` keeps none.
     """
-    input_tokens = 0
-    output_tokens = 0
-    text_parts: list[str] = []
-    raw_usage: dict[str, Any] = {}
-    for line in raw.decode("utf-8", errors="replace").splitlines():
+
+    def __init__(self, text_limit: int | None = None) -> None:
+        self._text_limit = text_limit
+        self._pending = b""
+        self._skipping_long_line = False
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.raw_usage: dict[str, Any] = {}
+        self._text_parts: list[str] = []
+        self._text_len = 0
+        self._saw_text = False
+
+    def feed(self, chunk: bytes) -> None:
+        data = self._pending + chunk if self._pending else chunk
+        start = 0
+        while True:
+            newline = data.find(b"\n", start)
+            if newline == -1:
+                break
+            if self._skipping_long_line:
+                self._skipping_long_line = False
+            else:
+                self._handle_line(data[start:newline])
+            start = newline + 1
+        rest = data[start:]
+        if self._skipping_long_line or len(rest) > _SSE_SNIFF_MAX_LINE_BYTES:
+            self._skipping_long_line = True
+            self._pending = b""
+        else:
+            self._pending = rest
+
+    def result(self) -> tuple[int, int, str | None, dict[str, Any]]:
+        """Return `(input_tokens, output_tokens, text, raw_usage)`, counting a
+        final line left without a trailing newline."""
+        if self._pending:
+            self._handle_line(self._pending)
+            self._pending = b""
+        return (
+            self.input_tokens,
+            self.output_tokens,
+            "".join(self._text_parts) if self._saw_text else None,
+            self.raw_usage,
+        )
+
+    def _handle_line(self, line: bytes) -> None:
         line = line.strip()
-        if not line.startswith("data:"):
-            continue
-        payload = line[len("data:") :].strip()
-        if not payload or payload == "[DONE]":
-            continue
+        if not line.startswith(b"data:"):
+            return
+        if not any(marker in line for marker in _SSE_SNIFF_MARKERS):
+            return
+        payload = line[len(b"data:") :].strip()
         try:
-            event = json.loads(payload)
+            event = json.loads(payload.decode("utf-8", errors="replace"))
         except json.JSONDecodeError:
-            continue
+            return
+        if not isinstance(event, dict):
+            return
         event_type = event.get("type")
         if event_type == "message_start":
             usage = event.get("message", {}).get("usage", {})
-            input_tokens = usage.get("input_tokens", input_tokens)
-            raw_usage.update(usage)
+            self.input_tokens = usage.get("input_tokens", self.input_tokens)
+            self.raw_usage.update(usage)
         elif event_type == "message_delta":
             usage = event.get("usage", {})
-            output_tokens = usage.get("output_tokens", output_tokens)
-            raw_usage.update(usage)
+            self.output_tokens = usage.get("output_tokens", self.output_tokens)
+            self.raw_usage.update(usage)
         elif event_type == "content_block_delta":
             delta = event.get("delta", {})
             if delta.get("type") == "text_delta":
-                text_parts.append(delta.get("text", ""))
-    return (
-        input_tokens,
-        output_tokens,
-        "".join(text_parts) if text_parts else None,
-        raw_usage,
-    )
+                self._append_text(delta.get("text", ""))
+
+    def _append_text(self, text: str) -> None:
+        self._saw_text = True
+        if self._text_limit is None:
+            self._text_parts.append(text)
+            return
+        if self._text_limit <= 0:
+            return
+        room = self._text_limit + 1 - self._text_len
+        if room <= 0 or not text:
+            return
+        kept = text[:room]
+        self._text_parts.append(kept)
+        self._text_len += len(kept)
+
+
+def _parse_anthropic_sse_usage(
+    raw: bytes,
+) -> tuple[int, int, str | None, dict[str, Any]]:
+    """One-shot form of AnthropicSseUsageSniffer for an already-buffered
+    stream — same result as feeding `raw` chunk by chunk."""
+    sniffer = AnthropicSseUsageSniffer()
+    sniffer.feed(raw)
+    return sniffer.result()
 
 
 async def _stream_passthrough_with_usage_tracking(
     resp: httpx.Response,
-    client: httpx.AsyncClient,
     usage_tracker: Any,
     request_id: str,
     auth_info: dict[str, Any],
@@ -586,13 +680,20 @@ async def _stream_passthrough_with_usage_tracking(
     compression_used: str | None = None,
     request: Request | None = None,
     retry_count: int | None = None,
+    preview_chars: int | None = None,
 ) -> AsyncGenerator[bytes, None]:
     """
     Relay a native-Anthropic-format SSE stream verbatim (byte-for-byte, same
     as `_stream_passthrough`) while sniffing usage from the same bytes to
     record it once the stream ends.
+
+    Usage is sniffed incrementally as chunks pass through rather than from
+    the whole stream buffered until the end — a long generation no longer
+    holds every byte in memory, nor parses it all in one burst on the event
+    loop when the stream closes. `preview_chars` bounds how much visible
+    text is kept for the usage record's output preview (None keeps all).
     """
-    raw_chunks: list[bytes] = []
+    sniffer = AnthropicSseUsageSniffer(text_limit=preview_chars)
     try:
         async for chunk in resp.aiter_bytes():
             if request is not None and await request.is_disconnected():
@@ -602,14 +703,11 @@ async def _stream_passthrough_with_usage_tracking(
                     request_id,
                 )
                 return
-            raw_chunks.append(chunk)
+            sniffer.feed(chunk)
             yield chunk
     finally:
         await resp.aclose()
-        await client.aclose()
-        input_tokens, output_tokens, response_text, raw_usage = (
-            _parse_anthropic_sse_usage(b"".join(raw_chunks))
-        )
+        input_tokens, output_tokens, response_text, raw_usage = sniffer.result()
         if usage_tracker and (input_tokens > 0 or output_tokens > 0):
             _fire_and_forget(
                 usage_tracker.record_usage(
@@ -638,5 +736,6 @@ async def _stream_passthrough_with_usage_tracking(
                     raw_usage=raw_usage,
                     start_time=start_time,
                     retry_count=retry_count,
+                    routing=auth_info.get("routing"),
                 )
             )
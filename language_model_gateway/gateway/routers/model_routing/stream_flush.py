@@ -0,0 +1,180 @@
+"""
+Output flush policy for the router's SSE responses — when the bytes the
+response generators produce are handed to the ASGI server as one
+`http.response.body` send ("frame") rather than one send per chunk.
+
+Without it every upstream chunk (passthrough) or converted event (the
+`api_type: openai` and native Bedrock paths) is its own send and socket
+write; a generation of a few thousand tokens is a few thousand tiny frames.
+StreamFlushPolicy merges chunks while they arrive in a burst:
+
+- A frame goes out once it holds `max_bytes`, or once its oldest chunk has
+  waited `max_delay_seconds`.
+- It goes out straight away when the chunk ends or starts a content block
+  (content_block_start — text or tool call —, content_block_stop,
+  message_stop), and so does the chunk after a content_block_start: the
+  first token of every block is never held, nor is the stream's first chunk.
+- When nothing else has arrived and the last chunk came after a pause
+  (more than `max_delay_seconds` since the one before), it goes out
+  immediately too — a slow stream is never delayed, only a fast one merged.
+
+The boundary checks are substring matches on the chunk, so a token that
+happens to contain "message_stop" only costs an early flush.
+
+Note GZipMiddleware never compresses text/event-stream (see api.py), so
+larger frames save sends and syscalls, not compressed bytes.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator
+
+from opentelemetry import metrics
+from starlette.responses import Response, StreamingResponse
+
+from .constants import _STREAM_PREFETCH_MAX_CHUNKS
+from .stream_prefetch import END, NOT_YET, Prefetcher
+
+_meter = metrics.get_meter(__name__)
+_frame_bytes_histogram = _meter.create_histogram(
+    "model_routing.stream.frame_size",
+    unit="By",
+    description="Bytes per SSE frame sent to the client (count: frames sent)",
+)
+_chunk_counter = _meter.create_counter(
+    "model_routing.stream.chunks",
+    description="Chunks the SSE response generators produced, before merging",
+)
+_flush_delay_histogram = _meter.create_histogram(
+    "model_routing.stream.flush_delay",
+    unit="ms",
+    description="How long a frame's oldest chunk was held before being sent",
+)
+
+_BLOCK_START = b"content_block_start"
+_BOUNDARY_MARKERS = (b"content_block_stop", b"message_stop")
+
+
+@dataclass(frozen=True)
+class StreamFlushPolicy:
+    """When merged SSE chunks are flushed; see the module docstring.
+
+    `max_delay_seconds` <= 0 turns merging off (one frame per chunk, as
+    before); `max_bytes` <= 0 means no size limit.
+    """
+
+    max_bytes: int = 0
+    max_delay_seconds: float = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_delay_seconds > 0
+
+    def for_route(self, route: dict[str, Any]) -> StreamFlushPolicy:
+        """This policy with the route's `stream_flush_bytes` and
+        `stream_flush_interval_ms` overrides, if it sets them."""
+        interval_ms = route.get("stream_flush_interval_ms")
+        return StreamFlushPolicy(
+            max_bytes=int(route.get("stream_flush_bytes", self.max_bytes)),
+            max_delay_seconds=(
+                self.max_delay_seconds
+                if interval_ms is None
+                else float(interval_ms) / 1000
+            ),
+        )
+
+    def apply(
+        self, response: Response, attributes: dict[str, str]
+    ) -> StreamingResponse | Response:
+        """Merge `response`'s frames if it's an SSE stream; anything else, or
+        everything when disabled, is returned untouched."""
+        if (
+            self.enabled
+            and isinstance(response, StreamingResponse)
+            and (response.media_type or "").startswith("text/event-stream")
+        ):
+            response.body_iterator = flush_frames(
+                response.body_iterator, self, attributes
+            )
+        return response
+
+
+def _frame(
+    buffer: list[bytes], held_since: float, reason: str, attributes: dict[str, str]
+) -> bytes:
+    frame = buffer[0] if len(buffer) == 1 else b"".join(buffer)
+    _frame_bytes_histogram.record(len(frame), attributes)
+    _flush_delay_histogram.record(
+        (time.monotonic() - held_since) * 1000, {**attributes, "reason": reason}
+    )
+    return frame
+
+
+async def flush_frames(
+    source: Any, policy: StreamFlushPolicy, attributes: dict[str, str]
+) -> AsyncGenerator[bytes, None]:
+    """`source`'s bytes, merged into frames per `policy`. `attributes` label
+    the model_routing.stream.* metrics (e.g. api_type and tier)."""
+    chunks = Prefetcher(source, _STREAM_PREFETCH_MAX_CHUNKS)
+    buffer: list[bytes] = []
+    size = 0
+    held_since = 0.0
+    last_arrival = 0.0
+    bursting = False
+    chunk: Any
+    # The stream's first chunk, and the first after a content_block_start.
+    eager = True
+    try:
+        while True:
+            if buffer and not chunks.ready():
+                wait = held_since + policy.max_delay_seconds - time.monotonic()
+                chunk = (
+                    await chunks.get(timeout=wait) if bursting and wait > 0 else NOT_YET
+                )
+                if chunk is NOT_YET:
+                    yield _frame(
+                        buffer,
+                        held_since,
+                        "interval" if bursting else "idle",
+                        attributes,
+                    )
+                    buffer, size = [], 0
+                    continue
+            else:
+                chunk = await chunks.get()
+            if chunk is END:
+                break
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            now = time.monotonic()
+            bursting = now - last_arrival < policy.max_delay_seconds
+            last_arrival = now
+            _chunk_counter.add(1, attributes)
+            if not buffer:
+                held_since = now
+            buffer.append(chunk)
+            size += len(chunk)
+
+            starts_block = _BLOCK_START in chunk
+            if eager or starts_block or any(m in chunk for m in _BOUNDARY_MARKERS):
+                reason = "boundary" if not eager or starts_block else "first"
+            elif 0 < policy.max_bytes <= size:
+                reason = "size"
+            elif now - held_since >= policy.max_delay_seconds:
+                reason = "interval"
+            else:
+                continue
+            eager = starts_block
+            yield _frame(buffer, held_since, reason, attributes)
+            buffer, size = [], 0
+    except Exception:
+        # What already arrived still goes out ahead of the error.
+        if buffer:
+            yield _frame(buffer, held_since, "error", attributes)
+        raise
+    finally:
+        await chunks.aclose()
+    if buffer:
+        yield _frame(buffer, held_since, "end", attributes)
@@ -0,0 +1,72 @@
+"""
+Read-ahead for the router's streaming generators.
+
+Prefetcher pulls an async iterator on a task of its own into a bounded
+queue, so the consumer can tell whether the next item has already arrived
+— and so wait for more of a burst — instead of only ever awaiting it.
+Used by stream_converter._stream_oai_sdk_to_anthropic and
+stream_flush.flush_frames.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, AsyncGenerator
+
+# Prefetcher.get() results: the source is exhausted / nothing arrived in time.
+END = object()
+NOT_YET = object()
+
+
+class _SourceFailed:
+    __slots__ = ("error",)
+
+    def __init__(self, error: Exception) -> None:
+        self.error = error
+
+
+class Prefetcher:
+    """Pulls an async iterator on a task of its own into a bounded queue, so
+    its consumer can tell which items have already arrived."""
+
+    def __init__(self, source: AsyncGenerator[Any, None], max_items: int) -> None:
+        self._queue: asyncio.Queue[Any] = asyncio.Queue(max_items)
+        self._source = source
+        self._task = asyncio.create_task(self._pump(source))
+
+    async def _pump(self, source: AsyncGenerator[Any, None]) -> None:
+        try:
+            async for item in source:
+                await self._queue.put(item)
+        except Exception as exc:
+            await self._queue.put(_SourceFailed(exc))
+        else:
+            await self._queue.put(END)
+
+    def ready(self) -> bool:
+        """Whether the next item has already arrived."""
+        return not self._queue.empty()
+
+    async def get(self, timeout: float | None = None) -> Any:
+        """The next item, END once the source is exhausted, or NOT_YET if
+        nothing arrived within `timeout`. Re-raises the source's error."""
+        if timeout is None or self.ready():
+            item = await self._queue.get()
+        else:
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout)
+            except TimeoutError:
+                return NOT_YET
+        if isinstance(item, _SourceFailed):
+            raise item.error
+        return item
+
+    async def aclose(self) -> None:
+        """Stop reading and close the source, running its cleanup even if it
+        was left suspended with the queue full."""
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        await self._source.aclose()
@@ -7,22 +7,124 @@ delimiters, BOS/EOS, tool-call markers, generation prompt) that the character-ba
 heuristic misses.
 
 Tokenizer objects are cached after the first load so repeated requests are cheap.
+The FastAPI lifespan preloads every tokenizer named in the route config
+(preload_tokenizers) so the first request after a deploy doesn't pay for
+`AutoTokenizer.from_pretrained`; a failed load is retried with exponential
+backoff rather than given up on for the life of the process.
+
+Per-message counts (count_oai_message_tokens) are cached too, keyed by message
+content: coding sessions resend the same history every turn, so trimming an
+over-budget conversation only tokenizes the messages that are new since the
+last request.
 """
 
 from __future__ import annotations
 
+import asyncio
 import functools
+import hashlib
 import json
 import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
 from typing import Any
 
+from opentelemetry import metrics
+
 from language_model_gateway.gateway.utilities.logger.log_levels import SRC_LOG_LEVELS
 
+from . import json_codec
+
 logger = logging.getLogger(__name__)
 logger.setLevel(SRC_LOG_LEVELS.get("LLM", logging.INFO))
 
-# Models that have permanently failed to load — skip future attempts.
-_UNAVAILABLE: set[str] = set()
+_meter = metrics.get_meter(__name__)
+_tokenizer_load_histogram = _meter.create_histogram(
+    "model_routing.tokenizer.load_time",
+    unit="s",
+    description="Time to load a HuggingFace tokenizer, by model and outcome",
+)
+_tokenizer_memory_histogram = _meter.create_histogram(
+    "model_routing.tokenizer.load_memory",
+    unit="By",
+    description="Process RSS growth while loading a tokenizer",
+)
+
+# `transformers` isn't installed — no point retrying, for any model.
+_TRANSFORMERS_MISSING = False
+
+# Models whose last load failed: (consecutive failures, monotonic time before
+# which no new attempt is made). Hub timeouts and rate limits are transient,
+# so a failure backs off instead of disabling the tokenizer for good.
+_load_failures: dict[str, tuple[int, float]] = {}
+_LOAD_RETRY_BASE_S = 30.0
+_LOAD_RETRY_MAX_S = 1800.0
+
+# Upper bound on startup preloading; loads still running after this keep
+# going in the background and the worker starts serving anyway.
+_PRELOAD_TIMEOUT_S = 120.0
+
+# Tokens the chat template wraps around every message on top of its content
+# (`<|im_start|>`, role, newline, `<|im_end|>`, newline for Qwen). Per-message
+# counts are an approximation of each message's share of the full templated
+# count — callers re-verify with count_oai_request_tokens before relying on
+# a total built from them.
+_MESSAGE_FRAMING_TOKENS = 5
+
+# Entries are one int each; 50k covers a few hundred concurrent long sessions.
+_MESSAGE_TOKEN_CACHE_MAX_ENTRIES = 50_000
+
+
+class _TokenCountCache:
+    """Thread-safe LRU of token counts, keyed by (model, content digest).
+
+    Used for per-message counts here and for whole-body count_tokens results
+    in anthropic_token_counter.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, bytes], int] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[str, bytes]) -> int | None:
+        with self._lock:
+            count = self._entries.get(key)
+            if count is not None:
+                self._entries.move_to_end(key)
+            return count
+
+    def put(self, key: tuple[str, bytes], count: int) -> None:
+        with self._lock:
+            self._entries[key] = count
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_message_token_cache = _TokenCountCache(_MESSAGE_TOKEN_CACHE_MAX_ENTRIES)
+
+# Tokenizer calls run on TokenizerExecutor's threads. A HuggingFace fast
+# tokenizer can raise "Already borrowed" if two threads use the same instance
+# at once (encode may reconfigure truncation/padding on the shared Rust
+# object), so calls are serialized per model — still off the event loop.
+_tokenizer_locks: dict[str, threading.Lock] = {}
+_tokenizer_locks_guard = threading.Lock()
+
+
+def _tokenizer_lock(tokenizer_model: str) -> threading.Lock:
+    with _tokenizer_locks_guard:
+        return _tokenizer_locks.setdefault(tokenizer_model, threading.Lock())
 
 
 def _flatten_message_content(messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
@@ -90,7 +192,7 @@ def _flatten_message_content(messages: list[dict[str, Any]]) -> list[dict[str, A
 
 @functools.lru_cache(maxsize=8)
 def _load_tokenizer(model_id: str) -> Any:
-    """Load and cache a HuggingFace tokenizer. Logs on first use; cached forever."""
+    """Load and cache a HuggingFace tokenizer. Failures aren't cached."""
     from transformers import AutoTokenizer
 
     logger.info(
@@ -100,24 +202,42 @@ def _load_tokenizer(model_id: str) -> Any:
     return AutoTokenizer.from_pretrained(model_id)  # nosec B615 — model_id comes from operator config, not user input; revision pinning would require per-deployment SHA management outside this layer; trust_remote_code not needed for standard models
 
 
-def count_oai_request_tokens(
-    oai_body: dict[str, Any], tokenizer_model: str
-) -> int | None:
-    """
-    Count tokens for an OpenAI-format request using the Qwen tokenizer.
+def _rss_bytes() -> int | None:
+    """Resident set size of this process, where /proc is available."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
 
-    Applies the model's Jinja2 chat template so the count includes all overhead:
-    system/user/assistant role tokens, tool-schema encoding, generation prompt, etc.
 
-    Returns None if the tokenizer cannot be loaded (e.g. transformers not installed,
-    model not cached). The caller should fall back gracefully in that case.
-    """
-    if tokenizer_model in _UNAVAILABLE:
+def _record_load_failure(tokenizer_model: str) -> float:
+    """Schedule the next load attempt; returns the backoff in seconds."""
+    failures = _load_failures.get(tokenizer_model, (0, 0.0))[0] + 1
+    delay = min(_LOAD_RETRY_MAX_S, _LOAD_RETRY_BASE_S * 2.0 ** (failures - 1))
+    _load_failures[tokenizer_model] = (failures, time.monotonic() + delay)
+    return delay
+
+
+def _get_tokenizer(tokenizer_model: str) -> Any | None:
+    """The loaded tokenizer, or None (logged) if it can't be loaded right now."""
+    global _TRANSFORMERS_MISSING
+    if _TRANSFORMERS_MISSING:
+        return None
+    failure = _load_failures.get(tokenizer_model)
+    if failure is not None and time.monotonic() < failure[1]:
         return None
+    start = time.perf_counter()
     try:
-        tok = _load_tokenizer(tokenizer_model)
+        # Under the lock so concurrent first calls load the model once.
+        with _tokenizer_lock(tokenizer_model):
+            loaded = _load_tokenizer.cache_info().currsize
+            rss_before = _rss_bytes()
+            tok = _load_tokenizer(tokenizer_model)
+            rss_after = _rss_bytes()
+            fresh_load = _load_tokenizer.cache_info().currsize > loaded
     except ImportError:
-        _UNAVAILABLE.add(tokenizer_model)
+        _TRANSFORMERS_MISSING = True
         logger.warning(
             "[coding-model-router] `transformers` not installed; "
             "tokenizer-based token counting unavailable for '%s'. "
@@ -126,15 +246,98 @@ def count_oai_request_tokens(
         )
         return None
     except Exception as exc:
-        _UNAVAILABLE.add(tokenizer_model)
+        delay = _record_load_failure(tokenizer_model)
+        _tokenizer_load_histogram.record(
+            time.perf_counter() - start,
+            {"tokenizer_model": tokenizer_model, "outcome": "error"},
+        )
         logger.warning(
             "[coding-model-router] failed to load tokenizer '%s': %s — "
-            "falling back to character-based estimation",
+            "falling back to character-based estimation; retrying in %.0fs",
             tokenizer_model,
             exc,
+            delay,
         )
         return None
+    if fresh_load:
+        _load_failures.pop(tokenizer_model, None)
+        elapsed = time.perf_counter() - start
+        attributes = {"tokenizer_model": tokenizer_model}
+        _tokenizer_load_histogram.record(elapsed, {**attributes, "outcome": "ok"})
+        rss_growth = None
+        if rss_before is not None and rss_after is not None:
+            rss_growth = max(0, rss_after - rss_before)
+            _tokenizer_memory_histogram.record(rss_growth, attributes)
+        logger.info(
+            "[coding-model-router] loaded tokenizer '%s' in %.2fs (RSS +%s MiB)",
+            tokenizer_model,
+            elapsed,
+            "?" if rss_growth is None else f"{rss_growth / 2**20:.1f}",
+        )
+    return tok
+
+
+def _warm_up(tokenizer_model: str) -> bool:
+    """Load a tokenizer and render its chat template once (compiling the
+    Jinja template), so the first real request pays for neither."""
+    tok = _get_tokenizer(tokenizer_model)
+    if tok is None:
+        return False
+    body = {"messages": [{"role": "user", "content": "warm-up"}]}
+    with _tokenizer_lock(tokenizer_model):
+        _count_with_template(tok, body, tokenizer_model)
+    return True
+
+
+async def preload_tokenizers(tokenizer_models: Iterable[str]) -> dict[str, bool]:
+    """
+    Load the given tokenizers concurrently, off the event loop.
+
+    Called from the FastAPI lifespan before the worker starts serving. Returns
+    whether each one loaded; a failure isn't fatal — that model's requests use
+    the character estimate until a later retry (see _get_tokenizer) succeeds.
+    Loads that outlast _PRELOAD_TIMEOUT_S carry on in the background.
+    """
+    models = sorted(set(tokenizer_models))
+    if not models:
+        return {}
+    tasks = [asyncio.create_task(asyncio.to_thread(_warm_up, m)) for m in models]
+    start = time.perf_counter()
+    done, _pending = await asyncio.wait(tasks, timeout=_PRELOAD_TIMEOUT_S)
+    results: dict[str, bool] = {}
+    for model, task in zip(models, tasks):
+        results[model] = task in done and task.exception() is None and task.result()
+    logger.info(
+        "[coding-model-router] preloaded %d/%d tokenizer(s) in %.2fs",
+        sum(results.values()),
+        len(models),
+        time.perf_counter() - start,
+    )
+    return results
+
+
+def count_oai_request_tokens(
+    oai_body: dict[str, Any], tokenizer_model: str
+) -> int | None:
+    """
+    Count tokens for an OpenAI-format request using the Qwen tokenizer.
+
+    Applies the model's Jinja2 chat template so the count includes all overhead:
+    system/user/assistant role tokens, tool-schema encoding, generation prompt, etc.
+
+    Returns None if the tokenizer cannot be loaded (e.g. transformers not installed,
+    model not cached). The caller should fall back gracefully in that case.
+    """
+    tok = _get_tokenizer(tokenizer_model)
+    if tok is None:
+        return None
+    with _tokenizer_lock(tokenizer_model):
+        return _count_with_template(tok, oai_body, tokenizer_model)
+
 
+def _count_with_template(
+    tok: Any, oai_body: dict[str, Any], tokenizer_model: str
+) -> int | None:
     # Flatten list-typed content blocks to strings; the Qwen Jinja2 chat template
     # requires string content and raises "Can only get item pairs from a mapping"
     # when it encounters OpenAI-format content block arrays.
@@ -187,3 +390,49 @@ def count_oai_request_tokens(
             return None
 
     return len(tok.encode(text))
+
+
+def _message_text(message: dict[str, Any]) -> str:
+    """The text a message contributes to the templated prompt, minus framing."""
+    (flat,) = _flatten_message_content([message])
+    parts: list[str] = [str(flat.get("role", ""))]
+    if isinstance(content := flat.get("content"), str):
+        parts.append(content)
+    for tc in flat.get("tool_calls") or []:
+        fn = tc.get("function") if isinstance(tc, dict) else None
+        if isinstance(fn, dict):
+            parts.append(str(fn.get("name", "")))
+            parts.append(json.dumps(fn.get("arguments", {}), ensure_ascii=False))
+    return "\n".join(parts)
+
+
+def count_oai_message_tokens(
+    message: dict[str, Any], tokenizer_model: str
+) -> int | None:
+    """
+    Approximate token count for a single OpenAI-format message.
+
+    Encodes the message's content (and tool-call names/arguments) without the
+    chat template and adds a fixed per-message framing cost, so a conversation's
+    total can be adjusted by subtraction when messages are dropped or
+    compressed, instead of re-templating and re-encoding the whole thing.
+    Cached across requests by message content.
+
+    Returns None if the tokenizer cannot be loaded.
+    """
+    key = (
+        tokenizer_model,
+        hashlib.blake2b(json_codec.dumps(message), digest_size=16).digest(),
+    )
+    cached = _message_token_cache.get(key)
+    if cached is not None:
+        return cached
+    tok = _get_tokenizer(tokenizer_model)
+    if tok is None:
+        return None
+    text = _message_text(message)
+    with _tokenizer_lock(tokenizer_model):
+        encoded = tok.encode(text, add_special_tokens=False)
+    count = len(encoded) + _MESSAGE_FRAMING_TOKENS
+    _message_token_cache.put(key, count)
+    return count
@@ -0,0 +1,156 @@
+"""
+Bounded thread pool for tokenizer work, so preflight token counting never
+runs on the event loop.
+
+`apply_chat_template` (Jinja rendering) plus `tok.encode` on a multi-MB
+Claude Code transcript takes tens of milliseconds; run inline in
+`proxy_messages`, that stalled every other request and stream on the worker
+for the duration. The HuggingFace fast tokenizers do their encoding in Rust
+with the GIL released, so a small thread pool is enough — no process pool
+(and no pickling of multi-MB bodies) needed.
+
+Backpressure: at most `max_pending` calls may be queued or running. Beyond
+that, and on a call exceeding `timeout_seconds`, `run()` returns None
+immediately and the caller falls back to the character estimate — a request
+is never held up waiting for the tokenizer. A timed-out call keeps its slot
+until its thread actually finishes, so slow calls can't pile up unbounded
+work behind the pool.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from opentelemetry import metrics
+
+from language_model_gateway.gateway.utilities.logger.log_levels import SRC_LOG_LEVELS
+
+logger = logging.getLogger(__name__)
+logger.setLevel(SRC_LOG_LEVELS.get("LLM", logging.INFO))
+
+_meter = metrics.get_meter(__name__)
+_tokenizer_call_histogram = _meter.create_histogram(
+    "model_routing.tokenizer.call_time",
+    unit="s",
+    description="Wall time of tokenizer calls run on the tokenizer executor",
+)
+_tokenizer_fallback_counter = _meter.create_counter(
+    "model_routing.tokenizer.fallbacks",
+    description="Tokenizer calls abandoned for the character estimate",
+)
+
+_T = TypeVar("_T")
+
+
+class TokenizerExecutor:
+    """Runs tokenizer calls on a bounded thread pool with a timeout.
+
+    Registered as a container singleton (see
+    LanguageModelGatewayContainerFactory) and shut down from the FastAPI
+    lifespan; CodingModelRouter builds a private one when none is injected
+    (e.g. in tests).
+    """
+
+    def __init__(
+        self,
+        *,
+        max_workers: int = 2,
+        max_pending: int = 16,
+        timeout_seconds: float = 2.0,
+    ) -> None:
+        self._max_workers = max_workers
+        self._max_pending = max(max_workers, max_pending)
+        self._timeout_seconds = timeout_seconds
+        self._pending = 0
+        self._pool: ThreadPoolExecutor | None = None
+
+    @property
+    def pending(self) -> int:
+        """Calls currently queued or running (including timed-out ones)."""
+        return self._pending
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self._max_workers,
+                thread_name_prefix="model-routing-tokenizer",
+            )
+        return self._pool
+
+    def _release(self) -> None:
+        self._pending -= 1
+
+    def _release_threadsafe(
+        self, loop: asyncio.AbstractEventLoop, _future: Future[Any]
+    ) -> None:
+        # Called on the pool thread; the counter is only touched on the loop.
+        try:
+            loop.call_soon_threadsafe(self._release)
+        except RuntimeError:
+            pass  # loop already closed (shutdown) — nothing left to account for
+
+    async def run(
+        self, fn: Callable[..., _T], *args: Any, operation: str = "tokenize"
+    ) -> _T | None:
+        """Run `fn(*args)` on the pool; None if saturated, timed out or failed."""
+        if self._pending >= self._max_pending:
+            _tokenizer_fallback_counter.add(
+                1, {"operation": operation, "reason": "saturated"}
+            )
+            logger.warning(
+                "[coding-model-router] tokenizer executor saturated (%d pending) — "
+                "using character estimate for %s",
+                self._pending,
+                operation,
+            )
+            return None
+        start = time.perf_counter()
+        future = self._get_pool().submit(fn, *args)
+        self._pending += 1
+        # Released from the pool thread's completion, not from here: a call
+        # that times out below still occupies a worker until it finishes.
+        future.add_done_callback(
+            functools.partial(self._release_threadsafe, asyncio.get_running_loop())
+        )
+        try:
+            result = await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(future)),
+                timeout=self._timeout_seconds,
+            )
+        except TimeoutError:
+            _tokenizer_fallback_counter.add(
+                1, {"operation": operation, "reason": "timeout"}
+            )
+            logger.warning(
+                "[coding-model-router] tokenizer %s exceeded %.1fs — using "
+                "character estimate",
+                operation,
+                self._timeout_seconds,
+            )
+            return None
+        except Exception:
+            _tokenizer_fallback_counter.add(
+                1, {"operation": operation, "reason": "error"}
+            )
+            logger.warning(
+                "[coding-model-router] tokenizer %s failed — using character estimate",
+                operation,
+                exc_info=True,
+            )
+            return None
+        _tokenizer_call_histogram.record(
+            time.perf_counter() - start, {"operation": operation}
+        )
+        return result
+
+    def shutdown(self) -> None:
+        """Stop accepting work; running calls finish in the background."""
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
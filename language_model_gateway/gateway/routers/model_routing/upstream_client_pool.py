@@ -0,0 +1,205 @@
+"""
+Pooled upstream HTTP clients for CodingModelRouter — one long-lived
+httpx.AsyncClient per (origin, auth, region) instead of a fresh client (and
+therefore a fresh TCP + TLS handshake) on every proxied request and on every
+throttle retry.
+
+Kept separate from bedrock_client.py (retry/backoff helpers) and
+bedrock_converse_client.py (boto3 client caching for the native Converse
+transport) — this module only owns httpx/openai-SDK client lifecycle for the
+Anthropic-passthrough, Anthropic-format Bedrock and Bedrock Mantle paths.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import logging
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit
+
+import httpx
+
+from language_model_gateway.gateway.utilities.logger.log_levels import SRC_LOG_LEVELS
+
+from .aws_auth import SigV4Auth
+
+if TYPE_CHECKING:
+    import openai
+
+logger = logging.getLogger(__name__)
+logger.setLevel(SRC_LOG_LEVELS.get("LLM", logging.INFO))
+
+_PoolKey = tuple[str, str, str | None, bool]
+
+
+def _http2_available() -> bool:
+    """Whether the optional `h2` package httpx needs for HTTP/2 is installed.
+
+    httpx raises ImportError at client construction time if `http2=True` is
+    requested without it, so check up front and fall back to HTTP/1.1
+    keep-alive instead of failing every request.
+    """
+    return importlib.util.find_spec("h2") is not None
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+def _non_persisting_cookie_jar() -> CookieJar:
+    """A cookie jar that refuses to store any cookie.
+
+    A per-request client never outlived the request it was built for, so
+    upstream `Set-Cookie` headers (e.g. load balancer affinity cookies) were
+    harmless. A pooled client is shared across every user of this worker —
+    persisting those cookies would replay one user's upstream cookies on
+    another user's request.
+    """
+    return CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+
+
+class UpstreamClientPool:
+    """Per-worker registry of pooled httpx.AsyncClients for CodingModelRouter.
+
+    Clients are keyed by (origin, auth, aws_region, sign_requests): the
+    connection pool itself only depends on the origin, but `auth="aws"`
+    clients used by the openai SDK carry a region-specific SigV4Auth, and
+    must never be handed to a passthrough route (or vice versa). Headers —
+    including the client's own Authorization header on passthrough routes —
+    are always set per request, never on the shared client.
+
+    `timeout=None` matches the per-request clients this replaces: streamed
+    generations routinely exceed any fixed read timeout, and throttle/retry
+    behavior is handled by the caller rather than by httpx.
+
+    Registered as a container singleton (see LanguageModelGatewayContainerFactory)
+    and closed from the FastAPI lifespan on shutdown; CodingModelRouter
+    builds a private one when none is injected (e.g. in tests).
+    """
+
+    def __init__(
+        self,
+        *,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry_seconds: float = 30.0,
+        http2: bool = True,
+    ) -> None:
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry_seconds,
+        )
+        self._http2 = http2 and _http2_available()
+        if http2 and not self._http2:
+            logger.warning(
+                "[coding-model-router] HTTP/2 requested for upstream clients but "
+                "the `h2` package is not installed — falling back to HTTP/1.1 "
+                "keep-alive"
+            )
+        self._clients: dict[_PoolKey, httpx.AsyncClient] = {}
+        self._openai_clients: dict[
+            tuple[str, str, str | None],
+            tuple[httpx.AsyncClient, openai.AsyncOpenAI],
+        ] = {}
+
+    @property
+    def http2(self) -> bool:
+        return self._http2
+
+    def get_client(
+        self,
+        url: str,
+        *,
+        auth: str = "passthrough",
+        aws_region: str | None = None,
+        sign_requests: bool = False,
+    ) -> httpx.AsyncClient:
+        """Return the shared client for `url`'s origin, creating it on first use.
+
+        `sign_requests=True` attaches SigV4Auth for `aws_region` to the client
+        itself — only for callers (the openai SDK) that can't sign each
+        request explicitly. Anthropic-format Bedrock requests are signed by
+        the caller (see _sign_bedrock) and use an unsigned client.
+        """
+        key: _PoolKey = (_origin(url), auth, aws_region, sign_requests)
+        client = self._clients.get(key)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(  # nosec B113
+                auth=(
+                    SigV4Auth({"aws_region": aws_region or "us-east-1"})
+                    if sign_requests
+                    else None
+                ),
+                timeout=None,
+                limits=self._limits,
+                http2=self._http2,
+                cookies=_non_persisting_cookie_jar(),
+            )
+            self._clients[key] = client
+            logger.info(
+                "[coding-model-router] opened pooled upstream client origin=%s "
+                "auth=%s region=%s http2=%s",
+                key[0],
+                auth,
+                aws_region,
+                self._http2,
+            )
+        return client
+
+    def get_openai_client(
+        self,
+        base_url: str,
+        *,
+        auth: str = "passthrough",
+        aws_region: str | None = None,
+    ) -> openai.AsyncOpenAI:
+        """Return a cached openai.AsyncOpenAI bound to the pooled httpx client.
+
+        The SDK wrapper is cheap but not free (it builds its own headers,
+        retry config and resource objects), so it's cached alongside the
+        httpx client it wraps. SigV4 signing happens on the httpx client,
+        since the SDK has no per-request auth hook.
+        """
+        import openai
+
+        http_client = self.get_client(
+            base_url,
+            auth=auth,
+            aws_region=aws_region,
+            sign_requests=auth == "aws",
+        )
+        key = (base_url, auth, aws_region)
+        cached = self._openai_clients.get(key)
+        # Rebuilt if the underlying httpx client was itself replaced (e.g.
+        # after aclose()), so the SDK never holds a closed client.
+        if cached is not None and cached[0] is http_client:
+            return cached[1]
+        _placeholder_key = "dummy"  # pragma: allowlist secret
+        oai_client = openai.AsyncOpenAI(
+            api_key=_placeholder_key,
+            base_url=base_url,
+            http_client=http_client,
+            max_retries=0,
+        )
+        self._openai_clients[key] = (http_client, oai_client)
+        return oai_client
+
+    async def aclose(self) -> None:
+        """Close every pooled client. Safe to call more than once; a later
+        get_client() call simply opens a fresh client."""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        # The SDK wrappers don't own any connections of their own — they
+        # only reference the httpx clients closed below.
+        self._openai_clients.clear()
+        for client in clients:
+            try:
+                await client.aclose()
+            except Exception:
+                logger.warning(
+                    "[coding-model-router] failed to close pooled upstream client",
+                    exc_info=True,
+                )
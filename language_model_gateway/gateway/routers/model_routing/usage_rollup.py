@@ -0,0 +1,237 @@
+"""Time-bucketed usage rollups for model routing.
+
+Alongside each per-request usage record, UsageTracker `$inc`s one document
+per granularity (minute, hour, day) in `{prefix}-{granularity}`, keyed by
+(bucket_start, model, model_tier, backend, user_id, account_uuid). A
+dashboard asking "tokens per model per hour" or "spend per user per day"
+then reads O(buckets) documents instead of running `$group` over every
+request ever recorded.
+
+The key is the document's `_id`, so concurrent upserts from several
+workers can't create duplicate buckets; the same fields are also stored
+flat (via `$setOnInsert`) for querying. UsageRollupReader serves them to
+UsageRollupRouter.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timezone
+from typing import Any
+
+from pydantic import BaseModel
+
+from .mongo_client_provider import MongoClientProvider
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_GRANULARITIES: tuple[str, ...] = ("minute", "hour", "day")
+
+# Rollup key fields, in `_id` order (embedded-document equality is
+# order-sensitive, so this order must never change).
+_KEY_FIELDS: tuple[str, ...] = (
+    "bucket_start",
+    "model",
+    "model_tier",
+    "backend",
+    "user_id",
+    "account_uuid",
+)
+
+# usage record field -> rollup counter
+_COUNTER_FIELDS: dict[str, str] = {
+    "input_tokens": "input_tokens",
+    "output_tokens": "output_tokens",
+    "total_tokens": "total_tokens",
+    "cost_usd": "cost_usd",
+    "anthropic_cost_usd": "anthropic_cost_usd",
+    "cost_savings_usd": "cost_savings_usd",
+    "retry_count": "retries",
+}
+
+
+def bucket_start(timestamp: datetime, granularity: str) -> datetime:
+    """Start of the `granularity` bucket containing `timestamp` (UTC)."""
+    timestamp = timestamp.astimezone(timezone.utc)
+    if granularity == "minute":
+        return timestamp.replace(second=0, microsecond=0)
+    if granularity == "hour":
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    if granularity == "day":
+        return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+    raise ValueError(f"unknown rollup granularity: {granularity}")
+
+
+def rollup_collection_name(prefix: str, granularity: str) -> str:
+    return f"{prefix}-{granularity}"
+
+
+def merge_rollup_updates(
+    records: list[dict[str, Any]],
+) -> dict[str, dict[tuple[Any, ...], tuple[dict[str, Any], dict[str, Any]]]]:
+    """Fold usage records into one ($id key, $inc) pair per bucket, per
+    granularity — a batch of requests in the same bucket is one upsert."""
+    merged: dict[str, dict[tuple[Any, ...], tuple[dict[str, Any], dict[str, Any]]]] = {
+        granularity: {} for granularity in ROLLUP_GRANULARITIES
+    }
+    for record in records:
+        timestamp = record.get("timestamp")
+        if not isinstance(timestamp, datetime):
+            continue
+        increments: dict[str, Any] = {"requests": 1}
+        for source, counter in _COUNTER_FIELDS.items():
+            value = record.get(source)
+            if isinstance(value, (int, float)):
+                increments[counter] = value
+        for granularity in ROLLUP_GRANULARITIES:
+            key = {
+                field: (
+                    bucket_start(timestamp, granularity)
+                    if field == "bucket_start"
+                    else record.get(field)
+                )
+                for field in _KEY_FIELDS
+            }
+            key_tuple = tuple(key.values())
+            existing = merged[granularity].get(key_tuple)
+            if existing is None:
+                merged[granularity][key_tuple] = (key, dict(increments))
+                continue
+            inc = existing[1]
+            for counter, value in increments.items():
+                inc[counter] = round(inc.get(counter, 0) + value, 6)
+    return merged
+
+
+class UsageRollupBucket(BaseModel):
+    bucket_start: datetime
+    model: str | None
+    model_tier: str | None
+    backend: str | None
+    user_id: str | None
+    account_uuid: str | None
+    requests: int
+    input_tokens: int
+    output_tokens: int
+    total_tokens: int
+    cost_usd: float
+    anthropic_cost_usd: float
+    cost_savings_usd: float
+    retries: int
+
+
+class UsageRollups(BaseModel):
+    granularity: str
+    buckets: list[UsageRollupBucket]
+
+
+class UsageRollupReader:
+    """Read-only reader for the usage rollup collections."""
+
+    def __init__(
+        self,
+        mongo_uri: str,
+        db_name: str = "llm_storage",
+        collection_prefix: str = "model-router-usage-rollup",
+        enabled: bool = True,
+        client_provider: MongoClientProvider | None = None,
+    ) -> None:
+        self._mongo_uri = mongo_uri
+        self._db_name = db_name
+        self._collection_prefix = collection_prefix
+        self._enabled = enabled
+        self._client_provider = client_provider
+        self._client: Any | None = None
+        self._db: Any | None = None
+
+    async def _ensure_connected(self) -> None:
+        """Ensure MongoDB connection is established."""
+        if not self._enabled or self._db is not None:
+            return
+
+        try:
+            self._client = MongoClientProvider.client_for(
+                self._client_provider, self._mongo_uri
+            )
+            self._db = self._client[self._db_name]
+            logger.info(
+                "[usage_rollup] Connected to MongoDB: %s.%s-*",
+                self._db_name,
+                self._collection_prefix,
+            )
+        except Exception as e:
+            logger.warning(
+                "[usage_rollup] Failed to connect to MongoDB: %s. "
+                "Usage rollup queries will be disabled.",
+                e,
+            )
+            self._enabled = False
+
+    async def get_rollups(
+        self,
+        granularity: str,
+        start: datetime,
+        end: datetime,
+        *,
+        model: str | None = None,
+        backend: str | None = None,
+        user_id: str | None = None,
+        account_uuid: str | None = None,
+        limit: int = 1000,
+    ) -> list[UsageRollupBucket] | None:
+        """Buckets starting in [start, end), oldest first; None if MongoDB
+        isn't available."""
+        await self._ensure_connected()
+        if self._db is None:
+            return None
+
+        query: dict[str, Any] = {"bucket_start": {"$gte": start, "$lt": end}}
+        for field, value in (
+            ("model", model),
+            ("backend", backend),
+            ("user_id", user_id),
+            ("account_uuid", account_uuid),
+        ):
+            if value is not None:
+                query[field] = value
+
+        collection = self._db[
+            rollup_collection_name(self._collection_prefix, granularity)
+        ]
+        try:
+            cursor = collection.find(query).sort("bucket_start", 1).limit(limit)
+            docs = [doc async for doc in cursor]
+        except Exception as e:
+            if self._client_provider is not None:
+                self._client_provider.report_failure("usage_rollup", e)
+            logger.warning("[usage_rollup] Failed to read rollups: %s", e)
+            return None
+        if self._client_provider is not None:
+            self._client_provider.report_success()
+
+        return [
+            UsageRollupBucket(
+                bucket_start=doc["bucket_start"],
+                model=doc.get("model"),
+                model_tier=doc.get("model_tier"),
+                backend=doc.get("backend"),
+                user_id=doc.get("user_id"),
+                account_uuid=doc.get("account_uuid"),
+                requests=doc.get("requests", 0),
+                input_tokens=doc.get("input_tokens", 0),
+                output_tokens=doc.get("output_tokens", 0),
+                total_tokens=doc.get("total_tokens", 0),
+                cost_usd=doc.get("cost_usd", 0.0),
+                anthropic_cost_usd=doc.get("anthropic_cost_usd", 0.0),
+                cost_savings_usd=doc.get("cost_savings_usd", 0.0),
+                retries=doc.get("retries", 0),
+            )
+            for doc in docs
+        ]
+
+    async def close(self) -> None:
+        """Close MongoDB connection (unless it's the shared one, which is
+        closed by its MongoClientProvider)."""
+        if self._client is not None and self._client_provider is None:
+            await self._client.close()
+            logger.info("[usage_rollup] MongoDB connection closed")
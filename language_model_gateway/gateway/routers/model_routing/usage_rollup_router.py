@@ -0,0 +1,142 @@
+"""Read endpoint for model-routing usage rollups (see usage_rollup.py).
+
+Unlike the session savings endpoint, this exposes spend across users, so
+every request must carry a verified b.well OIDC bearer token; without a
+TokenReader configured the endpoint rejects everything.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import Literal, Sequence
+
+from fastapi import APIRouter, HTTPException, Query, Request, params
+from oidcauthlib.auth.exceptions.authorization_bearer_token_expired_exception import (
+    AuthorizationBearerTokenExpiredException,
+)
+from oidcauthlib.auth.exceptions.authorization_bearer_token_invalid_exception import (
+    AuthorizationBearerTokenInvalidException,
+)
+from oidcauthlib.auth.token_reader import TokenReader
+
+from language_model_gateway.gateway.routers.model_routing.mongo_client_provider import (
+    MongoClientProvider,
+)
+from language_model_gateway.gateway.routers.model_routing.usage_rollup import (
+    UsageRollupReader,
+    UsageRollups,
+)
+from language_model_gateway.gateway.utilities.logger.log_levels import SRC_LOG_LEVELS
+
+logger = logging.getLogger(__name__)
+logger.setLevel(SRC_LOG_LEVELS.get("LLM", logging.INFO))
+
+_MAX_LIMIT = 10_000
+
+
+class UsageRollupRouter:
+    """Exposes GET {prefix}/usage/rollups."""
+
+    def __init__(
+        self,
+        *,
+        prefix: str = "/v1/model-routing",
+        tags: list[str | Enum] | None = None,
+        dependencies: Sequence[params.Depends] | None = None,
+        mongo_uri: str | None = None,
+        db_name: str = "llm_storage",
+        collection_prefix: str = "model-router-usage-rollup",
+        token_reader: TokenReader | None = None,
+        mongo_client_provider: MongoClientProvider | None = None,
+    ) -> None:
+        self.router = APIRouter(
+            prefix=prefix,
+            tags=tags or ["model-routing-usage"],
+            dependencies=dependencies or [],
+        )
+        self._token_reader = token_reader
+        self._reader: UsageRollupReader | None = None
+        if mongo_uri:
+            self._reader = UsageRollupReader(
+                mongo_uri=mongo_uri,
+                db_name=db_name,
+                collection_prefix=collection_prefix,
+                enabled=True,
+                client_provider=mongo_client_provider,
+            )
+        self._register_routes()
+
+    def _register_routes(self) -> None:
+        self.router.add_api_route(
+            "/usage/rollups",
+            self.get_usage_rollups,
+            methods=["GET"],
+            response_model=UsageRollups,
+            summary="Get time-bucketed model-routing usage",
+            description=(
+                "Returns pre-aggregated token and cost totals per "
+                "(bucket, model, tier, backend, user) for buckets starting in "
+                "[start, end). Requires a b.well OIDC bearer token."
+            ),
+            status_code=200,
+        )
+
+    async def _require_verified_caller(self, request: Request) -> None:
+        auth_header = request.headers.get("authorization")
+        token = (
+            self._token_reader.extract_token(authorization_header=auth_header)
+            if self._token_reader is not None and auth_header
+            else None
+        )
+        if self._token_reader is None or not token:
+            raise HTTPException(status_code=401, detail="bearer token required")
+        try:
+            token_item = await self._token_reader.verify_token_async(token=token)
+        except (
+            AuthorizationBearerTokenExpiredException,
+            AuthorizationBearerTokenInvalidException,
+            ValueError,
+        ) as e:
+            logger.warning(
+                "[usage_rollup] Authorization token failed validation (%s)",
+                type(e).__name__,
+            )
+            token_item = None
+        if token_item is None:
+            raise HTTPException(status_code=401, detail="invalid bearer token")
+
+    async def get_usage_rollups(
+        self,
+        request: Request,
+        granularity: Literal["minute", "hour", "day"] = "hour",
+        start: datetime | None = None,
+        end: datetime | None = None,
+        model: str | None = None,
+        backend: str | None = None,
+        user_id: str | None = None,
+        account_uuid: str | None = None,
+        limit: int = Query(default=1000, ge=1, le=_MAX_LIMIT),
+    ) -> UsageRollups:
+        await self._require_verified_caller(request)
+        if self._reader is None:
+            raise HTTPException(status_code=404, detail="usage tracking is disabled")
+        end = end or datetime.now(timezone.utc)
+        start = start or end - timedelta(days=1)
+        buckets = await self._reader.get_rollups(
+            granularity,
+            start,
+            end,
+            model=model,
+            backend=backend,
+            user_id=user_id,
+            account_uuid=account_uuid,
+            limit=limit,
+        )
+        if buckets is None:
+            raise HTTPException(status_code=503, detail="usage store unavailable")
+        return UsageRollups(granularity=granularity, buckets=buckets)
+
+    def get_router(self) -> APIRouter:
+        return self.router
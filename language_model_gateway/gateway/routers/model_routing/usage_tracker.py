@@ -1,13 +1,72 @@
-"""Usage tracking for model routing - records token usage to MongoDB."""
+"""Usage tracking for model routing - records token usage to MongoDB.
+
+With `write_batch_size` > 1, records are buffered in process and written
+behind the request: every `write_batch_size` records or
+`flush_interval_seconds`, whichever comes first, as one `insert_many` plus
+one `bulk_write` of session-rollup upserts (updates to the same session
+within a batch merged into one). At most `max_pending_writes` records are
+held; past that, new records are dropped and counted rather than letting
+memory grow while Mongo is slow. `close()` drains the buffer.
+
+With a `spool` (see record_spool.py), nothing is dropped for MongoDB being
+slow or down: records that overflow the buffer, or whose write fails or
+takes longer than `write_timeout_seconds`, are appended to the local spool
+together with their session update, and replayed through the same batch
+path once MongoDB answers again. Each record gets its `_id` before it's
+spooled, so a replay of a write that did land is skipped as a duplicate
+rather than credited twice.
+
+With `rollup_collection_prefix` set, every inserted record is also rolled
+into minute/hour/day buckets (see usage_rollup.py) — one `bulk_write` per
+granularity per flush, with same-bucket records merged.
+"""
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
+from collections.abc import Awaitable
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any
 
+from opentelemetry import metrics
+
+from .mongo_client_provider import MongoClientProvider
+from .record_spool import RecordSpool
+from .session_savings_cache import SessionSavingsCache
+from .usage_rollup import (
+    ROLLUP_GRANULARITIES,
+    merge_rollup_updates,
+    rollup_collection_name,
+)
+
 logger = logging.getLogger(__name__)
 
+_meter = metrics.get_meter(__name__)
+_usage_write_batch_histogram = _meter.create_histogram(
+    "model_routing.usage.write_batch_size",
+    description="Usage records written per batched flush",
+)
+_usage_dropped_counter = _meter.create_counter(
+    "model_routing.usage.dropped",
+    description=(
+        "Usage records not written, by reason (overflow, write_error, spool_full)"
+    ),
+)
+
+# MongoDB's duplicate key error: a replayed record that was already written.
+_DUPLICATE_KEY_ERROR = 11000
+# Set on replayed usage records once their rollups and session have been
+# credited. A record whose first write landed but timed out has no such
+# field, so a replay can still tell it apart from one credited by an
+# earlier replay of the same spool batch.
+_CREDITED_FIELD = "credited"
+# With a spool, a failed connect is retried after this long instead of
+# disabling tracking for the life of the worker.
+_CONNECT_RETRY_SECONDS = 30.0
+
 # Maps model_tier (the `tier` label in model-router-config.json) to the cost
 # bucket used on the per-session rollup document. Ordered roughly by list
 # price — "fable" gets its own bucket rather than being folded into one of
@@ -34,6 +93,28 @@ def _truncate(text: str | None, limit: int) -> str | None:
     return text[:limit] + "…"
 
 
+@dataclass
+class _PendingUsageWrite:
+    """A usage record waiting in the write-behind buffer, plus its
+    session-rollup update (None when the session rollup doesn't apply)."""
+
+    record: dict[str, Any]
+    session_id: str | None = None
+    session_update: dict[str, dict[str, Any]] | None = None
+
+
+def _merge_session_update(
+    into: dict[str, dict[str, Any]], update: dict[str, dict[str, Any]]
+) -> None:
+    """Fold one session update into another: $inc fields add, $set fields
+    take the later value."""
+    inc = into.setdefault("$inc", {})
+    for field, value in update.get("$inc", {}).items():
+        inc[field] = round(inc.get(field, 0) + value, 6)
+    if set_fields := update.get("$set"):
+        into.setdefault("$set", {}).update(set_fields)
+
+
 class UsageTracker:
     """Tracks and records token usage to MongoDB for model routing."""
 
@@ -47,6 +128,14 @@ class UsageTracker:
         track_sessions: bool = True,
         capture_previews: bool = False,
         preview_chars: int = 100,
+        write_batch_size: int = 1,
+        flush_interval_seconds: float = 0.5,
+        max_pending_writes: int = 10_000,
+        client_provider: MongoClientProvider | None = None,
+        savings_cache: SessionSavingsCache | None = None,
+        rollup_collection_prefix: str | None = None,
+        spool: RecordSpool | None = None,
+        write_timeout_seconds: float | None = None,
     ) -> None:
         self._mongo_uri = mongo_uri
         self._db_name = db_name
@@ -59,26 +148,61 @@ class UsageTracker:
         self._track_sessions = track_sessions
         self._capture_previews = capture_previews
         self._preview_chars = preview_chars
+        self._client_provider = client_provider
         self._client: Any | None = None
         self._db: Any | None = None
         self._collection: Any | None = None
         self._session_collection: Any | None = None
+        # The savings endpoint's cache; a session's entry is dropped whenever
+        # its rollup is written here.
+        self._savings_cache = savings_cache
+        # None turns the time-bucketed rollups off.
+        self._rollup_collection_prefix = rollup_collection_prefix
+        self._rollup_collections: dict[str, Any] = {}
+        # 1 writes each record as it arrives (insert_one + update_one).
+        self._write_batch_size = max(1, write_batch_size)
+        self._flush_interval_seconds = flush_interval_seconds
+        self._max_pending_writes = max_pending_writes
+        self._pending_writes: list[_PendingUsageWrite] = []
+        self._flush_wakeup = asyncio.Event()
+        self._flush_task: asyncio.Task[None] | None = None
+        self._dropped_writes = 0
+        # None keeps the old behavior: failed writes are dropped and counted.
+        self._spool = spool
+        self._write_timeout_seconds = write_timeout_seconds
+        self._connect_retry_at = 0.0
+
+    def _report_mongo_failure(self, error: BaseException) -> None:
+        if self._client_provider is not None:
+            self._client_provider.report_failure("usage_tracker", error)
+
+    def _report_mongo_success(self) -> None:
+        if self._client_provider is not None:
+            self._client_provider.report_success()
 
     async def _ensure_connected(self) -> None:
         """Ensure MongoDB connection is established."""
         if not self._enabled or self._collection is not None:
             return
+        if time.monotonic() < self._connect_retry_at:
+            return
 
         try:
-            # Deferred import: skip pymongo's import cost when this feature
-            # is disabled (no mongo_uri configured), since _ensure_connected
-            # is then never called.
-            from pymongo import AsyncMongoClient
-
-            self._client = AsyncMongoClient(self._mongo_uri)
+            self._client = MongoClientProvider.client_for(
+                self._client_provider, self._mongo_uri
+            )
             self._db = self._client[self._db_name]
             self._collection = self._db[self._collection_name]
             self._session_collection = self._db[self._session_collection_name]
+            if self._rollup_collection_prefix:
+                self._rollup_collections = {
+                    granularity: self._db[
+                        rollup_collection_name(
+                            self._rollup_collection_prefix, granularity
+                        )
+                    ]
+                    for granularity in ROLLUP_GRANULARITIES
+                }
             logger.info(
                 "[usage_tracker] Connected to MongoDB: %s.%s (sessions: %s)",
                 self._db_name,
@@ -86,12 +210,25 @@ class UsageTracker:
                 self._session_collection_name,
             )
         except Exception as e:
+            if self._spool is not None:
+                logger.warning(
+                    "[usage_tracker] Failed to connect to MongoDB: %s. "
+                    "Spooling usage records; retrying in %.0fs.",
+                    e,
+                    _CONNECT_RETRY_SECONDS,
+                )
+                self._connect_retry_at = time.monotonic() + _CONNECT_RETRY_SECONDS
+                return
             logger.warning(
                 "[usage_tracker] Failed to connect to MongoDB: %s. "
                 "Usage tracking will be disabled.",
                 e,
             )
             self._enabled = False
+            return
+        if self._spool is not None and self._spool.has_pending():
+            # Left behind by an earlier outage, or by an exited worker.
+            self._spool.schedule_replay(self._replay)
 
     async def record_usage(
         self,
@@ -123,6 +260,7 @@ class UsageTracker:
         prompt_text: str | None = None,
         response_text: str | None = None,
         raw_usage: dict[str, Any] | None = None,
+        routing: dict[str, Any] | None = None,
     ) -> None:
         """Record token usage to MongoDB.
 
@@ -140,6 +278,11 @@ class UsageTracker:
         "unknown", and 0 is a meaningful value, not a default standing in
         for missing data.
 
+        `routing` is set when the route has alternates (see failover.py):
+        which candidate served the request, the ones it failed over from,
+        and whether it was hedged (and won). `model`, `backend` and prices
+        are always the serving candidate's.
+
         `raw_usage` is the upstream response's usage object, stored verbatim
         (whatever shape/keys that upstream uses — Anthropic's
         cache_creation_input_tokens/cache_read_input_tokens, Bedrock
@@ -166,7 +309,7 @@ class UsageTracker:
 
         await self._ensure_connected()
 
-        if self._collection is None:
+        if self._collection is None and (self._spool is None or not self._enabled):
             return
 
         end_time = datetime.now(timezone.utc)
@@ -231,14 +374,43 @@ class UsageTracker:
             usage_record["retry_count"] = retry_count
         if raw_usage:
             usage_record["raw_usage"] = raw_usage
+        if routing:
+            # Copied: a hedged request's winner is settled after dispatch.
+            usage_record["routing"] = dict(routing)
         if self._capture_previews:
             if input_preview := _truncate(prompt_text, self._preview_chars):
                 usage_record["input_preview"] = input_preview
             if output_preview := _truncate(response_text, self._preview_chars):
                 usage_record["output_preview"] = output_preview
 
+        write = _PendingUsageWrite(record=usage_record)
+        if session_id and self._track_sessions:
+            write.session_id = session_id
+            write.session_update = self._session_update(
+                account_uuid=account_uuid,
+                user_id=user_id,
+                model=model,
+                model_tier=model_tier,
+                backend=backend,
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                price_per_mtok=price_per_mtok,
+                anthropic_price_per_mtok=anthropic_price_per_mtok,
+                retry_count=retry_count,
+            )
+        if self._collection is None:
+            # Not connected (yet): straight to the spool.
+            self._spool_or_drop([write], reason="write_error")
+            return
+        if self._write_batch_size > 1:
+            self._enqueue(write)
+            return
+
+        if self._spool is not None:
+            self._assign_id(usage_record)
         try:
-            await self._collection.insert_one(usage_record)
+            await self._with_write_timeout(self._collection.insert_one(usage_record))
+            self._report_mongo_success()
             logger.debug(
                 "[usage_tracker] Recorded usage: %d input, %d output tokens for %s",
                 input_tokens,
@@ -246,28 +418,21 @@ class UsageTracker:
                 model,
             )
         except Exception as e:
+            self._report_mongo_failure(e)
             logger.warning(
                 "[usage_tracker] Failed to record usage: %s",
                 e,
                 exc_info=True,
             )
+            if self._spool is not None:
+                self._spool_or_drop([write], reason="write_error")
             return
 
-        if session_id and self._track_sessions:
+        await self._write_rollups([usage_record])
+
+        if write.session_id is not None and write.session_update is not None:
             try:
-                await self._upsert_session_usage(
-                    session_id=session_id,
-                    account_uuid=account_uuid,
-                    user_id=user_id,
-                    model=model,
-                    model_tier=model_tier,
-                    backend=backend,
-                    input_tokens=input_tokens,
-                    output_tokens=output_tokens,
-                    price_per_mtok=price_per_mtok,
-                    anthropic_price_per_mtok=anthropic_price_per_mtok,
-                    retry_count=retry_count,
-                )
+                await self._upsert_session_usage(write.session_id, write.session_update)
             except Exception as e:
                 logger.warning(
                     "[usage_tracker] Failed to update session usage: %s",
@@ -275,10 +440,55 @@ class UsageTracker:
                     exc_info=True,
                 )
 
+    async def _write_rollups(self, records: list[dict[str, Any]]) -> None:
+        """$inc the minute/hour/day rollup buckets for these records — one
+        bulk_write per granularity. Failures are logged, never raised."""
+        if not self._rollup_collections or not records:
+            return
+        from pymongo import UpdateOne
+
+        for granularity, buckets in merge_rollup_updates(records).items():
+            collection = self._rollup_collections.get(granularity)
+            if collection is None or not buckets:
+                continue
+            try:
+                await collection.bulk_write(
+                    [
+                        UpdateOne(
+                            {"_id": key},
+                            {"$inc": increments, "$setOnInsert": key},
+                            upsert=True,
+                        )
+                        for key, increments in buckets.values()
+                    ],
+                    ordered=False,
+                )
+            except Exception as e:
+                logger.warning(
+                    "[usage_tracker] Failed to update %s usage rollups: %s",
+                    granularity,
+                    e,
+                    exc_info=True,
+                )
+
     async def _upsert_session_usage(
+        self, session_id: str, update: dict[str, dict[str, Any]]
+    ) -> None:
+        """Roll this request's usage into its per-session document now
+        (unbatched writes; see _session_update for the document shape)."""
+        if self._session_collection is None:
+            return
+        try:
+            await self._session_collection.update_one(
+                {"session_id": session_id}, update, upsert=True
+            )
+        finally:
+            if self._savings_cache is not None:
+                self._savings_cache.invalidate(session_id)
+
+    def _session_update(
         self,
         *,
-        session_id: str,
         account_uuid: str | None,
         user_id: str | None,
         model: str,
@@ -289,8 +499,9 @@ class UsageTracker:
         price_per_mtok: float | None,
         anthropic_price_per_mtok: float | None,
         retry_count: int | None = None,
-    ) -> None:
-        """Roll this request's usage into a single per-session document.
+    ) -> dict[str, dict[str, Any]]:
+        """The upsert that rolls one request's usage into its per-session
+        document.
 
         Keyed by session_id and upserted on every request so a session's
         totals are queryable without a $group aggregation over the (much
@@ -310,9 +521,6 @@ class UsageTracker:
         retries a session needed overall is the useful signal, not how
         many per tier.
         """
-        if self._session_collection is None:
-            return
-
         inc_fields: dict[str, int | float] = {
             "input_tokens": input_tokens,
             "output_tokens": output_tokens,
@@ -355,10 +563,265 @@ class UsageTracker:
         update: dict[str, dict[str, Any]] = {"$inc": inc_fields}
         if set_fields:
             update["$set"] = set_fields
-        await self._session_collection.update_one(
-            {"session_id": session_id}, update, upsert=True
+        return update
+
+    async def _with_write_timeout(self, write: Awaitable[Any]) -> Any:
+        """Await a MongoDB write, giving up after `write_timeout_seconds`
+        (the caller then spools the records)."""
+        if self._write_timeout_seconds is None:
+            return await write
+        return await asyncio.wait_for(write, timeout=self._write_timeout_seconds)
+
+    @staticmethod
+    def _assign_id(record: dict[str, Any]) -> None:
+        """Give a record its `_id` up front, so a replay of a write that did
+        land fails as a duplicate instead of inserting it twice."""
+        if "_id" not in record:
+            from bson import ObjectId
+
+            record["_id"] = ObjectId()
+
+    def _spool_or_drop(self, writes: list[_PendingUsageWrite], *, reason: str) -> None:
+        """Append writes MongoDB didn't take to the spool; without one (or
+        with it full), drop and count them."""
+        if self._spool is not None:
+            for write in writes:
+                self._assign_id(write.record)
+            if self._spool.append(
+                [
+                    {
+                        "record": write.record,
+                        "session_id": write.session_id,
+                        "session_update": write.session_update,
+                    }
+                    for write in writes
+                ]
+            ):
+                self._spool.schedule_replay(self._replay)
+                return
+            reason = "spool_full"
+        self._dropped_writes += len(writes)
+        _usage_dropped_counter.add(len(writes), {"reason": reason})
+
+    async def _replay(self, entries: list[dict[str, Any]]) -> bool:
+        """Write a batch of spooled records (see RecordSpool); False while
+        MongoDB is still unavailable."""
+        await self._ensure_connected()
+        if self._collection is None:
+            return False
+        for entry in entries:
+            entry["record"][_CREDITED_FIELD] = False
+        return await self._write_batch(
+            [
+                _PendingUsageWrite(
+                    record=entry["record"],
+                    session_id=entry.get("session_id"),
+                    session_update=entry.get("session_update"),
+                )
+                for entry in entries
+            ],
+            spool_on_failure=False,
         )
 
+    def _enqueue(self, write: _PendingUsageWrite) -> None:
+        if len(self._pending_writes) >= self._max_pending_writes:
+            if self._spool is not None:
+                self._spool_or_drop([write], reason="overflow")
+                return
+            self._dropped_writes += 1
+            _usage_dropped_counter.add(1, {"reason": "overflow"})
+            if self._dropped_writes % 1000 == 1:
+                logger.warning(
+                    "[usage_tracker] Write buffer full (%d records) — dropping "
+                    "usage records (%d dropped so far)",
+                    len(self._pending_writes),
+                    self._dropped_writes,
+                )
+            return
+        self._pending_writes.append(write)
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
+        if len(self._pending_writes) >= self._write_batch_size:
+            self._flush_wakeup.set()
+
+    async def _flush_loop(self) -> None:
+        """Flush every batch_size records or flush interval; exits once the
+        buffer is empty (the next _enqueue starts it again)."""
+        while self._pending_writes:
+            try:
+                await asyncio.wait_for(
+                    self._flush_wakeup.wait(), timeout=self._flush_interval_seconds
+                )
+            except TimeoutError:
+                pass
+            self._flush_wakeup.clear()
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Write everything currently buffered."""
+        while self._pending_writes:
+            batch = self._pending_writes[: self._write_batch_size]
+            del self._pending_writes[: self._write_batch_size]
+            await self._write_batch(batch)
+
+    async def _write_batch(
+        self, batch: list[_PendingUsageWrite], *, spool_on_failure: bool = True
+    ) -> bool:
+        """Insert a batch and credit its rollups and sessions; False if
+        MongoDB was unavailable (the batch is then spooled, unless it's
+        being replayed from the spool already).
+
+        A replayed batch credits only the records it claims (see
+        _claim_replayed), so each record is credited once however many
+        times its insert or replay is retried.
+        """
+        if self._collection is None:
+            if spool_on_failure:
+                self._spool_or_drop(batch, reason="write_error")
+            return False
+        from pymongo import UpdateOne
+        from pymongo.errors import BulkWriteError
+
+        _usage_write_batch_histogram.record(len(batch))
+        if self._spool is not None:
+            for write in batch:
+                self._assign_id(write.record)
+        failed: set[int] = set()
+        duplicates: list[int] = []
+        try:
+            await self._with_write_timeout(
+                self._collection.insert_many(
+                    [write.record for write in batch], ordered=False
+                )
+            )
+        except BulkWriteError as e:
+            # Per-document errors (e.g. validation): MongoDB itself is fine.
+            write_errors = e.details.get("writeErrors", [])
+            failed = {error["index"] for error in write_errors}
+            # Duplicates are replayed records whose first write landed;
+            # _claim_replayed decides whether they still need crediting.
+            duplicates = [
+                error["index"]
+                for error in write_errors
+                if error.get("code") == _DUPLICATE_KEY_ERROR
+            ]
+            rejected = len(write_errors) - len(duplicates)
+            if rejected:
+                logger.warning(
+                    "[usage_tracker] Failed to record %d of %d usage records: %s",
+                    rejected,
+                    len(batch),
+                    e,
+                )
+                _usage_dropped_counter.add(rejected, {"reason": "write_error"})
+        except Exception as e:
+            self._report_mongo_failure(e)
+            if not spool_on_failure:
+                # Still in the spool; the replayer retries later.
+                return False
+            logger.warning(
+                "[usage_tracker] Failed to record %d usage records: %s",
+                len(batch),
+                e,
+                exc_info=True,
+            )
+            self._spool_or_drop(batch, reason="write_error")
+            return False
+        else:
+            self._report_mongo_success()
+
+        claimed = True
+        if not spool_on_failure:
+            credited, claimed = await self._claim_replayed(
+                self._collection,
+                batch,
+                [index for index in range(len(batch)) if index not in failed],
+                duplicates,
+            )
+            failed = set(range(len(batch))) - credited
+
+        # As with unbatched writes, rollups and sessions are only credited
+        # with records that were actually inserted (or, replayed, claimed).
+        await self._write_rollups(
+            [write.record for index, write in enumerate(batch) if index not in failed]
+        )
+
+        session_updates: dict[str, dict[str, dict[str, Any]]] = {}
+        for index, write in enumerate(batch):
+            if index in failed or write.session_id is None:
+                continue
+            if write.session_update is None:
+                continue
+            _merge_session_update(
+                session_updates.setdefault(write.session_id, {}), write.session_update
+            )
+        if not session_updates or self._session_collection is None:
+            return claimed
+        try:
+            await self._session_collection.bulk_write(
+                [
+                    UpdateOne({"session_id": session_id}, update, upsert=True)
+                    for session_id, update in session_updates.items()
+                ],
+                ordered=False,
+            )
+        except Exception as e:
+            logger.warning(
+                "[usage_tracker] Failed to update usage for %d sessions: %s",
+                len(session_updates),
+                e,
+                exc_info=True,
+            )
+        if self._savings_cache is not None:
+            for session_id in session_updates:
+                self._savings_cache.invalidate(session_id)
+        return claimed
+
+    async def _claim_replayed(
+        self,
+        collection: Any,
+        batch: list[_PendingUsageWrite],
+        inserted: list[int],
+        duplicates: list[int],
+    ) -> tuple[set[int], bool]:
+        """Mark which replayed records this replay credits: the ones it just
+        inserted, and the duplicates nothing has credited yet (their first
+        write landed, then timed out). Returns their indexes, and False if
+        MongoDB failed part-way — the batch stays spooled, and the next
+        replay claims whatever this one didn't.
+        """
+        credited: set[int] = set()
+        try:
+            if inserted:
+                await self._with_write_timeout(
+                    collection.update_many(
+                        {"_id": {"$in": [batch[i].record["_id"] for i in inserted]}},
+                        {"$set": {_CREDITED_FIELD: True}},
+                    )
+                )
+                credited.update(inserted)
+            for index in duplicates:
+                result = await self._with_write_timeout(
+                    collection.update_one(
+                        {
+                            "_id": batch[index].record["_id"],
+                            _CREDITED_FIELD: {"$ne": True},
+                        },
+                        {"$set": {_CREDITED_FIELD: True}},
+                    )
+                )
+                if result.modified_count:
+                    credited.add(index)
+        except Exception as e:
+            self._report_mongo_failure(e)
+            logger.warning(
+                "[usage_tracker] Failed to mark %d replayed usage records credited: %s",
+                len(inserted) + len(duplicates) - len(credited),
+                e,
+            )
+            return credited, False
+        return credited, True
+
     async def record_usage_from_anthropic_response(
         self,
         request_id: str,
@@ -381,6 +844,7 @@ class UsageTracker:
         custom_headers = (
             auth_info.get("custom_headers") if isinstance(auth_info, dict) else None
         )
+        routing = auth_info.get("routing") if isinstance(auth_info, dict) else None
         usage = response_body.get("usage", {})
         input_tokens = usage.get("input_tokens", 0)
         output_tokens = usage.get("output_tokens", 0)
@@ -440,6 +904,7 @@ class UsageTracker:
             compression_requested=compression_requested,
             compression_used=compression_used,
             custom_headers=custom_headers,
+            routing=routing,
             prompt_text=prompt_text,
             response_text=response_text,
             raw_usage=usage,
@@ -470,6 +935,7 @@ class UsageTracker:
         custom_headers = (
             auth_info.get("custom_headers") if isinstance(auth_info, dict) else None
         )
+        routing = auth_info.get("routing") if isinstance(auth_info, dict) else None
         usage = response_body.get("usage", {})
         input_tokens = usage.get("prompt_tokens", 0)
         output_tokens = usage.get("completion_tokens", 0)
@@ -528,6 +994,7 @@ class UsageTracker:
             compression_requested=compression_requested,
             compression_used=compression_used,
             custom_headers=custom_headers,
+            routing=routing,
             prompt_text=prompt_text,
             response_text=response_text,
             raw_usage=usage,
@@ -536,7 +1003,15 @@ class UsageTracker:
         )
 
     async def close(self) -> None:
-        """Close MongoDB connection."""
-        if self._client is not None:
+        """Flush buffered usage records (spooling whatever MongoDB won't
+        take), then close the spool and the MongoDB connection."""
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_wakeup.set()
+            await self._flush_task
+        await self.flush()
+        if self._spool is not None:
+            await self._spool.close()
+        # A shared client is closed by its MongoClientProvider.
+        if self._client is not None and self._client_provider is None:
             await self._client.close()
             logger.info("[usage_tracker] MongoDB connection closed")
@@ -0,0 +1,66 @@
+"""
+Event-loop lag sampling, exported as an OpenTelemetry histogram.
+
+Every interval the monitor sleeps and measures how late it woke up. Any
+synchronous work on the loop — JSON parsing, tokenization, template
+rendering — shows up directly as lag, and as a stall for every other request
+and stream on that worker. Started and stopped by the FastAPI lifespan.
+"""
+
+import asyncio
+import logging
+import time
+
+from opentelemetry import metrics
+
+from language_model_gateway.gateway.utilities.logger.log_levels import SRC_LOG_LEVELS
+
+logger = logging.getLogger(__name__)
+logger.setLevel(SRC_LOG_LEVELS.get("HTTP", logging.INFO))
+
+_meter = metrics.get_meter(__name__)
+_loop_lag_histogram = _meter.create_histogram(
+    "gateway.event_loop.lag",
+    unit="s",
+    description="How late the event loop ran a timer scheduled to fire on time",
+)
+
+
+class EventLoopLagMonitor:
+    """Samples event-loop lag every `interval_seconds` on the running loop."""
+
+    def __init__(
+        self, *, interval_seconds: float = 0.5, warn_threshold_seconds: float = 0.1
+    ) -> None:
+        self._interval_seconds = interval_seconds
+        self._warn_threshold_seconds = warn_threshold_seconds
+        self._task: asyncio.Task[None] | None = None
+        self.last_lag_seconds: float = 0.0
+        self.max_lag_seconds: float = 0.0
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            logger.debug("Event loop lag monitor stopped")
+
+    def _record(self, lag: float) -> None:
+        self.last_lag_seconds = lag
+        self.max_lag_seconds = max(self.max_lag_seconds, lag)
+        _loop_lag_histogram.record(lag)
+        if lag >= self._warn_threshold_seconds:
+            logger.warning("Event loop blocked for %.0fms", lag * 1000)
+
+    async def _run(self) -> None:
+        while True:
+            expected = time.perf_counter() + self._interval_seconds
+            await asyncio.sleep(self._interval_seconds)
+            self._record(max(0.0, time.perf_counter() - expected))
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from typing import Optional
 
 
@@ -155,6 +156,34 @@ class LanguageModelGatewayEnvironmentVariables(LanguageModelCommonEnvironmentVar
             "MODEL_ROUTING_ERROR_COLLECTION_NAME", "model-router-errors"
         )
 
+    @property
+    def model_routing_error_group_collection_name(self) -> str:
+        """Collection for aggregated error groups: one counted document per
+        (model, error_type, status_code, normalized message) per window."""
+        return os.environ.get(
+            "MODEL_ROUTING_ERROR_GROUP_COLLECTION_NAME", "model-router-error-groups"
+        )
+
+    @property
+    def model_routing_error_aggregation_window_seconds(self) -> float:
+        """Window over which identical failures are grouped into one
+        document. 0 writes one document per failure, as before."""
+        return float(
+            os.environ.get("MODEL_ROUTING_ERROR_AGGREGATION_WINDOW_SECONDS", "10")
+        )
+
+    @property
+    def model_routing_error_sample_rate(self) -> float:
+        """Fraction of grouped failures (after each group's first per
+        window) that still get a full per-request error document."""
+        return float(os.environ.get("MODEL_ROUTING_ERROR_SAMPLE_RATE", "0.05"))
+
+    @property
+    def model_routing_error_max_writes_per_second(self) -> float:
+        """Cap on full per-request error documents written per second per
+        worker, across all groups; failures over it are only counted."""
+        return float(os.environ.get("MODEL_ROUTING_ERROR_MAX_WRITES_PER_SECOND", "20"))
+
     @property
     def model_routing_usage_session_collection_name(self) -> str:
         """Collection name for the per-session usage rollup.
@@ -182,6 +211,22 @@ class LanguageModelGatewayEnvironmentVariables(LanguageModelCommonEnvironmentVar
             os.environ.get("MODEL_ROUTING_USAGE_SESSION_TRACKING_ENABLED", "true")
         )
 
+    @property
+    def model_routing_usage_rollups_enabled(self) -> bool:
+        """Whether CodingModelRouter also maintains minute/hour/day usage
+        rollups alongside the per-request records."""
+        return self.str2bool(
+            os.environ.get("MODEL_ROUTING_USAGE_ROLLUPS_ENABLED", "true")
+        )
+
+    @property
+    def model_routing_usage_rollup_collection_prefix(self) -> str:
+        """Prefix of the usage rollup collections; one per granularity
+        ("{prefix}-minute", "{prefix}-hour", "{prefix}-day")."""
+        return os.environ.get(
+            "MODEL_ROUTING_USAGE_ROLLUP_COLLECTION_PREFIX", "model-router-usage-rollup"
+        )
+
     @property
     def model_routing_usage_capture_previews(self) -> bool:
         """Whether to write input_preview/output_preview fields to the usage collection.
@@ -234,6 +279,49 @@ class LanguageModelGatewayEnvironmentVariables(LanguageModelCommonEnvironmentVar
             "model-router-account-directory",
         )
 
+    @property
+    def model_routing_account_directory_preload(self) -> bool:
+        """Load the account directory into memory at startup and keep it in
+        sync (change stream, or periodic re-load). Off by default: the
+        router doesn't resolve account emails on the request path today."""
+        return self.str2bool(
+            os.environ.get("MODEL_ROUTING_ACCOUNT_DIRECTORY_PRELOAD", "false")
+        )
+
+    @property
+    def model_routing_account_directory_cache_max_entries(self) -> int:
+        """Max account_uuid -> email entries the account directory keeps in
+        memory (the startup preload stops at this many)."""
+        return int(
+            os.environ.get("MODEL_ROUTING_ACCOUNT_DIRECTORY_CACHE_MAX_ENTRIES", "10000")
+        )
+
+    @property
+    def model_routing_account_directory_hit_ttl_seconds(self) -> float:
+        """How long a resolved email is cached before it's looked up again."""
+        return float(
+            os.environ.get("MODEL_ROUTING_ACCOUNT_DIRECTORY_HIT_TTL_SECONDS", "3600")
+        )
+
+    @property
+    def model_routing_account_directory_miss_ttl_seconds(self) -> float:
+        """How long an account_uuid that isn't in the directory is cached as
+        a miss — i.e. the longest a newly added account can go unresolved
+        when the directory isn't being watched for changes."""
+        return float(
+            os.environ.get("MODEL_ROUTING_ACCOUNT_DIRECTORY_MISS_TTL_SECONDS", "300")
+        )
+
+    @property
+    def model_routing_account_directory_refresh_interval_seconds(self) -> float:
+        """How often the account directory is re-loaded when a MongoDB change
+        stream can't be opened (e.g. a standalone mongod)."""
+        return float(
+            os.environ.get(
+                "MODEL_ROUTING_ACCOUNT_DIRECTORY_REFRESH_INTERVAL_SECONDS", "300"
+            )
+        )
+
     @property
     def model_routing_bedrock_transport(self) -> str:
         """Which transport CodingModelRouter uses for auth="aws" routes:
@@ -322,3 +410,210 @@ class LanguageModelGatewayEnvironmentVariables(LanguageModelCommonEnvironmentVar
         AwsClientFactory.create_bedrock_client's own default of "adaptive".
         """
         return os.environ.get("MODEL_ROUTING_BEDROCK_RETRY_MODE", "adaptive")
+
+    @property
+    def model_routing_bedrock_native_client(self) -> str:
+        """Which client sends native Bedrock Converse requests: "httpx"
+        (default) signs them itself and sends them over the pooled httpx
+        clients, decoding the ConverseStream event stream on the event
+        loop (see converse_http_client.py); "boto3" uses the boto3 client on
+        worker threads instead — the original implementation, kept as a
+        fallback.
+
+        Only the literal value "boto3" (case-insensitive) selects boto3.
+        The MODEL_ROUTING_BEDROCK_MAX_ATTEMPTS/RETRY_MODE settings only
+        apply to boto3.
+        """
+        return (
+            "boto3"
+            if os.environ.get("MODEL_ROUTING_BEDROCK_NATIVE_CLIENT", "").lower()
+            == "boto3"
+            else "httpx"
+        )
+
+    @property
+    def model_routing_bedrock_executor_max_workers(self) -> int:
+        """Threads for boto3 Bedrock calls, used with
+        MODEL_ROUTING_BEDROCK_NATIVE_CLIENT=boto3. A stream holds one for its
+        whole duration, so this caps the worker's concurrent native Bedrock
+        requests; beyond it, requests get 529 overloaded_error instead of
+        waiting for a thread."""
+        return int(os.environ.get("MODEL_ROUTING_BEDROCK_EXECUTOR_MAX_WORKERS", "64"))
+
+    @property
+    def model_routing_stream_flush_interval_ms(self) -> int:
+        """Max milliseconds a streamed SSE chunk is held to be sent together
+        with the ones arriving right behind it; 0 sends each chunk on its
+        own. Routes can override it with `stream_flush_interval_ms`."""
+        return int(os.environ.get("MODEL_ROUTING_STREAM_FLUSH_INTERVAL_MS", "5"))
+
+    @property
+    def model_routing_stream_flush_bytes(self) -> int:
+        """Held SSE chunks are sent as soon as they add up to this many
+        bytes; 0 for no limit. Routes can override it with
+        `stream_flush_bytes`."""
+        return int(os.environ.get("MODEL_ROUTING_STREAM_FLUSH_BYTES", "8192"))
+
+    @property
+    def model_routing_upstream_max_connections(self) -> int:
+        """Max concurrent connections per pooled upstream client.
+
+        CodingModelRouter keeps one long-lived httpx client per upstream
+        origin/auth/region (see UpstreamClientPool) instead of opening a new
+        one per request. This caps how many connections each of those clients
+        may hold open at once; requests beyond it wait for a free connection.
+        With HTTP/2 a single connection multiplexes many requests, so this is
+        rarely the binding limit.
+        """
+        return int(os.environ.get("MODEL_ROUTING_UPSTREAM_MAX_CONNECTIONS", "100"))
+
+    @property
+    def model_routing_upstream_max_keepalive_connections(self) -> int:
+        """Max idle keep-alive connections retained per pooled upstream client."""
+        return int(
+            os.environ.get("MODEL_ROUTING_UPSTREAM_MAX_KEEPALIVE_CONNECTIONS", "20")
+        )
+
+    @property
+    def model_routing_upstream_keepalive_expiry_seconds(self) -> float:
+        """Seconds an idle pooled upstream connection is kept before closing.
+
+        Kept below the typical 60s idle timeout of upstream load balancers,
+        so the pool drops a connection before the far end silently does.
+        """
+        return float(
+            os.environ.get("MODEL_ROUTING_UPSTREAM_KEEPALIVE_EXPIRY_SECONDS", "30")
+        )
+
+    @property
+    def model_routing_upstream_http2(self) -> bool:
+        """Whether pooled upstream clients negotiate HTTP/2 (via ALPN).
+
+        Falls back to HTTP/1.1 keep-alive automatically when the upstream
+        doesn't offer h2, or when the optional `h2` package isn't installed.
+        """
+        return self.str2bool(os.environ.get("MODEL_ROUTING_UPSTREAM_HTTP2", "true"))
+
+    @property
+    def model_routing_dispatch_redis_url(self) -> str | None:
+        """Redis URL for a Bedrock dispatch budget shared across workers.
+
+        Without it each Gunicorn worker paces Bedrock requests on its own, so
+        N workers send up to N times a route's `dispatch_rate_per_s`. When set,
+        every worker (on every pod pointing at the same Redis) draws from one
+        token bucket per (region, model), and a throttle seen by any worker
+        slows all of them. If Redis is unreachable, workers fall back to
+        per-worker pacing until it recovers.
+        """
+        return os.environ.get("MODEL_ROUTING_DISPATCH_REDIS_URL") or None
+
+    @property
+    def model_routing_circuit_breaker_enabled(self) -> bool:
+        """Whether Bedrock routes get a per-(region, model) circuit breaker
+        that fails requests fast (or sends them to the route's
+        `fallback_model`) while the backend keeps failing."""
+        return self.str2bool(
+            os.environ.get("MODEL_ROUTING_CIRCUIT_BREAKER_ENABLED", "true")
+        )
+
+    @property
+    def model_routing_circuit_open_seconds(self) -> float:
+        """Seconds an open circuit rejects requests before letting a single
+        probe request through."""
+        return float(os.environ.get("MODEL_ROUTING_CIRCUIT_OPEN_SECONDS", "30"))
+
+    @property
+    def model_routing_circuit_open_below_health(self) -> float:
+        """Health (EWMA of dispatch outcomes, 1 = all succeeding) below which
+        a route's circuit opens."""
+        return float(os.environ.get("MODEL_ROUTING_CIRCUIT_OPEN_BELOW_HEALTH", "0.2"))
+
+    @property
+    def model_routing_tokenizer_max_workers(self) -> int:
+        """Threads running preflight token counting, off the event loop.
+
+        Calls for the same tokenizer model are serialized, so more workers
+        only help when several tokenizer models are in use.
+        """
+        return int(os.environ.get("MODEL_ROUTING_TOKENIZER_MAX_WORKERS", "2"))
+
+    @property
+    def model_routing_tokenizer_max_pending(self) -> int:
+        """Max tokenizer calls queued or running before new requests skip the
+        tokenizer and use the character estimate instead of waiting."""
+        return int(os.environ.get("MODEL_ROUTING_TOKENIZER_MAX_PENDING", "16"))
+
+    @property
+    def model_routing_tokenizer_timeout_seconds(self) -> float:
+        """Seconds a request waits for a tokenizer call before falling back to
+        the character estimate."""
+        return float(os.environ.get("MODEL_ROUTING_TOKENIZER_TIMEOUT_SECONDS", "2"))
+
+    @property
+    def model_routing_tokenizer_preload(self) -> bool:
+        """Load every route's tokenizer at worker startup rather than on the
+        first request that needs it."""
+        return self.str2bool(os.environ.get("MODEL_ROUTING_TOKENIZER_PRELOAD", "true"))
+
+    @property
+    def model_routing_config_reload_interval_seconds(self) -> float:
+        """How often each worker checks the route config file for changes;
+        0 turns hot reload off."""
+        return float(
+            os.environ.get("MODEL_ROUTING_CONFIG_RELOAD_INTERVAL_SECONDS", "5")
+        )
+
+    @property
+    def model_routing_usage_write_batch_size(self) -> int:
+        """Usage records written per batch (insert_many + one session
+        bulk_write). 1 writes each record as it arrives."""
+        return int(os.environ.get("MODEL_ROUTING_USAGE_WRITE_BATCH_SIZE", "100"))
+
+    @property
+    def model_routing_usage_flush_interval_ms(self) -> int:
+        """Max milliseconds a usage record waits in the write buffer before
+        a partial batch is flushed."""
+        return int(os.environ.get("MODEL_ROUTING_USAGE_FLUSH_INTERVAL_MS", "500"))
+
+    @property
+    def model_routing_usage_max_pending_writes(self) -> int:
+        """Usage records buffered before new ones are dropped (and counted)
+        — bounds memory while MongoDB is slow or down."""
+        return int(os.environ.get("MODEL_ROUTING_USAGE_MAX_PENDING_WRITES", "10000"))
+
+    @property
+    def model_routing_mongo_max_pool_size(self) -> int:
+        """Max connections in the model router's shared MongoDB pool (one per
+        worker, shared by usage/error tracking and lookups)."""
+        return int(os.environ.get("MODEL_ROUTING_MONGO_MAX_POOL_SIZE", "20"))
+
+    @property
+    def model_routing_mongo_min_pool_size(self) -> int:
+        """Connections the model router's shared MongoDB pool keeps open even
+        when idle."""
+        return int(os.environ.get("MODEL_ROUTING_MONGO_MIN_POOL_SIZE", "0"))
+
+    @property
+    def model_routing_spool_dir(self) -> str:
+        """Directory where usage/error records MongoDB didn't take (failed,
+        timed out, or over the write buffer) are spooled until it's back.
+        Empty disables spooling: those records are dropped and counted."""
+        return os.environ.get(
+            "MODEL_ROUTING_SPOOL_DIR",
+            os.path.join(tempfile.gettempdir(), "model-routing-spool"),
+        )
+
+    @property
+    def model_routing_mongo_write_timeout_seconds(self) -> float:
+        """Seconds a usage/error write may take before its records are
+        spooled instead (only with MODEL_ROUTING_SPOOL_DIR set)."""
+        return float(os.environ.get("MODEL_ROUTING_MONGO_WRITE_TIMEOUT_SECONDS", "5"))
+
+    @property
+    def model_routing_session_savings_cache_ttl_seconds(self) -> float:
+        """How long /v1/model-routing/sessions/{id}/savings results are cached
+        per worker. A worker drops a session's entry as soon as it writes
+        that session's usage; this bounds staleness from other workers."""
+        return float(
+            os.environ.get("MODEL_ROUTING_SESSION_SAVINGS_CACHE_TTL_SECONDS", "10")
+        )
@@ -8,6 +8,10 @@ summary. Any failure (timeout, network error, 404, malformed response)
 prints nothing — a missing footer segment is a normal, silent outcome here,
 never a stall or a raw error string in Claude Code's UI.
 
+The last response is kept per session in the system temp directory along
+with its ETag, and sent back as If-None-Match: while the session's figures
+are unchanged the gateway answers 304 and the kept copy is shown.
+
 Configure via ~/.claude/settings.json:
   {"statusLine": {"type": "command", "command": "python3 /path/to/claude_code_statusline.py"}}
 and set MODEL_ROUTING_GATEWAY_URL to this gateway's base URL in your shell env.
@@ -17,12 +21,17 @@ from __future__ import annotations
 
 import json
 import os
+import re
 import sys
+import tempfile
 import urllib.error
 import urllib.request
+from pathlib import Path
 from typing import Any
 
 _TIMEOUT_SECONDS = 2.0
+_CACHE_DIR = Path(tempfile.gettempdir()) / "claude_code_statusline"
+_SAFE_SESSION_ID = re.compile(r"[A-Za-z0-9_-]{1,128}")
 _TIER_LABELS = {"low": "Haiku", "medium": "Sonnet", "high": "Opus", "fable": "Fable"}
 _BACKEND_LABELS = {"anthropic": "Anthropic", "aws_bedrock": "AWS"}
 
@@ -58,15 +67,59 @@ def format_savings_line(payload: dict[str, Any]) -> str | None:
         return None
 
 
+def _cache_path(session_id: str) -> Path | None:
+    # session_id becomes a file name: anything but a plain id isn't cached.
+    if not _SAFE_SESSION_ID.fullmatch(session_id):
+        return None
+    return _CACHE_DIR / f"{session_id}.json"
+
+
+def _read_cached(path: Path | None) -> tuple[str, dict[str, Any]] | None:
+    """(etag, body) kept from this session's last 200, if any."""
+    if path is None:
+        return None
+    try:
+        cached = json.loads(path.read_text())
+        etag, body = cached["etag"], cached["body"]
+    except (OSError, ValueError, TypeError, KeyError):
+        return None
+    if isinstance(etag, str) and isinstance(body, dict):
+        return etag, body
+    return None
+
+
+def _write_cached(path: Path | None, etag: str, body: dict[str, Any]) -> None:
+    if path is None:
+        return
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"etag": etag, "body": body}))
+    except OSError:
+        pass  # caching is an optimization; never fail the statusline over it
+
+
 def fetch_savings(gateway_url: str, session_id: str) -> dict[str, Any] | None:
     """GET the session's savings from the gateway. Returns None on any failure."""
     url = f"{gateway_url.rstrip('/')}/v1/model-routing/sessions/{session_id}/savings"
+    path = _cache_path(session_id)
+    cached = _read_cached(path)
+    request = urllib.request.Request(url)
+    if cached is not None:
+        request.add_header("If-None-Match", cached[0])
     try:
-        with urllib.request.urlopen(url, timeout=_TIMEOUT_SECONDS) as resp:  # nosec: B310
+        with urllib.request.urlopen(request, timeout=_TIMEOUT_SECONDS) as resp:  # nosec: B310
             data = json.loads(resp.read())
-            if isinstance(data, dict):
-                return data
-            return None
+            if not isinstance(data, dict):
+                return None
+            headers = getattr(resp, "headers", None)
+            etag = headers.get("ETag") if headers is not None else None
+            if etag:
+                _write_cached(path, etag, data)
+            return data
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and cached is not None:
+            return cached[1]
+        return None
     except (urllib.error.URLError, TimeoutError, json.JSONDecodeError, ValueError):
         return None
 
@@ -30,6 +30,12 @@ class TestLanguageModelGatewayEnvironmentVariables(
     def llm_storage_type(self) -> str:
         return "memory"
 
+    @override
+    @property
+    def model_routing_tokenizer_preload(self) -> bool:
+        # Don't download route tokenizers from the HuggingFace hub in tests.
+        return False
+
 
 def create_test_container() -> SimpleContainer:
     container: SimpleContainer = LanguageModelGatewayContainerFactory.create_container(
@@ -11,6 +11,12 @@ import httpx
 import pytest
 from fastapi import FastAPI
 
+from language_model_gateway.gateway.routers.model_routing.anthropic_token_counter import (
+    count_tokens_cache,
+)
+from language_model_gateway.gateway.routers.model_routing.bedrock_client import (
+    get_bedrock_circuit_breaker,
+)
 from language_model_gateway.gateway.routers.model_routing.router import (
     CodingModelRouter,
 )
@@ -18,6 +24,10 @@ from language_model_gateway.gateway.routers.model_routing.router import (
 
 @pytest.fixture
 async def router_client() -> AsyncGenerator[httpx.AsyncClient, None]:
+    # count_tokens results are cached process-wide by body digest.
+    count_tokens_cache.clear()
+    # So are Bedrock circuit states.
+    get_bedrock_circuit_breaker().reset()
     app = FastAPI()
     app.include_router(CodingModelRouter().get_router())
     async with httpx.AsyncClient(
@@ -4,6 +4,8 @@ Tests for account_directory.py.
 
 from __future__ import annotations
 
+import asyncio
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from language_model_gateway.gateway.routers.model_routing.account_directory import (
@@ -200,3 +202,135 @@ class TestAccountDirectoryResolveEmail:
                 {"_id": "unknown-acct"}
             )
             mock_ensure_connected.assert_called_once()
+
+
+class _Cursor:
+    """Minimal async cursor over a list of documents."""
+
+    def __init__(self, docs: list[dict[str, Any]]) -> None:
+        self._docs = iter(docs)
+
+    def __aiter__(self) -> _Cursor:
+        return self
+
+    async def __anext__(self) -> dict[str, Any]:
+        try:
+            return next(self._docs)
+        except StopIteration:
+            raise StopAsyncIteration from None
+
+
+def _directory_with_collection(
+    docs: list[dict[str, Any]] | None = None, **kwargs: Any
+) -> tuple[AccountDirectory, MagicMock]:
+    directory = AccountDirectory(
+        mongo_uri="mongodb://localhost:27017", enabled=False, **kwargs
+    )
+    collection = MagicMock()
+    collection.find = MagicMock(side_effect=lambda *a, **kw: _Cursor(docs or []))
+    collection.find_one = AsyncMock(return_value=None)
+    collection.watch = AsyncMock(side_effect=RuntimeError("not a replica set"))
+    directory._collection = collection
+    return directory, collection
+
+
+class TestAccountDirectoryCache:
+    """Tests for the TTL/LRU cache behind resolve_email."""
+
+    async def test_expired_miss_is_looked_up_again(self) -> None:
+        directory, collection = _directory_with_collection(miss_ttl_seconds=0.0)
+        assert await directory.resolve_email("acct-new") is None
+        collection.find_one = AsyncMock(
+            return_value={"_id": "acct-new", "email": "new@example.com"}
+        )
+        assert await directory.resolve_email("acct-new") == "new@example.com"
+
+    async def test_failure_is_retried_after_failure_ttl(self) -> None:
+        directory, collection = _directory_with_collection(
+            failure_ttl_seconds=0.0, miss_ttl_seconds=3600.0
+        )
+        collection.find_one = AsyncMock(side_effect=RuntimeError("boom"))
+        assert await directory.resolve_email("acct-123") is None
+        collection.find_one = AsyncMock(
+            return_value={"_id": "acct-123", "email": "person@example.com"}
+        )
+        assert await directory.resolve_email("acct-123") == "person@example.com"
+
+    async def test_cache_is_bounded_lru(self) -> None:
+        directory, collection = _directory_with_collection(cache_max_entries=2)
+        for account in ("a", "b", "a", "c"):
+            await directory.resolve_email(account)
+        assert len(directory._email_cache) == 2
+        collection.find_one.reset_mock()
+        await directory.resolve_email("a")
+        collection.find_one.assert_not_called()
+        await directory.resolve_email("b")
+        collection.find_one.assert_called_once_with({"_id": "b"})
+
+
+class TestAccountDirectorySync:
+    """Tests for preloading and keeping the directory in sync."""
+
+    async def test_preload_serves_lookups_from_memory(self) -> None:
+        directory, collection = _directory_with_collection(
+            [
+                {"_id": "acct-1", "email": "one@example.com"},
+                {"_id": "acct-2"},
+            ]
+        )
+        assert await directory.preload() == 2
+        assert await directory.resolve_email("acct-1") == "one@example.com"
+        assert await directory.resolve_email("acct-2") is None
+        collection.find_one.assert_not_called()
+
+    async def test_preload_stops_at_cache_capacity(self) -> None:
+        directory, _ = _directory_with_collection(
+            [{"_id": f"acct-{i}", "email": f"{i}@example.com"} for i in range(5)],
+            cache_max_entries=3,
+        )
+        assert await directory.preload() == 3
+        assert len(directory._email_cache) == 3
+
+    async def test_change_events_update_the_cache(self) -> None:
+        directory, collection = _directory_with_collection(
+            [{"_id": "acct-1", "email": "old@example.com"}]
+        )
+        await directory.preload()
+        directory._apply_change(
+            {
+                "operationType": "update",
+                "documentKey": {"_id": "acct-1"},
+                "fullDocument": {"_id": "acct-1", "email": "new@example.com"},
+            }
+        )
+        directory._apply_change(
+            {
+                "operationType": "insert",
+                "documentKey": {"_id": "acct-2"},
+                "fullDocument": {"_id": "acct-2", "email": "two@example.com"},
+            }
+        )
+        assert await directory.resolve_email("acct-1") == "new@example.com"
+        assert await directory.resolve_email("acct-2") == "two@example.com"
+        directory._apply_change(
+            {"operationType": "delete", "documentKey": {"_id": "acct-1"}}
+        )
+        assert await directory.resolve_email("acct-1") is None
+        collection.find_one.assert_not_called()
+
+    async def test_falls_back_to_periodic_reload_without_change_streams(
+        self,
+    ) -> None:
+        docs = [{"_id": "acct-1", "email": "one@example.com"}]
+        directory, collection = _directory_with_collection(
+            docs, refresh_interval_seconds=0.01
+        )
+        with patch.object(directory, "_ensure_connected", new_callable=AsyncMock):
+            await directory.start()
+            docs.append({"_id": "acct-2", "email": "two@example.com"})
+            await asyncio.sleep(0.05)
+            await directory.close()
+        assert collection.find.call_count >= 2
+        assert collection.watch.await_count >= 2
+        assert await directory.resolve_email("acct-2") == "two@example.com"
+        assert directory._sync_task is None
@@ -0,0 +1,162 @@
+"""
+Tests for anthropic_token_counter.py's local count_tokens engine.
+"""
+
+from __future__ import annotations
+
+import base64
+import struct
+from typing import Any
+
+from language_model_gateway.gateway.routers.model_routing.anthropic_token_counter import (
+    _IMAGE_MAX_TOKENS,
+    _TOOL_SYSTEM_PROMPT_TOKENS,
+    _image_dimensions,
+    _image_tokens,
+    count_anthropic_request_tokens,
+)
+
+
+def _png(width: int, height: int) -> bytes:
+    ihdr = struct.pack(">II", width, height) + b"\x08\x02\x00\x00\x00"
+    return b"\x89PNG\r\n\x1a\n" + b"\x00\x00\x00\rIHDR" + ihdr + b"\x00" * 64
+
+
+def _jpeg(width: int, height: int) -> bytes:
+    app0 = b"\xff\xe0" + struct.pack(">H", 16) + b"JFIF\x00" + b"\x00" * 9
+    sof0 = b"\xff\xc0" + struct.pack(">HBHH", 17, 8, height, width) + b"\x00" * 10
+    return b"\xff\xd8" + app0 + sof0 + b"\xff\xd9"
+
+
+def _image_block(data: bytes, media_type: str = "image/png") -> dict[str, Any]:
+    return {
+        "type": "image",
+        "source": {
+            "type": "base64",
+            "media_type": media_type,
+            "data": base64.b64encode(data).decode(),
+        },
+    }
+
+
+def _body(*content: Any, **extra: Any) -> dict[str, Any]:
+    return {
+        "model": "claude-sonnet-5",
+        "messages": [{"role": "user", "content": list(content)}],
+        **extra,
+    }
+
+
+class TestImageDimensions:
+    def test_png(self) -> None:
+        assert _image_dimensions(_png(800, 600)) == (800, 600)
+
+    def test_jpeg_skips_leading_segments(self) -> None:
+        assert _image_dimensions(_jpeg(1024, 768)) == (1024, 768)
+
+    def test_gif(self) -> None:
+        gif = b"GIF89a" + struct.pack("<HH", 320, 200) + b"\x00" * 8
+        assert _image_dimensions(gif) == (320, 200)
+
+    def test_unknown_format(self) -> None:
+        assert _image_dimensions(b"not an image") is None
+
+
+class TestImageTokens:
+    def test_small_image_is_billed_by_area(self) -> None:
+        # 200 * 150 / 750
+        block = _image_block(_png(200, 150))
+        assert _image_tokens(block["source"]) == 40
+
+    def test_large_image_is_downscaled_then_capped(self) -> None:
+        block = _image_block(_jpeg(4000, 3000), "image/jpeg")
+        assert _image_tokens(block["source"]) == _IMAGE_MAX_TOKENS
+
+    def test_url_image_counts_at_the_ceiling(self) -> None:
+        source = {"type": "url", "url": "https://example.com/a.png"}
+        assert _image_tokens(source) == _IMAGE_MAX_TOKENS
+
+
+class TestCountRequest:
+    def test_longer_text_counts_more(self) -> None:
+        short = count_anthropic_request_tokens(_body({"type": "text", "text": "hi"}))
+        long = count_anthropic_request_tokens(
+            _body({"type": "text", "text": "hi " * 1000})
+        )
+        assert long - short > 800
+
+    def test_image_is_not_counted_by_its_base64_length(self) -> None:
+        """The old len(json.dumps(body)) // 4 counted a 100KB image as
+        ~33k tokens; Anthropic bills it by pixel area."""
+        image = _image_block(_png(200, 150) + b"\x00" * 100_000)
+        assert count_anthropic_request_tokens(_body(image)) < 100
+
+    def test_tools_add_the_tool_use_system_prompt(self) -> None:
+        tool = {
+            "name": "bash",
+            "description": "Run a command",
+            "input_schema": {
+                "type": "object",
+                "properties": {"command": {"type": "string"}},
+            },
+        }
+        without = count_anthropic_request_tokens(_body("hi"))
+        with_tools = count_anthropic_request_tokens(_body("hi", tools=[tool]))
+        assert with_tools - without > _TOOL_SYSTEM_PROMPT_TOKENS
+
+    def test_system_blocks_are_counted(self) -> None:
+        system = [{"type": "text", "text": "x" * 3500}]
+        without = count_anthropic_request_tokens(_body("hi"))
+        assert count_anthropic_request_tokens(_body("hi", system=system)) == (
+            without + 1000
+        )
+
+    def test_only_the_last_assistant_turns_thinking_counts(self) -> None:
+        thinking = {"type": "thinking", "thinking": "t" * 3500, "signature": "s"}
+        body = {
+            "messages": [
+                {"role": "user", "content": "a"},
+                {"role": "assistant", "content": [thinking]},
+                {"role": "user", "content": "b"},
+                {"role": "assistant", "content": [thinking]},
+            ]
+        }
+        no_thinking = {
+            "messages": [
+                {"role": "user", "content": "a"},
+                {"role": "assistant", "content": []},
+                {"role": "user", "content": "b"},
+                {"role": "assistant", "content": []},
+            ]
+        }
+        assert count_anthropic_request_tokens(body) == (
+            count_anthropic_request_tokens(no_thinking) + 1000
+        )
+
+    def test_tool_use_and_results_are_counted(self) -> None:
+        body = {
+            "messages": [
+                {
+                    "role": "assistant",
+                    "content": [
+                        {
+                            "type": "tool_use",
+                            "id": "t1",
+                            "name": "bash",
+                            "input": {"command": "ls -la " * 50},
+                        }
+                    ],
+                },
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "tool_result",
+                            "tool_use_id": "t1",
+                            "content": [{"type": "text", "text": "f" * 3500}],
+                        }
+                    ],
+                },
+            ]
+        }
+        assert count_anthropic_request_tokens(body) > 1100
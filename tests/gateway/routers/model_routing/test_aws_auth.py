@@ -0,0 +1,133 @@
+"""
+Tests for aws_auth.py's cached Bedrock credentials and SigV4 signer.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+from botocore.credentials import Credentials, ReadOnlyCredentials
+
+from language_model_gateway.gateway.routers.model_routing import aws_auth
+from language_model_gateway.gateway.routers.model_routing.aws_auth import (
+    BedrockCredentialsUnavailableError,
+    BedrockSigner,
+    _sign_bedrock,
+    get_bedrock_signer,
+)
+
+_ROUTE = {"aws_region": "us-west-2"}
+_URL = "https://bedrock-runtime.us-west-2.amazonaws.com/model/m/invoke"
+
+
+@pytest.fixture(autouse=True)
+def _no_cached_signers(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    monkeypatch.delenv("AWS_PROFILE", raising=False)
+    with patch.dict(aws_auth._bedrock_signers, clear=True):
+        yield
+
+
+def _session_returning(credentials: Any) -> MagicMock:
+    session_cls = MagicMock()
+    session_cls.return_value.get_credentials.return_value = credentials
+    return session_cls
+
+
+def _refreshable(*, due: bool, expiring: bool, token: str = "t1") -> MagicMock:
+    """Refreshable credentials due for botocore's refresh and/or about to
+    expire."""
+    credentials = MagicMock()
+    credentials.refresh_needed.side_effect = lambda refresh_in=None: (
+        due if refresh_in is None else expiring
+    )
+    credentials.get_frozen_credentials.return_value = ReadOnlyCredentials(
+        "AKID", "secret", token
+    )
+    return credentials
+
+
+def test_credentials_are_resolved_once_and_requests_are_signed() -> None:
+    session_cls = _session_returning(Credentials("AKID", "secret"))
+    with patch("boto3.Session", session_cls):
+        first = _sign_bedrock(_URL, b"{}", _ROUTE)
+        second = _sign_bedrock(_URL, b'{"a": 1}', _ROUTE)
+
+    session_cls.assert_called_once_with(region_name="us-west-2")
+    assert first["Authorization"].startswith("AWS4-HMAC-SHA256 Credential=AKID/")
+    assert "/us-west-2/bedrock/" in first["Authorization"]
+    assert first["Authorization"] != second["Authorization"]
+
+
+def test_signers_are_per_profile_and_region(monkeypatch: pytest.MonkeyPatch) -> None:
+    east = get_bedrock_signer({"aws_region": "us-east-1"})
+    assert get_bedrock_signer({}) is east
+    assert get_bedrock_signer(_ROUTE) is not east
+    monkeypatch.setenv("AWS_PROFILE", "dev")
+    assert get_bedrock_signer({"aws_region": "us-east-1"}) is not east
+
+
+def test_no_credentials_raises_unavailable() -> None:
+    with (
+        patch("boto3.Session", _session_returning(None)),
+        pytest.raises(BedrockCredentialsUnavailableError),
+    ):
+        _sign_bedrock(_URL, b"{}", _ROUTE)
+
+
+def test_credentials_due_for_refresh_are_refreshed_in_the_background() -> None:
+    credentials = _refreshable(due=False, expiring=False)
+    signer = BedrockSigner(None, "us-west-2")
+    with patch("boto3.Session", _session_returning(credentials)):
+        current = signer.signer()
+        assert credentials.get_frozen_credentials.call_count == 1
+
+        credentials.refresh_needed.side_effect = lambda refresh_in=None: (
+            refresh_in is None
+        )
+        credentials.get_frozen_credentials.return_value = ReadOnlyCredentials(
+            "AKID", "secret", "t2"
+        )
+        # Still signs with the current credentials while refreshing.
+        assert signer.signer() is current
+        refresh = signer._refresh_thread
+        assert refresh is not None
+        refresh.join(timeout=5)
+
+    assert credentials.get_frozen_credentials.call_count == 2
+    credentials.refresh_needed.side_effect = lambda refresh_in=None: False
+    assert signer.signer() is not current
+    assert signer.signer().credentials.token == "t2"
+
+
+def test_expiring_credentials_are_refreshed_before_signing() -> None:
+    credentials = _refreshable(due=True, expiring=True)
+    signer = BedrockSigner(None, "us-west-2")
+    with patch("boto3.Session", _session_returning(credentials)) as session_cls:
+        signer.signer()
+        signer.signer()
+
+    session_cls.assert_called_once()
+    assert credentials.get_frozen_credentials.call_count == 2
+    assert signer._refresh_thread is None
+
+
+def test_failed_background_refresh_keeps_signing_and_backs_off() -> None:
+    credentials = _refreshable(due=False, expiring=False)
+    signer = BedrockSigner(None, "us-west-2")
+    with patch("boto3.Session", _session_returning(credentials)):
+        current = signer.signer()
+    credentials.refresh_needed.side_effect = lambda refresh_in=None: refresh_in is None
+    credentials.get_frozen_credentials.side_effect = RuntimeError("sts down")
+
+    assert signer.signer() is current
+    refresh = signer._refresh_thread
+    assert refresh is not None
+    refresh.join(timeout=5)
+
+    # Not retried straight away.
+    assert signer.signer() is current
+    assert not signer._refreshing()
+    assert credentials.get_frozen_credentials.call_count == 2
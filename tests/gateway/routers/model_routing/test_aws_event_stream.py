@@ -0,0 +1,99 @@
+"""
+Tests for aws_event_stream.py's incremental event-stream decoder.
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+import zlib
+from typing import Any
+
+import pytest
+
+from language_model_gateway.gateway.routers.model_routing.aws_event_stream import (
+    EventStreamDecoder,
+    EventStreamError,
+)
+
+
+def encode_message(headers: dict[str, str], payload: bytes) -> bytes:
+    """One event-stream message with string-valued headers."""
+    raw_headers = b""
+    for name, value in headers.items():
+        encoded_name = name.encode()
+        encoded_value = value.encode()
+        raw_headers += (
+            bytes([len(encoded_name)])
+            + encoded_name
+            + bytes([7])
+            + struct.pack(">H", len(encoded_value))
+            + encoded_value
+        )
+    total_length = 12 + len(raw_headers) + len(payload) + 4
+    prelude = struct.pack(">II", total_length, len(raw_headers))
+    message = prelude + struct.pack(">I", zlib.crc32(prelude)) + raw_headers + payload
+    return message + struct.pack(">I", zlib.crc32(message))
+
+
+def encode_event(event_type: str, payload: dict[str, Any]) -> bytes:
+    return encode_message(
+        {
+            ":event-type": event_type,
+            ":content-type": "application/json",
+            ":message-type": "event",
+        },
+        json.dumps(payload).encode(),
+    )
+
+
+def test_decodes_messages_split_across_arbitrary_chunks() -> None:
+    stream = encode_event("messageStart", {"role": "assistant"}) + encode_event(
+        "contentBlockDelta", {"delta": {"text": "hi"}, "contentBlockIndex": 0}
+    )
+    decoder = EventStreamDecoder()
+    messages = []
+    for i in range(0, len(stream), 7):
+        messages.extend(decoder.feed(stream[i : i + 7]))
+
+    assert [m.headers[":event-type"] for m in messages] == [
+        "messageStart",
+        "contentBlockDelta",
+    ]
+    assert json.loads(messages[1].payload)["delta"] == {"text": "hi"}
+    assert decoder.pending == 0
+
+
+def test_incomplete_message_stays_pending() -> None:
+    message = encode_event("messageStop", {"stopReason": "end_turn"})
+    decoder = EventStreamDecoder()
+    assert decoder.feed(message[:-1]) == []
+    assert decoder.pending == len(message) - 1
+    assert len(decoder.feed(message[-1:])) == 1
+
+
+def test_decodes_non_string_header_types() -> None:
+    raw_headers = (
+        b"\x04flag\x00"
+        + b"\x03int\x04"
+        + struct.pack(">i", -5)
+        + b"\x03buf\x06"
+        + struct.pack(">H", 2)
+        + b"\x01\x02"
+    )
+    total_length = 12 + len(raw_headers) + 4
+    prelude = struct.pack(">II", total_length, len(raw_headers))
+    message = prelude + struct.pack(">I", zlib.crc32(prelude)) + raw_headers
+    message += struct.pack(">I", zlib.crc32(message))
+
+    (decoded,) = EventStreamDecoder().feed(message)
+    assert decoded.headers == {"flag": True, "int": -5, "buf": b"\x01\x02"}
+    assert decoded.payload == b""
+
+
+@pytest.mark.parametrize("offset", [8, -1])
+def test_corrupt_checksum_raises(offset: int) -> None:
+    message = bytearray(encode_event("messageStart", {"role": "assistant"}))
+    message[offset] ^= 0xFF
+    with pytest.raises(EventStreamError):
+        EventStreamDecoder().feed(bytes(message))
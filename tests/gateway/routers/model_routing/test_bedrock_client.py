@@ -16,10 +16,25 @@ from language_model_gateway.gateway.routers.model_routing.bedrock_client import
 from language_model_gateway.gateway.routers.model_routing.constants import (
     _MAX_THROTTLE_RETRIES,
 )
+from language_model_gateway.gateway.routers.model_routing.failover import (
+    FailoverRequested,
+)
 
 _SIGN_BEDROCK = (
     "language_model_gateway.gateway.routers.model_routing.bedrock_client._sign_bedrock"
 )
+_RECORD_THROTTLE = (
+    "language_model_gateway.gateway.routers.model_routing.bedrock_client."
+    "_record_bedrock_throttle"
+)
+_RECORD_UNAVAILABLE = (
+    "language_model_gateway.gateway.routers.model_routing.bedrock_client."
+    "_record_bedrock_unavailable"
+)
+_RECORD_SUCCESS = (
+    "language_model_gateway.gateway.routers.model_routing.bedrock_client."
+    "_record_bedrock_success"
+)
 _THROTTLE_BACKOFF = (
     "language_model_gateway.gateway.routers.model_routing.bedrock_client."
     "_throttle_backoff"
@@ -114,3 +129,199 @@ class TestSendWithBedrockRetry:
             )
 
         assert client.send.await_count == 1
+
+    async def test_throttle_and_success_feed_dispatch_rate(self) -> None:
+        """A 429 must slow this route's dispatch rate (AIMD decrease) and the
+        eventual success must start recovering it."""
+        client = MagicMock(spec=httpx.AsyncClient)
+        client.build_request = MagicMock(return_value=MagicMock())
+        throttled_resp = MagicMock(spec=httpx.Response)
+        throttled_resp.status_code = 429
+        throttled_resp.headers = httpx.Headers()
+        throttled_resp.aread = AsyncMock(return_value=b"Too many requests")
+        throttled_resp.aclose = AsyncMock()
+        success_resp = MagicMock(spec=httpx.Response)
+        success_resp.status_code = 200
+        client.send = AsyncMock(side_effect=[throttled_resp, success_resp])
+        route = {"aws_region": "us-east-1", "model": "throttle-feedback-test"}
+
+        with (
+            patch(_SIGN_BEDROCK, return_value={}),
+            patch(_THROTTLE_BACKOFF, return_value=0),
+            patch(_RECORD_THROTTLE) as record_throttle,
+            patch(_RECORD_SUCCESS) as record_success,
+        ):
+            _, retry_count = await _send_with_bedrock_retry(
+                client,
+                "https://example.bedrock.aws/v1/messages",
+                {},
+                b"{}",
+                route,
+                "aws",
+            )
+
+        assert retry_count == 1
+        record_throttle.assert_called_once_with(route)
+        record_success.assert_called_once_with(route)
+
+    async def test_last_throttle_is_recorded_before_being_returned(self) -> None:
+        client = MagicMock(spec=httpx.AsyncClient)
+        client.build_request = MagicMock(return_value=MagicMock())
+        throttled_resp = MagicMock(spec=httpx.Response)
+        throttled_resp.status_code = 429
+        throttled_resp.headers = httpx.Headers()
+        throttled_resp.aread = AsyncMock(return_value=b"Too many requests")
+        throttled_resp.aclose = AsyncMock()
+        client.send = AsyncMock(return_value=throttled_resp)
+        route = {"aws_region": "us-east-1", "model": "last-throttle-test"}
+
+        with (
+            patch(_SIGN_BEDROCK, return_value={}),
+            patch(_THROTTLE_BACKOFF, return_value=0),
+            patch(_RECORD_THROTTLE) as record_throttle,
+        ):
+            resp, retry_count = await _send_with_bedrock_retry(
+                client,
+                "https://example.bedrock.aws/v1/messages",
+                {},
+                b"{}",
+                route,
+                "aws",
+            )
+
+        assert resp.status_code == 429
+        assert await resp.aread() == b"Too many requests"
+        assert retry_count == _MAX_THROTTLE_RETRIES
+        # Every attempt's throttle, the returned one included.
+        assert record_throttle.call_count == _MAX_THROTTLE_RETRIES + 1
+
+    async def test_server_error_after_throttles_reaches_the_breaker(self) -> None:
+        client = MagicMock(spec=httpx.AsyncClient)
+        client.build_request = MagicMock(return_value=MagicMock())
+        throttled_resp = MagicMock(spec=httpx.Response)
+        throttled_resp.status_code = 429
+        throttled_resp.headers = httpx.Headers()
+        throttled_resp.aread = AsyncMock(return_value=b"Too many requests")
+        throttled_resp.aclose = AsyncMock()
+        unavailable_resp = MagicMock(spec=httpx.Response)
+        unavailable_resp.status_code = 503
+        unavailable_resp.headers = httpx.Headers()
+        unavailable_resp.aread = AsyncMock(return_value=b"service unavailable")
+        unavailable_resp.aclose = AsyncMock()
+        client.send = AsyncMock(
+            side_effect=[throttled_resp] * _MAX_THROTTLE_RETRIES + [unavailable_resp]
+        )
+        route = {"aws_region": "us-east-1", "model": "last-5xx-test"}
+
+        with (
+            patch(_SIGN_BEDROCK, return_value={}),
+            patch(_THROTTLE_BACKOFF, return_value=0),
+            patch(_RECORD_THROTTLE),
+            patch(_RECORD_UNAVAILABLE) as record_unavailable,
+        ):
+            resp, retry_count = await _send_with_bedrock_retry(
+                client,
+                "https://example.bedrock.aws/v1/messages",
+                {},
+                b"{}",
+                route,
+                "aws",
+            )
+
+        assert resp.status_code == 503
+        assert retry_count == _MAX_THROTTLE_RETRIES
+        record_unavailable.assert_called_once_with(route)
+
+
+class TestSendWithBedrockRetryFailover:
+    """With a later candidate to fail over to, a throttle, 5xx or transport
+    error gives up on the first attempt instead of backing off."""
+
+    async def test_throttle_fails_over_without_retrying(self) -> None:
+        client = MagicMock(spec=httpx.AsyncClient)
+        client.build_request = MagicMock(return_value=MagicMock())
+        throttled_resp = MagicMock(spec=httpx.Response)
+        throttled_resp.status_code = 429
+        throttled_resp.headers = httpx.Headers()
+        throttled_resp.aread = AsyncMock(return_value=b"Too many requests")
+        throttled_resp.aclose = AsyncMock()
+        client.send = AsyncMock(return_value=throttled_resp)
+        route = {"aws_region": "us-east-1", "model": "failover-test"}
+
+        with (
+            patch(_RECORD_THROTTLE) as record_throttle,
+            pytest.raises(FailoverRequested) as exc_info,
+        ):
+            await _send_with_bedrock_retry(
+                client,
+                "https://example.bedrock.aws/v1/messages",
+                {},
+                b"{}",
+                route,
+                "aws",
+                failover=True,
+            )
+
+        assert exc_info.value.status_code == 429
+        assert client.send.await_count == 1
+        record_throttle.assert_called_once_with(route)
+
+    async def test_passthrough_overload_fails_over(self) -> None:
+        client = MagicMock(spec=httpx.AsyncClient)
+        client.build_request = MagicMock(return_value=MagicMock())
+        overloaded_resp = MagicMock(spec=httpx.Response)
+        overloaded_resp.status_code = 529
+        overloaded_resp.headers = httpx.Headers()
+        overloaded_resp.aread = AsyncMock(return_value=b'{"type": "error"}')
+        overloaded_resp.aclose = AsyncMock()
+        client.send = AsyncMock(return_value=overloaded_resp)
+
+        with pytest.raises(FailoverRequested):
+            await _send_with_bedrock_retry(
+                client,
+                "https://api.anthropic.com/v1/messages",
+                {},
+                b"{}",
+                {},
+                "passthrough",
+                failover=True,
+            )
+
+    async def test_client_error_is_returned_not_failed_over(self) -> None:
+        client = MagicMock(spec=httpx.AsyncClient)
+        client.build_request = MagicMock(return_value=MagicMock())
+        bad_resp = MagicMock(spec=httpx.Response)
+        bad_resp.status_code = 400
+        bad_resp.headers = httpx.Headers()
+        bad_resp.aread = AsyncMock(return_value=b"invalid request")
+        bad_resp.aclose = AsyncMock()
+        client.send = AsyncMock(return_value=bad_resp)
+
+        resp, retry_count = await _send_with_bedrock_retry(
+            client,
+            "https://api.anthropic.com/v1/messages",
+            {},
+            b"{}",
+            {},
+            "passthrough",
+            failover=True,
+        )
+
+        assert resp.status_code == 400
+        assert retry_count == 0
+
+    async def test_transport_error_fails_over(self) -> None:
+        client = MagicMock(spec=httpx.AsyncClient)
+        client.build_request = MagicMock(return_value=MagicMock())
+        client.send = AsyncMock(side_effect=httpx.ConnectError("refused"))
+
+        with pytest.raises(FailoverRequested):
+            await _send_with_bedrock_retry(
+                client,
+                "https://api.anthropic.com/v1/messages",
+                {},
+                b"{}",
+                {},
+                "passthrough",
+                failover=True,
+            )
@@ -0,0 +1,156 @@
+"""
+Tests for bedrock_executor.py's dedicated boto3 pool and stream pump.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import Iterator
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from language_model_gateway.gateway.routers.model_routing.bedrock_executor import (
+    BedrockExecutor,
+    BedrockExecutorSaturatedError,
+    _EventPump,
+)
+
+
+class FakeSyncEventStream:
+    """Stands in for boto3's synchronous EventStream."""
+
+    def __init__(
+        self, events: Iterator[dict[str, Any]], exc: Exception | None = None
+    ) -> None:
+        self._iter = events
+        self._exc = exc
+        self.closed = threading.Event()
+
+    def __iter__(self) -> "FakeSyncEventStream":
+        return self
+
+    def __next__(self) -> dict[str, Any]:
+        try:
+            return next(self._iter)
+        except StopIteration:
+            if self._exc is not None:
+                raise self._exc from None
+            raise
+
+    def close(self) -> None:
+        self.closed.set()
+
+
+async def _wait_until_idle(executor: BedrockExecutor) -> None:
+    for _ in range(200):
+        if executor.in_flight == 0:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"{executor.in_flight} call(s) still in flight")
+
+
+async def test_run_uses_the_dedicated_pool() -> None:
+    executor = BedrockExecutor()
+    name = await executor.run(lambda: threading.current_thread().name)
+    assert name.startswith("model-routing-bedrock")
+    await _wait_until_idle(executor)
+    executor.shutdown()
+
+
+async def test_stream_yields_events_in_order_and_closes_the_stream() -> None:
+    events = [
+        {"messageStart": {"role": "assistant"}},
+        {"messageStop": {"stopReason": "end_turn"}},
+    ]
+    sync_stream = FakeSyncEventStream(iter(events))
+    executor = BedrockExecutor()
+
+    result = [e async for e in await executor.stream(lambda: sync_stream)]
+
+    assert result == events
+    assert sync_stream.closed.wait(timeout=5)
+    await _wait_until_idle(executor)
+    executor.shutdown()
+
+
+async def test_stream_propagates_exception_mid_stream() -> None:
+    events = [{"messageStart": {"role": "assistant"}}]
+    sync_stream = FakeSyncEventStream(iter(events), RuntimeError("boom"))
+    executor = BedrockExecutor()
+    collected = []
+    with pytest.raises(RuntimeError, match="boom"):
+        async for e in await executor.stream(lambda: sync_stream):
+            collected.append(e)
+    assert collected == events
+    executor.shutdown()
+
+
+async def test_failure_to_open_the_stream_raises_from_stream() -> None:
+    def open_stream() -> FakeSyncEventStream:
+        raise ValueError("throttled")
+
+    executor = BedrockExecutor()
+    with pytest.raises(ValueError, match="throttled"):
+        await executor.stream(open_stream)
+    await _wait_until_idle(executor)
+    executor.shutdown()
+
+
+async def test_events_arriving_together_are_handed_over_in_batches() -> None:
+    events = [{"contentBlockDelta": {"delta": {"text": str(i)}}} for i in range(200)]
+    deliveries = 0
+    deliver = _EventPump._deliver
+
+    def counting_deliver(self: _EventPump[Any]) -> None:
+        nonlocal deliveries
+        deliveries += 1
+        deliver(self)
+
+    executor = BedrockExecutor()
+    with patch.object(_EventPump, "_deliver", counting_deliver):
+        stream = await executor.stream(lambda: FakeSyncEventStream(iter(events)))
+        assert [e async for e in stream] == events
+
+    assert deliveries < len(events)
+    executor.shutdown()
+
+
+async def test_saturated_executor_rejects_instead_of_queueing() -> None:
+    release = threading.Event()
+
+    def slow_events() -> Iterator[dict[str, Any]]:
+        yield {"messageStart": {"role": "assistant"}}
+        release.wait(timeout=5)
+
+    executor = BedrockExecutor(max_workers=1)
+    stream = await executor.stream(lambda: FakeSyncEventStream(slow_events()))
+    assert executor.in_flight == 1
+
+    with pytest.raises(BedrockExecutorSaturatedError):
+        await executor.run(lambda: None)
+
+    release.set()
+    assert len([e async for e in stream]) == 1
+    await _wait_until_idle(executor)
+    assert await executor.run(lambda: "ok") == "ok"
+    executor.shutdown()
+
+
+async def test_abandoned_stream_stops_the_pump() -> None:
+    def endless() -> Iterator[dict[str, Any]]:
+        while True:
+            yield {"contentBlockDelta": {"delta": {"text": "x"}}}
+
+    sync_stream = FakeSyncEventStream(endless())
+    executor = BedrockExecutor(max_buffered_events=4)
+    stream = await executor.stream(lambda: sync_stream)
+
+    assert await anext(stream) is not None
+    await stream.aclose()
+
+    assert sync_stream.closed.wait(timeout=5)
+    await _wait_until_idle(executor)
+    executor.shutdown()
@@ -0,0 +1,131 @@
+"""
+Tests for circuit_breaker.py's per-(region, model) circuit breaker.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import patch
+
+from language_model_gateway.gateway.routers.model_routing.circuit_breaker import (
+    RouteCircuitBreaker,
+)
+
+_KEY = "us-east-1/qwen.test"
+
+
+def _route(
+    model: str = "qwen.test",
+    region: str = "us-east-1",
+) -> dict[str, Any]:
+    return {"auth": "aws", "aws_region": region, "model": model}
+
+
+def _breaker(**kwargs: Any) -> RouteCircuitBreaker:
+    kwargs.setdefault("min_samples", 3)
+    kwargs.setdefault("health_alpha", 0.5)
+    kwargs.setdefault("open_below_health", 0.2)
+    return RouteCircuitBreaker(**kwargs)
+
+
+def _fail(breaker: RouteCircuitBreaker, times: int, route: dict[str, Any]) -> None:
+    for _ in range(times):
+        breaker.record_failure(route)
+
+
+class TestClosed:
+    def test_unknown_route_is_admitted(self) -> None:
+        assert _breaker().try_acquire(_route()) is True
+
+    def test_isolated_failures_keep_circuit_closed(self) -> None:
+        breaker = _breaker()
+        route = _route()
+        for _ in range(10):
+            breaker.record_failure(route)
+            breaker.record_success(route)
+        assert breaker.snapshot()[_KEY]["state"] == "closed"
+        assert breaker.try_acquire(route) is True
+
+    def test_needs_min_samples_before_opening(self) -> None:
+        breaker = _breaker(min_samples=5)
+        route = _route()
+        _fail(breaker, 4, route)
+        assert breaker.snapshot()[_KEY]["state"] == "closed"
+        breaker.record_failure(route)
+        assert breaker.snapshot()[_KEY]["state"] == "open"
+
+
+class TestOpen:
+    def test_open_circuit_rejects_and_reports_retry_after(self) -> None:
+        breaker = _breaker(open_seconds=30.0)
+        route = _route()
+        _fail(breaker, 3, route)
+        assert breaker.try_acquire(route) is False
+        assert 0 < breaker.retry_after(route) <= 30.0
+
+    def test_other_region_or_model_is_unaffected(self) -> None:
+        breaker = _breaker()
+        _fail(breaker, 3, _route())
+        assert breaker.try_acquire(_route(model="qwen.other")) is True
+        assert breaker.try_acquire(_route(region="us-west-2")) is True
+
+    def test_straggler_success_does_not_close_an_open_circuit(self) -> None:
+        breaker = _breaker(open_seconds=30.0)
+        route = _route()
+        _fail(breaker, 3, route)
+        # A request admitted before the circuit opened succeeds late.
+        breaker.record_success(route)
+        assert breaker.snapshot()[_KEY]["state"] == "open"
+        assert breaker.try_acquire(route) is False
+
+
+class TestHalfOpen:
+    def _opened_at_epoch(self, breaker: RouteCircuitBreaker) -> None:
+        for _key, circuit in breaker.circuits():
+            circuit.opened_at = 1_000_000.0
+
+    def test_probe_success_closes_circuit(self) -> None:
+        breaker = _breaker(open_seconds=30.0)
+        route = _route()
+        _fail(breaker, 3, route)
+        self._opened_at_epoch(breaker)
+        with patch(
+            "language_model_gateway.gateway.routers.model_routing.circuit_breaker.time.monotonic",
+            return_value=1_000_031.0,
+        ):
+            assert breaker.try_acquire(route) is True
+            assert breaker.snapshot()[_KEY]["state"] == "half_open"
+            assert breaker.try_acquire(route) is False
+            breaker.record_success(route)
+            assert breaker.snapshot()[_KEY] == {
+                "state": "closed",
+                "health": 1.0,
+                "samples": 0,
+                "retry_after_s": 0.0,
+            }
+            assert breaker.try_acquire(route) is True
+
+    def test_probe_failure_reopens_circuit(self) -> None:
+        breaker = _breaker(open_seconds=30.0)
+        route = _route()
+        _fail(breaker, 3, route)
+        self._opened_at_epoch(breaker)
+        with patch(
+            "language_model_gateway.gateway.routers.model_routing.circuit_breaker.time.monotonic",
+            return_value=1_000_031.0,
+        ):
+            assert breaker.try_acquire(route) is True
+            breaker.record_failure(route)
+            assert breaker.snapshot()[_KEY]["state"] == "open"
+            assert breaker.try_acquire(route) is False
+
+
+class TestConfigure:
+    def test_disabled_breaker_admits_everything_and_forgets_state(self) -> None:
+        breaker = _breaker()
+        route = _route()
+        _fail(breaker, 3, route)
+        breaker.configure(enabled=False, open_seconds=30.0, open_below_health=0.2)
+        assert breaker.snapshot() == {}
+        _fail(breaker, 10, route)
+        assert breaker.try_acquire(route) is True
@@ -7,8 +7,10 @@ downloading any HuggingFace model.
 
 from __future__ import annotations
 
-from typing import Any, Sequence
-from unittest.mock import _patch, patch
+from typing import Any, Iterator, Sequence
+from unittest.mock import MagicMock, _patch, patch
+
+import pytest
 
 from language_model_gateway.gateway.routers.model_routing.context_manager import (
     _TOOL_COMPRESS_THRESHOLD_CHARS,
@@ -79,6 +81,23 @@ def _mock_count_seq(values: Sequence[int | None]) -> _patch:  # type: ignore[typ
     )
 
 
+def _mock_message_count(value: int | None) -> _patch:  # type: ignore[type-arg]
+    """Patch count_oai_message_tokens to return *value* for every message."""
+    return patch(
+        "language_model_gateway.gateway.routers.model_routing.context_manager"
+        ".count_oai_message_tokens",
+        return_value=value,
+    )
+
+
+@pytest.fixture(autouse=True)
+def _no_per_message_counts() -> Iterator[None]:
+    """Per-message counts unavailable unless a test opts in, so the
+    count_oai_request_tokens sequences below describe every recount."""
+    with _mock_message_count(None):
+        yield
+
+
 # ---------------------------------------------------------------------------
 # ContextBudget
 # ---------------------------------------------------------------------------
@@ -511,3 +530,212 @@ def test_output_budget_cap_clamps_to_hard_headroom_when_severely_exceeded() -> N
     )
     result = _apply_output_budget_cap(oai_body, 20000, budget)
     assert result["max_tokens"] == 1
+
+
+# ---------------------------------------------------------------------------
+# enforce_context_budget — incremental counting from per-message counts
+# ---------------------------------------------------------------------------
+
+
+def _long_session(turns: int) -> list[dict[str, Any]]:
+    messages = [_msg("system", "sys")]
+    for i in range(turns):
+        messages += [_msg("user", f"q{i}"), _msg("assistant", f"a{i}")]
+    return messages + [_msg("user", "CURRENT")]
+
+
+def test_drops_by_subtraction_and_recounts_once() -> None:
+    """With per-message counts available, Phase 2 subtracts dropped groups'
+    counts instead of re-templating the conversation after every drop: one
+    recount confirms the cut fits, one more that a smaller cut doesn't."""
+    body = _body(_long_session(20))
+    # effective budget = 262144 - 16384 - 6000 = 239760; 300000 is 60240 over,
+    # so with 10000 tokens/message, 7 single-message groups must go.
+    full_count = MagicMock(side_effect=[300000, 235000, 245000])
+    with (
+        patch(
+            "language_model_gateway.gateway.routers.model_routing.context_manager"
+            ".count_oai_request_tokens",
+            full_count,
+        ),
+        _mock_message_count(10000),
+    ):
+        result = enforce_context_budget(body, {}, FAKE_MODEL)
+    assert full_count.call_count == 3
+    contents = [m["content"] for m in result["messages"]]
+    assert contents[:2] == ["sys", "a3"]
+    assert contents[-1] == "CURRENT"
+
+
+def test_falls_back_to_exact_bisection_when_estimate_undershoots() -> None:
+    """Per-message counts are approximate; if the confirming recount is still
+    over budget, the cut is found by bisecting over exact recounts."""
+    body = _body(_long_session(20))
+
+    def exact(oai_body: dict[str, Any], _model: str) -> int:
+        # 9000/message + 30000 template overhead, vs. 10000/message estimated
+        return 9000 * (len(oai_body["messages"]) - 1) + 30000
+
+    full_count = MagicMock(side_effect=exact)
+    with (
+        patch(
+            "language_model_gateway.gateway.routers.model_routing.context_manager"
+            ".count_oai_request_tokens",
+            full_count,
+        ),
+        _mock_message_count(10000),
+    ):
+        result = enforce_context_budget(body, {}, FAKE_MODEL)
+    # Smallest cut with 9000 * remaining + 30000 <= 239760 is 18 groups.
+    assert [m["content"] for m in result["messages"]][:2] == ["sys", "q9"]
+    # initial + confirm + a bisection over 24 candidates, not one per group
+    assert full_count.call_count <= 2 + 5
+
+
+def test_smallest_cut_is_kept_when_estimate_overshoots() -> None:
+    """Per-message counts leave out the chat template's tool-call wrappers,
+    so the estimate can drop more groups than needed; the recount then fits,
+    and smaller cuts must still be tried rather than over-trimming."""
+    body = _body(_long_session(20))
+
+    def exact(oai_body: dict[str, Any], _model: str) -> int:
+        # 12000/message in reality vs. 10000/message estimated
+        return 12000 * (len(oai_body["messages"]) - 1)
+
+    full_count = MagicMock(side_effect=exact)
+    with (
+        patch(
+            "language_model_gateway.gateway.routers.model_routing.context_manager"
+            ".count_oai_request_tokens",
+            full_count,
+        ),
+        _mock_message_count(10000),
+    ):
+        result = enforce_context_budget(body, {}, FAKE_MODEL)
+    # The estimate cuts 26 groups; the smallest cut with
+    # 12000 * (41 - cut) <= 239760 is 22.
+    contents = [m["content"] for m in result["messages"]]
+    assert contents[:2] == ["sys", "q11"]
+    assert len(contents) == 1 + 41 - 22
+    assert full_count.call_count <= 2 + 1 + 5
+
+
+def test_exact_bisection_without_per_message_counts() -> None:
+    body = _body(_long_session(20))
+    full_count = MagicMock(side_effect=lambda b, _m: 10000 * len(b["messages"]))
+    with patch(
+        "language_model_gateway.gateway.routers.model_routing.context_manager"
+        ".count_oai_request_tokens",
+        full_count,
+    ):
+        result = enforce_context_budget(body, {}, FAKE_MODEL)
+    # 10000 * (1 system + remaining) <= 239760 → at most 22 remaining → cut 19
+    assert len(result["messages"]) == 23
+    assert result["messages"][-1]["content"] == "CURRENT"
+    assert full_count.call_count <= 1 + 6
+
+
+def test_compression_stops_once_estimate_fits() -> None:
+    """Older oversized tool results are compressed first; newer ones are left
+    intact once the estimate is within budget."""
+    big = "Z" * (2 * _TOOL_COMPRESS_THRESHOLD_CHARS)
+    body = _body(
+        [
+            _msg("system", "sys"),
+            *_tool_call_group("old", big),
+            _msg("user", "next"),
+            *_tool_call_group("new", big),
+            _msg("user", "go"),
+        ]
+    )
+    full_count = MagicMock(side_effect=[6000, 4000])
+    with (
+        patch(
+            "language_model_gateway.gateway.routers.model_routing.context_manager"
+            ".count_oai_request_tokens",
+            full_count,
+        ),
+        patch(
+            "language_model_gateway.gateway.routers.model_routing.context_manager"
+            ".count_oai_message_tokens",
+            side_effect=lambda msg, _model: len(msg["content"] or "") // 4,
+        ),
+    ):
+        result = enforce_context_budget(
+            body, {"effective_input_tokens": 5000}, FAKE_MODEL
+        )
+    tools = {
+        m["tool_call_id"]: m["content"]
+        for m in result["messages"]
+        if m["role"] == "tool"
+    }
+    assert _TRUNCATION_MARKER in tools["old"]
+    assert tools["new"] == big
+
+
+def test_compression_estimate_is_confirmed_before_returning() -> None:
+    big = "Z" * (2 * _TOOL_COMPRESS_THRESHOLD_CHARS)
+    body = _body(
+        [_msg("system", "sys"), *_tool_call_group("tc1", big), _msg("user", "go")]
+    )
+    route = {"effective_input_tokens": 5000}
+    full_count = MagicMock(side_effect=[6000, 4500])
+    with (
+        patch(
+            "language_model_gateway.gateway.routers.model_routing.context_manager"
+            ".count_oai_request_tokens",
+            full_count,
+        ),
+        patch(
+            "language_model_gateway.gateway.routers.model_routing.context_manager"
+            ".count_oai_message_tokens",
+            side_effect=lambda msg, _model: len(msg["content"] or "") // 4,
+        ),
+    ):
+        result = enforce_context_budget(body, route, FAKE_MODEL)
+    assert full_count.call_count == 2
+    tool_msg = next(m for m in result["messages"] if m.get("role") == "tool")
+    assert _TRUNCATION_MARKER in tool_msg["content"]
+
+
+def test_remaining_results_are_compressed_when_the_estimate_undershoots() -> None:
+    """The estimate fits after the first compression but the recount
+    doesn't: the other oversized results are compressed before any history
+    is dropped."""
+    big = "Z" * (2 * _TOOL_COMPRESS_THRESHOLD_CHARS)
+    messages = [
+        _msg("system", "sys"),
+        *_tool_call_group("old", big),
+        _msg("user", "next"),
+        *_tool_call_group("new", big),
+        _msg("user", "go"),
+    ]
+    full_count = MagicMock(side_effect=[6000, 5200, 4200])
+    with (
+        patch(
+            "language_model_gateway.gateway.routers.model_routing.context_manager"
+            ".count_oai_request_tokens",
+            full_count,
+        ),
+        patch(
+            "language_model_gateway.gateway.routers.model_routing.context_manager"
+            ".count_oai_message_tokens",
+            side_effect=lambda msg, _model: len(msg["content"] or "") // 4,
+        ),
+    ):
+        result = enforce_context_budget(
+            _body(messages), {"effective_input_tokens": 5000}, FAKE_MODEL
+        )
+    assert full_count.call_count == 3
+    assert len(result["messages"]) == len(messages)
+    tools = [m["content"] for m in result["messages"] if m["role"] == "tool"]
+    assert all(_TRUNCATION_MARKER in content for content in tools)
+
+
+def test_char_estimate_only_skips_the_tokenizer() -> None:
+    """Used when the tokenizer executor is saturated or timed out."""
+    body = _body([_msg("user", "hello")])
+    with _mock_count(1000) as full_count:
+        result = enforce_context_budget(body, {}, FAKE_MODEL, char_estimate_only=True)
+    full_count.assert_not_called()
+    assert result["messages"] == body["messages"]
@@ -0,0 +1,163 @@
+"""
+Tests for converse_http_client.py — native Bedrock Converse over pooled httpx.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterator
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from botocore.exceptions import ClientError, EventStreamError, NoCredentialsError
+from pytest_httpx import HTTPXMock, IteratorStream
+
+from language_model_gateway.gateway.routers.model_routing.aws_auth import (
+    BedrockCredentialsUnavailableError,
+)
+from language_model_gateway.gateway.routers.model_routing.converse_http_client import (
+    AsyncConverseClient,
+)
+from language_model_gateway.gateway.routers.model_routing.upstream_client_pool import (
+    UpstreamClientPool,
+)
+from tests.gateway.routers.model_routing.test_aws_event_stream import (
+    encode_event,
+    encode_message,
+)
+
+_ROUTE = {"aws_region": "us-west-2"}
+_MODEL_ID = "us.anthropic.claude-sonnet-4-5-20250929-v1:0"
+_BASE = "https://bedrock-runtime.us-west-2.amazonaws.com/model/"
+_STREAM_URL = f"{_BASE}us.anthropic.claude-sonnet-4-5-20250929-v1%3A0/converse-stream"
+_CONVERSE_URL = f"{_BASE}us.anthropic.claude-sonnet-4-5-20250929-v1%3A0/converse"
+_SIGN = (
+    "language_model_gateway.gateway.routers.model_routing.converse_http_client."
+    "_sign_bedrock"
+)
+
+
+@pytest.fixture(autouse=True)
+def _unsigned() -> Iterator[None]:
+    with patch(_SIGN, return_value={"Authorization": "AWS4-HMAC-SHA256 test"}):
+        yield
+
+
+def _kwargs() -> dict[str, Any]:
+    return {
+        "modelId": _MODEL_ID,
+        "messages": [{"role": "user", "content": [{"text": "hi"}]}],
+        "inferenceConfig": {"maxTokens": 16},
+    }
+
+
+async def test_converse_stream_yields_boto3_shaped_events(
+    httpx_mock: HTTPXMock,
+) -> None:
+    body = (
+        encode_event("messageStart", {"role": "assistant"})
+        + encode_event(
+            "contentBlockDelta", {"delta": {"text": "hel"}, "contentBlockIndex": 0}
+        )
+        + encode_event("messageStop", {"stopReason": "end_turn"})
+    )
+    httpx_mock.add_response(
+        url=_STREAM_URL,
+        method="POST",
+        stream=IteratorStream([body[:20], body[20:61], body[61:]]),
+    )
+    pool = UpstreamClientPool()
+    client = AsyncConverseClient(upstream_client_pool=pool)
+
+    events = [e async for e in await client.converse_stream(_ROUTE, _kwargs())]
+
+    assert events == [
+        {"messageStart": {"role": "assistant"}},
+        {"contentBlockDelta": {"delta": {"text": "hel"}, "contentBlockIndex": 0}},
+        {"messageStop": {"stopReason": "end_turn"}},
+    ]
+    request = httpx_mock.get_request()
+    assert request is not None
+    assert request.headers["Authorization"] == "AWS4-HMAC-SHA256 test"
+    assert "modelId" not in json.loads(request.content)
+    await pool.aclose()
+
+
+async def test_error_response_raises_client_error(httpx_mock: HTTPXMock) -> None:
+    httpx_mock.add_response(
+        url=_STREAM_URL,
+        method="POST",
+        status_code=429,
+        headers={
+            "x-amzn-errortype": "ThrottlingException:http://internal.amazon.com/",
+            "x-amzn-requestid": "req-1",
+        },
+        json={"message": "Too many requests, please wait before trying again."},
+    )
+    pool = UpstreamClientPool()
+    client = AsyncConverseClient(upstream_client_pool=pool)
+
+    with pytest.raises(ClientError) as exc_info:
+        await client.converse_stream(_ROUTE, _kwargs())
+
+    error = exc_info.value.response
+    assert error["Error"]["Code"] == "ThrottlingException"
+    assert error["Error"]["Message"].startswith("Too many requests")
+    assert error["ResponseMetadata"]["HTTPStatusCode"] == 429
+    assert error["ResponseMetadata"]["RequestId"] == "req-1"
+    await pool.aclose()
+
+
+async def test_mid_stream_exception_raises_event_stream_error(
+    httpx_mock: HTTPXMock,
+) -> None:
+    httpx_mock.add_response(
+        url=_STREAM_URL,
+        method="POST",
+        content=encode_event("messageStart", {"role": "assistant"})
+        + encode_message(
+            {
+                ":exception-type": "modelStreamErrorException",
+                ":message-type": "exception",
+            },
+            b'{"message": "stream broke"}',
+        ),
+    )
+    pool = UpstreamClientPool()
+    client = AsyncConverseClient(upstream_client_pool=pool)
+    events = await client.converse_stream(_ROUTE, _kwargs())
+
+    assert await anext(events) == {"messageStart": {"role": "assistant"}}
+    with pytest.raises(EventStreamError) as exc_info:
+        await anext(events)
+    assert exc_info.value.response["Error"] == {
+        "Code": "ModelStreamErrorException",
+        "Message": "stream broke",
+    }
+    await pool.aclose()
+
+
+async def test_converse_returns_the_response_body(httpx_mock: HTTPXMock) -> None:
+    response = {
+        "output": {"message": {"role": "assistant", "content": [{"text": "hi"}]}},
+        "stopReason": "end_turn",
+        "usage": {"inputTokens": 3, "outputTokens": 1, "totalTokens": 4},
+    }
+    httpx_mock.add_response(url=_CONVERSE_URL, method="POST", json=response)
+    pool = UpstreamClientPool()
+    client = AsyncConverseClient(upstream_client_pool=pool)
+
+    assert await client.converse(_ROUTE, _kwargs()) == response
+    await pool.aclose()
+
+
+async def test_missing_credentials_raise_no_credentials_error() -> None:
+    pool = UpstreamClientPool()
+    client = AsyncConverseClient(upstream_client_pool=pool)
+    with (
+        patch(_SIGN, side_effect=BedrockCredentialsUnavailableError("no creds")),
+        pytest.raises(NoCredentialsError),
+    ):
+        await client.converse(_ROUTE, _kwargs())
+    await pool.aclose()
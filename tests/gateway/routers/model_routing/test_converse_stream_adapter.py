@@ -14,61 +14,10 @@ import pytest
 
 from language_model_gateway.gateway.routers.model_routing.converse_stream_adapter import (
     _converse_stream_with_usage_tracking,
-    _iter_converse_stream_events,
     _stream_bedrock_converse_to_anthropic,
 )
 
 
-class FakeSyncEventStream:
-    """Stands in for boto3's synchronous EventStream — a plain iterator."""
-
-    def __init__(self, events: list[dict[str, Any]]) -> None:
-        self._iter = iter(events)
-
-    def __iter__(self) -> "FakeSyncEventStream":
-        return self
-
-    def __next__(self) -> dict[str, Any]:
-        return next(self._iter)
-
-
-class FakeSyncEventStreamThatRaises:
-    def __init__(self, events: list[dict[str, Any]], exc: Exception) -> None:
-        self._iter = iter(events)
-        self._exc = exc
-
-    def __iter__(self) -> "FakeSyncEventStreamThatRaises":
-        return self
-
-    def __next__(self) -> dict[str, Any]:
-        try:
-            return next(self._iter)
-        except StopIteration:
-            raise self._exc from None
-
-
-class TestIterConverseStreamEvents:
-    @pytest.mark.asyncio
-    async def test_yields_events_in_order(self) -> None:
-        events = [
-            {"messageStart": {"role": "assistant"}},
-            {"messageStop": {"stopReason": "end_turn"}},
-        ]
-        sync_stream = FakeSyncEventStream(events)
-        result = [e async for e in _iter_converse_stream_events(sync_stream)]
-        assert result == events
-
-    @pytest.mark.asyncio
-    async def test_propagates_exception_mid_stream(self) -> None:
-        events = [{"messageStart": {"role": "assistant"}}]
-        sync_stream = FakeSyncEventStreamThatRaises(events, RuntimeError("boom"))
-        collected = []
-        with pytest.raises(RuntimeError, match="boom"):
-            async for e in _iter_converse_stream_events(sync_stream):
-                collected.append(e)
-        assert collected == events
-
-
 class TestStreamBedrockConverseToAnthropic:
     @staticmethod
     async def _fake_events(
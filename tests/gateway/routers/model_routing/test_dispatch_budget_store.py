@@ -0,0 +1,60 @@
+"""
+Tests for dispatch_budget_store.py's Redis-backed shared dispatch budget.
+
+No Redis server is needed: the scripts are stubbed at `register_script`, so
+these cover key naming, argument order and reply decoding; the Lua itself
+mirrors _TokenBucket's arithmetic in dispatch_scheduler.py.
+"""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from language_model_gateway.gateway.routers.model_routing.dispatch_budget_store import (
+    RedisDispatchBudgetStore,
+)
+
+
+def _store(replies: list[bytes]) -> tuple[RedisDispatchBudgetStore, list[AsyncMock]]:
+    client = MagicMock()
+    client.aclose = AsyncMock()
+    scripts = [AsyncMock(return_value=reply) for reply in replies]
+    client.register_script.side_effect = scripts
+    with patch("redis.asyncio.from_url", return_value=client):
+        store = RedisDispatchBudgetStore("redis://localhost:6379/0", ttl_seconds=60)
+    return store, scripts
+
+
+async def test_take_decodes_wait_seconds() -> None:
+    store, (take, _, _) = _store([b"0.25", b"1", b"1"])
+    wait = await store.take("us-east-1/qwen.test", max_rate=4.0, burst=3.0)
+    assert wait == 0.25
+    take.assert_awaited_once_with(
+        keys=["model-routing:bedrock-dispatch:us-east-1/qwen.test"],
+        args=[4.0, 3.0, 60],
+    )
+
+
+async def test_throttle_and_success_pass_aimd_parameters() -> None:
+    store, (_, throttle, success) = _store([b"0", b"2", b"2.2"])
+    assert (
+        await store.record_throttle(
+            "us-east-1/qwen.test", max_rate=4.0, min_rate=0.2, decrease_factor=0.5
+        )
+        == 2.0
+    )
+    assert (
+        await store.record_success(
+            "us-east-1/qwen.test", max_rate=4.0, increase_fraction=0.05
+        )
+        == 2.2
+    )
+    throttle.assert_awaited_once_with(
+        keys=["model-routing:bedrock-dispatch:us-east-1/qwen.test"],
+        args=[4.0, 0.2, 0.5, 60],
+    )
+    success.assert_awaited_once_with(
+        keys=["model-routing:bedrock-dispatch:us-east-1/qwen.test"],
+        args=[4.0, 0.05, 60],
+    )
+    await store.aclose()
@@ -0,0 +1,200 @@
+"""
+Tests for dispatch_scheduler.py's per-(region, model) token-bucket pacing.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, override
+
+import pytest
+
+from language_model_gateway.gateway.routers.model_routing.dispatch_budget_store import (
+    BaseDispatchBudgetStore,
+)
+from language_model_gateway.gateway.routers.model_routing.dispatch_scheduler import (
+    BedrockDispatchScheduler,
+)
+
+
+def _route(
+    model: str = "qwen.test",
+    region: str = "us-east-1",
+    **extra: Any,
+) -> dict[str, Any]:
+    return {"auth": "aws", "aws_region": region, "model": model, **extra}
+
+
+class TestAcquire:
+    async def test_burst_dispatches_immediately(self) -> None:
+        scheduler = BedrockDispatchScheduler()
+        route = _route(dispatch_rate_per_s=1.0, dispatch_burst=3)
+        waits = [await scheduler.acquire(route) for _ in range(3)]
+        assert max(waits) < 0.05
+
+    async def test_waits_for_refill_once_burst_is_spent(self) -> None:
+        scheduler = BedrockDispatchScheduler()
+        route = _route(dispatch_rate_per_s=20.0, dispatch_burst=1)
+        await scheduler.acquire(route)
+        waited = await scheduler.acquire(route)
+        assert waited == pytest.approx(0.05, abs=0.04)
+
+    async def test_other_region_or_model_is_not_blocked(self) -> None:
+        """The old global lock made every Bedrock request wait on every
+        other one; separate (region, model) keys must not."""
+        scheduler = BedrockDispatchScheduler()
+        slow = _route(dispatch_rate_per_s=0.5, dispatch_burst=1)
+        await scheduler.acquire(slow)
+        blocked = asyncio.create_task(scheduler.acquire(slow))
+        await asyncio.sleep(0)
+
+        other_model = await scheduler.acquire(_route(model="qwen.other"))
+        other_region = await scheduler.acquire(_route(region="us-west-2"))
+
+        assert other_model < 0.05
+        assert other_region < 0.05
+        assert scheduler.snapshot()["us-east-1/qwen.test"]["queued"] == 1
+        blocked.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await blocked
+        assert scheduler.snapshot()["us-east-1/qwen.test"]["queued"] == 0
+
+
+class TestAimd:
+    async def test_throttle_halves_rate_and_drains_bucket(self) -> None:
+        scheduler = BedrockDispatchScheduler()
+        route = _route(dispatch_rate_per_s=4.0, dispatch_burst=5)
+        scheduler.record_throttle(route)
+        state = scheduler.snapshot()["us-east-1/qwen.test"]
+        assert state["rate_per_s"] == 2.0
+        assert state["tokens"] <= 0.0
+
+    async def test_rate_never_drops_below_floor(self) -> None:
+        scheduler = BedrockDispatchScheduler(min_rate_per_s=0.5)
+        route = _route(dispatch_rate_per_s=4.0)
+        for _ in range(10):
+            scheduler.record_throttle(route)
+        assert scheduler.snapshot()["us-east-1/qwen.test"]["rate_per_s"] == 0.5
+
+    async def test_success_recovers_additively_up_to_configured_rate(self) -> None:
+        scheduler = BedrockDispatchScheduler(increase_fraction=0.25)
+        route = _route(dispatch_rate_per_s=4.0)
+        scheduler.record_throttle(route)
+        scheduler.record_success(route)
+        assert scheduler.snapshot()["us-east-1/qwen.test"]["rate_per_s"] == 3.0
+        for _ in range(10):
+            scheduler.record_success(route)
+        assert scheduler.snapshot()["us-east-1/qwen.test"]["rate_per_s"] == 4.0
+
+    async def test_picks_up_changed_route_config(self) -> None:
+        scheduler = BedrockDispatchScheduler()
+        await scheduler.acquire(_route(dispatch_rate_per_s=4.0, dispatch_burst=4))
+        await scheduler.acquire(_route(dispatch_rate_per_s=2.0, dispatch_burst=2))
+        state = scheduler.snapshot()["us-east-1/qwen.test"]
+        assert state["max_rate_per_s"] == 2.0
+        assert state["rate_per_s"] == 2.0
+        assert state["burst"] == 2.0
+
+
+class _InMemoryStore(BaseDispatchBudgetStore):
+    """Stands in for Redis: one store shared by several schedulers plays the
+    part of several workers pointing at the same Redis."""
+
+    def __init__(self) -> None:
+        self.taken = 0
+        self.capacity = 1_000_000
+        self.rates: dict[str, float] = {}
+        self.fail = False
+        self.closed = False
+
+    @override
+    async def take(self, key: str, *, max_rate: float, burst: float) -> float:
+        if self.fail:
+            raise ConnectionError("redis down")
+        if self.taken >= self.capacity:
+            return 0.01
+        self.taken += 1
+        return 0.0
+
+    @override
+    async def record_throttle(
+        self,
+        key: str,
+        *,
+        max_rate: float,
+        min_rate: float,
+        decrease_factor: float,
+    ) -> float:
+        if self.fail:
+            raise ConnectionError("redis down")
+        rate = max(min_rate, self.rates.get(key, max_rate) * decrease_factor)
+        self.rates[key] = rate
+        return rate
+
+    @override
+    async def record_success(
+        self, key: str, *, max_rate: float, increase_fraction: float
+    ) -> float:
+        return self.rates.get(key, max_rate)
+
+    @override
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+class TestSharedStore:
+    async def test_workers_draw_from_the_shared_budget(self) -> None:
+        store = _InMemoryStore()
+        store.capacity = 3
+        workers = [BedrockDispatchScheduler(shared_store=store) for _ in range(3)]
+        route = _route(dispatch_rate_per_s=1.0, dispatch_burst=3)
+        for worker in workers:
+            await worker.acquire(route)
+        assert store.taken == 3
+
+        # Budget exhausted across all workers: a fourth dispatch from any of
+        # them waits on the shared store, even though each worker's own
+        # bucket still has tokens to spare.
+        blocked = asyncio.create_task(workers[0].acquire(route))
+        await asyncio.sleep(0.05)
+        assert not blocked.done()
+        store.capacity = 4
+        await asyncio.wait_for(blocked, timeout=1.0)
+        assert store.taken == 4
+
+    async def test_throttle_is_propagated_to_the_store(self) -> None:
+        store = _InMemoryStore()
+        scheduler = BedrockDispatchScheduler(shared_store=store)
+        scheduler.record_throttle(_route(dispatch_rate_per_s=4.0))
+        await scheduler.aclose()
+        assert store.rates == {"us-east-1/qwen.test": 2.0}
+        assert store.closed
+
+    async def test_falls_back_to_local_pacing_when_store_fails(self) -> None:
+        store = _InMemoryStore()
+        store.fail = True
+        scheduler = BedrockDispatchScheduler(
+            shared_store=store, shared_store_retry_seconds=60.0
+        )
+        route = _route(dispatch_rate_per_s=1.0, dispatch_burst=2)
+        waits = [await scheduler.acquire(route) for _ in range(2)]
+        assert max(waits) < 0.05
+        assert scheduler.snapshot()["us-east-1/qwen.test"]["tokens"] < 1.0
+
+        # Within the retry window the store isn't consulted at all.
+        store.fail = False
+        store.capacity = 0
+        scheduler.record_throttle(route)
+        await scheduler.aclose()
+        assert store.rates == {}
+
+    async def test_store_is_retried_after_the_retry_window(self) -> None:
+        store = _InMemoryStore()
+        store.fail = True
+        scheduler = BedrockDispatchScheduler(
+            shared_store=store, shared_store_retry_seconds=0.0
+        )
+        await scheduler.acquire(_route())
+        store.fail = False
+        await scheduler.acquire(_route())
+        assert store.taken == 1
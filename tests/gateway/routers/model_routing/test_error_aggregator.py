@@ -0,0 +1,95 @@
+"""
+Tests for error_aggregator.py.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from language_model_gateway.gateway.routers.model_routing.error_aggregator import (
+    ErrorAggregator,
+    normalize_error_message,
+)
+
+_T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _failure(
+    request_id: str,
+    *,
+    seconds: int = 0,
+    message: str = "ThrottlingException: rate exceeded (request 42)",
+    status_code: int | None = 429,
+) -> dict[str, Any]:
+    record: dict[str, Any] = {
+        "request_id": request_id,
+        "model": "claude-sonnet",
+        "error_type": "bedrock_upstream_error",
+        "error_message": message,
+        "timestamp": _T0 + timedelta(seconds=seconds),
+        "backend": "aws_bedrock",
+    }
+    if status_code is not None:
+        record["status_code"] = status_code
+    return record
+
+
+def test_normalize_masks_ids_and_numbers() -> None:
+    assert normalize_error_message(
+        "Request 5f0c1d2e-aaaa-bbbb-cccc-0123456789ab failed after 3.5s"
+    ) == normalize_error_message(
+        "Request 0a0b0c0d-1111-2222-3333-444455556666 failed after  12s"
+    )
+    assert normalize_error_message("x" * 500) == "x" * 200
+
+
+def test_identical_failures_become_one_counted_group() -> None:
+    aggregator = ErrorAggregator(sample_rate=0.0, rng=lambda: 0.5)
+    written = [
+        aggregator.observe(_failure(f"req-{i}", seconds=i, message=f"boom {i}"))
+        for i in range(5)
+    ]
+    # Only the group's first failure gets a full document.
+    assert written == [True, False, False, False, False]
+
+    (group,), suppressed = aggregator.drain()
+    assert suppressed == 0
+    assert group["count"] == 5
+    assert group["message"] == "boom <n>"
+    assert group["example_message"] == "boom 0"
+    assert group["first_seen"] == _T0
+    assert group["last_seen"] == _T0 + timedelta(seconds=4)
+    assert group["sample_request_ids"] == ["req-0"]
+    assert group["backend"] == "aws_bedrock"
+    assert not aggregator.has_groups
+
+
+def test_different_status_codes_are_separate_groups() -> None:
+    aggregator = ErrorAggregator()
+    aggregator.observe(_failure("req-1", status_code=429))
+    aggregator.observe(_failure("req-2", status_code=500))
+    groups, _ = aggregator.drain()
+    assert sorted(group["status_code"] for group in groups) == [429, 500]
+
+
+def test_sample_rate_selects_later_failures() -> None:
+    draws = iter([0.01, 0.9, 0.02])
+    aggregator = ErrorAggregator(sample_rate=0.05, rng=lambda: next(draws))
+    written = [aggregator.observe(_failure(f"req-{i}")) for i in range(4)]
+    assert written == [True, True, False, True]
+    (group,), _ = aggregator.drain()
+    assert group["sample_request_ids"] == ["req-0", "req-1", "req-3"]
+
+
+def test_write_budget_caps_full_documents_across_groups() -> None:
+    aggregator = ErrorAggregator(max_writes_per_second=2)
+    written = [
+        aggregator.observe(_failure(f"req-{i}", message=f"error kind {chr(97 + i)}"))
+        for i in range(4)
+    ]
+    assert written == [True, True, False, False]
+    groups, suppressed = aggregator.drain()
+    assert len(groups) == 4
+    assert suppressed == 2
+    assert all(group["count"] == 1 for group in groups)
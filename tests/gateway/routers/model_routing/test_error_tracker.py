@@ -4,12 +4,21 @@ Tests for error_tracker.py.
 
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
+from language_model_gateway.gateway.routers.model_routing.error_aggregator import (
+    ErrorAggregator,
+)
 from language_model_gateway.gateway.routers.model_routing.error_tracker import (
     ErrorTracker,
 )
+from language_model_gateway.gateway.routers.model_routing.record_spool import (
+    RecordSpool,
+)
 
 _TEST_START_TIME = datetime(2026, 1, 1, tzinfo=timezone.utc)
 
@@ -168,3 +177,155 @@ class TestErrorTrackerRecordError:
                 error_message="boom",
                 start_time=_TEST_START_TIME,
             )
+
+
+class TestErrorTrackerSpool:
+    """Error records MongoDB doesn't take are spooled and replayed."""
+
+    async def test_failed_write_is_spooled_and_replayed(self, tmp_path: Path) -> None:
+        spool = RecordSpool(str(tmp_path), "errors", replay_interval_seconds=60)
+        tracker = ErrorTracker(
+            mongo_uri="mongodb://localhost:27017", enabled=False, spool=spool
+        )
+        collection = MagicMock()
+        collection.insert_one = AsyncMock(side_effect=ConnectionError("down"))
+        collection.insert_many = AsyncMock()
+        tracker._collection = collection
+
+        await tracker.record_error(
+            request_id="req-1",
+            model="claude-opus-4-8",
+            error_type="upstream_error",
+            error_message="boom",
+            start_time=_TEST_START_TIME,
+        )
+        assert spool.has_pending()
+
+        assert await spool.replay(tracker._replay) is True
+        (record,) = collection.insert_many.call_args[0][0]
+        assert record["request_id"] == "req-1"
+        assert record["_id"] == collection.insert_one.call_args[0][0]["_id"]
+        assert record["start_time"] == _TEST_START_TIME
+        await tracker.close()
+
+    async def test_replay_waits_while_mongo_is_down(self, tmp_path: Path) -> None:
+        spool = RecordSpool(str(tmp_path), "errors", replay_interval_seconds=60)
+        tracker = ErrorTracker(
+            mongo_uri="mongodb://localhost:27017", enabled=False, spool=spool
+        )
+        collection = MagicMock()
+        collection.insert_one = AsyncMock(side_effect=ConnectionError("down"))
+        collection.insert_many = AsyncMock(side_effect=ConnectionError("down"))
+        tracker._collection = collection
+        await tracker.record_error(
+            request_id="req-1",
+            model="claude-opus-4-8",
+            error_type="upstream_error",
+            error_message="boom",
+            start_time=_TEST_START_TIME,
+        )
+        assert await spool.replay(tracker._replay) is False
+        assert spool.has_pending()
+        await tracker.close()
+
+
+class TestErrorTrackerAggregation:
+    """With an aggregator, failures are grouped and only sampled in full."""
+
+    async def test_storm_writes_one_group_and_the_first_failure(self) -> None:
+        tracker = ErrorTracker(
+            mongo_uri="mongodb://localhost:27017",
+            enabled=False,
+            aggregator=ErrorAggregator(window_seconds=60, sample_rate=0.0),
+        )
+        collection = MagicMock()
+        collection.insert_one = AsyncMock()
+        groups = MagicMock()
+        groups.insert_many = AsyncMock()
+        tracker._collection = collection
+        tracker._group_collection = groups
+
+        for i in range(50):
+            await tracker.record_error(
+                request_id=f"req-{i}",
+                model="claude-opus-4-8",
+                error_type="bedrock_upstream_error",
+                error_message=f"throttled after {i} retries",
+                start_time=_TEST_START_TIME,
+                status_code=429,
+            )
+        collection.insert_one.assert_awaited_once()
+        groups.insert_many.assert_not_called()
+
+        await tracker.close()
+        (group,) = groups.insert_many.call_args[0][0]
+        assert group["count"] == 50
+        assert group["status_code"] == 429
+        assert group["sample_request_ids"] == ["req-0"]
+
+    async def test_failed_group_write_is_spooled(self, tmp_path: Path) -> None:
+        spool = RecordSpool(str(tmp_path), "errors", replay_interval_seconds=60)
+        tracker = ErrorTracker(
+            mongo_uri="mongodb://localhost:27017",
+            enabled=False,
+            spool=spool,
+            aggregator=ErrorAggregator(window_seconds=60),
+        )
+        collection = MagicMock()
+        collection.insert_one = AsyncMock()
+        collection.insert_many = AsyncMock()
+        groups = MagicMock()
+        groups.insert_many = AsyncMock(side_effect=ConnectionError("down"))
+        tracker._collection = collection
+        tracker._group_collection = groups
+        await tracker.record_error(
+            request_id="req-1",
+            model="claude-opus-4-8",
+            error_type="upstream_error",
+            error_message="boom",
+            start_time=_TEST_START_TIME,
+        )
+        await tracker.flush_groups()
+
+        groups.insert_many = AsyncMock()
+        assert await spool.replay(tracker._replay) is True
+        (group,) = groups.insert_many.call_args[0][0]
+        assert group["count"] == 1
+        collection.insert_many.assert_not_called()
+        await tracker.close()
+
+    async def test_close_waits_for_an_in_flight_group_write(self) -> None:
+        tracker = ErrorTracker(
+            mongo_uri="mongodb://localhost:27017",
+            enabled=False,
+            aggregator=ErrorAggregator(window_seconds=0.01),
+        )
+        collection = MagicMock()
+        collection.insert_one = AsyncMock()
+        written: list[dict[str, Any]] = []
+        write_started = asyncio.Event()
+
+        async def slow_insert_many(
+            records: list[dict[str, Any]], ordered: bool
+        ) -> None:
+            write_started.set()
+            await asyncio.sleep(0.05)
+            written.extend(records)
+
+        groups = MagicMock()
+        groups.insert_many = slow_insert_many
+        tracker._collection = collection
+        tracker._group_collection = groups
+        await tracker.record_error(
+            request_id="req-1",
+            model="claude-opus-4-8",
+            error_type="upstream_error",
+            error_message="boom",
+            start_time=_TEST_START_TIME,
+        )
+
+        # Shut down while the flush loop's write of the drained group runs.
+        await asyncio.wait_for(write_started.wait(), timeout=1)
+        await tracker.close()
+        (group,) = written
+        assert group["count"] == 1
@@ -0,0 +1,60 @@
+"""
+Tests for failover.py's hedge delay tracking.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from language_model_gateway.gateway.routers.model_routing.failover import (
+    HedgeLatencyTracker,
+    _route_label,
+)
+
+
+def _route(**extra: Any) -> dict[str, Any]:
+    return {
+        "auth": "aws",
+        "aws_region": "us-east-1",
+        "model": "qwen.test",
+        **extra,
+    }
+
+
+def test_route_label() -> None:
+    assert _route_label(_route()) == "us-east-1/qwen.test"
+    assert (
+        _route_label({"auth": "passthrough", "url": "https://api.anthropic.com"})
+        == "https://api.anthropic.com"
+    )
+
+
+def test_unhedged_route_has_no_delay() -> None:
+    assert HedgeLatencyTracker().delay_s(_route()) is None
+
+
+def test_configured_delay_until_enough_samples() -> None:
+    tracker = HedgeLatencyTracker(min_samples=5)
+    route = _route(hedge_after_ms=2500)
+    for _ in range(4):
+        tracker.observe(route, 0.1)
+    assert tracker.delay_s(route) == 2.5
+
+
+def test_observed_percentile_once_enough_samples() -> None:
+    tracker = HedgeLatencyTracker(min_samples=5)
+    route = _route(hedge_after_ms=2500)
+    for seconds in range(1, 21):
+        tracker.observe(route, float(seconds))
+    assert tracker.delay_s(route) == 19.0
+    assert tracker.delay_s({**route, "hedge_percentile": 50}) == 10.0
+
+
+def test_window_keeps_only_recent_samples() -> None:
+    tracker = HedgeLatencyTracker(window=5, min_samples=5)
+    route = _route(hedge_after_ms=2500)
+    for _ in range(5):
+        tracker.observe(route, 30.0)
+    for _ in range(5):
+        tracker.observe(route, 1.0)
+    assert tracker.delay_s(route) == 1.0
@@ -0,0 +1,98 @@
+"""
+Tests for json_codec.py's orjson-backed request body encode/decode.
+"""
+
+from __future__ import annotations
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from language_model_gateway.gateway.routers.model_routing import json_codec
+
+
+def _agent_transcript(turns: int = 200) -> dict[str, object]:
+    """A Claude Code-shaped body: long tool-use history plus tool schemas."""
+    messages: list[dict[str, object]] = []
+    for i in range(turns):
+        messages.append(
+            {
+                "role": "assistant",
+                "content": [
+                    {"type": "text", "text": f"Reading file {i} — naïve café ✓"},
+                    {
+                        "type": "tool_use",
+                        "id": f"toolu_{i}",
+                        "name": "Read",
+                        "input": {"file_path": f"/src/module_{i}.py", "limit": 2000},
+                    },
+                ],
+            }
+        )
+        messages.append(
+            {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "tool_result",
+                        "tool_use_id": f"toolu_{i}",
+                        "content": "def f(x):\n    return x * 2\n" * 50,
+                    }
+                ],
+            }
+        )
+    return {
+        "model": "claude-sonnet-5",
+        "max_tokens": 32000,
+        "stream": True,
+        "system": [{"type": "text", "text": "You are a coding agent."}],
+        "tools": [
+            {
+                "name": "Read",
+                "description": "Read a file",
+                "input_schema": {
+                    "type": "object",
+                    "properties": {"file_path": {"type": "string"}},
+                    "required": ["file_path"],
+                },
+            }
+        ],
+        "messages": messages,
+        "metadata": {"user_id": "user_abc_account_123_session_456"},
+    }
+
+
+class TestRoundTrip:
+    def test_large_transcript_round_trips_identically_to_stdlib(self) -> None:
+        body = _agent_transcript()
+        encoded = json_codec.dumps(body)
+        assert json_codec.loads(encoded) == body
+        assert json.loads(encoded) == body
+        assert json_codec.loads(json.dumps(body).encode()) == body
+
+    def test_dumps_is_compact_utf8(self) -> None:
+        assert json_codec.dumps({"a": [1, "é"]}) == '{"a":[1,"é"]}'.encode()
+
+    def test_stdlib_fallback_produces_equivalent_bytes(self) -> None:
+        body = _agent_transcript(turns=5)
+        with patch.object(json_codec, "_orjson", None):
+            fallback = json_codec.dumps(body)
+            assert json_codec.loads(fallback) == body
+        assert json.loads(fallback) == json.loads(json_codec.dumps(body))
+
+
+class TestStdlibCompatibility:
+    def test_lone_surrogate_escape_is_accepted(self) -> None:
+        """A truncated emoji in a tool output arrives as a lone surrogate
+        escape; the stdlib accepts it, so it must not turn into a 400."""
+        parsed = json_codec.loads(b'{"text": "broken \\ud83d"}')
+        assert parsed == {"text": "broken \ud83d"}
+        assert json.loads(json_codec.dumps(parsed)) == parsed
+
+    def test_big_int_falls_back_to_stdlib(self) -> None:
+        assert json.loads(json_codec.dumps({"n": 2**70})) == {"n": 2**70}
+
+    def test_invalid_json_raises_stdlib_decode_error(self) -> None:
+        with pytest.raises(json.JSONDecodeError):
+            json_codec.loads(b"{not json")
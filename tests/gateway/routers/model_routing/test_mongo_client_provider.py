@@ -0,0 +1,143 @@
+"""
+Tests for mongo_client_provider.py's shared per-worker MongoDB client.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from language_model_gateway.gateway.routers.model_routing.error_tracker import (
+    ErrorTracker,
+)
+from language_model_gateway.gateway.routers.model_routing.mongo_client_provider import (
+    MongoClientProvider,
+)
+from language_model_gateway.gateway.routers.model_routing.usage_tracker import (
+    UsageTracker,
+)
+
+
+def _mock_client() -> MagicMock:
+    client = MagicMock()
+    client.aconnect = AsyncMock()
+    client.admin.command = AsyncMock()
+    client.close = AsyncMock()
+    return client
+
+
+class TestMongoClientProvider:
+    def test_client_is_built_once_with_pool_settings(self) -> None:
+        provider = MongoClientProvider(
+            "mongodb://localhost:27017", max_pool_size=7, min_pool_size=2
+        )
+        with patch("pymongo.AsyncMongoClient") as client_cls:
+            first = provider.get_client()
+            second = provider.get_client()
+        assert first is second
+        client_cls.assert_called_once_with(
+            "mongodb://localhost:27017",
+            maxPoolSize=7,
+            minPoolSize=2,
+            serverSelectionTimeoutMS=5000,
+        )
+
+    async def test_unconfigured_provider_has_no_client(self) -> None:
+        provider = MongoClientProvider(None)
+        assert provider.get_client() is None
+        assert await provider.connect() is False
+        assert provider.healthy is None
+
+    async def test_connect_pings_and_marks_healthy(self) -> None:
+        provider = MongoClientProvider("mongodb://localhost:27017")
+        client = _mock_client()
+        with patch("pymongo.AsyncMongoClient", return_value=client):
+            assert await provider.connect() is True
+        client.aconnect.assert_awaited_once()
+        client.admin.command.assert_awaited_once_with("ping")
+        assert provider.healthy is True
+
+    async def test_connect_failure_does_not_raise(self) -> None:
+        provider = MongoClientProvider("mongodb://localhost:27017")
+        client = _mock_client()
+        client.admin.command.side_effect = ConnectionError("refused")
+        with patch("pymongo.AsyncMongoClient", return_value=client):
+            assert await provider.connect() is False
+        assert provider.healthy is False
+
+    def test_health_changes_are_logged_once(
+        self, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        # The module logger's level comes from LOG_LEVEL.
+        caplog.set_level(logging.INFO, logger=MongoClientProvider.__module__)
+        provider = MongoClientProvider("mongodb://localhost:27017")
+        for _ in range(3):
+            provider.report_failure("usage_tracker", ConnectionError("down"))
+        provider.report_success()
+        provider.report_success()
+        messages = [r.getMessage() for r in caplog.records]
+        assert sum("unavailable" in m for m in messages) == 1
+        assert sum("available again" in m for m in messages) == 1
+
+    async def test_aclose_closes_the_client(self) -> None:
+        provider = MongoClientProvider("mongodb://localhost:27017")
+        client = _mock_client()
+        with patch("pymongo.AsyncMongoClient", return_value=client):
+            provider.get_client()
+        await provider.aclose()
+        client.close.assert_awaited_once()
+        await provider.aclose()
+        client.close.assert_awaited_once()
+
+
+class TestSharedClientConsumers:
+    async def test_components_share_the_provider_client(self) -> None:
+        provider = MongoClientProvider("mongodb://localhost:27017")
+        client = _mock_client()
+        provider._client = client
+        usage = UsageTracker(
+            mongo_uri="mongodb://localhost:27017", client_provider=provider
+        )
+        errors = ErrorTracker(
+            mongo_uri="mongodb://localhost:27017", client_provider=provider
+        )
+        with patch("pymongo.AsyncMongoClient") as client_cls:
+            await usage._ensure_connected()
+            await errors._ensure_connected()
+        client_cls.assert_not_called()
+        assert usage._client is client
+        assert errors._client is client
+
+    async def test_component_close_leaves_the_shared_client_open(self) -> None:
+        provider = MongoClientProvider("mongodb://localhost:27017")
+        client = _mock_client()
+        provider._client = client
+        usage = UsageTracker(
+            mongo_uri="mongodb://localhost:27017", client_provider=provider
+        )
+        await usage._ensure_connected()
+        await usage.close()
+        client.close.assert_not_called()
+
+    async def test_write_failures_are_reported_to_the_provider(self) -> None:
+        provider = MongoClientProvider("mongodb://localhost:27017")
+        client = _mock_client()
+        provider._client = client
+        errors = ErrorTracker(
+            mongo_uri="mongodb://localhost:27017", client_provider=provider
+        )
+        await errors._ensure_connected()
+        collection = MagicMock()
+        collection.insert_one = AsyncMock(side_effect=ConnectionError("down"))
+        errors._collection = collection
+        await errors.record_error(
+            request_id="req-1",
+            model="model",
+            error_type="upstream_error",
+            error_message="boom",
+            start_time=datetime.now(UTC),
+        )
+        assert provider.healthy is False
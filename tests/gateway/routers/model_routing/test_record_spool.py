@@ -0,0 +1,140 @@
+"""
+Tests for record_spool.py's local write-ahead spool.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import os
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from bson import ObjectId
+
+from language_model_gateway.gateway.routers.model_routing.record_spool import (
+    RecordSpool,
+    decode_entry,
+    encode_entry,
+)
+
+
+class _Sink:
+    """A replay `write` that collects entries, or reports MongoDB down."""
+
+    def __init__(self, *, available: bool = True) -> None:
+        self.available = available
+        self.entries: list[dict[str, Any]] = []
+
+    async def __call__(self, entries: list[dict[str, Any]]) -> bool:
+        if not self.available:
+            return False
+        self.entries.extend(entries)
+        return True
+
+
+def test_datetimes_and_object_ids_round_trip() -> None:
+    entry = {
+        "record": {
+            "_id": ObjectId(),
+            "timestamp": datetime(2026, 1, 1, 12, 30, tzinfo=UTC),
+            "nested": {"tokens": 5, "model": "m"},
+        },
+        "session_id": None,
+    }
+    assert decode_entry(encode_entry(entry)) == entry
+
+
+async def test_appended_records_are_replayed_and_removed(tmp_path: Path) -> None:
+    spool = RecordSpool(str(tmp_path), "usage", fsync_interval_seconds=0)
+    assert spool.append([{"n": 1}, {"n": 2}])
+    assert spool.append([{"n": 3}])
+    assert spool.has_pending()
+
+    sink = _Sink()
+    assert await spool.replay(sink) is True
+    assert [entry["n"] for entry in sink.entries] == [1, 2, 3]
+    assert not spool.has_pending()
+    assert list(tmp_path.iterdir()) == []
+    await spool.close()
+
+
+async def test_replay_batches_by_replay_batch_size(tmp_path: Path) -> None:
+    spool = RecordSpool(str(tmp_path), "usage", replay_batch_size=2)
+    spool.append([{"n": i} for i in range(5)])
+    batches: list[int] = []
+
+    async def write(entries: list[dict[str, Any]]) -> bool:
+        batches.append(len(entries))
+        return True
+
+    await spool.replay(write)
+    assert batches == [2, 2, 1]
+    await spool.close()
+
+
+async def test_segment_is_kept_while_mongo_is_down(tmp_path: Path) -> None:
+    spool = RecordSpool(str(tmp_path), "usage")
+    spool.append([{"n": 1}])
+    sink = _Sink(available=False)
+    assert await spool.replay(sink) is False
+    assert spool.has_pending()
+
+    spool.append([{"n": 2}])
+    sink.available = True
+    assert await spool.replay(sink) is True
+    assert sorted(entry["n"] for entry in sink.entries) == [1, 2]
+    await spool.close()
+
+
+async def test_exited_workers_file_is_replayed(tmp_path: Path) -> None:
+    (tmp_path / "usage-99999.jsonl").write_bytes(encode_entry({"n": 7}))
+    spool = RecordSpool(str(tmp_path), "usage")
+    assert spool.has_pending()
+    sink = _Sink()
+    assert await spool.replay(sink) is True
+    assert sink.entries == [{"n": 7}]
+    assert not (tmp_path / "usage-99999.jsonl").exists()
+
+
+async def test_live_workers_file_is_left_alone(tmp_path: Path) -> None:
+    live = tmp_path / "usage-99999.jsonl"
+    live.write_bytes(encode_entry({"n": 7}))
+    with open(live, "ab") as held:
+        fcntl.flock(held.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        spool = RecordSpool(str(tmp_path), "usage")
+        sink = _Sink()
+        assert await spool.replay(sink) is True
+    assert sink.entries == []
+    assert live.exists()
+
+
+async def test_torn_lines_are_skipped(tmp_path: Path) -> None:
+    (tmp_path / "errors-99999.jsonl").write_bytes(
+        encode_entry({"n": 1}) + b'{"n": 2, "trunc'
+    )
+    spool = RecordSpool(str(tmp_path), "errors")
+    sink = _Sink()
+    await spool.replay(sink)
+    assert sink.entries == [{"n": 1}]
+
+
+async def test_full_spool_refuses_appends(tmp_path: Path) -> None:
+    spool = RecordSpool(str(tmp_path), "usage", max_bytes=20)
+    assert spool.append([{"n": 1}])
+    assert not spool.append([{"payload": "x" * 50}])
+    await spool.close()
+
+
+async def test_close_removes_an_empty_file_and_keeps_records(tmp_path: Path) -> None:
+    empty = RecordSpool(str(tmp_path / "a"), "usage")
+    empty.append([{"n": 1}])
+    await empty.replay(_Sink())
+    empty.append([])
+    await empty.close()
+    assert os.listdir(tmp_path / "a") == []
+
+    kept = RecordSpool(str(tmp_path / "b"), "usage")
+    kept.append([{"n": 1}])
+    await kept.close()
+    assert os.listdir(tmp_path / "b") == [os.path.basename(kept.path)]
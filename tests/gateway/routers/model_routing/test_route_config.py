@@ -9,13 +9,21 @@ cost-routing and context-budget enforcement.
 from __future__ import annotations
 
 import re
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 
+from language_model_gateway.gateway.routers.model_routing import route_config
+from language_model_gateway.gateway.routers.model_routing.anthropic_token_counter import (
+    count_tokens_cache,
+)
 from language_model_gateway.gateway.routers.model_routing.route_config import (
     _build_routes,
+    _config_backends,
     _find_route,
+    _route_candidates,
+    _swap_config,
+    _tokenizer_models,
 )
 
 # ---------------------------------------------------------------------------
@@ -88,6 +96,50 @@ def test_find_route_falls_back_to_pattern_when_no_exact_match() -> None:
     assert route["model"] == "sonnet-backend"
 
 
+def test_find_route_remembers_pattern_matches_until_patterns_change() -> None:
+    pattern = MagicMock(wraps=re.compile("^claude-sonnet"))
+    first = [(pattern, {"model": "first"})]
+    with (
+        patch(
+            "language_model_gateway.gateway.routers.model_routing.route_config._ROUTES",
+            {},
+        ),
+        patch(
+            "language_model_gateway.gateway.routers.model_routing.route_config._PATTERNS",
+            first,
+        ),
+    ):
+        assert _find_route("claude-sonnet-9") == {"model": "first"}
+        assert _find_route("claude-sonnet-9") == {"model": "first"}
+        assert _find_route("claude-opus-9") is None
+        assert _find_route("claude-opus-9") is None
+        assert pattern.search.call_count == 2
+
+    # A reload replaces _PATTERNS; nothing matched against the old list is kept.
+    second = [(re.compile("^claude-sonnet"), {"model": "second"})]
+    with (
+        patch(
+            "language_model_gateway.gateway.routers.model_routing.route_config._ROUTES",
+            {},
+        ),
+        patch(
+            "language_model_gateway.gateway.routers.model_routing.route_config._PATTERNS",
+            second,
+        ),
+    ):
+        assert _find_route("claude-sonnet-9") == {"model": "second"}
+
+
+def test_swap_config_drops_cached_token_counts() -> None:
+    """A count cached under the old config may have been counted another way
+    (count_tokens mode, tokenizer_model) than the new one would."""
+    count_tokens_cache.put(("count_tokens", b"digest"), 123)
+
+    _swap_config(route_config._CONFIG, route_config._ROUTES, route_config._PATTERNS)
+
+    assert count_tokens_cache.get(("count_tokens", b"digest")) is None
+
+
 def test_find_route_no_match_returns_none() -> None:
     with (
         patch(
@@ -144,3 +196,100 @@ def test_live_config_still_supports_old_sonnet_model() -> None:
     assert new_route is not None
     assert old_route["tier"] == "sonnet"
     assert old_route["model"] == new_route["model"]
+
+
+# ---------------------------------------------------------------------------
+# _tokenizer_models
+# ---------------------------------------------------------------------------
+
+
+def test_tokenizer_models_are_distinct_and_skip_routes_without_one() -> None:
+    config = {
+        "routes": [
+            {"claude_model": "a", "tokenizer_model": "Qwen/Qwen3-Coder"},
+            {"claude_model": "b", "tokenizer_model": "Qwen/Qwen3-Coder"},
+            {"claude_model": "c"},
+        ]
+    }
+    with patch(
+        "language_model_gateway.gateway.routers.model_routing.route_config._CONFIG",
+        config,
+    ):
+        assert _tokenizer_models() == ["Qwen/Qwen3-Coder"]
+
+
+def test_tokenizer_models_of_a_given_config() -> None:
+    config = {"routes": [{"claude_model": "a", "tokenizer_model": "Qwen/Qwen3"}]}
+    assert _tokenizer_models(config) == ["Qwen/Qwen3"]
+
+
+# ---------------------------------------------------------------------------
+# _route_candidates
+# ---------------------------------------------------------------------------
+
+
+def test_route_without_alternates_is_its_own_only_candidate() -> None:
+    route = {"claude_model": "a", "model": "m", "auth": "aws"}
+    assert _route_candidates(route) == [route]
+
+
+def test_alternates_are_merged_over_the_route_then_fallback_appended() -> None:
+    fallback = {"claude_model": "direct", "auth": "passthrough"}
+    route = {
+        "claude_model": "a",
+        "model": "m",
+        "auth": "aws",
+        "aws_region": "us-east-1",
+        "tier": "sonnet",
+        "hedge_after_ms": 5000,
+        "alternates": [{"aws_region": "us-west-2"}, "not-an-object"],
+        "fallback_model": "direct",
+    }
+    with patch.dict(
+        "language_model_gateway.gateway.routers.model_routing.route_config._ROUTES",
+        {"direct": fallback},
+    ):
+        primary, alternate, last = _route_candidates(route)
+
+    assert primary is route
+    assert alternate == {
+        "claude_model": "a",
+        "model": "m",
+        "auth": "aws",
+        "aws_region": "us-west-2",
+        "tier": "sonnet",
+    }
+    assert last is fallback
+
+
+def test_fallback_model_that_does_not_resolve_is_skipped() -> None:
+    route = {"claude_model": "a", "model": "m", "auth": "aws", "fallback_model": "x"}
+    with (
+        patch.dict(
+            "language_model_gateway.gateway.routers.model_routing.route_config._ROUTES",
+            {},
+            clear=True,
+        ),
+        patch(
+            "language_model_gateway.gateway.routers.model_routing.route_config._PATTERNS",
+            [],
+        ),
+    ):
+        assert _route_candidates(route) == [route]
+
+
+def test_config_backends_include_each_routes_alternates() -> None:
+    route = {
+        "claude_model": "a",
+        "auth": "aws",
+        "aws_region": "us-east-1",
+        "alternates": [{"aws_region": "us-west-2"}],
+        "fallback_model": "b",
+    }
+    other = {"claude_model": "b", "auth": "passthrough"}
+    backends = _config_backends({"routes": [route, other]})
+    assert backends == [
+        route,
+        {"claude_model": "a", "auth": "aws", "aws_region": "us-west-2"},
+        other,
+    ]
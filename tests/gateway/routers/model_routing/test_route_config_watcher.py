@@ -0,0 +1,115 @@
+"""
+Tests for route_config_watcher.py — hot reload of the route config file.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from language_model_gateway.gateway.routers.model_routing import route_config
+from language_model_gateway.gateway.routers.model_routing.route_config import (
+    _find_route,
+)
+from language_model_gateway.gateway.routers.model_routing.route_config_watcher import (
+    RouteConfigWatcher,
+)
+
+_MODULE = "language_model_gateway.gateway.routers.model_routing.route_config"
+
+
+@pytest.fixture(autouse=True)
+def _restore_live_config() -> Iterator[None]:
+    """Each reload rebinds the module globals; put the real ones back."""
+    with (
+        patch(f"{_MODULE}._CONFIG", route_config._CONFIG),
+        patch(f"{_MODULE}._ROUTES", route_config._ROUTES),
+        patch(f"{_MODULE}._PATTERNS", route_config._PATTERNS),
+    ):
+        yield
+
+
+def _write(path: Path, routes: list[dict[str, Any]], *, tick: int) -> None:
+    path.write_text(json.dumps({"routes": routes}))
+    # Distinct mtimes even on filesystems with coarse timestamps.
+    os.utime(path, ns=(tick * 1_000_000_000, tick * 1_000_000_000))
+
+
+@pytest.mark.asyncio
+async def test_changed_file_is_prewarmed_then_swapped_in(tmp_path: Path) -> None:
+    path = tmp_path / "model-router-config.json"
+    _write(path, [{"claude_model": "claude-a", "model": "old"}], tick=1)
+    seen_at_prewarm: list[dict[str, Any] | None] = []
+
+    async def prewarm(config: dict[str, Any]) -> None:
+        assert config["routes"][0]["model"] == "new"
+        seen_at_prewarm.append(_find_route("claude-b"))
+
+    watcher = RouteConfigWatcher(path=path, prewarm=prewarm)
+    watcher.start()
+    try:
+        assert await watcher.check() is False
+
+        _write(
+            path,
+            [
+                {
+                    "claude_model": "claude-b",
+                    "claude_model_pattern": "^claude-b",
+                    "model": "new",
+                }
+            ],
+            tick=2,
+        )
+        assert await watcher.check() is True
+    finally:
+        await watcher.stop()
+
+    # Not yet live while it was being pre-warmed.
+    assert seen_at_prewarm == [None]
+    route = _find_route("claude-b-2")
+    assert route is not None and route["model"] == "new"
+    assert await watcher.check() is False
+
+
+@pytest.mark.asyncio
+async def test_invalid_or_missing_file_keeps_current_routes(tmp_path: Path) -> None:
+    path = tmp_path / "model-router-config.json"
+    _write(path, [{"claude_model": "claude-a", "model": "a"}], tick=1)
+    watcher = RouteConfigWatcher(path=path)
+    routes_before = route_config._ROUTES
+
+    path.write_text("{not json")
+    os.utime(path, ns=(2_000_000_000, 2_000_000_000))
+    assert await watcher.check() is False
+    _write(path, [{"model": "no claude_model"}], tick=3)
+    assert await watcher.check() is False
+    path.unlink()
+    assert await watcher.check() is False
+
+    assert route_config._ROUTES is routes_before
+
+
+@pytest.mark.asyncio
+async def test_failed_prewarm_still_swaps_in_the_config(tmp_path: Path) -> None:
+    path = tmp_path / "model-router-config.json"
+
+    async def prewarm(config: dict[str, Any]) -> None:
+        raise RuntimeError("tokenizer download failed")
+
+    watcher = RouteConfigWatcher(path=path, prewarm=prewarm)
+    _write(path, [{"claude_model": "claude-c", "model": "c"}], tick=1)
+    assert await watcher.check() is True
+    assert route_config._ROUTES["claude-c"]["model"] == "c"
+
+
+def test_zero_interval_does_not_start_polling(tmp_path: Path) -> None:
+    watcher = RouteConfigWatcher(path=tmp_path / "x.json", interval_seconds=0)
+    watcher.start()
+    assert watcher._task is None
@@ -0,0 +1,99 @@
+"""
+Tests for session_savings_cache.py.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+from language_model_gateway.gateway.routers.model_routing.session_savings_cache import (
+    SessionSavingsCache,
+)
+from language_model_gateway.gateway.routers.model_routing.session_savings_reader import (
+    SessionSavings,
+)
+
+
+def _savings(total: float = 0.42) -> SessionSavings:
+    return SessionSavings(
+        session_id="sess-1", total_savings_usd=total, total_tokens=100, tiers={}
+    )
+
+
+class _Loader:
+    def __init__(self, result: SessionSavings | None = None) -> None:
+        self.result = result
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self, session_id: str) -> SessionSavings | None:
+        self.calls += 1
+        await self.release.wait()
+        return self.result
+
+
+class TestSessionSavingsCache:
+    async def test_second_lookup_is_served_from_cache(self) -> None:
+        cache = SessionSavingsCache()
+        load = _Loader(_savings())
+        first = await cache.get("sess-1", load)
+        second = await cache.get("sess-1", load)
+        assert load.calls == 1
+        assert second is first
+        assert first.etag is not None
+        assert first.body == _savings().model_dump_json().encode()
+
+    async def test_concurrent_lookups_share_one_load(self) -> None:
+        cache = SessionSavingsCache()
+        load = _Loader(_savings())
+        load.release.clear()
+        lookups = [asyncio.create_task(cache.get("sess-1", load)) for _ in range(5)]
+        await asyncio.sleep(0)
+        load.release.set()
+        results = await asyncio.gather(*lookups)
+        assert load.calls == 1
+        assert {r.etag for r in results} == {results[0].etag}
+
+    async def test_missing_session_is_cached_without_etag(self) -> None:
+        cache = SessionSavingsCache()
+        load = _Loader(None)
+        result = await cache.get("sess-1", load)
+        await cache.get("sess-1", load)
+        assert result.savings is None and result.etag is None
+        assert load.calls == 1
+
+    async def test_expired_entry_is_reloaded(self) -> None:
+        cache = SessionSavingsCache(ttl_seconds=0.0)
+        load = _Loader(_savings())
+        await cache.get("sess-1", load)
+        await cache.get("sess-1", load)
+        assert load.calls == 2
+
+    async def test_invalidate_forces_a_reload_with_a_new_etag(self) -> None:
+        cache = SessionSavingsCache()
+        load = _Loader(_savings(0.42))
+        before = await cache.get("sess-1", load)
+        load.result = _savings(0.50)
+        cache.invalidate("sess-1")
+        after = await cache.get("sess-1", load)
+        assert load.calls == 2
+        assert after.etag != before.etag
+
+    async def test_load_in_flight_during_invalidate_is_not_cached(self) -> None:
+        cache = SessionSavingsCache()
+        load = _Loader(_savings())
+        load.release.clear()
+        lookup = asyncio.create_task(cache.get("sess-1", load))
+        await asyncio.sleep(0)
+        cache.invalidate("sess-1")
+        load.release.set()
+        await lookup
+        assert len(cache) == 0
+
+    async def test_cache_is_bounded(self) -> None:
+        cache = SessionSavingsCache(max_entries=2)
+        load = _Loader(_savings())
+        for session_id in ("a", "b", "c"):
+            await cache.get(session_id, load)
+        assert len(cache) == 2
@@ -89,3 +89,33 @@ async def test_get_savings_returns_404_when_no_mongo_configured() -> None:
         response = await client.get("/v1/model-routing/sessions/sess-1/savings")
 
     assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_get_savings_revalidates_with_etag() -> None:
+    router = SessionSavingsRouter(mongo_uri="mongodb://localhost:27017")
+    savings = SessionSavings(
+        session_id="sess-1", total_savings_usd=0.42, total_tokens=12345, tiers={}
+    )
+    app = FastAPI()
+    app.include_router(router.get_router())
+    reader = AsyncMock(return_value=savings)
+
+    with patch.object(router._reader, "get_session_savings", new=reader):
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            url = "/v1/model-routing/sessions/sess-1/savings"
+            first = await client.get(url)
+            etag = first.headers["etag"]
+            unchanged = await client.get(url, headers={"If-None-Match": etag})
+            stale = await client.get(url, headers={"If-None-Match": '"other"'})
+
+    assert first.status_code == 200
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+    assert unchanged.headers["etag"] == etag
+    assert stale.status_code == 200
+    assert stale.json()["total_savings_usd"] == 0.42
+    # Served from the cache after the first lookup.
+    reader.assert_awaited_once_with("sess-1")
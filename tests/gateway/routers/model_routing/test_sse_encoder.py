@@ -0,0 +1,115 @@
+"""
+Tests for sse_encoder.py's precomputed content_block_delta encoding.
+"""
+
+from __future__ import annotations
+
+import os
+import timeit
+
+import pytest
+
+from language_model_gateway.gateway.routers.model_routing.sse_encoder import (
+    DeltaCoalescer,
+    _delta_event,
+)
+from language_model_gateway.gateway.routers.model_routing.stream_converter import (
+    _sse_event,
+)
+
+
+@pytest.mark.parametrize(
+    ("index", "delta_type", "field", "value"),
+    [
+        (0, "text_delta", "text", "hello"),
+        (12, "text_delta", "text", 'quotes " and \\ and\nnewlines\t'),
+        (1, "text_delta", "text", "héllo ✓ 😀 \x00 "),
+        (3, "input_json_delta", "partial_json", '{"path": "/tmp/a b'),
+        (0, "text_delta", "text", ""),
+    ],
+)
+def test_delta_event_matches_sse_event_byte_for_byte(
+    index: int, delta_type: str, field: str, value: str
+) -> None:
+    assert _delta_event(index, delta_type, value) == _sse_event(
+        "content_block_delta",
+        {
+            "type": "content_block_delta",
+            "index": index,
+            "delta": {"type": delta_type, field: value},
+        },
+    )
+
+
+def test_coalescer_merges_deltas_for_the_same_block() -> None:
+    deltas = DeltaCoalescer()
+    assert not deltas
+    assert deltas.add(0, "text_delta", "Hel") is None
+    assert deltas.add(0, "text_delta", "lo") is None
+    assert deltas
+
+    assert deltas.flush() == _delta_event(0, "text_delta", "Hello")
+    assert not deltas
+    assert deltas.flush() is None
+
+
+def test_coalescer_emits_pending_delta_before_another_blocks() -> None:
+    deltas = DeltaCoalescer()
+    deltas.add(0, "text_delta", "Done.")
+
+    flushed = deltas.add(1, "input_json_delta", '{"a"')
+
+    assert flushed == _delta_event(0, "text_delta", "Done.")
+    assert deltas.flush() == _delta_event(1, "input_json_delta", '{"a"')
+
+
+def test_coalescer_without_merging_returns_every_delta() -> None:
+    deltas = DeltaCoalescer(merge=False)
+
+    assert deltas.add(0, "text_delta", "Hel") == _delta_event(0, "text_delta", "Hel")
+    assert deltas.add(0, "text_delta", "lo") == _delta_event(0, "text_delta", "lo")
+    assert not deltas
+
+
+# Four mixed deltas, as a translated stream sends them.
+_BENCHMARK_DELTAS = [
+    (0, "text_delta", "text", "Hello"),
+    (0, "text_delta", "text", ', "world"\n'),
+    (1, "input_json_delta", "partial_json", '{"path": "/tmp/a'),
+    (1, "input_json_delta", "partial_json", ' b.txt"}'),
+]
+
+
+@pytest.mark.skipif(
+    os.environ.get("RUN_BENCHMARKS") != "1",
+    reason="Environment Variable RUN_BENCHMARKS not set",
+)
+def test_benchmark_delta_event_against_sse_event() -> None:
+    """Events/s of the template encoder against building and dumping the
+    dict; run with RUN_BENCHMARKS=1 pytest -s to see the numbers."""
+
+    def with_sse_event() -> None:
+        for index, delta_type, field, value in _BENCHMARK_DELTAS:
+            _sse_event(
+                "content_block_delta",
+                {
+                    "type": "content_block_delta",
+                    "index": index,
+                    "delta": {"type": delta_type, field: value},
+                },
+            )
+
+    def with_delta_event() -> None:
+        for index, delta_type, _, value in _BENCHMARK_DELTAS:
+            _delta_event(index, delta_type, value)
+
+    rates: dict[str, float] = {}
+    for name, encode in (
+        ("_sse_event", with_sse_event),
+        ("_delta_event", with_delta_event),
+    ):
+        seconds = min(timeit.repeat(encode, number=20_000, repeat=5))
+        rates[name] = 20_000 * len(_BENCHMARK_DELTAS) / seconds
+        print(f"{name}: {rates[name] / 1e6:.2f}M events/s")
+
+    assert rates["_delta_event"] > rates["_sse_event"]
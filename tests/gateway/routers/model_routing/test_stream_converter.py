@@ -14,14 +14,20 @@ from unittest.mock import AsyncMock, MagicMock
 import httpx
 
 from language_model_gateway.gateway.routers.model_routing.stream_converter import (
+    _SSE_SNIFF_MAX_LINE_BYTES,
+    AnthropicSseUsageSniffer,
     _oai_stream_with_usage_tracking,
     _parse_anthropic_sse_usage,
     _stream_oai_sdk_to_anthropic,
     _stream_passthrough,
     _stream_passthrough_with_usage_tracking,
 )
+from language_model_gateway.gateway.routers.model_routing.stream_flush import (
+    StreamFlushPolicy,
+)
 
 _TEST_START_TIME = datetime(2026, 1, 1, tzinfo=timezone.utc)
+_MERGING = StreamFlushPolicy(max_bytes=0, max_delay_seconds=0.005)
 
 
 def _fake_chunk(
@@ -122,19 +128,14 @@ class TestDisconnectDetection:
         resp = MagicMock(spec=httpx.Response)
         resp.aiter_bytes = fake_aiter_bytes
         resp.aclose = AsyncMock()
-        client = MagicMock(spec=httpx.AsyncClient)
-        client.aclose = AsyncMock()
 
         request = MagicMock()
         request.is_disconnected = AsyncMock(side_effect=[False, True])
 
-        received = [
-            chunk async for chunk in _stream_passthrough(resp, client, request=request)
-        ]
+        received = [chunk async for chunk in _stream_passthrough(resp, request=request)]
 
         assert received == [b"part-1"]
         resp.aclose.assert_awaited_once()
-        client.aclose.assert_awaited_once()
 
 
 class TestOnStreamError:
@@ -253,6 +254,114 @@ class TestOnStreamError:
         assert b'"max_tokens"' in joined  # stop_reason mapped through
 
 
+def _text_deltas(chunks: list[bytes]) -> list[str]:
+    texts = []
+    for chunk in chunks:
+        for line in chunk.split(b"\n"):
+            if line.startswith(b"data: "):
+                data = json.loads(line[len(b"data: ") :])
+                if data["type"] == "content_block_delta" and (
+                    data["delta"]["type"] == "text_delta"
+                ):
+                    texts.append(data["delta"]["text"])
+    return texts
+
+
+class TestDeltaCoalescing:
+    async def test_deltas_arriving_together_share_one_event(self) -> None:
+        """The first token goes out on its own; tokens that have already
+        arrived after it are merged into a single content_block_delta."""
+
+        async def fake_stream() -> AsyncIterator[object]:
+            for text in ("a", "b", "c", "d"):
+                yield _fake_chunk(content=text)
+            yield _fake_chunk(finish_reason="stop")
+
+        chunks = [
+            chunk
+            async for chunk in _stream_oai_sdk_to_anthropic(
+                fake_stream(), "msg_1", "upstream-model", flush_policy=_MERGING
+            )
+        ]
+
+        assert _text_deltas(chunks) == ["a", "bcd"]
+
+    async def test_no_merging_when_the_route_turns_flushing_off(self) -> None:
+        async def fake_stream() -> AsyncIterator[object]:
+            for text in ("a", "b", "c", "d"):
+                yield _fake_chunk(content=text)
+
+        chunks = [
+            chunk
+            async for chunk in _stream_oai_sdk_to_anthropic(
+                fake_stream(),
+                "msg_1",
+                "upstream-model",
+                flush_policy=_MERGING.for_route({"stream_flush_interval_ms": 0}),
+            )
+        ]
+
+        assert _text_deltas(chunks) == ["a", "b", "c", "d"]
+
+    async def test_spaced_out_deltas_are_not_held_back(self) -> None:
+        async def fake_stream() -> AsyncIterator[object]:
+            for text in ("a", "b", "c"):
+                yield _fake_chunk(content=text)
+                await asyncio.sleep(0.03)
+
+        received: list[bytes] = []
+        async for chunk in _stream_oai_sdk_to_anthropic(
+            fake_stream(), "msg_1", "upstream-model", flush_policy=_MERGING
+        ):
+            received.append(chunk)
+
+        assert _text_deltas(received) == ["a", "b", "c"]
+
+    async def test_pending_text_is_sent_before_a_tool_call_starts(self) -> None:
+        tool_call = SimpleNamespace(
+            index=0,
+            id="call_1",
+            function=SimpleNamespace(name="read_file", arguments='{"path": "a"}'),
+        )
+
+        async def fake_stream() -> AsyncIterator[object]:
+            yield _fake_chunk(content="Let me ")
+            yield _fake_chunk(content="look.")
+            yield SimpleNamespace(
+                choices=[
+                    SimpleNamespace(
+                        delta=SimpleNamespace(content=None, tool_calls=[tool_call]),
+                        finish_reason="tool_calls",
+                    )
+                ],
+                usage=None,
+            )
+
+        body = b"".join(
+            [
+                chunk
+                async for chunk in _stream_oai_sdk_to_anthropic(
+                    fake_stream(), "msg_1", "upstream-model", flush_policy=_MERGING
+                )
+            ]
+        )
+        events = [
+            json.loads(line[len(b"data: ") :])
+            for line in body.split(b"\n")
+            if line.startswith(b"data: ")
+        ]
+        types = [(e["type"], e.get("index")) for e in events]
+
+        assert types.index(("content_block_delta", 0)) < types.index(
+            ("content_block_start", 1)
+        )
+        assert _text_deltas([body]) == ["Let me ", "look."]
+        assert events[types.index(("content_block_delta", 1))]["delta"] == {
+            "type": "input_json_delta",
+            "partial_json": '{"path": "a"}',
+        }
+
+
 class TestSseEventCount:
     async def test_records_sse_event_count_matching_yielded_chunks(self) -> None:
         async def fake_stream() -> AsyncIterator[object]:
@@ -261,8 +370,6 @@ class TestSseEventCount:
 
         usage_tracker = MagicMock()
         usage_tracker.record_usage = AsyncMock()
-        http_client = MagicMock(spec=httpx.AsyncClient)
-        http_client.aclose = AsyncMock()
 
         chunks = [
             chunk
@@ -270,7 +377,6 @@ class TestSseEventCount:
                 fake_stream(),
                 "msg_1",
                 "upstream-model",
-                http_client,
                 usage_tracker,
                 {"user_id": "user-1"},
                 _TEST_START_TIME,
@@ -298,14 +404,11 @@ class TestOaiStreamUsageRetryCount:
 
         usage_tracker = MagicMock()
         usage_tracker.record_usage = AsyncMock()
-        http_client = MagicMock(spec=httpx.AsyncClient)
-        http_client.aclose = AsyncMock()
 
         async for _ in _oai_stream_with_usage_tracking(
             fake_stream(),
             "msg_1",
             "upstream-model",
-            http_client,
             usage_tracker,
             {"user_id": "user-1"},
             _TEST_START_TIME,
@@ -366,8 +469,6 @@ class TestOaiStreamUsageAndCacheTokens:
 
         usage_tracker = MagicMock()
         usage_tracker.record_usage = AsyncMock()
-        http_client = MagicMock(spec=httpx.AsyncClient)
-        http_client.aclose = AsyncMock()
 
         _ = [
             chunk
@@ -375,7 +476,6 @@ class TestOaiStreamUsageAndCacheTokens:
                 fake_stream(),
                 "msg_1",
                 "upstream-model",
-                http_client,
                 usage_tracker,
                 {"user_id": "user-1"},
                 _TEST_START_TIME,
@@ -482,6 +582,77 @@ class TestParseAnthropicSseUsage:
         }
 
 
+class TestAnthropicSseUsageSniffer:
+    def test_byte_at_a_time_matches_one_shot_parse(self) -> None:
+        """Chunk boundaries from the upstream land anywhere — mid-line and
+        mid-UTF-8 character included — and must not change the result."""
+        unicode_delta = (
+            _anthropic_sse_event(
+                "content_block_delta",
+                {
+                    "type": "content_block_delta",
+                    "index": 0,
+                    "delta": {"type": "text_delta", "text": "héllo ✓"},
+                },
+            )
+            .replace(b"\\u00e9", "é".encode())
+            .replace(b"\\u2713", "✓".encode())
+        )
+        raw = _MESSAGE_START + unicode_delta + _MESSAGE_DELTA + _MESSAGE_STOP
+
+        sniffer = AnthropicSseUsageSniffer()
+        for i in range(len(raw)):
+            sniffer.feed(raw[i : i + 1])
+
+        assert sniffer.result() == _parse_anthropic_sse_usage(raw)
+        assert sniffer.result()[2] == "héllo ✓"
+
+    def test_handles_crlf_and_missing_trailing_newline(self) -> None:
+        raw = (_MESSAGE_START + _MESSAGE_DELTA).replace(b"\n", b"\r\n").rstrip()
+        sniffer = AnthropicSseUsageSniffer()
+        sniffer.feed(raw)
+        input_tokens, output_tokens, _, _ = sniffer.result()
+        assert (input_tokens, output_tokens) == (42, 17)
+
+    def test_text_limit_keeps_one_char_past_limit(self) -> None:
+        """One extra character is kept so the usage tracker's truncation
+        marker still distinguishes a cut-off preview from a complete one."""
+        sniffer = AnthropicSseUsageSniffer(text_limit=7)
+        for _ in range(1000):
+            sniffer.feed(_CONTENT_DELTA)
+        _, _, text, _ = sniffer.result()
+        assert text == "hellohel"
+
+    def test_text_limit_zero_keeps_no_text(self) -> None:
+        sniffer = AnthropicSseUsageSniffer(text_limit=0)
+        sniffer.feed(_MESSAGE_START + _CONTENT_DELTA + _MESSAGE_DELTA)
+        input_tokens, output_tokens, text, _ = sniffer.result()
+        assert (input_tokens, output_tokens) == (42, 17)
+        assert not text
+
+    def test_state_stays_bounded_for_long_streams(self) -> None:
+        sniffer = AnthropicSseUsageSniffer(text_limit=100)
+        sniffer.feed(_MESSAGE_START)
+        for _ in range(20_000):
+            sniffer.feed(_CONTENT_DELTA)
+        sniffer.feed(_MESSAGE_DELTA)
+
+        assert len(sniffer._pending) == 0
+        assert sum(len(part) for part in sniffer._text_parts) == 101
+        assert len(sniffer._text_parts) <= 21
+        assert sniffer.result()[:2] == (42, 17)
+
+    def test_oversized_line_is_skipped_not_buffered(self) -> None:
+        huge = b"data: " + b"x" * (_SSE_SNIFF_MAX_LINE_BYTES + 10)
+        sniffer = AnthropicSseUsageSniffer()
+        sniffer.feed(_MESSAGE_START)
+        sniffer.feed(huge[: len(huge) // 2])
+        sniffer.feed(huge[len(huge) // 2 :])
+        assert len(sniffer._pending) <= _SSE_SNIFF_MAX_LINE_BYTES
+        sniffer.feed(b"\n\n" + _MESSAGE_DELTA)
+        assert sniffer.result()[:2] == (42, 17)
+
+
 class TestStreamPassthroughWithUsageTracking:
     async def test_relays_bytes_verbatim_and_records_usage(self) -> None:
         async def fake_aiter_bytes() -> AsyncIterator[bytes]:
@@ -493,8 +664,6 @@ class TestStreamPassthroughWithUsageTracking:
         resp = MagicMock(spec=httpx.Response)
         resp.aiter_bytes = fake_aiter_bytes
         resp.aclose = AsyncMock()
-        client = MagicMock(spec=httpx.AsyncClient)
-        client.aclose = AsyncMock()
         usage_tracker = MagicMock()
         usage_tracker.record_usage = AsyncMock()
 
@@ -502,7 +671,6 @@ class TestStreamPassthroughWithUsageTracking:
             chunk
             async for chunk in _stream_passthrough_with_usage_tracking(
                 resp,
-                client,
                 usage_tracker,
                 "req-1",
                 {"user_id": "user-1"},
@@ -529,7 +697,6 @@ class TestStreamPassthroughWithUsageTracking:
         assert call_kwargs["raw_usage"] == {"input_tokens": 42, "output_tokens": 17}
         assert call_kwargs["start_time"] == _TEST_START_TIME
         resp.aclose.assert_awaited_once()
-        client.aclose.assert_awaited_once()
 
     async def test_threads_retry_count_through_to_record_usage(self) -> None:
         async def fake_aiter_bytes() -> AsyncIterator[bytes]:
@@ -541,14 +708,11 @@ class TestStreamPassthroughWithUsageTracking:
         resp = MagicMock(spec=httpx.Response)
         resp.aiter_bytes = fake_aiter_bytes
         resp.aclose = AsyncMock()
-        client = MagicMock(spec=httpx.AsyncClient)
-        client.aclose = AsyncMock()
         usage_tracker = MagicMock()
         usage_tracker.record_usage = AsyncMock()
 
         async for _ in _stream_passthrough_with_usage_tracking(
             resp,
-            client,
             usage_tracker,
             "req-1",
             {"user_id": "user-1"},
@@ -570,8 +734,6 @@ class TestStreamPassthroughWithUsageTracking:
         resp = MagicMock(spec=httpx.Response)
         resp.aiter_bytes = fake_aiter_bytes
         resp.aclose = AsyncMock()
-        client = MagicMock(spec=httpx.AsyncClient)
-        client.aclose = AsyncMock()
         usage_tracker = MagicMock()
         usage_tracker.record_usage = AsyncMock()
 
@@ -579,7 +741,6 @@ class TestStreamPassthroughWithUsageTracking:
             chunk
             async for chunk in _stream_passthrough_with_usage_tracking(
                 resp,
-                client,
                 usage_tracker,
                 "req-1",
                 {"user_id": "user-1"},
@@ -599,8 +760,6 @@ class TestStreamPassthroughWithUsageTracking:
         resp = MagicMock(spec=httpx.Response)
         resp.aiter_bytes = fake_aiter_bytes
         resp.aclose = AsyncMock()
-        client = MagicMock(spec=httpx.AsyncClient)
-        client.aclose = AsyncMock()
         usage_tracker = MagicMock()
         usage_tracker.record_usage = AsyncMock()
 
@@ -611,7 +770,6 @@ class TestStreamPassthroughWithUsageTracking:
             chunk
             async for chunk in _stream_passthrough_with_usage_tracking(
                 resp,
-                client,
                 usage_tracker,
                 "req-1",
                 {"user_id": "user-1"},
@@ -623,4 +781,3 @@ class TestStreamPassthroughWithUsageTracking:
 
         assert received == [_MESSAGE_START]
         resp.aclose.assert_awaited_once()
-        client.aclose.assert_awaited_once()
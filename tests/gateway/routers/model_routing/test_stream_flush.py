@@ -0,0 +1,160 @@
+"""
+Tests for stream_flush.py's SSE output flush policy.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncGenerator
+
+import pytest
+from starlette.responses import JSONResponse, StreamingResponse
+
+from language_model_gateway.gateway.routers.model_routing.stream_flush import (
+    StreamFlushPolicy,
+    flush_frames,
+)
+
+_POLICY = StreamFlushPolicy(max_bytes=0, max_delay_seconds=0.02)
+
+
+def _delta(text: str) -> bytes:
+    return (
+        b"event: content_block_delta\n"
+        b'data: {"type": "content_block_delta", "index": 0, '
+        b'"delta": {"type": "text_delta", "text": "' + text.encode() + b'"}}\n\n'
+    )
+
+
+_BLOCK_START = (
+    b"event: content_block_start\n"
+    b'data: {"type": "content_block_start", "index": 0, '
+    b'"content_block": {"type": "text", "text": ""}}\n\n'
+)
+_BLOCK_STOP = (
+    b'event: content_block_stop\ndata: {"type": "content_block_stop", "index": 0}\n\n'
+)
+
+
+async def _source(
+    chunks: list[bytes], gap_seconds: float = 0.0
+) -> AsyncGenerator[bytes, None]:
+    for chunk in chunks:
+        yield chunk
+        if gap_seconds:
+            await asyncio.sleep(gap_seconds)
+
+
+async def _frames(
+    source: AsyncGenerator[bytes, None], policy: StreamFlushPolicy = _POLICY
+) -> list[bytes]:
+    return [frame async for frame in flush_frames(source, policy, {})]
+
+
+async def test_chunks_arriving_together_share_a_frame() -> None:
+    chunks = [b": first\n\n"] + [_delta(str(i)) for i in range(5)]
+
+    frames = await _frames(_source(chunks))
+
+    assert frames == [chunks[0], b"".join(chunks[1:])]
+
+
+async def test_spaced_out_chunks_are_not_held_back() -> None:
+    chunks = [_delta(str(i)) for i in range(3)]
+
+    frames = await _frames(_source(chunks, gap_seconds=0.05))
+
+    assert frames == chunks
+
+
+async def test_block_boundaries_and_the_first_token_are_sent_immediately() -> None:
+    chunks = [
+        b": first\n\n",
+        b": ping\n\n",
+        _BLOCK_START,
+        _delta("a"),
+        _delta("b"),
+        _delta("c"),
+        _BLOCK_STOP,
+        _delta("late"),
+    ]
+
+    frames = await _frames(_source(chunks))
+
+    assert frames == [
+        chunks[0],
+        chunks[1] + _BLOCK_START,
+        _delta("a"),
+        _delta("b") + _delta("c") + _BLOCK_STOP,
+        _delta("late"),
+    ]
+
+
+async def test_a_frame_is_sent_once_it_reaches_max_bytes() -> None:
+    chunks = [b": first\n\n"] + [_delta(str(i)) for i in range(6)]
+    policy = StreamFlushPolicy(max_bytes=2 * len(_delta("0")), max_delay_seconds=1.0)
+
+    frames = await _frames(_source(chunks), policy)
+
+    assert frames == [
+        chunks[0],
+        chunks[1] + chunks[2],
+        chunks[3] + chunks[4],
+        chunks[5] + chunks[6],
+    ]
+
+
+async def test_held_chunks_go_out_before_a_source_error() -> None:
+    async def failing() -> AsyncGenerator[bytes, None]:
+        yield b": first\n\n"
+        yield _delta("a")
+        raise RuntimeError("upstream went away")
+
+    received = []
+    with pytest.raises(RuntimeError, match="upstream went away"):
+        async for frame in flush_frames(failing(), _POLICY, {}):
+            received.append(frame)
+
+    assert received == [b": first\n\n", _delta("a")]
+
+
+async def test_closing_the_frames_closes_the_source() -> None:
+    closed = asyncio.Event()
+
+    async def endless() -> AsyncGenerator[bytes, None]:
+        try:
+            while True:
+                yield _delta("x")
+                await asyncio.sleep(0)
+        finally:
+            closed.set()
+
+    frames = flush_frames(endless(), _POLICY, {})
+    assert await anext(frames) == _delta("x")
+    await frames.aclose()
+
+    assert closed.is_set()
+
+
+def test_route_overrides_the_default_policy() -> None:
+    default = StreamFlushPolicy(max_bytes=8192, max_delay_seconds=0.005)
+
+    assert default.for_route({}) == default
+    assert default.for_route({"stream_flush_interval_ms": 0}) == StreamFlushPolicy(
+        max_bytes=8192, max_delay_seconds=0.0
+    )
+    assert default.for_route({"stream_flush_bytes": 1024}).max_bytes == 1024
+
+
+def test_only_enabled_policies_wrap_sse_responses() -> None:
+    source = _source([_delta("a")])
+    sse = StreamingResponse(source, media_type="text/event-stream")
+    json_response = JSONResponse({"ok": True})
+
+    unchanged = StreamFlushPolicy().apply(sse, {})
+    assert isinstance(unchanged, StreamingResponse)
+    assert unchanged.body_iterator is source
+    assert _POLICY.apply(json_response, {}) is json_response
+    merged = _POLICY.apply(sse, {})
+    assert isinstance(merged, StreamingResponse)
+    assert merged.body_iterator is not source
@@ -0,0 +1,139 @@
+"""
+Tests for tokenizer.py's cached per-message token counts.
+
+The HuggingFace tokenizer is replaced by a whitespace-splitting fake, so no
+model is downloaded.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterator
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from language_model_gateway.gateway.routers.model_routing import tokenizer
+from language_model_gateway.gateway.routers.model_routing.tokenizer import (
+    _MESSAGE_FRAMING_TOKENS,
+    _TokenCountCache,
+    count_oai_message_tokens,
+)
+
+FAKE_MODEL = "test-tokenizer/does-not-exist"
+
+
+@pytest.fixture
+def fake_tokenizer() -> Iterator[MagicMock]:
+    tok = MagicMock()
+    tok.encode.side_effect = lambda text, add_special_tokens=True: text.split()
+    tokenizer._message_token_cache.clear()
+    with patch.object(tokenizer, "_get_tokenizer", return_value=tok):
+        yield tok
+    tokenizer._message_token_cache.clear()
+
+
+def test_counts_content_plus_framing(fake_tokenizer: MagicMock) -> None:
+    msg = {"role": "user", "content": "one two three"}
+    # "user" + three content words
+    assert count_oai_message_tokens(msg, FAKE_MODEL) == 4 + _MESSAGE_FRAMING_TOKENS
+
+
+def test_counts_tool_call_name_and_arguments(fake_tokenizer: MagicMock) -> None:
+    msg: dict[str, Any] = {
+        "role": "assistant",
+        "content": None,
+        "tool_calls": [
+            {
+                "id": "tc1",
+                "type": "function",
+                "function": {"name": "bash", "arguments": '{"cmd": "ls -la"}'},
+            }
+        ],
+    }
+    count = count_oai_message_tokens(msg, FAKE_MODEL)
+    assert count is not None and count > 2 + _MESSAGE_FRAMING_TOKENS
+
+
+def test_repeated_message_is_served_from_cache(fake_tokenizer: MagicMock) -> None:
+    """A session resends its whole history every turn — each message must be
+    tokenized once, not once per request."""
+    msg = {"role": "user", "content": "same history every turn"}
+    first = count_oai_message_tokens(msg, FAKE_MODEL)
+    second = count_oai_message_tokens(dict(msg), FAKE_MODEL)
+    assert first == second
+    assert fake_tokenizer.encode.call_count == 1
+
+
+def test_cache_is_keyed_by_tokenizer_model(fake_tokenizer: MagicMock) -> None:
+    msg = {"role": "user", "content": "hello"}
+    count_oai_message_tokens(msg, FAKE_MODEL)
+    count_oai_message_tokens(msg, "another/tokenizer")
+    assert fake_tokenizer.encode.call_count == 2
+
+
+def test_returns_none_without_tokenizer() -> None:
+    with patch.object(tokenizer, "_get_tokenizer", return_value=None):
+        assert count_oai_message_tokens({"role": "user"}, FAKE_MODEL) is None
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    cache = _TokenCountCache(max_entries=2)
+    cache.put(("m", b"a"), 1)
+    cache.put(("m", b"b"), 2)
+    assert cache.get(("m", b"a")) == 1  # refreshes "a"
+    cache.put(("m", b"c"), 3)
+    assert cache.get(("m", b"b")) is None
+    assert cache.get(("m", b"a")) == 1
+    assert len(cache) == 2
+
+
+class TestLoadRetry:
+    @pytest.fixture(autouse=True)
+    def _reset_failures(self) -> Iterator[None]:
+        tokenizer._load_failures.clear()
+        yield
+        tokenizer._load_failures.clear()
+
+    def test_failed_load_backs_off_then_retries(self) -> None:
+        """A transient hub failure must not disable the tokenizer for the
+        life of the process."""
+        tok = MagicMock()
+        load = MagicMock(side_effect=[OSError("hub timeout"), tok])
+        with patch.object(tokenizer, "_load_tokenizer", load):
+            load.cache_info = MagicMock(return_value=MagicMock(currsize=0))
+            assert tokenizer._get_tokenizer(FAKE_MODEL) is None
+            # Within the backoff window no new attempt is made.
+            assert tokenizer._get_tokenizer(FAKE_MODEL) is None
+            assert load.call_count == 1
+
+            failures, _retry_at = tokenizer._load_failures[FAKE_MODEL]
+            tokenizer._load_failures[FAKE_MODEL] = (failures, 0.0)
+            assert tokenizer._get_tokenizer(FAKE_MODEL) is tok
+        assert load.call_count == 2
+
+    def test_backoff_grows_and_is_capped(self) -> None:
+        delays = [tokenizer._record_load_failure(FAKE_MODEL) for _ in range(10)]
+        assert delays[0] == tokenizer._LOAD_RETRY_BASE_S
+        assert delays[1] == 2 * tokenizer._LOAD_RETRY_BASE_S
+        assert delays[-1] == tokenizer._LOAD_RETRY_MAX_S
+
+
+async def test_preload_warms_each_configured_tokenizer_once() -> None:
+    warmed: list[str] = []
+
+    def warm_up(model: str) -> bool:
+        warmed.append(model)
+        return model != "broken/model"
+
+    with patch.object(tokenizer, "_warm_up", side_effect=warm_up):
+        results = await tokenizer.preload_tokenizers(
+            ["qwen/a", "qwen/a", "broken/model"]
+        )
+    assert results == {"broken/model": False, "qwen/a": True}
+    assert sorted(warmed) == ["broken/model", "qwen/a"]
+
+
+def test_warm_up_renders_the_chat_template(fake_tokenizer: MagicMock) -> None:
+    fake_tokenizer.apply_chat_template.return_value = "<|im_start|>user warm-up"
+    assert tokenizer._warm_up(FAKE_MODEL) is True
+    fake_tokenizer.apply_chat_template.assert_called_once()
@@ -0,0 +1,125 @@
+"""
+Tests for upstream_client_pool.py's pooled httpx/openai client lifecycle.
+"""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import httpx
+from pytest_httpx import HTTPXMock
+
+from language_model_gateway.gateway.routers.model_routing.aws_auth import SigV4Auth
+from language_model_gateway.gateway.routers.model_routing.upstream_client_pool import (
+    UpstreamClientPool,
+)
+
+_HTTP2_AVAILABLE = (
+    "language_model_gateway.gateway.routers.model_routing.upstream_client_pool."
+    "_http2_available"
+)
+
+
+class TestGetClient:
+    async def test_reuses_client_for_same_origin_auth_and_region(self) -> None:
+        pool = UpstreamClientPool()
+        first = pool.get_client("https://api.anthropic.com/v1/messages")
+        second = pool.get_client("https://api.anthropic.com/v1/messages/count_tokens")
+        assert first is second
+        await pool.aclose()
+
+    async def test_separates_clients_by_auth_and_region(self) -> None:
+        pool = UpstreamClientPool()
+        url = "https://bedrock-runtime.us-east-1.amazonaws.com/model/x/invoke"
+        passthrough = pool.get_client(url)
+        east = pool.get_client(url, auth="aws", aws_region="us-east-1")
+        west = pool.get_client(url, auth="aws", aws_region="us-west-2")
+        assert len({id(passthrough), id(east), id(west)}) == 3
+        await pool.aclose()
+
+    async def test_sign_requests_attaches_sigv4_auth(self) -> None:
+        pool = UpstreamClientPool()
+        url = "https://bedrock-mantle.us-east-1.api.aws/v1"
+        signed = pool.get_client(
+            url, auth="aws", aws_region="us-east-1", sign_requests=True
+        )
+        unsigned = pool.get_client(url, auth="aws", aws_region="us-east-1")
+        assert isinstance(signed.auth, SigV4Auth)
+        assert not isinstance(unsigned.auth, SigV4Auth)
+        await pool.aclose()
+
+    async def test_falls_back_to_http1_without_h2(self) -> None:
+        with patch(_HTTP2_AVAILABLE, return_value=False):
+            pool = UpstreamClientPool(http2=True)
+        assert pool.http2 is False
+        # Constructing the client must not raise ImportError for missing h2.
+        pool.get_client("https://api.anthropic.com/v1/messages")
+        await pool.aclose()
+
+    async def test_does_not_persist_upstream_cookies(
+        self, httpx_mock: HTTPXMock
+    ) -> None:
+        """A pooled client is shared by every user of the worker — a cookie
+        set in response to one user's request must never be replayed on
+        another's."""
+        httpx_mock.add_response(
+            url="https://api.anthropic.com/v1/messages",
+            headers={"set-cookie": "affinity=user-a; Domain=api.anthropic.com"},
+            json={},
+        )
+        pool = UpstreamClientPool()
+        client = pool.get_client("https://api.anthropic.com/v1/messages")
+        await client.post("https://api.anthropic.com/v1/messages", json={})
+        assert len(client.cookies.jar) == 0
+        await pool.aclose()
+
+
+class TestGetOpenaiClient:
+    async def test_caches_sdk_client_over_pooled_http_client(self) -> None:
+        pool = UpstreamClientPool()
+        base_url = "https://bedrock-mantle.us-east-1.api.aws/v1"
+        first = pool.get_openai_client(base_url, auth="aws", aws_region="us-east-1")
+        second = pool.get_openai_client(base_url, auth="aws", aws_region="us-east-1")
+        assert first is second
+        assert str(first.base_url).rstrip("/") == base_url
+        await pool.aclose()
+
+
+class TestAclose:
+    async def test_closes_clients_and_reopens_on_next_use(self) -> None:
+        pool = UpstreamClientPool()
+        url = "https://api.anthropic.com/v1/messages"
+        client = pool.get_client(url)
+        oai_client = pool.get_openai_client("https://api.anthropic.com/v1")
+
+        await pool.aclose()
+
+        assert client.is_closed
+        reopened = pool.get_client(url)
+        assert reopened is not client
+        assert not reopened.is_closed
+        assert pool.get_openai_client("https://api.anthropic.com/v1") is not oai_client
+        await pool.aclose()
+
+    async def test_is_idempotent(self) -> None:
+        pool = UpstreamClientPool()
+        pool.get_client("https://api.anthropic.com/v1/messages")
+        await pool.aclose()
+        await pool.aclose()
+
+
+async def test_client_is_reused_across_requests(httpx_mock: HTTPXMock) -> None:
+    """Two sequential requests through the same pooled client share its
+    connection pool rather than each building (and tearing down) their own."""
+    httpx_mock.add_response(url="https://api.anthropic.com/v1/messages", json={})
+    httpx_mock.add_response(url="https://api.anthropic.com/v1/messages", json={})
+    pool = UpstreamClientPool()
+    clients: list[httpx.AsyncClient] = []
+    for _ in range(2):
+        client = pool.get_client("https://api.anthropic.com/v1/messages")
+        resp = await client.post("https://api.anthropic.com/v1/messages", json={})
+        assert resp.status_code == 200
+        clients.append(client)
+    assert clients[0] is clients[1]
+    assert not clients[0].is_closed
+    await pool.aclose()
@@ -0,0 +1,159 @@
+"""
+Tests for usage_rollup.py.
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from language_model_gateway.gateway.routers.model_routing.usage_rollup import (
+    UsageRollupReader,
+    bucket_start,
+    merge_rollup_updates,
+)
+
+_TS = datetime(2026, 7, 14, 15, 42, 17, 123456, tzinfo=UTC)
+
+
+def _record(**overrides: Any) -> dict[str, Any]:
+    record: dict[str, Any] = {
+        "timestamp": _TS,
+        "model": "qwen.test",
+        "model_tier": "sonnet",
+        "backend": "aws_bedrock",
+        "account_uuid": "acct-1",
+        "input_tokens": 100,
+        "output_tokens": 50,
+        "total_tokens": 150,
+        "cost_usd": 0.001,
+        "anthropic_cost_usd": 0.003,
+        "cost_savings_usd": 0.002,
+        "retry_count": 1,
+    }
+    record.update(overrides)
+    return record
+
+
+class TestBucketStart:
+    @pytest.mark.parametrize(
+        "granularity,expected",
+        [
+            ("minute", datetime(2026, 7, 14, 15, 42, tzinfo=UTC)),
+            ("hour", datetime(2026, 7, 14, 15, tzinfo=UTC)),
+            ("day", datetime(2026, 7, 14, tzinfo=UTC)),
+        ],
+    )
+    def test_truncates_to_bucket(self, granularity: str, expected: datetime) -> None:
+        assert bucket_start(_TS, granularity) == expected
+
+    def test_rejects_unknown_granularity(self) -> None:
+        with pytest.raises(ValueError):
+            bucket_start(_TS, "week")
+
+
+class TestMergeRollupUpdates:
+    def test_same_bucket_records_merge_into_one_upsert(self) -> None:
+        merged = merge_rollup_updates([_record(), _record()])
+        for granularity in ("minute", "hour", "day"):
+            assert len(merged[granularity]) == 1
+        key, inc = next(iter(merged["hour"].values()))
+        assert key["bucket_start"] == datetime(2026, 7, 14, 15, tzinfo=UTC)
+        assert key["user_id"] is None
+        assert inc["requests"] == 2
+        assert inc["total_tokens"] == 300
+        assert inc["cost_savings_usd"] == 0.004
+        assert inc["retries"] == 2
+
+    def test_different_minutes_share_the_hour_bucket(self) -> None:
+        later = _TS.replace(minute=43)
+        merged = merge_rollup_updates([_record(), _record(timestamp=later)])
+        assert len(merged["minute"]) == 2
+        assert len(merged["hour"]) == 1
+
+    def test_different_models_get_separate_buckets(self) -> None:
+        merged = merge_rollup_updates([_record(), _record(model="qwen.other")])
+        assert len(merged["day"]) == 2
+
+    def test_records_without_cost_count_requests_and_tokens(self) -> None:
+        record = _record()
+        for field in ("cost_usd", "anthropic_cost_usd", "cost_savings_usd"):
+            del record[field]
+        _, inc = next(iter(merge_rollup_updates([record])["day"].values()))
+        assert inc == {
+            "requests": 1,
+            "input_tokens": 100,
+            "output_tokens": 50,
+            "total_tokens": 150,
+            "retries": 1,
+        }
+
+
+class _Cursor:
+    def __init__(self, docs: list[dict[str, Any]]) -> None:
+        self._docs = iter(docs)
+        self.sort_args: tuple[Any, ...] = ()
+        self.limit_arg: int | None = None
+
+    def sort(self, *args: Any) -> _Cursor:
+        self.sort_args = args
+        return self
+
+    def limit(self, limit: int) -> _Cursor:
+        self.limit_arg = limit
+        return self
+
+    def __aiter__(self) -> _Cursor:
+        return self
+
+    async def __anext__(self) -> dict[str, Any]:
+        try:
+            return next(self._docs)
+        except StopIteration:
+            raise StopAsyncIteration from None
+
+
+class TestUsageRollupReader:
+    async def test_queries_the_granularity_collection(self) -> None:
+        reader = UsageRollupReader(mongo_uri="mongodb://localhost:27017")
+        cursor = _Cursor(
+            [
+                {
+                    "bucket_start": datetime(2026, 7, 14, 15, tzinfo=UTC),
+                    "model": "qwen.test",
+                    "requests": 2,
+                    "total_tokens": 300,
+                    "cost_usd": 0.002,
+                }
+            ]
+        )
+        collection = MagicMock()
+        collection.find = MagicMock(return_value=cursor)
+        reader._db = MagicMock()
+        reader._db.__getitem__.return_value = collection
+        start = datetime(2026, 7, 14, tzinfo=UTC)
+        end = datetime(2026, 7, 15, tzinfo=UTC)
+
+        buckets = await reader.get_rollups("hour", start, end, model="qwen.test")
+
+        reader._db.__getitem__.assert_called_once_with("model-router-usage-rollup-hour")
+        collection.find.assert_called_once_with(
+            {"bucket_start": {"$gte": start, "$lt": end}, "model": "qwen.test"}
+        )
+        assert cursor.sort_args == ("bucket_start", 1)
+        assert cursor.limit_arg == 1000
+        assert buckets is not None
+        assert buckets[0].requests == 2
+        assert buckets[0].input_tokens == 0
+        assert buckets[0].cost_usd == 0.002
+
+    async def test_returns_none_on_mongo_failure(self) -> None:
+        reader = UsageRollupReader(mongo_uri="mongodb://localhost:27017")
+        collection = MagicMock()
+        collection.find = MagicMock(side_effect=ConnectionError("down"))
+        reader._db = MagicMock()
+        reader._db.__getitem__.return_value = collection
+        assert await reader.get_rollups("day", _TS, _TS) is None
@@ -0,0 +1,126 @@
+"""
+Tests for usage_rollup_router.py.
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from language_model_gateway.gateway.routers.model_routing.usage_rollup import (
+    UsageRollupBucket,
+)
+from language_model_gateway.gateway.routers.model_routing.usage_rollup_router import (
+    UsageRollupRouter,
+)
+
+_URL = "/v1/model-routing/usage/rollups"
+
+
+def _token_reader(valid: bool = True) -> MagicMock:
+    token_reader = MagicMock()
+    token_reader.extract_token = MagicMock(return_value="token")
+    token_reader.verify_token_async = AsyncMock(
+        return_value=MagicMock() if valid else None
+    )
+    return token_reader
+
+
+def _bucket() -> UsageRollupBucket:
+    return UsageRollupBucket(
+        bucket_start=datetime(2026, 7, 14, 15, tzinfo=UTC),
+        model="qwen.test",
+        model_tier="sonnet",
+        backend="aws_bedrock",
+        user_id=None,
+        account_uuid="acct-1",
+        requests=2,
+        input_tokens=200,
+        output_tokens=100,
+        total_tokens=300,
+        cost_usd=0.002,
+        anthropic_cost_usd=0.006,
+        cost_savings_usd=0.004,
+        retries=0,
+    )
+
+
+async def _get(
+    router: UsageRollupRouter, params: dict[str, str] | None = None
+) -> httpx.Response:
+    app = FastAPI()
+    app.include_router(router.get_router())
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        return await client.get(
+            _URL, params=params, headers={"Authorization": "Bearer token"}
+        )
+
+
+@pytest.mark.asyncio
+async def test_rejects_requests_without_a_token_reader() -> None:
+    router = UsageRollupRouter(mongo_uri="mongodb://localhost:27017")
+    response = await _get(router)
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_rejects_unverified_tokens() -> None:
+    router = UsageRollupRouter(
+        mongo_uri="mongodb://localhost:27017", token_reader=_token_reader(False)
+    )
+    response = await _get(router)
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_returns_buckets_for_the_requested_window() -> None:
+    router = UsageRollupRouter(
+        mongo_uri="mongodb://localhost:27017", token_reader=_token_reader()
+    )
+    assert router._reader is not None
+    get_rollups = AsyncMock(return_value=[_bucket()])
+    with patch.object(router._reader, "get_rollups", new=get_rollups):
+        response = await _get(
+            router,
+            {
+                "granularity": "day",
+                "start": "2026-07-14T00:00:00Z",
+                "end": "2026-07-15T00:00:00Z",
+                "model": "qwen.test",
+            },
+        )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["granularity"] == "day"
+    assert body["buckets"][0]["total_tokens"] == 300
+    args, kwargs = get_rollups.call_args
+    assert args[0] == "day"
+    assert args[1] == datetime(2026, 7, 14, tzinfo=UTC)
+    assert kwargs["model"] == "qwen.test"
+
+
+@pytest.mark.asyncio
+async def test_rejects_unknown_granularity() -> None:
+    router = UsageRollupRouter(
+        mongo_uri="mongodb://localhost:27017", token_reader=_token_reader()
+    )
+    response = await _get(router, {"granularity": "week"})
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_returns_503_when_the_store_is_unavailable() -> None:
+    router = UsageRollupRouter(
+        mongo_uri="mongodb://localhost:27017", token_reader=_token_reader()
+    )
+    assert router._reader is not None
+    with patch.object(router._reader, "get_rollups", new=AsyncMock(return_value=None)):
+        response = await _get(router)
+    assert response.status_code == 503
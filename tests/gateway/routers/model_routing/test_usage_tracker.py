@@ -6,9 +6,18 @@ Tests for usage tracking functionality including data extraction and usage recor
 
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
+from language_model_gateway.gateway.routers.model_routing.record_spool import (
+    RecordSpool,
+)
+from language_model_gateway.gateway.routers.model_routing.session_savings_cache import (
+    SessionSavingsCache,
+)
 from language_model_gateway.gateway.routers.model_routing.usage_tracker import (
     UsageTracker,
 )
@@ -1432,3 +1441,375 @@ class TestUsageTrackerInitialization:
         tracker = UsageTracker(mongo_uri="mongodb://localhost:27017", enabled=False)
         assert tracker._enabled is False
         assert tracker._client is None
+
+
+def _batched_tracker(**kwargs: Any) -> tuple[UsageTracker, MagicMock, MagicMock]:
+    """A tracker with mocked collections: (tracker, usage, sessions)."""
+    tracker = UsageTracker(
+        mongo_uri="mongodb://localhost:27017", enabled=False, **kwargs
+    )
+    collection = MagicMock()
+    collection.insert_many = AsyncMock()
+    collection.insert_one = AsyncMock()
+    collection.update_many = AsyncMock()
+    collection.update_one = AsyncMock()
+    sessions = MagicMock()
+    sessions.bulk_write = AsyncMock()
+    sessions.update_one = AsyncMock()
+    tracker._collection = collection
+    tracker._session_collection = sessions
+    return tracker, collection, sessions
+
+
+async def _record(
+    tracker: UsageTracker, request_id: str, session_id: str | None = "sess-1"
+) -> None:
+    with patch.object(tracker, "_ensure_connected", new_callable=AsyncMock):
+        await tracker.record_usage(
+            start_time=_TEST_START_TIME,
+            request_id=request_id,
+            user_id="user-1",
+            model="claude-3-5-haiku",
+            input_tokens=100,
+            output_tokens=50,
+            session_id=session_id,
+            model_tier="haiku",
+            price_per_mtok=1.0,
+            anthropic_price_per_mtok=3.0,
+        )
+
+
+class TestUsageTrackerBatchedWrites:
+    """Tests for the write-behind buffer (write_batch_size > 1)."""
+
+    async def test_full_batch_is_one_insert_many_and_one_bulk_write(self) -> None:
+        tracker, collection, sessions = _batched_tracker(
+            write_batch_size=3, flush_interval_seconds=60
+        )
+        await _record(tracker, "req-1")
+        await _record(tracker, "req-2")
+        await _record(tracker, "req-3", session_id="sess-2")
+        await asyncio.sleep(0.01)
+
+        collection.insert_one.assert_not_called()
+        collection.insert_many.assert_awaited_once()
+        records = collection.insert_many.call_args[0][0]
+        assert [r["request_id"] for r in records] == ["req-1", "req-2", "req-3"]
+
+        sessions.update_one.assert_not_called()
+        sessions.bulk_write.assert_awaited_once()
+        ops = sessions.bulk_write.call_args[0][0]
+        by_session = {op._filter["session_id"]: op._doc for op in ops}
+        # Two requests in sess-1 merged into a single upsert.
+        assert by_session["sess-1"]["$inc"]["input_tokens"] == 200
+        assert by_session["sess-1"]["$inc"]["low_tier_cost"] == 0.0003
+        assert by_session["sess-1"]["$set"]["user_id"] == "user-1"
+        assert by_session["sess-2"]["$inc"]["input_tokens"] == 100
+        assert all(op._upsert for op in ops)
+
+    async def test_partial_batch_is_flushed_after_the_interval(self) -> None:
+        tracker, collection, sessions = _batched_tracker(
+            write_batch_size=100, flush_interval_seconds=0.02
+        )
+        await _record(tracker, "req-1")
+        collection.insert_many.assert_not_called()
+        await asyncio.sleep(0.1)
+        collection.insert_many.assert_awaited_once()
+
+    async def test_overflow_drops_new_records(self) -> None:
+        tracker, collection, sessions = _batched_tracker(
+            write_batch_size=100, flush_interval_seconds=60, max_pending_writes=2
+        )
+        for i in range(5):
+            await _record(tracker, f"req-{i}")
+        assert len(tracker._pending_writes) == 2
+        assert tracker._dropped_writes == 3
+
+    async def test_close_drains_the_buffer(self) -> None:
+        tracker, collection, sessions = _batched_tracker(
+            write_batch_size=100, flush_interval_seconds=60
+        )
+        await _record(tracker, "req-1")
+        await _record(tracker, "req-2", session_id=None)
+        await tracker.close()
+        records = collection.insert_many.call_args[0][0]
+        assert len(records) == 2
+        ops = sessions.bulk_write.call_args[0][0]
+        assert [op._filter for op in ops] == [{"session_id": "sess-1"}]
+        assert tracker._pending_writes == []
+
+    async def test_failed_inserts_are_not_credited_to_the_session(self) -> None:
+        from pymongo.errors import BulkWriteError
+
+        tracker, collection, sessions = _batched_tracker(
+            write_batch_size=2, flush_interval_seconds=60
+        )
+        collection.insert_many = AsyncMock(
+            side_effect=BulkWriteError(
+                {"writeErrors": [{"index": 0, "code": 11000, "errmsg": "dup"}]}
+            )
+        )
+        await _record(tracker, "req-1")
+        await _record(tracker, "req-2")
+        await tracker.close()
+        ops = sessions.bulk_write.call_args[0][0]
+        assert ops[0]._doc["$inc"]["input_tokens"] == 100
+
+    async def test_mongo_outage_does_not_raise(self) -> None:
+        tracker, collection, sessions = _batched_tracker(
+            write_batch_size=1_000, flush_interval_seconds=60
+        )
+        collection.insert_many = AsyncMock(side_effect=ConnectionError())
+        await _record(tracker, "req-1")
+        await tracker.close()
+        sessions.bulk_write.assert_not_called()
+
+
+class TestUsageTrackerInvalidatesSavingsCache:
+    """A session's savings-endpoint cache entry is dropped once its rollup
+    is written."""
+
+    async def _cache_with_entry(self) -> SessionSavingsCache:
+        cache = SessionSavingsCache()
+        await cache.get("sess-1", AsyncMock(return_value=None))
+        assert len(cache) == 1
+        return cache
+
+    async def test_unbatched_upsert_invalidates(self) -> None:
+        cache = await self._cache_with_entry()
+        tracker, _, sessions = _batched_tracker(savings_cache=cache)
+        await _record(tracker, "req-1")
+        sessions.update_one.assert_awaited_once()
+        assert len(cache) == 0
+
+    async def test_batched_flush_invalidates(self) -> None:
+        cache = await self._cache_with_entry()
+        tracker, _, sessions = _batched_tracker(
+            savings_cache=cache, write_batch_size=100, flush_interval_seconds=60
+        )
+        await _record(tracker, "req-1")
+        assert len(cache) == 1
+        await tracker.close()
+        sessions.bulk_write.assert_awaited_once()
+        assert len(cache) == 0
+
+
+class TestUsageTrackerRollups:
+    """Tests for the minute/hour/day usage rollups."""
+
+    def _rollup_tracker(
+        self, **kwargs: Any
+    ) -> tuple[UsageTracker, MagicMock, dict[str, MagicMock]]:
+        tracker, collection, _ = _batched_tracker(
+            rollup_collection_prefix="rollup", **kwargs
+        )
+        rollups = {}
+        for granularity in ("minute", "hour", "day"):
+            rollups[granularity] = MagicMock()
+            rollups[granularity].bulk_write = AsyncMock()
+        tracker._rollup_collections = dict(rollups)
+        return tracker, collection, rollups
+
+    async def test_unbatched_record_updates_every_granularity(self) -> None:
+        tracker, _, rollups = self._rollup_tracker()
+        await _record(tracker, "req-1")
+        for granularity, collection in rollups.items():
+            collection.bulk_write.assert_awaited_once()
+            (op,) = collection.bulk_write.call_args[0][0]
+            assert op._filter["_id"]["model"] == "claude-3-5-haiku"
+            assert op._doc["$inc"]["requests"] == 1
+            assert op._doc["$setOnInsert"] == op._filter["_id"]
+
+    async def test_batch_merges_same_bucket_records(self) -> None:
+        tracker, _, rollups = self._rollup_tracker(
+            write_batch_size=100, flush_interval_seconds=60
+        )
+        await _record(tracker, "req-1")
+        await _record(tracker, "req-2", session_id="sess-2")
+        await tracker.close()
+        ops = rollups["day"].bulk_write.call_args[0][0]
+        assert len(ops) == 1
+        assert ops[0]._doc["$inc"]["requests"] == 2
+        assert ops[0]._doc["$inc"]["input_tokens"] == 200
+
+    async def test_failed_inserts_are_not_rolled_up(self) -> None:
+        from pymongo.errors import BulkWriteError
+
+        tracker, collection, rollups = self._rollup_tracker(
+            write_batch_size=2, flush_interval_seconds=60
+        )
+        collection.insert_many = AsyncMock(
+            side_effect=BulkWriteError(
+                {"writeErrors": [{"index": 0, "code": 11000, "errmsg": "dup"}]}
+            )
+        )
+        await _record(tracker, "req-1")
+        await _record(tracker, "req-2")
+        await tracker.close()
+        ops = rollups["hour"].bulk_write.call_args[0][0]
+        assert ops[0]._doc["$inc"]["requests"] == 1
+
+    async def test_rollups_off_without_prefix(self) -> None:
+        tracker, _, _ = _batched_tracker()
+        await _record(tracker, "req-1")
+        assert tracker._rollup_collections == {}
+
+
+class _SlowUsageCollection:
+    """Usage collection whose inserts land for the first `landing` records
+    and then time out; `landing=None` inserts everything normally."""
+
+    def __init__(self, landing: int | None) -> None:
+        self.landing = landing
+        self.docs: dict[Any, dict[str, Any]] = {}
+
+    async def insert_many(self, records: list[dict[str, Any]], ordered: bool) -> None:
+        from pymongo.errors import BulkWriteError
+
+        duplicates = []
+        for index, record in enumerate(records[: self.landing]):
+            if record["_id"] in self.docs:
+                duplicates.append({"index": index, "code": 11000, "errmsg": "dup"})
+            else:
+                self.docs[record["_id"]] = dict(record)
+        if self.landing is not None:
+            raise TimeoutError()
+        if duplicates:
+            raise BulkWriteError({"writeErrors": duplicates})
+
+    async def update_many(self, query: dict[str, Any], update: dict[str, Any]) -> None:
+        for _id in query["_id"]["$in"]:
+            self.docs[_id].update(update["$set"])
+
+    async def update_one(self, query: dict[str, Any], update: dict[str, Any]) -> Any:
+        doc = self.docs.get(query["_id"])
+        claimed = doc is not None and doc.get("credited") is not True
+        if doc is not None and claimed:
+            doc.update(update["$set"])
+        return MagicMock(modified_count=int(claimed))
+
+
+class TestUsageTrackerSpool:
+    """Records MongoDB doesn't take go to the local spool and are replayed."""
+
+    async def test_outage_spools_the_batch_and_replay_credits_it(
+        self, tmp_path: Path
+    ) -> None:
+        spool = RecordSpool(str(tmp_path), "usage", replay_interval_seconds=60)
+        tracker, collection, sessions = _batched_tracker(
+            write_batch_size=100, flush_interval_seconds=60, spool=spool
+        )
+        collection.insert_many = AsyncMock(side_effect=ConnectionError("down"))
+        await _record(tracker, "req-1")
+        await _record(tracker, "req-2")
+        await tracker.flush()
+        sessions.bulk_write.assert_not_called()
+        assert tracker._dropped_writes == 0
+        assert spool.has_pending()
+
+        collection.insert_many = AsyncMock()
+        assert await spool.replay(tracker._replay) is True
+        records = collection.insert_many.call_args[0][0]
+        assert [r["request_id"] for r in records] == ["req-1", "req-2"]
+        assert all("_id" in r for r in records)
+        assert records[0]["timestamp"].tzinfo is not None
+        ops = sessions.bulk_write.call_args[0][0]
+        assert ops[0]._doc["$inc"]["input_tokens"] == 200
+        await tracker.close()
+
+    async def test_landed_then_timed_out_batch_is_credited_once_on_replay(
+        self, tmp_path: Path
+    ) -> None:
+        spool = RecordSpool(str(tmp_path), "usage", replay_interval_seconds=60)
+        tracker, _, sessions = _batched_tracker(
+            write_batch_size=100, flush_interval_seconds=60, spool=spool
+        )
+        collection = _SlowUsageCollection(landing=1)
+        tracker._collection = collection
+        hourly = MagicMock()
+        hourly.bulk_write = AsyncMock()
+        tracker._rollup_collections = {"hour": hourly}
+        await _record(tracker, "req-1")
+        await _record(tracker, "req-2")
+        # req-1's insert lands, then the write times out anyway.
+        await tracker.flush()
+        sessions.bulk_write.assert_not_called()
+        hourly.bulk_write.assert_not_called()
+
+        collection.landing = None
+        replayed: list[list[dict[str, Any]]] = []
+
+        async def replay(entries: list[dict[str, Any]]) -> bool:
+            replayed.append(entries)
+            return await tracker._replay(entries)
+
+        assert await spool.replay(replay) is True
+        ops = sessions.bulk_write.call_args[0][0]
+        assert ops[0]._doc["$inc"]["input_tokens"] == 200
+        (op,) = hourly.bulk_write.call_args[0][0]
+        assert op._doc["$inc"]["requests"] == 2
+        assert len(collection.docs) == 2
+
+        # Replayed again, e.g. after a crash before the segment was deleted.
+        assert await tracker._replay(replayed[0]) is True
+        sessions.bulk_write.assert_awaited_once()
+        hourly.bulk_write.assert_awaited_once()
+        assert tracker._dropped_writes == 0
+        await tracker.close()
+
+    async def test_overflow_is_spooled_instead_of_dropped(self, tmp_path: Path) -> None:
+        spool = RecordSpool(str(tmp_path), "usage", replay_interval_seconds=60)
+        tracker, collection, sessions = _batched_tracker(
+            write_batch_size=100,
+            flush_interval_seconds=60,
+            max_pending_writes=2,
+            spool=spool,
+        )
+        for i in range(5):
+            await _record(tracker, f"req-{i}")
+        assert len(tracker._pending_writes) == 2
+        assert tracker._dropped_writes == 0
+
+        await spool.replay(tracker._replay)
+        records = collection.insert_many.call_args[0][0]
+        assert [r["request_id"] for r in records] == ["req-2", "req-3", "req-4"]
+        await tracker.close()
+
+    async def test_slow_unbatched_write_is_spooled(self, tmp_path: Path) -> None:
+        async def slow_insert(record: dict[str, Any]) -> None:
+            await asyncio.sleep(10)
+
+        spool = RecordSpool(str(tmp_path), "usage", replay_interval_seconds=60)
+        tracker, collection, sessions = _batched_tracker(
+            spool=spool, write_timeout_seconds=0.01
+        )
+        collection.insert_one = AsyncMock(side_effect=slow_insert)
+        await _record(tracker, "req-1")
+        sessions.update_one.assert_not_called()
+
+        await spool.replay(tracker._replay)
+        (record,) = collection.insert_many.call_args[0][0]
+        assert record["request_id"] == "req-1"
+        ops = sessions.bulk_write.call_args[0][0]
+        assert ops[0]._filter == {"session_id": "sess-1"}
+        await tracker.close()
+
+    async def test_failed_connect_spools_and_retries_later(
+        self, tmp_path: Path
+    ) -> None:
+        spool = RecordSpool(str(tmp_path), "usage", replay_interval_seconds=60)
+        tracker = UsageTracker(
+            mongo_uri="mongodb://localhost:27017", client_provider=None, spool=spool
+        )
+        with patch("pymongo.AsyncMongoClient", side_effect=ValueError("bad uri")):
+            await tracker.record_usage(
+                start_time=_TEST_START_TIME,
+                request_id="req-1",
+                user_id="user-1",
+                model="claude-3-5-haiku",
+                input_tokens=100,
+                output_tokens=50,
+            )
+        assert tracker._enabled is True
+        assert spool.has_pending()
+        await tracker.close()
@@ -6,7 +6,7 @@ Tests cover:
   _openai_to_anthropic_response, _is_throttling
 - Route registration
 - Invalid JSON → 400
-- count_tokens estimate for OpenAI api_type routes
+- count_tokens: OpenAI api_type estimate, local Anthropic-format counting, cache
 - Passthrough to Anthropic direct (streaming + non-streaming)
 - Unknown model fallback to Anthropic direct
 - Error response helpers (streaming + non-streaming)
@@ -29,13 +29,21 @@ from oidcauthlib.auth.exceptions.authorization_bearer_token_invalid_exception im
 )
 from pytest_httpx import HTTPXMock
 from starlette.requests import Request
+from starlette.responses import JSONResponse
 
+from language_model_gateway.gateway.routers.model_routing.anthropic_token_counter import (
+    count_anthropic_request_tokens,
+)
 from language_model_gateway.gateway.routers.model_routing.bedrock_client import (
     _is_throttling,
+    get_bedrock_circuit_breaker,
 )
 from language_model_gateway.gateway.routers.model_routing.bedrock_converse_client import (
     BedrockRuntimeClientProvider,
 )
+from language_model_gateway.gateway.routers.model_routing.bedrock_executor import (
+    BedrockExecutor,
+)
 from language_model_gateway.gateway.routers.model_routing.constants import (
     _MAX_THROTTLE_RETRIES,
 )
@@ -392,6 +400,57 @@ def test_bedrock_transport_stores_native_override() -> None:
     assert router._bedrock_transport == "native"
 
 
+@pytest.mark.asyncio
+async def test_prewarm_routes_builds_each_routes_client() -> None:
+    router = CodingModelRouter()
+    pool = MagicMock()
+    router._upstream_client_pool = pool
+    router._bedrock_client_provider = MagicMock()
+    mantle = {
+        "claude_model": "mantle",
+        "auth": "aws",
+        "api_type": "openai",
+        "url": "https://bedrock-mantle.us-east-1.api.aws/v1/chat/completions",
+    }
+    native = {
+        "claude_model": "native",
+        "auth": "aws",
+        "api_type": "openai",
+        "bedrock_transport": "native",
+        "url": "https://bedrock-mantle.us-west-2.api.aws/v1/chat/completions",
+        "aws_region": "us-west-2",
+    }
+
+    with patch(
+        "language_model_gateway.gateway.routers.model_routing.router.get_bedrock_signer"
+    ) as get_signer:
+        await router.prewarm_routes(
+            [
+                {
+                    "claude_model": "direct",
+                    "auth": "passthrough",
+                    "url": "https://api.anthropic.com/v1/messages",
+                },
+                mantle,
+                native,
+                {"claude_model": "incomplete"},
+            ]
+        )
+
+    pool.get_client.assert_called_once_with(
+        "https://api.anthropic.com/v1/messages", auth="passthrough", aws_region=None
+    )
+    pool.get_openai_client.assert_called_once_with(
+        "https://bedrock-mantle.us-east-1.api.aws/v1",
+        auth="aws",
+        aws_region="us-east-1",
+    )
+    router._bedrock_client_provider.get_client.assert_called_once_with(native)
+    # Native routes sign through their boto3 client instead.
+    get_signer.assert_called_once_with(mantle)
+    get_signer.return_value.signer.assert_called_once_with()
+
+
 # ---------------------------------------------------------------------------
 # _get_auth_info — usage-tracking identity validation
 #
@@ -841,6 +900,76 @@ async def test_count_tokens_openai_route_returns_estimate(
     assert data["input_tokens"] > 0
 
 
+@pytest.mark.asyncio
+async def test_count_tokens_bedrock_route_is_counted_locally(
+    router_client: httpx.AsyncClient,
+) -> None:
+    """No upstream request: httpx_mock isn't set up, so one would fail."""
+    fake_route = {
+        "claude_model": "claude-test-model",
+        "url": "https://bedrock-runtime.us-east-1.amazonaws.com/model/m/invoke",
+        "model": "upstream-model",
+        "auth": "aws",
+    }
+    body = {
+        "model": "claude-test-model",
+        "system": "You are a coding assistant.",
+        "messages": [{"role": "user", "content": "hello " * 100}],
+        "tools": [
+            {
+                "name": "bash",
+                "description": "Run a shell command",
+                "input_schema": {"type": "object"},
+            }
+        ],
+    }
+    with (
+        patch.dict(_ROUTES, {"claude-test-model": fake_route}),
+        patch(
+            "language_model_gateway.gateway.routers.model_routing.router.count_anthropic_request_tokens",
+            wraps=count_anthropic_request_tokens,
+        ) as counter,
+    ):
+        first = await router_client.post("/v1/messages/count_tokens", json=body)
+        second = await router_client.post("/v1/messages/count_tokens", json=body)
+    assert first.status_code == 200
+    assert first.json() == second.json()
+    assert first.json()["input_tokens"] > 346  # includes the tool system prompt
+    # The repeat is answered from the body-digest cache.
+    assert counter.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_count_tokens_route_can_opt_into_upstream_counting(
+    router_client: httpx.AsyncClient,
+    httpx_mock: HTTPXMock,
+) -> None:
+    fake_route = {
+        "claude_model": "claude-test-model",
+        "url": "https://api.anthropic.com/v1/messages",
+        "model": "claude-test-model",
+        "auth": "passthrough",
+        "count_tokens": "upstream",
+    }
+    httpx_mock.add_response(
+        url="https://api.anthropic.com/v1/messages/count_tokens",
+        method="POST",
+        status_code=200,
+        content=b'{"input_tokens": 42}',
+        headers={"content-type": "application/json"},
+    )
+    with patch.dict(_ROUTES, {"claude-test-model": fake_route}):
+        response = await router_client.post(
+            "/v1/messages/count_tokens",
+            json={
+                "model": "claude-test-model",
+                "messages": [{"role": "user", "content": "hi"}],
+            },
+            headers={"authorization": "Bearer test-key"},
+        )
+    assert response.json() == {"input_tokens": 42}
+
+
 @pytest.mark.asyncio
 async def test_passthrough_unknown_model_calls_anthropic(
     router_client: httpx.AsyncClient,
@@ -1091,6 +1220,35 @@ async def test_passthrough_forwards_clients_model_not_configured_model(
     assert sent_body["model"] == "claude-opus-stale-pin-v2"
 
 
+@pytest.mark.asyncio
+async def test_passthrough_unmodified_body_is_forwarded_verbatim(
+    router_client: httpx.AsyncClient,
+    httpx_mock: HTTPXMock,
+) -> None:
+    """
+    When no stage changes the body (passthrough route, no context_window
+    cap), the client's bytes are forwarded as-is rather than re-serialized.
+    """
+    httpx_mock.add_response(
+        url="https://api.anthropic.com/v1/messages",
+        method="POST",
+        status_code=200,
+        json={"usage": {"input_tokens": 1, "output_tokens": 1}},
+    )
+    raw = (
+        b'{"model": "claude-unrouted-verbatim",  "max_tokens": 16,\n'
+        b' "messages": [{"role": "user", "content": "caf\\u00e9"}]}'
+    )
+    response = await router_client.post(
+        "/v1/messages",
+        content=raw,
+        headers={"content-type": "application/json", "authorization": "Bearer key"},
+    )
+
+    assert response.status_code == 200
+    assert httpx_mock.get_requests()[0].content == raw
+
+
 @pytest.mark.asyncio
 async def test_upstream_error_propagated(
     router_client: httpx.AsyncClient,
@@ -1330,6 +1488,7 @@ async def router_client_with_trackers() -> AsyncGenerator[
     `UsageTracker`/`ErrorTracker`-shaped mocks rather than the `X | None`
     attribute type on CodingModelRouter.
     """
+    get_bedrock_circuit_breaker().reset()
     router = CodingModelRouter()
     usage_tracker = MagicMock()
     usage_tracker.record_usage = AsyncMock()
@@ -1441,6 +1600,59 @@ async def test_anthropic_passthrough_streaming_relays_bytes_and_records_usage(
     error_tracker.record_error.assert_not_awaited()
 
 
+@pytest.mark.asyncio
+async def test_anthropic_passthrough_streaming_with_flush_policy_relays_same_bytes(
+    httpx_mock: HTTPXMock,
+) -> None:
+    """Merging SSE chunks into fewer frames must not change what the client
+    receives, nor when the stream's usage is recorded."""
+    get_bedrock_circuit_breaker().reset()
+    router = CodingModelRouter(
+        stream_flush_bytes=8192, stream_flush_interval_seconds=0.005
+    )
+    usage_tracker = MagicMock()
+    usage_tracker.record_usage = AsyncMock()
+    router._usage_tracker = usage_tracker
+    app = FastAPI()
+    app.include_router(router.get_router())
+    sse_body = (
+        b"event: message_start\n"
+        b'data: {"type":"message_start","message":{"usage":{"input_tokens":9,"output_tokens":1}}}\n\n'
+        b"event: content_block_delta\n"
+        b'data: {"type":"content_block_delta","delta":{"type":"text_delta","text":"hi"}}\n\n'
+        b"event: message_delta\n"
+        b'data: {"type":"message_delta","usage":{"output_tokens":4}}\n\n'
+        b"event: message_stop\n"
+        b'data: {"type":"message_stop"}\n\n'
+    )
+    httpx_mock.add_response(
+        url="https://api.anthropic.com/v1/messages",
+        method="POST",
+        status_code=200,
+        content=sse_body,
+        headers={"content-type": "text/event-stream"},
+    )
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        response = await client.post(
+            "/v1/messages",
+            json={
+                "model": "claude-unknown-model-xyz",
+                "messages": [{"role": "user", "content": "Hello"}],
+                "stream": True,
+            },
+            headers={"content-type": "application/json"},
+        )
+
+    assert response.status_code == 200
+    assert response.content == sse_body
+    await asyncio.sleep(0)  # let the fire-and-forget usage-recording task run
+    usage_tracker.record_usage.assert_awaited_once()
+    assert usage_tracker.record_usage.call_args.kwargs["output_tokens"] == 4
+
+
 @pytest.mark.asyncio
 async def test_anthropic_passthrough_upstream_error_records_error(
     router_client_with_trackers: tuple[httpx.AsyncClient, MagicMock, MagicMock],
@@ -1751,6 +1963,263 @@ async def test_bedrock_mantle_connection_error_is_not_misrecorded_as_stream_erro
     usage_tracker.record_usage_from_openai_response.assert_not_called()
 
 
+def _open_circuit(route: dict[str, Any]) -> None:
+    breaker = get_bedrock_circuit_breaker()
+    for _ in range(20):
+        breaker.record_failure(route)
+    assert breaker.snapshot()[f"us-east-1/{route['model']}"]["state"] == "open"
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast_without_calling_bedrock(
+    router_client_with_trackers: tuple[httpx.AsyncClient, MagicMock, MagicMock],
+    httpx_mock: HTTPXMock,
+) -> None:
+    """While a Bedrock route's circuit is open, requests get Anthropic's
+    overloaded error with a Retry-After straight away instead of each one
+    sitting through the full throttle backoff."""
+    client, _usage_tracker, error_tracker = router_client_with_trackers
+    fake_route = {
+        "claude_model": "claude-test-model-circuit",
+        "url": "https://example.bedrock.aws/v1/chat/completions",
+        "model": "qwen.circuit-test",
+        "auth": "aws",
+        "aws_region": "us-east-1",
+        "api_type": "openai",
+    }
+    _open_circuit(fake_route)
+
+    with patch.dict(_ROUTES, {"claude-test-model-circuit": fake_route}):
+        response = await client.post(
+            "/v1/messages",
+            json={
+                "model": "claude-test-model-circuit",
+                "messages": [{"role": "user", "content": "Hello"}],
+            },
+        )
+
+    assert response.status_code == 503
+    assert response.json()["error"]["type"] == "overloaded_error"
+    assert int(response.headers["retry-after"]) >= 1
+    assert httpx_mock.get_requests() == []
+    await asyncio.sleep(0)  # let the fire-and-forget error-recording task run
+    assert error_tracker.record_error.call_args.kwargs["error_type"] == "circuit_open"
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_routes_to_fallback_model(
+    router_client: httpx.AsyncClient,
+    httpx_mock: HTTPXMock,
+) -> None:
+    primary = {
+        "claude_model": "claude-test-model-primary",
+        "url": "https://example.bedrock.aws/v1/chat/completions",
+        "model": "qwen.primary-test",
+        "auth": "aws",
+        "aws_region": "us-east-1",
+        "api_type": "openai",
+        "fallback_model": "claude-test-model-direct",
+    }
+    direct = {
+        "claude_model": "claude-test-model-direct",
+        "url": "https://api.anthropic.com/v1/messages",
+        "model": "claude-test-model-direct",
+        "auth": "passthrough",
+    }
+    _open_circuit(primary)
+    httpx_mock.add_response(
+        url="https://api.anthropic.com/v1/messages",
+        method="POST",
+        json={
+            "id": "msg_1",
+            "type": "message",
+            "role": "assistant",
+            "content": [{"type": "text", "text": "hi"}],
+            "model": "claude-test-model-primary",
+            "stop_reason": "end_turn",
+            "usage": {"input_tokens": 1, "output_tokens": 1},
+        },
+    )
+
+    with patch.dict(
+        _ROUTES,
+        {"claude-test-model-primary": primary, "claude-test-model-direct": direct},
+    ):
+        response = await router_client.post(
+            "/v1/messages",
+            json={
+                "model": "claude-test-model-primary",
+                "messages": [{"role": "user", "content": "Hello"}],
+            },
+        )
+
+    assert response.status_code == 200
+    (sent,) = httpx_mock.get_requests()
+    assert str(sent.url) == "https://api.anthropic.com/v1/messages"
+
+
+@pytest.mark.asyncio
+async def test_circuits_endpoint_reports_state(
+    router_client: httpx.AsyncClient,
+) -> None:
+    _open_circuit({"auth": "aws", "aws_region": "us-east-1", "model": "qwen.shown"})
+
+    response = await router_client.get("/v1/model-routing/circuits")
+
+    assert response.status_code == 200
+    circuit = response.json()["circuits"]["us-east-1/qwen.shown"]
+    assert circuit["state"] == "open"
+    assert circuit["retry_after_s"] > 0
+
+
+@pytest.mark.asyncio
+async def test_overloaded_route_fails_over_to_alternate_and_tracks_usage(
+    router_client_with_trackers: tuple[httpx.AsyncClient, MagicMock, MagicMock],
+    httpx_mock: HTTPXMock,
+) -> None:
+    """An overloaded first candidate is abandoned on the first attempt, the
+    alternate answers, and the usage record names the alternate."""
+    client, usage_tracker, error_tracker = router_client_with_trackers
+    fake_route = {
+        "claude_model": "claude-test-model-alternates",
+        "url": "https://primary.example/v1/messages",
+        "model": "claude-test-model-alternates",
+        "auth": "passthrough",
+        "alternates": [{"url": "https://secondary.example/v1/messages"}],
+    }
+    httpx_mock.add_response(
+        url="https://primary.example/v1/messages",
+        method="POST",
+        status_code=529,
+        json={"type": "error", "error": {"type": "overloaded_error"}},
+    )
+    httpx_mock.add_response(
+        url="https://secondary.example/v1/messages",
+        method="POST",
+        json={
+            "id": "msg_alt",
+            "type": "message",
+            "role": "assistant",
+            "content": [{"type": "text", "text": "Hi"}],
+            "model": "claude-test-model-alternates",
+            "usage": {"input_tokens": 5, "output_tokens": 2},
+        },
+    )
+
+    with patch.dict(_ROUTES, {"claude-test-model-alternates": fake_route}):
+        response = await client.post(
+            "/v1/messages",
+            json={
+                "model": "claude-test-model-alternates",
+                "messages": [{"role": "user", "content": "Hello"}],
+            },
+        )
+
+    assert response.status_code == 200
+    assert len(httpx_mock.get_requests()) == 2
+    usage_tracker.record_usage_from_anthropic_response.assert_awaited_once()
+    routing = usage_tracker.record_usage_from_anthropic_response.call_args.kwargs[
+        "auth_info"
+    ]["routing"]
+    assert routing == {
+        "served_by": "https://secondary.example/v1/messages",
+        "candidate_index": 1,
+        "failed_over_from": ["https://primary.example/v1/messages"],
+    }
+    await asyncio.sleep(0)  # let the fire-and-forget error-recording task run
+    call_kwargs = error_tracker.record_error.call_args.kwargs
+    assert call_kwargs["error_type"] == "route_failover"
+    assert call_kwargs["status_code"] == 529
+
+
+@pytest.mark.asyncio
+async def test_hedged_dispatch_takes_first_answer_and_finishes_loser() -> None:
+    router = CodingModelRouter()
+    slow = {"auth": "passthrough", "url": "https://slow.example", "hedge_after_ms": 10}
+    fast = {"auth": "passthrough", "url": "https://fast.example"}
+    release_slow = asyncio.Event()
+    loser_background = AsyncMock()
+    routings: dict[str, dict[str, Any]] = {}
+
+    async def fake_dispatch(
+        candidate: dict[str, Any],
+        *,
+        fresh_body: bool,
+        failover: bool,
+        routing: dict[str, Any] | None = None,
+        tasks: Any = None,
+    ) -> Any:
+        assert routing is not None
+        routings[candidate["url"]] = routing
+        response = MagicMock(status_code=200)
+        if candidate is slow:
+            await release_slow.wait()
+            response.background = loser_background
+        else:
+            response.background = None
+        response.url = candidate["url"]
+        return response
+
+    response = await router._dispatch_candidates(
+        [slow, fast],
+        fake_dispatch,
+        request_id="req-hedge",
+        auth_info={},
+        request_start_time=MagicMock(),
+        is_streaming=False,
+    )
+
+    assert isinstance(response, MagicMock)
+    assert response.url == "https://fast.example"
+    assert routings["https://slow.example"]["hedged"] is True
+    assert routings["https://slow.example"]["hedge_winner"] is False
+    assert routings["https://fast.example"]["hedge_winner"] is True
+    # The loser still runs to completion and records its usage.
+    release_slow.set()
+    for _ in range(5):
+        await asyncio.sleep(0)
+    loser_background.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_hedged_error_response_does_not_beat_a_slower_success() -> None:
+    router = CodingModelRouter()
+    primary = {
+        "auth": "passthrough",
+        "url": "https://primary.example",
+        "hedge_after_ms": 10,
+    }
+    last = {"auth": "passthrough", "url": "https://last.example"}
+    succeeded = JSONResponse({"ok": True})
+
+    async def fake_dispatch(
+        candidate: dict[str, Any],
+        *,
+        fresh_body: bool,
+        failover: bool,
+        routing: dict[str, Any] | None = None,
+        tasks: Any = None,
+    ) -> Any:
+        if candidate is last:
+            # The last candidate runs with failover off, so its 5xx comes
+            # back as a response.
+            assert failover is False
+            return JSONResponse({"error": "unavailable"}, status_code=503)
+        await asyncio.sleep(0.05)
+        return succeeded
+
+    response = await router._dispatch_candidates(
+        [primary, last],
+        fake_dispatch,
+        request_id="req-hedge",
+        auth_info={},
+        request_start_time=MagicMock(),
+        is_streaming=False,
+    )
+
+    assert response is succeeded
+
+
 @pytest.mark.asyncio
 async def test_bedrock_mantle_qwen_chat_template_kwargs_reaches_wire_via_extra_body(
     router_client: httpx.AsyncClient,
@@ -1900,6 +2369,45 @@ async def test_native_bedrock_nonstreaming_happy_path(
     assert call_kwargs["modelId"] == "qwen.qwen3-coder-next"
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize("stream", [False, True])
+async def test_native_bedrock_saturated_executor_returns_529(
+    native_bedrock_route: dict[str, Any], stream: bool
+) -> None:
+    """With every boto3 executor thread busy, a native request is refused
+    with 529 overloaded_error (which clients retry) rather than queued."""
+    router = CodingModelRouter(
+        bedrock_transport="native", bedrock_executor=BedrockExecutor(max_workers=0)
+    )
+    app = FastAPI()
+    app.include_router(router.get_router())
+    mock_client = MagicMock()
+
+    with (
+        patch.dict(_ROUTES, {"claude-test-native-sonnet": native_bedrock_route}),
+        patch.object(
+            BedrockRuntimeClientProvider, "get_client", return_value=mock_client
+        ),
+    ):
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            response = await client.post(
+                "/v1/messages",
+                json={
+                    "model": "claude-test-native-sonnet",
+                    "messages": [{"role": "user", "content": "Hello"}],
+                    "stream": stream,
+                },
+                headers={"content-type": "application/json"},
+            )
+
+    assert response.status_code == 529
+    assert response.json()["error"]["type"] == "overloaded_error"
+    mock_client.converse.assert_not_called()
+    mock_client.converse_stream.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_native_bedrock_mantle_default_transport_unaffected(
     native_bedrock_route: dict[str, Any],
@@ -0,0 +1,20 @@
+import asyncio
+import time
+
+from language_model_gateway.gateway.utilities.event_loop_lag_monitor import (
+    EventLoopLagMonitor,
+)
+
+
+async def test_records_lag_when_the_loop_is_blocked() -> None:
+    monitor = EventLoopLagMonitor(interval_seconds=0.01)
+    monitor.start()
+    await asyncio.sleep(0.02)
+    time.sleep(0.1)  # blocks the loop, as inline tokenization used to
+    await asyncio.sleep(0.03)
+    await monitor.stop()
+    assert monitor.max_lag_seconds >= 0.05
+
+
+async def test_stop_is_safe_without_start() -> None:
+    await EventLoopLagMonitor().stop()
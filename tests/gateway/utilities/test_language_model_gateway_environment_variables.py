@@ -129,3 +129,290 @@ def test_model_routing_bedrock_retry_mode_reads_override(
     monkeypatch.setenv("MODEL_ROUTING_BEDROCK_RETRY_MODE", "standard")
     env_vars = LanguageModelGatewayEnvironmentVariables()
     assert env_vars.model_routing_bedrock_retry_mode == "standard"
+
+
+def test_model_routing_bedrock_native_client_defaults_to_httpx(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.delenv("MODEL_ROUTING_BEDROCK_NATIVE_CLIENT", raising=False)
+    env_vars = LanguageModelGatewayEnvironmentVariables()
+    assert env_vars.model_routing_bedrock_native_client == "httpx"
+
+
+def test_model_routing_bedrock_native_client_boto3_opt_out(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("MODEL_ROUTING_BEDROCK_NATIVE_CLIENT", "BOTO3")
+    env_vars = LanguageModelGatewayEnvironmentVariables()
+    assert env_vars.model_routing_bedrock_native_client == "boto3"
+    monkeypatch.setenv("MODEL_ROUTING_BEDROCK_NATIVE_CLIENT", "typo")
+    assert env_vars.model_routing_bedrock_native_client == "httpx"
+
+
+def test_model_routing_bedrock_executor_max_workers(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.delenv("MODEL_ROUTING_BEDROCK_EXECUTOR_MAX_WORKERS", raising=False)
+    env_vars = LanguageModelGatewayEnvironmentVariables()
+    assert env_vars.model_routing_bedrock_executor_max_workers == 64
+    monkeypatch.setenv("MODEL_ROUTING_BEDROCK_EXECUTOR_MAX_WORKERS", "8")
+    assert env_vars.model_routing_bedrock_executor_max_workers == 8
+
+
+def test_model_routing_stream_flush_settings_default(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.delenv("MODEL_ROUTING_STREAM_FLUSH_INTERVAL_MS", raising=False)
+    monkeypatch.delenv("MODEL_ROUTING_STREAM_FLUSH_BYTES", raising=False)
+    env_vars = LanguageModelGatewayEnvironmentVariables()
+    assert env_vars.model_routing_stream_flush_interval_ms == 5
+    assert env_vars.model_routing_stream_flush_bytes == 8192
+
+
+def test_model_routing_stream_flush_settings_read_overrides(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("MODEL_ROUTING_STREAM_FLUSH_INTERVAL_MS", "0")
+    monkeypatch.setenv("MODEL_ROUTING_STREAM_FLUSH_BYTES", "1024")
+    env_vars = LanguageModelGatewayEnvironmentVariables()
+    assert env_vars.model_routing_stream_flush_interval_ms == 0
+    assert env_vars.model_routing_stream_flush_bytes == 1024
+
+
+def test_model_routing_upstream_pool_settings_default(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    for name in (
+        "MODEL_ROUTING_UPSTREAM_MAX_CONNECTIONS",
+        "MODEL_ROUTING_UPSTREAM_MAX_KEEPALIVE_CONNECTIONS",
+        "MODEL_ROUTING_UPSTREAM_KEEPALIVE_EXPIRY_SECONDS",
+        "MODEL_ROUTING_UPSTREAM_HTTP2",
+    ):
+        monkeypatch.delenv(name, raising=False)
+    env_vars = LanguageModelGatewayEnvironmentVariables()
+    assert env_vars.model_routing_upstream_max_connections == 100
+    assert env_vars.model_routing_upstream_max_keepalive_connections == 20
+    assert env_vars.model_routing_upstream_keepalive_expiry_seconds == 30.0
+    assert env_vars.model_routing_upstream_http2 is True
+
+
+def test_model_routing_upstream_pool_settings_read_overrides(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("MODEL_ROUTING_UPSTREAM_MAX_CONNECTIONS", "50")
+    monkeypatch.setenv("MODEL_ROUTING_UPSTREAM_MAX_KEEPALIVE_CONNECTIONS", "5")
+    monkeypatch.setenv("MODEL_ROUTING_UPSTREAM_KEEPALIVE_EXPIRY_SECONDS", "12.5")
+    monkeypatch.setenv("MODEL_ROUTING_UPSTREAM_HTTP2", "false")
+    env_vars = LanguageModelGatewayEnvironmentVariables()
+    assert env_vars.model_routing_upstream_max_connections == 50
+    assert env_vars.model_routing_upstream_max_keepalive_connections == 5
+    assert env_vars.model_routing_upstream_keepalive_expiry_seconds == 12.5
+    assert env_vars.model_routing_upstream_http2 is False
+
+
+def test_model_routing_dispatch_redis_url_defaults_to_none(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.delenv("MODEL_ROUTING_DISPATCH_REDIS_URL", raising=False)
+    env_vars = LanguageModelGatewayEnvironmentVariables()
+    assert env_vars.model_routing_dispatch_redis_url is None
+
+
+def test_model_routing_dispatch_redis_url_reads_override(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("MODEL_ROUTING_DISPATCH_REDIS_URL", "redis://redis:6379/2")
+    env_vars = LanguageModelGatewayEnvironmentVariables()
+    assert env_vars.model_routing_dispatch_redis_url == "redis://redis:6379/2"
+
+
+def test_model_routing_tokenizer_executor_settings_default(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    for name in (
+        "MODEL_ROUTING_TOKENIZER_MAX_WORKERS",
+        "MODEL_ROUTING_TOKENIZER_MAX_PENDING",
+        "MODEL_ROUTING_TOKENIZER_TIMEOUT_SECONDS",
+    ):
+        monkeypatch.delenv(name, raising=False)
+    env_vars = LanguageModelGatewayEnvironmentVariables()
+    assert env_vars.model_routing_tokenizer_max_workers == 2
+    assert env_vars.model_routing_tokenizer_max_pending == 16
+    assert env_vars.model_routing_tokenizer_timeout_seconds == 2.0
+
+
+def test_model_routing_tokenizer_executor_settings_read_overrides(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("MODEL_ROUTING_TOKENIZER_MAX_WORKERS", "4")
+    monkeypatch.setenv("MODEL_ROUTING_TOKENIZER_MAX_PENDING", "8")
+    monkeypatch.setenv("MODEL_ROUTING_TOKENIZER_TIMEOUT_SECONDS", "0.5")
+    env_vars = LanguageModelGatewayEnvironmentVariables()
+    assert env_vars.model_routing_tokenizer_max_workers == 4
+    assert env_vars.model_routing_tokenizer_max_pending == 8
+    assert env_vars.model_routing_tokenizer_timeout_seconds == 0.5
+
+
+def test_model_routing_tokenizer_preload(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("MODEL_ROUTING_TOKENIZER_PRELOAD", raising=False)
+    assert LanguageModelGatewayEnvironmentVariables().model_routing_tokenizer_preload
+    monkeypatch.setenv("MODEL_ROUTING_TOKENIZER_PRELOAD", "false")
+    assert (
+        not LanguageModelGatewayEnvironmentVariables().model_routing_tokenizer_preload
+    )
+
+
+def test_model_routing_usage_write_buffer_settings_default(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    for name in (
+        "MODEL_ROUTING_USAGE_WRITE_BATCH_SIZE",
+        "MODEL_ROUTING_USAGE_FLUSH_INTERVAL_MS",
+        "MODEL_ROUTING_USAGE_MAX_PENDING_WRITES",
+    ):
+        monkeypatch.delenv(name, raising=False)
+    env_vars = LanguageModelGatewayEnvironmentVariables()
+    assert env_vars.model_routing_usage_write_batch_size == 100
+    assert env_vars.model_routing_usage_flush_interval_ms == 500
+    assert env_vars.model_routing_usage_max_pending_writes == 10000
+
+
+def test_model_routing_usage_write_buffer_settings_read_overrides(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("MODEL_ROUTING_USAGE_WRITE_BATCH_SIZE", "1")
+    monkeypatch.setenv("MODEL_ROUTING_USAGE_FLUSH_INTERVAL_MS", "250")
+    monkeypatch.setenv("MODEL_ROUTING_USAGE_MAX_PENDING_WRITES", "50")
+    env_vars = LanguageModelGatewayEnvironmentVariables()
+    assert env_vars.model_routing_usage_write_batch_size == 1
+    assert env_vars.model_routing_usage_flush_interval_ms == 250
+    assert env_vars.model_routing_usage_max_pending_writes == 50
+
+
+def test_model_routing_mongo_pool_size_default_and_override(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.delenv("MODEL_ROUTING_MONGO_MAX_POOL_SIZE", raising=False)
+    monkeypatch.delenv("MODEL_ROUTING_MONGO_MIN_POOL_SIZE", raising=False)
+    env_vars = LanguageModelGatewayEnvironmentVariables()
+    assert env_vars.model_routing_mongo_max_pool_size == 20
+    assert env_vars.model_routing_mongo_min_pool_size == 0
+    monkeypatch.setenv("MODEL_ROUTING_MONGO_MAX_POOL_SIZE", "50")
+    monkeypatch.setenv("MODEL_ROUTING_MONGO_MIN_POOL_SIZE", "5")
+    assert env_vars.model_routing_mongo_max_pool_size == 50
+    assert env_vars.model_routing_mongo_min_pool_size == 5
+
+
+def test_model_routing_account_directory_cache_settings(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    for name in (
+        "MODEL_ROUTING_ACCOUNT_DIRECTORY_PRELOAD",
+        "MODEL_ROUTING_ACCOUNT_DIRECTORY_CACHE_MAX_ENTRIES",
+        "MODEL_ROUTING_ACCOUNT_DIRECTORY_HIT_TTL_SECONDS",
+        "MODEL_ROUTING_ACCOUNT_DIRECTORY_MISS_TTL_SECONDS",
+        "MODEL_ROUTING_ACCOUNT_DIRECTORY_REFRESH_INTERVAL_SECONDS",
+    ):
+        monkeypatch.delenv(name, raising=False)
+    env_vars = LanguageModelGatewayEnvironmentVariables()
+    assert env_vars.model_routing_account_directory_preload is False
+    assert env_vars.model_routing_account_directory_cache_max_entries == 10000
+    assert env_vars.model_routing_account_directory_hit_ttl_seconds == 3600.0
+    assert env_vars.model_routing_account_directory_miss_ttl_seconds == 300.0
+    assert env_vars.model_routing_account_directory_refresh_interval_seconds == 300.0
+    monkeypatch.setenv("MODEL_ROUTING_ACCOUNT_DIRECTORY_PRELOAD", "true")
+    monkeypatch.setenv("MODEL_ROUTING_ACCOUNT_DIRECTORY_MISS_TTL_SECONDS", "60")
+    assert env_vars.model_routing_account_directory_preload is True
+    assert env_vars.model_routing_account_directory_miss_ttl_seconds == 60.0
+
+
+def test_model_routing_error_aggregation_settings(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    for name in (
+        "MODEL_ROUTING_ERROR_GROUP_COLLECTION_NAME",
+        "MODEL_ROUTING_ERROR_AGGREGATION_WINDOW_SECONDS",
+        "MODEL_ROUTING_ERROR_SAMPLE_RATE",
+        "MODEL_ROUTING_ERROR_MAX_WRITES_PER_SECOND",
+    ):
+        monkeypatch.delenv(name, raising=False)
+    env_vars = LanguageModelGatewayEnvironmentVariables()
+    assert (
+        env_vars.model_routing_error_group_collection_name
+        == "model-router-error-groups"
+    )
+    assert env_vars.model_routing_error_aggregation_window_seconds == 10.0
+    assert env_vars.model_routing_error_sample_rate == 0.05
+    assert env_vars.model_routing_error_max_writes_per_second == 20.0
+    monkeypatch.setenv("MODEL_ROUTING_ERROR_AGGREGATION_WINDOW_SECONDS", "0")
+    monkeypatch.setenv("MODEL_ROUTING_ERROR_SAMPLE_RATE", "1")
+    assert env_vars.model_routing_error_aggregation_window_seconds == 0.0
+    assert env_vars.model_routing_error_sample_rate == 1.0
+
+
+def test_model_routing_spool_settings(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.delenv("MODEL_ROUTING_SPOOL_DIR", raising=False)
+    monkeypatch.delenv("MODEL_ROUTING_MONGO_WRITE_TIMEOUT_SECONDS", raising=False)
+    env_vars = LanguageModelGatewayEnvironmentVariables()
+    assert env_vars.model_routing_spool_dir.endswith("model-routing-spool")
+    assert env_vars.model_routing_mongo_write_timeout_seconds == 5.0
+    monkeypatch.setenv("MODEL_ROUTING_SPOOL_DIR", "")
+    monkeypatch.setenv("MODEL_ROUTING_MONGO_WRITE_TIMEOUT_SECONDS", "1.5")
+    assert env_vars.model_routing_spool_dir == ""
+    assert env_vars.model_routing_mongo_write_timeout_seconds == 1.5
+
+
+def test_model_routing_session_savings_cache_ttl(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.delenv("MODEL_ROUTING_SESSION_SAVINGS_CACHE_TTL_SECONDS", raising=False)
+    env_vars = LanguageModelGatewayEnvironmentVariables()
+    assert env_vars.model_routing_session_savings_cache_ttl_seconds == 10.0
+    monkeypatch.setenv("MODEL_ROUTING_SESSION_SAVINGS_CACHE_TTL_SECONDS", "2.5")
+    assert env_vars.model_routing_session_savings_cache_ttl_seconds == 2.5
+
+
+def test_model_routing_usage_rollup_settings(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.delenv("MODEL_ROUTING_USAGE_ROLLUPS_ENABLED", raising=False)
+    monkeypatch.delenv("MODEL_ROUTING_USAGE_ROLLUP_COLLECTION_PREFIX", raising=False)
+    env_vars = LanguageModelGatewayEnvironmentVariables()
+    assert env_vars.model_routing_usage_rollups_enabled is True
+    assert (
+        env_vars.model_routing_usage_rollup_collection_prefix
+        == "model-router-usage-rollup"
+    )
+    monkeypatch.setenv("MODEL_ROUTING_USAGE_ROLLUPS_ENABLED", "false")
+    monkeypatch.setenv("MODEL_ROUTING_USAGE_ROLLUP_COLLECTION_PREFIX", "rollups")
+    assert env_vars.model_routing_usage_rollups_enabled is False
+    assert env_vars.model_routing_usage_rollup_collection_prefix == "rollups"
+
+
+def test_model_routing_circuit_breaker_settings(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    for name in (
+        "MODEL_ROUTING_CIRCUIT_BREAKER_ENABLED",
+        "MODEL_ROUTING_CIRCUIT_OPEN_SECONDS",
+        "MODEL_ROUTING_CIRCUIT_OPEN_BELOW_HEALTH",
+    ):
+        monkeypatch.delenv(name, raising=False)
+    env_vars = LanguageModelGatewayEnvironmentVariables()
+    assert env_vars.model_routing_circuit_breaker_enabled is True
+    assert env_vars.model_routing_circuit_open_seconds == 30.0
+    assert env_vars.model_routing_circuit_open_below_health == 0.2
+    monkeypatch.setenv("MODEL_ROUTING_CIRCUIT_BREAKER_ENABLED", "false")
+    monkeypatch.setenv("MODEL_ROUTING_CIRCUIT_OPEN_SECONDS", "5")
+    assert env_vars.model_routing_circuit_breaker_enabled is False
+    assert env_vars.model_routing_circuit_open_seconds == 5.0
+
+
+def test_model_routing_config_reload_interval(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("MODEL_ROUTING_CONFIG_RELOAD_INTERVAL_SECONDS", raising=False)
+    env_vars = LanguageModelGatewayEnvironmentVariables()
+    assert env_vars.model_routing_config_reload_interval_seconds == 5.0
+    monkeypatch.setenv("MODEL_ROUTING_CONFIG_RELOAD_INTERVAL_SECONDS", "0")
+    assert env_vars.model_routing_config_reload_interval_seconds == 0.0
@@ -8,8 +8,9 @@ import importlib.util
 import io
 import json
 import sys
+from email.message import Message
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -114,6 +115,43 @@ class TestFetchSavings:
         assert result == payload
 
 
+class TestFetchSavingsRevalidation:
+    @pytest.fixture(autouse=True)
+    def _cache_dir(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(statusline, "_CACHE_DIR", tmp_path)
+
+    def _respond(self, payload: dict[str, object], etag: str) -> MagicMock:
+        response = MagicMock()
+        response.read.return_value = json.dumps(payload).encode()
+        response.headers = {"ETag": etag}
+        return response
+
+    def test_sends_etag_and_uses_kept_body_on_304(self) -> None:
+        payload = {"total_savings_usd": 0.42, "tiers": {}}
+        with patch.object(statusline.urllib.request, "urlopen") as mock_urlopen:
+            mock_urlopen.return_value.__enter__.return_value = self._respond(
+                payload, '"abc"'
+            )
+            assert statusline.fetch_savings("http://gateway", "sess-1") == payload
+
+            mock_urlopen.side_effect = statusline.urllib.error.HTTPError(
+                "http://gateway", 304, "Not Modified", Message(), None
+            )
+            assert statusline.fetch_savings("http://gateway", "sess-1") == payload
+
+        request = mock_urlopen.call_args[0][0]
+        assert request.get_header("If-none-match") == '"abc"'
+
+    def test_unsafe_session_id_is_not_cached(self, tmp_path: Path) -> None:
+        payload = {"total_savings_usd": 0.42, "tiers": {}}
+        with patch.object(statusline.urllib.request, "urlopen") as mock_urlopen:
+            mock_urlopen.return_value.__enter__.return_value = self._respond(
+                payload, '"abc"'
+            )
+            statusline.fetch_savings("http://gateway", "../escape")
+        assert list(tmp_path.iterdir()) == []
+
+
 class TestMain:
     def test_prints_nothing_when_stdin_is_not_json(
         self, capsys: pytest.CaptureFixture[str]